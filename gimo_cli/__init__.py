@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import importlib
 import sys
+from typing import Any
 
 import typer
+import typer.main
 from rich.console import Console
+from typer.core import TyperCommand, TyperGroup
 
 
 def _setup_windows_console():
@@ -32,31 +36,123 @@ def _setup_windows_console():
 
 _setup_windows_console()
 
+
+# Command/group name -> (module under gimo_cli.commands, one-line help).
+# Modules are imported only when their command is invoked; the help text lets
+# ``gimo --help`` list everything without importing them.  Keep in sync with
+# the modules' own registrations (tests/unit/test_cli_startup.py checks it).
+LAZY_COMMANDS: dict[str, tuple[str, str]] = {
+    "init": ("core", "Initialize the current workspace for GIMO CLI usage."),
+    "status": ("core", "Render the authoritative backend status snapshot."),
+    "plan": ("plan", "Create a structured draft plan and persist it under .gimo/plans."),
+    "run": ("run", "Approve a draft and optionally start its backend run."),
+    "merge": ("run", "Perform authoritative manual merge for a run that passed dry-run gates."),
+    "watch": ("run", "Watch the backend SSE stream for live orchestration events."),
+    "tui": ("chat_cmd", "Launch the experimental Textual UI."),
+    "chat": ("chat_cmd", "Interactive agentic chat session with GIMO orchestrator."),
+    "diff": ("ops", "Show backend diff summary for the active repository."),
+    "rollback": ("ops", "Rollback the last AI-generated change using safe git defaults."),
+    "config": ("ops", "Read or update local .gimo/config.yaml."),
+    "audit": ("ops", "Aggregate lightweight audit signals from backend endpoints."),
+    "graph": ("ops", "Display the orchestration graph."),
+    "capabilities": ("ops", "Display server capabilities."),
+    "login": ("auth", "Authenticate with a GIMO server and create a ServerBond."),
+    "logout": ("auth", "Remove ServerBond and CLI Bond for a given server."),
+    "doctor": ("auth", "Comprehensive health check with actionable hints."),
+    "providers": ("providers", "Manage LLM providers and connectors."),
+    "trust": ("trust", "Trust engine dashboard and controls."),
+    "mastery": ("mastery", "Token economy, cost analytics, and budget forecast."),
+    "skills": ("skills", "List and execute registered skills."),
+    "repos": ("repos", "Repository management."),
+    "threads": ("threads", "Conversation thread management."),
+    "observe": ("observe", "Observability: metrics, traces, and alerts."),
+    "up": ("server", "Start the GIMO server in the background."),
+    "down": ("server", "Stop the GIMO server running on the given host/port."),
+    "ps": ("server", "Discover running GIMO server instances by probing /health on each port."),
+    "surface": ("surface", "Manage surface connections (MCP clients)"),
+    "discover": ("discover", "Scan the LAN for GIMO Core peers advertised via mDNS."),
+    "runtime": ("runtime", "Operaciones sobre el bundle Core"),
+}
+
+
+class LazyCommandGroup(TyperGroup):
+    """Root group that imports a command module the first time it is needed."""
+
+    _listing = False
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        return list(dict.fromkeys([*LAZY_COMMANDS, *self.commands]))
+
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> Any:
+        command = self.commands.get(cmd_name)
+        if command is not None or cmd_name not in LAZY_COMMANDS:
+            return command
+        module, summary = LAZY_COMMANDS[cmd_name]
+        if self._listing:
+            return TyperCommand(cmd_name, help=summary)
+        importlib.import_module(f"gimo_cli.commands.{module}")
+        self._absorb_registrations()
+        return self.commands.get(cmd_name)
+
+    def format_help(self, ctx: typer.Context, formatter: Any) -> None:
+        self._listing = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing = False
+
+    def _absorb_registrations(self) -> None:
+        """Convert commands/groups registered on ``app`` since this group was built."""
+        markup = app.rich_markup_mode
+        for info in app.registered_commands:
+            name = info.name or typer.main.get_command_name(info.callback.__name__)
+            if name not in self.commands:
+                self.commands[name] = typer.main.get_command_from_info(
+                    info, pretty_exceptions_short=app.pretty_exceptions_short, rich_markup_mode=markup
+                )
+        for info in app.registered_groups:
+            if info.name not in self.commands:
+                self.commands[info.name] = typer.main.get_group_from_info(
+                    info,
+                    pretty_exceptions_short=app.pretty_exceptions_short,
+                    suggest_commands=app.suggest_commands,
+                    rich_markup_mode=markup,
+                )
+
+
 app = typer.Typer(
     name="gimo",
     help="GIMO: Gred In Multiagent Orchestrator",
     add_completion=True,
     invoke_without_command=True,
+    cls=LazyCommandGroup,
 )
 console = Console()
 
-# Register all command modules (side-effect imports)
-from gimo_cli.commands import core  # noqa: E402,F401
-from gimo_cli.commands import plan  # noqa: E402,F401
-from gimo_cli.commands import run  # noqa: E402,F401
-from gimo_cli.commands import chat_cmd  # noqa: E402,F401
-from gimo_cli.commands import ops  # noqa: E402,F401
-from gimo_cli.commands import auth  # noqa: E402,F401
-from gimo_cli.commands import providers  # noqa: E402,F401
-from gimo_cli.commands import trust  # noqa: E402,F401
-from gimo_cli.commands import mastery  # noqa: E402,F401
-from gimo_cli.commands import skills  # noqa: E402,F401
-from gimo_cli.commands import repos  # noqa: E402,F401
-from gimo_cli.commands import threads  # noqa: E402,F401
-from gimo_cli.commands import observe  # noqa: E402,F401
-from gimo_cli.commands import server  # noqa: E402,F401
-from gimo_cli.commands import surface  # noqa: E402,F401
-from gimo_cli.commands import discover  # noqa: E402,F401
-from gimo_cli.commands import runtime  # noqa: E402,F401
-
-__all__ = ["app", "console"]
+
+def _close_http_client() -> None:
+    api = sys.modules.get("gimo_cli.api")
+    if api is not None:
+        api.close_http_client()
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    verbose: bool = typer.Option(False, "--verbose", help="Enable debug/verbose render mode"),
+) -> None:
+    """GIMO: Gred In Multiagent Orchestrator.
+
+    Run without a subcommand to start an interactive agentic chat session.
+    """
+    # One keep-alive HTTP client per invocation, closed when the command ends.
+    ctx.call_on_close(_close_http_client)
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from gimo_cli.commands.core import start_interactive_chat
+
+    start_interactive_chat(verbose=verbose)
+
+
+__all__ = ["app", "console", "LAZY_COMMANDS"]
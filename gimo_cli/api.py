@@ -26,6 +26,28 @@ _caps_cache: dict[str, Any] = {}
 _caps_ts: float = 0.0
 _CAPS_TTL = 300.0
 
+# ── Shared HTTP client ────────────────────────────────────────────────────────
+# One keep-alive client per CLI invocation: requests reuse the pooled
+# connection instead of paying a TCP (and TLS) handshake each time.  The root
+# callback closes it when the command finishes; long-lived callers (chat) keep
+# it for the whole session.
+
+_http_client: httpx.Client | None = None
+
+
+def http_client() -> httpx.Client:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.Client(timeout=DEFAULT_TIMEOUT_SECONDS)
+    return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None:
+        client.close()
+
 
 def resolve_server_url(config: dict[str, Any]) -> str:
     env_url = os.environ.get("GIMO_API_URL") or os.environ.get("ORCH_API_URL")
@@ -116,12 +138,11 @@ def fetch_capabilities(config: dict[str, Any]) -> dict[str, Any]:
         base_url = resolve_server_url(config)
         token = resolve_token("operator", config)
         headers = {"Authorization": f"Bearer {token}"} if token else {}
-        with httpx.Client(timeout=5.0) as client:
-            resp = client.get(f"{base_url}/ops/capabilities", headers=headers)
-            if resp.status_code == 200:
-                _caps_cache = resp.json()
-                _caps_ts = time.time()
-                return _caps_cache
+        resp = http_client().get(f"{base_url}/ops/capabilities", headers=headers, timeout=5.0)
+        if resp.status_code == 200:
+            _caps_cache = resp.json()
+            _caps_ts = time.time()
+            return _caps_cache
     except Exception:
         pass
     return {}
@@ -230,16 +251,19 @@ def api_request(
 
     url = f"{base_url}{path}"
 
+    def _send() -> httpx.Response:
+        return http_client().request(
+            method, url, params=params, json=json_body, headers=headers, timeout=timeout_seconds
+        )
+
     try:
-        with httpx.Client(timeout=timeout_seconds) as client:
-            response = client.request(method, url, params=params, json=json_body, headers=headers)
+        response = _send()
     except (httpx.ConnectError, httpx.TimeoutException) as exc:
         # Auto-start: offer to launch the server interactively
         if _try_auto_start(base_url):
             # Retry the request after successful auto-start
             try:
-                with httpx.Client(timeout=timeout_seconds) as client:
-                    response = client.request(method, url, params=params, json=json_body, headers=headers)
+                response = _send()
             except (httpx.ConnectError, httpx.TimeoutException) as retry_exc:
                 console.print(f"[red]Server still unreachable after auto-start[/red]")
                 console.print(f"[dim]  Error: {retry_exc}[/dim]")
@@ -1,4 +1,4 @@
-"""Core commands: main callback, init, status."""
+"""Core commands: interactive chat entry, init, status."""
 
 from __future__ import annotations
 
@@ -24,18 +24,8 @@ from terminal_command_executor import fetch_operator_status_snapshot
 from gimo_cli.api import api_request, resolve_token
 
 
-@app.callback()
-def main(
-    ctx: typer.Context,
-    verbose: bool = typer.Option(False, "--verbose", help="Enable debug/verbose render mode"),
-) -> None:
-    """GIMO: Gred In Multiagent Orchestrator.
-
-    Run without a subcommand to start an interactive agentic chat session.
-    """
-    if ctx.invoked_subcommand is not None:
-        return
-
+def start_interactive_chat(*, verbose: bool = False) -> None:
+    """Entry for ``gimo`` with no subcommand (see the root callback in ``gimo_cli``)."""
     try:
         config = load_config()
     except typer.Exit:
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import sys
 from typing import Any
+from urllib.parse import urlencode
 
 import httpx
 import typer
@@ -18,7 +19,7 @@ from gimo_cli.config import (
     load_config,
     runs_dir,
 )
-from gimo_cli.stream import emit_output, poll_run, stream_events, write_json
+from gimo_cli.stream import emit_output, follow_run, stream_events, write_json
 
 
 @app.command()
@@ -27,9 +28,9 @@ def run(
     auto: bool = typer.Option(True, "--auto/--approve-only", help="Spawn the backend run immediately after approval."),
     confirm: bool = typer.Option(True, "--confirm/--no-confirm", help="Confirm before approval when interactive."),
     yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompt (alias for --no-confirm)."),
-    wait: bool = typer.Option(True, "--wait/--no-wait", help="Poll the run until it reaches a terminal status."),
-    poll_interval: float = typer.Option(DEFAULT_POLL_INTERVAL_SECONDS, "--poll-interval", min=0.1, help="Polling interval in seconds."),
-    timeout_seconds: float = typer.Option(300.0, "--timeout", min=1.0, help="Maximum wait time when polling."),
+    wait: bool = typer.Option(True, "--wait/--no-wait", help="Follow the run until it reaches a terminal status."),
+    poll_interval: float = typer.Option(DEFAULT_POLL_INTERVAL_SECONDS, "--poll-interval", min=0.1, help="Polling interval when the event stream is unavailable."),
+    timeout_seconds: float = typer.Option(300.0, "--timeout", min=1.0, help="Maximum wait time while following the run."),
     json_output: bool = typer.Option(False, "--json", help="Emit machine-readable JSON."),
 ) -> None:
     """Approve a draft and optionally start its backend run."""
@@ -84,7 +85,7 @@ def run(
 
     final_run_payload = run_payload
     if auto and wait and isinstance(run_payload, dict) and run_payload.get("id"):
-        final_run_payload = poll_run(
+        final_run_payload = follow_run(
             config,
             str(run_payload["id"]),
             poll_interval_seconds=poll_interval,
@@ -136,8 +137,8 @@ def run(
 @app.command()
 def merge(
     run_id: str = typer.Argument(..., help="Run ID in AWAITING_MERGE status to finalize."),
-    wait: bool = typer.Option(True, "--wait/--no-wait", help="Poll the run until it reaches a terminal status."),
-    poll_interval: float = typer.Option(DEFAULT_POLL_INTERVAL_SECONDS, "--poll-interval", min=0.1, help="Polling interval in seconds."),
+    wait: bool = typer.Option(True, "--wait/--no-wait", help="Follow the run until it reaches a terminal status."),
+    poll_interval: float = typer.Option(DEFAULT_POLL_INTERVAL_SECONDS, "--poll-interval", min=0.1, help="Polling interval when the event stream is unavailable."),
     json_output: bool = typer.Option(False, "--json", help="Emit machine-readable JSON."),
 ) -> None:
     """Perform authoritative manual merge for a run that passed dry-run gates."""
@@ -153,7 +154,7 @@ def merge(
 
     final_run = payload
     if wait:
-        final_run = poll_run(config, run_id, poll_interval_seconds=poll_interval, announce=not json_output)
+        final_run = follow_run(config, run_id, poll_interval_seconds=poll_interval, announce=not json_output)
 
     if json_output:
         emit_output(final_run, json_output=True)
@@ -174,6 +175,7 @@ def merge(
 def watch(
     limit: int = typer.Option(10, "--limit", min=1, help="Maximum number of events to consume before exiting."),
     timeout_seconds: float = typer.Option(DEFAULT_WATCH_TIMEOUT_SECONDS, "--timeout", min=1.0, help="Read timeout for the event stream."),
+    run_id: str | None = typer.Option(None, "--run", help="Only show events for this run (filtered server-side)."),
     json_output: bool = typer.Option(False, "--json", help="Emit machine-readable JSON."),
 ) -> None:
     """Watch the backend SSE stream for live orchestration events."""
@@ -184,7 +186,8 @@ def watch(
         console.print(f"[dim]Watching for events (timeout={timeout_seconds}s, limit={limit})...[/dim]")
 
     try:
-        for event in stream_events(config, timeout_seconds=timeout_seconds):
+        path = f"/ops/stream?{urlencode({'run_id': run_id})}" if run_id else "/ops/stream"
+        for event in stream_events(config, path=path, timeout_seconds=timeout_seconds):
             events.append(event)
             if not json_output:
                 if isinstance(event, dict):
@@ -1,4 +1,4 @@
-"""SSE streaming, output helpers, and run polling."""
+"""SSE streaming, output helpers, and run following (SSE with polling fallback)."""
 
 from __future__ import annotations
 
@@ -24,6 +24,9 @@ from gimo_cli.config import (
 
 
 SSE_IDLE_TIMEOUT_SECONDS = 120
+RUN_STATUS_EVENT = "run_status"
+# While following a run over SSE, re-read it after this long without a status event.
+FOLLOW_RECONCILE_SECONDS = 60.0
 
 
 def stream_events(
@@ -32,6 +35,8 @@ def stream_events(
     path: str = "/ops/stream",
     timeout_seconds: float = DEFAULT_WATCH_TIMEOUT_SECONDS,
     last_event_id: str = "",
+    params: dict[str, Any] | None = None,
+    announce_idle: bool = True,
 ):
     base_url, connect_timeout_seconds = api_settings(config)
     token = resolve_token("operator", config)
@@ -54,11 +59,12 @@ def stream_events(
     idle_seconds = timeout_seconds if timeout_seconds > 0 else SSE_IDLE_TIMEOUT_SECONDS
     try:
         with httpx.Client(timeout=timeout) as client:
-            with client.stream("GET", url, headers=headers) as response:
+            with client.stream("GET", url, headers=headers, params=params) as response:
                 response.raise_for_status()
                 for line in response.iter_lines():
                     if timeout_seconds > 0 and (time.monotonic() - last_payload_at) >= timeout_seconds:
-                        console.print(f"[yellow]No events received for {idle_seconds}s - stream idle.[/yellow]")
+                        if announce_idle:
+                            console.print(f"[yellow]No events received for {idle_seconds}s - stream idle.[/yellow]")
                         return
                     if not line:
                         continue
@@ -81,7 +87,8 @@ def stream_events(
                     except json.JSONDecodeError:
                         yield raw
     except httpx.ReadTimeout:
-        console.print(f"[yellow]No events received for {idle_seconds}s - stream idle.[/yellow]")
+        if announce_idle:
+            console.print(f"[yellow]No events received for {idle_seconds}s - stream idle.[/yellow]")
 
 
 def emit_output(payload: Any, *, json_output: bool) -> None:
@@ -140,6 +147,87 @@ def poll_run(
         time.sleep(max(poll_interval_seconds, 0.1))
 
 
+def follow_run(
+    config: dict[str, Any],
+    run_id: str,
+    *,
+    poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    announce: bool = True,
+) -> dict[str, Any]:
+    """Follow a run until it reaches a terminal status.
+
+    Status and stage changes arrive as ``run_status`` events on ``/ops/stream``
+    (filtered server-side by ``run_id``), so a long run costs one open
+    connection instead of a request per poll interval.  The run itself is
+    re-read on start, after a terminal event, and whenever the stream stays
+    quiet for ``FOLLOW_RECONCILE_SECONDS``.  If the stream cannot be opened,
+    following falls back to ``poll_run``.
+    """
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds > 0 else None
+    last_snapshot: tuple[str, str] | None = None
+    last_event_id = ""
+
+    def _announce(status: str, stage: str) -> None:
+        nonlocal last_snapshot
+        if announce and (status, stage) != last_snapshot:
+            stage_suffix = f" [{stage}]" if stage else ""
+            console.print(f"[cyan]Run {run_id}[/cyan] -> [bold]{status}[/bold]{stage_suffix}")
+        last_snapshot = (status, stage)
+
+    while True:
+        status_code, payload = api_request(config, "GET", f"/ops/runs/{run_id}")
+        if status_code != 200 or not isinstance(payload, dict):
+            return {
+                "id": run_id,
+                "status": "unknown",
+                "poll_error": payload,
+                "poll_http_status": status_code,
+            }
+        status = str(payload.get("status") or "unknown")
+        _announce(status, str(payload.get("stage") or ""))
+        if terminal_status(status):
+            return payload
+
+        remaining = deadline - time.monotonic() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            payload["poll_timeout"] = True
+            return payload
+
+        window = FOLLOW_RECONCILE_SECONDS if remaining is None else min(FOLLOW_RECONCILE_SECONDS, remaining)
+        opened_at = time.monotonic()
+        reached_terminal = False
+        try:
+            for event in stream_events(
+                config,
+                params={"run_id": run_id, "event_types": RUN_STATUS_EVENT},
+                timeout_seconds=max(window, 1.0),
+                last_event_id=last_event_id,
+                announce_idle=False,
+            ):
+                if not isinstance(event, dict) or event.get("event") != RUN_STATUS_EVENT:
+                    continue
+                last_event_id = str(event.get("_last_event_id") or last_event_id)
+                data = event.get("data") if isinstance(event.get("data"), dict) else {}
+                event_status = str(data.get("status") or status)
+                _announce(event_status, str(data.get("stage") or ""))
+                if terminal_status(event_status):
+                    reached_terminal = True
+                    break
+        except httpx.HTTPError:
+            remaining = deadline - time.monotonic() if deadline is not None else 0
+            return poll_run(
+                config,
+                run_id,
+                poll_interval_seconds=poll_interval_seconds,
+                timeout_seconds=max(remaining, 0.1) if deadline is not None else 0,
+                announce=announce,
+            )
+        # A stream the server closes straight away must not turn into a busy loop.
+        if not reached_terminal and time.monotonic() - opened_at < poll_interval_seconds:
+            time.sleep(max(poll_interval_seconds, 0.1))
+
+
 def git_command(args: list[str]) -> subprocess.CompletedProcess[str]:
     return subprocess.run(
         ["git", *args],
@@ -4,6 +4,7 @@ import asyncio
 import inspect
 import json
 import os
+import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
@@ -21,6 +22,11 @@ DEFAULT_TEST_ACTOR = os.environ.get("ORCH_TEST_ACTOR", "test_actor")
 os.environ.setdefault("ORCH_TOKEN", DEFAULT_TEST_TOKEN)
 os.environ.setdefault("ORCH_TEST_ACTOR", DEFAULT_TEST_ACTOR)
 os.environ.setdefault("ORCH_REPO_ROOT", str(Path(__file__).parent.parent.resolve()))
+# Runtime state (ops store, locks, run events, audit log) goes to a throwaway
+# directory so test runs never leave artifacts in the working tree.
+_TEST_DATA_DIR = Path(tempfile.mkdtemp(prefix="gimo-test-data-"))
+os.environ.setdefault("ORCH_DATA_DIR", str(_TEST_DATA_DIR / ".orch_data"))
+os.environ.setdefault("ORCH_AUDIT_LOG_PATH", str(_TEST_DATA_DIR / "logs" / "orchestrator_audit.log"))
 # Test-safe defaults BEFORE importing app/config singletons
 os.environ.setdefault("DEBUG", "true")
 os.environ.setdefault("ORCH_LICENSE_ALLOW_DEBUG_BYPASS", "true")
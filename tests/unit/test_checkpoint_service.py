@@ -0,0 +1,175 @@
+"""CheckpointService: id index, latest pointer, TTL buckets and state chunks."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from tools.gimo_server.services.checkpoint_service import CheckpointService
+
+
+class _FakeGics:
+    """Dict-backed GICS stand-in; ``scan`` walks every key like a prefix scan."""
+
+    def __init__(self) -> None:
+        self.items: dict = {}
+        self.puts = 0
+        self.gets = 0
+        self.scans = 0
+        self._lock = threading.Lock()
+
+    def put(self, key, fields):
+        with self._lock:
+            self.items[key] = dict(fields)
+            self.puts += 1
+
+    def get(self, key):
+        self.gets += 1
+        fields = self.items.get(key)
+        return {"key": key, "fields": dict(fields)} if fields is not None else None
+
+    def delete(self, key):
+        return self.items.pop(key, None) is not None
+
+    def scan(self, prefix="", include_fields=True):
+        self.scans += 1
+        with self._lock:
+            snapshot = list(self.items.items())
+        return [{"key": k, "fields": dict(v)} for k, v in snapshot if k.startswith(prefix)]
+
+
+@pytest.fixture
+def gics():
+    fake = _FakeGics()
+    CheckpointService.set_gics(fake)
+    CheckpointService._indexed_for = None
+    CheckpointService._chunk_buckets = {}
+    yield fake
+    CheckpointService.set_gics(None)
+    CheckpointService._indexed_for = None
+    CheckpointService._chunk_buckets = {}
+
+
+def test_ids_are_unique_under_concurrent_saves(gics):
+    ids: list = []
+
+    def _save(n):
+        for i in range(50):
+            ids.append(CheckpointService.save_checkpoint("run", f"r{n}", {"step": i}))
+
+    threads = [threading.Thread(target=_save, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(ids) == 400 and len(set(ids)) == 400
+    assert CheckpointService.get_stats()["total_checkpoints"] == 400
+
+
+def test_lookups_use_the_index_and_latest_pointer(gics):
+    first = CheckpointService.save_checkpoint("run", "r1", {"stage": "a"})
+    second = CheckpointService.save_checkpoint("run", "r1", {"stage": "b"})
+    CheckpointService.save_checkpoint("plan", "p1", {"stage": "x"})
+    gics.scans = 0
+
+    assert CheckpointService.get_checkpoint(first)["state"] == {"stage": "a"}
+    latest = CheckpointService.get_latest("run", "r1")
+    assert latest["checkpoint_id"] == second and latest["state"] == {"stage": "b"}
+    assert CheckpointService.mark_non_resumable(second)
+    assert CheckpointService.get_checkpoint(second)["resumable"] is False
+    assert CheckpointService.get_checkpoint("ckpt_missing") is None
+    assert gics.scans == 0
+
+    # Latest resumed: falls back to the operation's own records and repairs the pointer.
+    assert CheckpointService.get_latest("run", "r1")["checkpoint_id"] == first
+    assert CheckpointService.delete_checkpoint(first)
+    assert CheckpointService.get_checkpoint(first) is None
+    assert "ckpt_latest:run:r1" not in gics.items
+    assert not CheckpointService.delete_checkpoint(first)
+    assert CheckpointService.get_latest("run", "r1") is None
+
+
+def test_large_state_values_are_shared_chunks(gics, monkeypatch):
+    monkeypatch.setattr(CheckpointService, "CHUNK_SIZE_BYTES", 64 * 1024)
+    corpus = {f"doc{i}": "y" * 1000 for i in range(200)}  # ~200 KB
+    first = CheckpointService.save_checkpoint("run", "r1", {"corpus": corpus, "step": 1})
+    chunks = {k for k in gics.items if k.startswith("ckpt_chunk:")}
+    assert len(chunks) == 4
+
+    puts_before = gics.puts
+    second = CheckpointService.save_checkpoint("run", "r1", {"corpus": corpus, "step": 2})
+    assert {k for k in gics.items if k.startswith("ckpt_chunk:")} == chunks
+    assert gics.puts - puts_before == 4  # record, index, ttl marker, latest pointer
+
+    record = gics.items[f"ckpt:run:r1:{second}"]
+    assert record["state"] == {"step": 2} and len(record["state_chunks"]["corpus"]) == 4
+    for checkpoint_id, step in ((first, 1), (second, 2)):
+        assert CheckpointService.get_checkpoint(checkpoint_id)["state"] == {"corpus": corpus, "step": step}
+    assert CheckpointService.list_resumable(operation="run")[0]["checkpoint_id"] == second
+
+
+def test_sweep_removes_expired_buckets_and_unused_chunks(gics, monkeypatch):
+    monkeypatch.setattr(CheckpointService, "CHUNK_THRESHOLD_BYTES", 100)
+    now = time.time()
+    old = CheckpointService.save_checkpoint("run", "old", {"blob": "a" * 500})
+    shared = CheckpointService.save_checkpoint("run", "shared", {"blob": "b" * 500})
+    assert CheckpointService.sweep_expired(now=now) == 0
+
+    # Later checkpoints: "old" is not referenced again, "shared" is.
+    monkeypatch.setattr(CheckpointService, "CHECKPOINT_TTL", CheckpointService.CHECKPOINT_TTL * 2)
+    keep = CheckpointService.save_checkpoint("run", "shared", {"blob": "b" * 500})
+
+    swept_at = now + CheckpointService.CHECKPOINT_TTL // 2 + CheckpointService.TTL_BUCKET_SECONDS
+    gics.scans = 0
+    assert CheckpointService.sweep_expired(now=swept_at) == 2
+    for checkpoint_id in (old, shared):
+        assert f"ckpt_idx:{checkpoint_id}" not in gics.items
+    # The swept "old" was its operation's latest; "shared" now points at keep.
+    assert "ckpt_latest:run:old" not in gics.items
+    assert gics.items["ckpt_latest:run:shared"]["checkpoint_id"] == keep
+    assert CheckpointService.get_stats()["total_checkpoints"] == 1
+    chunk_keys = [k for k in gics.items if k.startswith("ckpt_chunk:")]
+    assert len(chunk_keys) == 1  # "b" blob kept alive by the later checkpoint
+    CheckpointService._chunk_buckets = {}
+    assert CheckpointService.get_checkpoint(keep)["state"] == {"blob": "b" * 500}
+    # Cursor persisted: sweeping again visits no bucket.
+    gics.scans = 0
+    assert CheckpointService.sweep_expired(now=swept_at) == 0
+    assert gics.scans == 0
+
+
+def test_records_from_before_the_index_are_migrated_once(gics):
+    expires_at = int(time.time()) + 3600
+    for i, op_id in enumerate(["r1", "r1", "r2"]):
+        gics.put(f"ckpt:run:{op_id}:ckpt_17356896501{i}", {
+            "operation": "run", "operation_id": op_id, "checkpoint_id": f"ckpt_17356896501{i}",
+            "state": {"i": i}, "metadata": {}, "timestamp": 1000 + i, "resumable": True,
+            "expires_at": expires_at,
+        })
+    assert CheckpointService.get_checkpoint("ckpt_173568965010")["state"] == {"i": 0}
+    assert CheckpointService.get_latest("run", "r1")["checkpoint_id"] == "ckpt_173568965011"
+    gics.scans = 0
+    CheckpointService._indexed_for = None
+    assert CheckpointService.get_checkpoint("ckpt_173568965012")["state"] == {"i": 2}
+    assert gics.scans == 0
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(600)
+def test_resume_with_100k_checkpoints_never_scans(gics):
+    """Resume (by id and latest-for-operation) against 100k stored checkpoints."""
+    state = {"stage": "execute", "completed_tasks": list(range(20))}
+    ids = [CheckpointService.save_checkpoint("run", f"r{i % 5000}", dict(state, n=i)) for i in range(100_000)]
+    probes = ids[::10_000]
+
+    gics.gets = gics.scans = 0
+    for checkpoint_id in probes:
+        assert CheckpointService.get_checkpoint(checkpoint_id)["checkpoint_id"] == checkpoint_id
+    assert (gics.scans, gics.gets) == (0, 2 * len(probes))  # index marker, then the record
+
+    gics.gets = 0
+    for i in range(1000):
+        latest = CheckpointService.get_latest("run", f"r{i}")
+    assert latest["state"]["n"] == 95_000 + 999
+    assert (gics.scans, gics.gets) == (0, 2 * 1000)  # latest pointer, then the record
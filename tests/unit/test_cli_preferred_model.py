@@ -8,6 +8,14 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from gimo import _api_request
+from gimo_cli.api import close_http_client
+
+
+@pytest.fixture(autouse=True)
+def _fresh_http_client():
+    close_http_client()
+    yield
+    close_http_client()
 
 
 @pytest.fixture
@@ -49,13 +57,13 @@ def test_preferred_model_sends_header(mock_client, mock_timeout, mock_token, moc
     mock_resp.json.return_value = {"status": "ok"}
 
     mock_http = MagicMock()
-    mock_http.__enter__.return_value.request.return_value = mock_resp
+    mock_http.request.return_value = mock_resp
     mock_client.return_value = mock_http
 
     status, resp = _api_request(mock_config, "GET", "/ops/capabilities")
 
     # Verify header was sent
-    call_args = mock_http.__enter__.return_value.request.call_args
+    call_args = mock_http.request.call_args
     headers = call_args[1]["headers"]
     assert "X-Preferred-Model" in headers
     assert headers["X-Preferred-Model"] == "claude-haiku-4-5-20251001"
@@ -74,13 +82,13 @@ def test_no_preferred_model_doesnt_send_header(mock_client, mock_timeout, mock_t
     mock_resp.json.return_value = {"status": "ok"}
 
     mock_http = MagicMock()
-    mock_http.__enter__.return_value.request.return_value = mock_resp
+    mock_http.request.return_value = mock_resp
     mock_client.return_value = mock_http
 
     status, resp = _api_request(mock_config_no_model, "GET", "/ops/capabilities")
 
     # Verify header NOT sent
-    call_args = mock_http.__enter__.return_value.request.call_args
+    call_args = mock_http.request.call_args
     headers = call_args[1]["headers"]
     assert "X-Preferred-Model" not in headers
 
@@ -98,7 +106,7 @@ def test_preferred_model_none_doesnt_crash(mock_client, mock_timeout, mock_token
     mock_resp.json.return_value = {"status": "ok"}
 
     mock_http = MagicMock()
-    mock_http.__enter__.return_value.request.return_value = mock_resp
+    mock_http.request.return_value = mock_resp
     mock_client.return_value = mock_http
 
     config = {
@@ -111,6 +119,6 @@ def test_preferred_model_none_doesnt_crash(mock_client, mock_timeout, mock_token
     assert status == 200
 
     # Header should not be sent
-    call_args = mock_http.__enter__.return_value.request.call_args
+    call_args = mock_http.request.call_args
     headers = call_args[1]["headers"]
     assert "X-Preferred-Model" not in headers
@@ -0,0 +1,260 @@
+"""Tests for CLI start-up and run following: lazy commands, shared client, SSE follow."""
+from __future__ import annotations
+
+import importlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import typer.main
+from typer.testing import CliRunner
+
+import gimo_cli
+from gimo_cli import api, stream
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+runner = CliRunner()
+
+
+def _run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_lazy_table_matches_module_registrations():
+    for module in {module for module, _help in gimo_cli.LAZY_COMMANDS.values()}:
+        importlib.import_module(f"gimo_cli.commands.{module}")
+
+    registered = {}
+    for info in gimo_cli.app.registered_commands:
+        name = info.name or typer.main.get_command_name(info.callback.__name__)
+        doc = (info.help or info.callback.__doc__ or "").strip().splitlines()[0]
+        registered[name] = (info.callback.__module__.rsplit(".", 1)[-1], doc)
+    for info in gimo_cli.app.registered_groups:
+        sub = info.typer_instance
+        module = next(iter(sub.registered_commands)).callback.__module__.rsplit(".", 1)[-1]
+        registered[info.name] = (module, sub.info.help)
+
+    assert registered == gimo_cli.LAZY_COMMANDS
+
+
+def test_help_lists_commands_without_importing_them():
+    out = _run_python(
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from gimo_cli import app\n"
+        "result = CliRunner().invoke(app, ['--help'], color=False)\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith('gimo_cli.commands.'))\n"
+        "print(result.exit_code, loaded, 'httpx' in sys.modules)\n"
+        "print(result.stdout)\n"
+    )
+    header, help_text = out.split("\n", 1)
+    assert header == "0 [] False"
+    for name in ("run", "watch", "providers", "doctor", "runtime"):
+        assert name in help_text
+    assert "Approve a draft and optionally start its backend run." in help_text
+
+
+def test_subcommand_loads_its_module_on_demand(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(gimo_cli.app, ["init"], color=False)
+    assert result.exit_code == 0
+    assert (tmp_path / ".gimo" / "config.yaml").exists()
+
+    result = runner.invoke(gimo_cli.app, ["providers", "--help"], color=False)
+    assert result.exit_code == 0 and "Manage LLM providers" in result.stdout
+
+    result = runner.invoke(gimo_cli.app, ["no-such-command"], color=False)
+    assert result.exit_code != 0
+
+
+def test_one_keep_alive_client_per_invocation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner.invoke(gimo_cli.app, ["init"], color=False)
+    api.close_http_client()
+
+    created: list[httpx.Client] = []
+    seen: list[tuple[str, object]] = []
+    real_client = httpx.Client
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.extensions["timeout"]["read"]))
+        if request.url.path == "/ops/capabilities":
+            return httpx.Response(200, json={"hints": {"default_timeout_s": 12}})
+        if request.url.path == "/ops/operator/status":
+            return httpx.Response(200, json={"active_provider": "p", "active_model": "m"})
+        return httpx.Response(200, json={"id": "x"})
+
+    def _factory(**kwargs):
+        client = real_client(transport=httpx.MockTransport(_handler), **kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(api.httpx, "Client", _factory)
+    monkeypatch.setattr(api, "resolve_token", lambda role, config=None: None)
+    monkeypatch.setattr(api, "_caps_cache", {})
+
+    config = {"api": {"base_url": "http://gimo.test"}}
+    for path in ("/ops/drafts/a", "/ops/drafts/b", "/ops/drafts/c"):
+        assert api.api_request(config, "GET", path)[0] == 200
+
+    assert len(created) == 1
+    assert [p for p, _ in seen] == ["/ops/capabilities", "/ops/drafts/a", "/ops/drafts/b", "/ops/drafts/c"]
+    assert seen[0][1] == 5.0 and seen[1][1] == 12.0  # per-request timeouts on the shared client
+
+    # A CLI invocation closes the client when the command finishes.
+    monkeypatch.setattr("gimo_cli.commands.core.api_request", lambda *a, **k: api.api_request(config, "GET", "/ops/operator/status"))
+    monkeypatch.setattr(
+        "gimo_cli.commands.core.fetch_operator_status_snapshot",
+        lambda *a, **k: (200, {"active_provider": "p", "active_model": "m"}),
+    )
+    runner.invoke(gimo_cli.app, ["status", "--json"], color=False)
+    assert all(c.is_closed for c in created)
+    assert api._http_client is None
+
+
+class _SimulatedRun:
+    """A run whose status/stage follow a timeline on a fake clock."""
+
+    def __init__(self, timeline: list[tuple[float, str, str]], *, sse: bool = True):
+        self.timeline = timeline
+        self.sse = sse
+        self.now = 0.0
+        self.gets = 0
+        self.streams = 0
+
+    def state_at(self, t: float) -> tuple[str, str]:
+        status, stage = "pending", ""
+        for at, st, sg in self.timeline:
+            if at <= t:
+                status, stage = st, sg
+        return status, stage
+
+    # Patched into gimo_cli.stream ------------------------------------------------
+    def api_request(self, config, method, path, **_kwargs):
+        self.gets += 1
+        status, stage = self.state_at(self.now)
+        return 200, {"id": "r1", "status": status, "stage": stage}
+
+    def stream_events(self, config, *, params=None, timeout_seconds, last_event_id="", **_kwargs):
+        self.streams += 1
+        if not self.sse:
+            raise httpx.ConnectError("stream unavailable")
+        assert params == {"run_id": "r1", "event_types": "run_status"}
+        window_end = self.now + timeout_seconds
+        for event_id, (at, status, stage) in enumerate(self.timeline, start=1):
+            if event_id <= int(last_event_id or 0) or at < self.now:
+                continue
+            if at > window_end:
+                break
+            self.now = at
+            yield {"event": "run_status", "data": {"run_id": "r1", "status": status, "stage": stage},
+                   "_last_event_id": str(event_id)}
+        self.now = max(self.now, window_end)
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def install(self, monkeypatch) -> None:
+        monkeypatch.setattr(stream, "api_request", self.api_request)
+        monkeypatch.setattr(stream, "stream_events", self.stream_events)
+        monkeypatch.setattr(stream, "time", SimpleNamespace(
+            sleep=self.sleep, monotonic=self.monotonic, time=self.monotonic,
+        ))
+
+
+_FIVE_MINUTE_RUN = [
+    (1.0, "running", "plan"),
+    (45.0, "running", "execute"),
+    (150.0, "running", "gate_lint"),
+    (240.0, "running", "dry_run_merge"),
+    (300.0, "done", "merge"),
+]
+
+
+def test_follow_run_is_event_driven(monkeypatch):
+    sim = _SimulatedRun(_FIVE_MINUTE_RUN)
+    sim.install(monkeypatch)
+    lines: list[str] = []
+    monkeypatch.setattr(stream.console, "print", lambda message: lines.append(str(message)))
+
+    final = stream.follow_run({}, "r1", timeout_seconds=600)
+
+    assert final["status"] == "done" and sim.now == 300.0
+    assert [line.split("->")[1].strip() for line in lines] == [
+        "[bold]pending[/bold]",
+        "[bold]running[/bold] [plan]",
+        "[bold]running[/bold] [execute]",
+        "[bold]running[/bold] [gate_lint]",
+        "[bold]running[/bold] [dry_run_merge]",
+        "[bold]done[/bold] [merge]",
+    ]
+    assert sim.gets <= 8
+
+
+def test_follow_run_falls_back_to_polling(monkeypatch):
+    sim = _SimulatedRun([(0.0, "running", "execute"), (5.0, "done", "merge")], sse=False)
+    sim.install(monkeypatch)
+
+    final = stream.follow_run({}, "r1", poll_interval_seconds=1.0, timeout_seconds=60, announce=False)
+
+    assert final["status"] == "done"
+    assert sim.streams == 1 and sim.gets == 7
+
+
+def test_follow_run_times_out(monkeypatch):
+    sim = _SimulatedRun([(0.0, "running", "execute")])
+    sim.install(monkeypatch)
+
+    final = stream.follow_run({}, "r1", timeout_seconds=150, announce=False)
+
+    assert final["status"] == "running" and final["poll_timeout"] is True
+    assert sim.now == 150.0 and sim.gets == 4
+
+
+_LOADED = (
+    "\nimport sys\n"
+    "print(sum(m.startswith('gimo_cli.commands.') for m in sys.modules), 'httpx' in sys.modules)\n"
+)
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+def test_cli_startup_imports_and_follow_requests(monkeypatch):
+    """Modules imported by ``gimo --help``, lazy vs every command module, and
+    requests made while following a 5-minute run over SSE vs polling."""
+    commands = len({m for m, _ in gimo_cli.LAZY_COMMANDS.values()})
+    eager_code = (
+        "import importlib, gimo_cli\n"
+        "for m in sorted({m for m, _ in gimo_cli.LAZY_COMMANDS.values()}):\n"
+        "    importlib.import_module('gimo_cli.commands.' + m)\n"
+    )
+    help_code = "import sys; sys.argv = ['gimo', '--help']\nfrom gimo_cli import app\ntry:\n    app()\nexcept SystemExit:\n    pass\n"
+
+    assert _run_python("import gimo_cli" + _LOADED).split() == ["0", "False"]
+    assert _run_python(help_code + _LOADED).splitlines()[-1].split() == ["0", "False"]
+    assert _run_python(eager_code + _LOADED).split() == [str(commands), "True"]
+
+    sse = _SimulatedRun(_FIVE_MINUTE_RUN)
+    sse.install(monkeypatch)
+    stream.follow_run({}, "r1", timeout_seconds=600, announce=False)
+
+    polled = _SimulatedRun(_FIVE_MINUTE_RUN)
+    polled.install(monkeypatch)
+    stream.poll_run({}, "r1", poll_interval_seconds=1.0, timeout_seconds=600, announce=False)
+
+    assert (sse.gets, sse.streams) == (6, 5)
+    assert polled.gets == 301
@@ -0,0 +1,250 @@
+"""Tests for the warm CLI worker pool behind CliAccountAdapter."""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools.gimo_server.providers import cli_account
+from tools.gimo_server.providers.cli_account import CliAccountAdapter, close_worker_pools, worker_pool_stats
+
+_FAKE_CLI = r'''
+import json, os, sys, time
+
+def record(kind, **extra):
+    with open(os.environ["FAKE_CLI_LOG"], "a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"kind": kind, "pid": os.getpid(), "t": time.time(), **extra}) + "\n")
+
+time.sleep(float(os.environ.get("FAKE_CLI_STARTUP", "0.2")))  # runtime + auth bootstrap
+delay = float(os.environ.get("FAKE_CLI_DELAY", "0"))
+
+if sys.argv[1:2] == ["--worker"]:
+    record("start")
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        msg = json.loads(line)
+        if msg.get("ping"):
+            print(json.dumps({"id": msg["id"], "pong": True}), flush=True)
+            continue
+        prompt = msg["prompt"]
+        if prompt == "crash":
+            os._exit(3)
+        record("begin", prompt=prompt)
+        time.sleep(delay)
+        record("end", prompt=prompt)
+        if prompt == "fail":
+            print(json.dumps({"id": msg["id"], "error": "model refused"}), flush=True)
+        else:
+            print(json.dumps({"id": msg["id"], "content": "echo:" + prompt}), flush=True)
+    sys.exit(0)
+
+prompt = sys.argv[2]  # <binary> exec <prompt> --json --skip-git-repo-check
+record("spawn", prompt=prompt)
+record("begin", prompt=prompt)
+time.sleep(delay)
+record("end", prompt=prompt)
+print(json.dumps({"type": "output_text", "text": "echo:" + prompt}))
+'''
+
+
+class _FakeCli:
+    def __init__(self, tmp_path: Path, monkeypatch) -> None:
+        self.script = tmp_path / "fake_cli.py"
+        self.script.write_text(_FAKE_CLI, encoding="utf-8")
+        self.binary = tmp_path / "fake-codex"
+        self.binary.write_text(f"#!{sys.executable}\nexec(open({str(self.script)!r}).read())\n", encoding="utf-8")
+        self.binary.chmod(0o755)
+        self.log = tmp_path / "cli.log"
+        self._monkeypatch = monkeypatch
+        monkeypatch.setenv("FAKE_CLI_LOG", str(self.log))
+        monkeypatch.setenv("FAKE_CLI_STARTUP", "0.2")
+        monkeypatch.delenv("ORCH_CLI_WORKER_MAX_CALLS", raising=False)
+        monkeypatch.delenv("ORCH_CLI_ACCOUNT_CONCURRENCY", raising=False)
+
+    def enable_worker_mode(self, argv=None) -> None:
+        argv = argv or [sys.executable, str(self.script), "--worker"]
+        self._monkeypatch.setenv("ORCH_CLI_WORKER_MODES", json.dumps({str(self.binary): argv}))
+
+    def adapter(self) -> CliAccountAdapter:
+        return CliAccountAdapter(binary=str(self.binary))
+
+    def events(self, kind: str | None = None) -> list[dict]:
+        if not self.log.exists():
+            return []
+        rows = [json.loads(line) for line in self.log.read_text(encoding="utf-8").splitlines()]
+        return [r for r in rows if kind is None or r["kind"] == kind]
+
+    def max_overlap(self) -> int:
+        current = peak = 0
+        for row in sorted(self.events(), key=lambda r: (r["t"], r["kind"] == "begin")):
+            if row["kind"] == "begin":
+                current += 1
+                peak = max(peak, current)
+            elif row["kind"] == "end":
+                current -= 1
+        return peak
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    if sys.platform == "win32":
+        pytest.skip("worker mode is disabled on Windows")
+    monkeypatch.delenv("ORCH_CLI_WORKER_MODES", raising=False)
+    cli_account._POOLS.clear()
+    yield _FakeCli(tmp_path, monkeypatch)
+    cli_account._POOLS.clear()
+
+
+def _run(coro):
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await close_worker_pools()
+
+    return asyncio.run(_main())
+
+
+async def _generate_many(adapter, prompts):
+    return [(await adapter.generate(p, {}))["content"] for p in prompts]
+
+
+def test_pooled_calls_reuse_one_warm_worker(fake_cli):
+    fake_cli.enable_worker_mode()
+    adapter = fake_cli.adapter()
+
+    async def _calls():
+        out = await _generate_many(adapter, [f"p{i}" for i in range(6)])
+        return out, worker_pool_stats()[adapter.binary]
+
+    contents, stats = _run(_calls())
+
+    assert contents == [f"echo:p{i}" for i in range(6)]
+    assert len(fake_cli.events("start")) == 1 and not fake_cli.events("spawn")
+    assert stats["spawned"] == 1 and stats["reused"] == 5
+
+
+def test_workers_recycled_after_max_calls(fake_cli, monkeypatch):
+    fake_cli.enable_worker_mode()
+    monkeypatch.setenv("ORCH_CLI_WORKER_MAX_CALLS", "3")
+
+    _run(_generate_many(fake_cli.adapter(), [f"p{i}" for i in range(7)]))
+
+    starts = fake_cli.events("start")
+    assert len(starts) == 3 and len({s["pid"] for s in starts}) == 3
+    pids = [e["pid"] for e in fake_cli.events("begin")]
+    assert pids == [starts[0]["pid"]] * 3 + [starts[1]["pid"]] * 3 + [starts[2]["pid"]]
+
+
+def test_crashed_worker_is_recycled_and_call_falls_back_to_spawn(fake_cli):
+    fake_cli.enable_worker_mode()
+    adapter = fake_cli.adapter()
+
+    contents = _run(_generate_many(adapter, ["before", "crash", "after"]))
+
+    assert contents == ["echo:before", "echo:crash", "echo:after"]
+    assert [e["prompt"] for e in fake_cli.events("spawn")] == ["crash"]
+    assert len(fake_cli.events("start")) == 2
+
+
+def test_worker_error_reply_raises_and_recycles(fake_cli):
+    fake_cli.enable_worker_mode()
+    adapter = fake_cli.adapter()
+
+    async def _calls():
+        with pytest.raises(RuntimeError, match="model refused"):
+            await adapter.generate("fail", {})
+        return (await adapter.generate("ok", {}))["content"]
+
+    assert _run(_calls()) == "echo:ok"
+    assert len(fake_cli.events("start")) == 2 and not fake_cli.events("spawn")
+
+
+def test_per_account_concurrency_limit(fake_cli, monkeypatch):
+    fake_cli.enable_worker_mode()
+    monkeypatch.setenv("ORCH_CLI_ACCOUNT_CONCURRENCY", "2")
+    monkeypatch.setenv("FAKE_CLI_DELAY", "0.15")
+    adapter = fake_cli.adapter()
+
+    async def _burst():
+        return await asyncio.gather(*(adapter.generate(f"p{i}", {}) for i in range(6)))
+
+    results = _run(_burst())
+
+    assert sorted(r["content"] for r in results) == sorted(f"echo:p{i}" for i in range(6))
+    assert fake_cli.max_overlap() == 2
+    assert len(fake_cli.events("start")) == 2
+
+
+def test_concurrency_limit_also_bounds_per_call_spawn(fake_cli, monkeypatch):
+    monkeypatch.setenv("ORCH_CLI_ACCOUNT_CONCURRENCY", "1")
+    monkeypatch.setenv("FAKE_CLI_STARTUP", "0")
+    monkeypatch.setenv("FAKE_CLI_DELAY", "0.1")
+    adapter = fake_cli.adapter()
+
+    async def _burst():
+        return await asyncio.gather(*(adapter.generate(f"p{i}", {}) for i in range(3)))
+
+    _run(_burst())
+    assert len(fake_cli.events("spawn")) == 3 and fake_cli.max_overlap() == 1
+
+
+def test_failed_worker_start_falls_back_to_spawn(fake_cli):
+    fake_cli.enable_worker_mode([sys.executable, "-c", "print('not the protocol')"])
+    adapter = fake_cli.adapter()
+
+    async def _calls():
+        out = await _generate_many(adapter, ["a", "b"])
+        return out, worker_pool_stats()[adapter.binary]
+
+    contents, stats = _run(_calls())
+
+    assert contents == ["echo:a", "echo:b"]
+    assert [e["prompt"] for e in fake_cli.events("spawn")] == ["a", "b"]
+    assert stats["failed_starts"] == 1 and stats["disabled"]  # no retry storm
+
+
+def test_idle_worker_health_checked_before_reuse(fake_cli):
+    fake_cli.enable_worker_mode()
+    adapter = fake_cli.adapter()
+
+    async def _calls():
+        await adapter.generate("first", {})
+        pool = cli_account._POOLS[adapter.binary]
+        pool.health_check_after = 0.0
+        await asyncio.sleep(0.01)
+        await adapter.generate("pinged", {})  # answers the ping: reused
+        next(iter(pool._idle)).proc.kill()
+        await asyncio.sleep(0.05)
+        await adapter.generate("replaced", {})
+        return pool.stats()
+
+    stats = _run(_calls())
+    assert stats["reused"] == 1 and stats["spawned"] == 2
+    assert len(fake_cli.events("start")) == 2 and not fake_cli.events("spawn")
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(120)
+def test_ten_sequential_calls_start_one_worker(fake_cli):
+    """10 sequential calls: a CLI process per call vs one warm pooled worker."""
+    prompts = [f"p{i}" for i in range(10)]
+
+    _run(_generate_many(fake_cli.adapter(), prompts))
+    assert [e["prompt"] for e in fake_cli.events("spawn")] == prompts
+
+    fake_cli.enable_worker_mode()
+    cli_account._POOLS.clear()
+    adapter = fake_cli.adapter()
+
+    async def _calls():
+        await _generate_many(adapter, prompts)
+        return worker_pool_stats()[adapter.binary]
+
+    stats = _run(_calls())
+
+    assert len(fake_cli.events("start")) == 1 and len(fake_cli.events("spawn")) == len(prompts)
+    assert (stats["spawned"], stats["reused"]) == (1, len(prompts) - 1)
@@ -1,7 +1,10 @@
 """Unit tests for Fase 5: Model Compiler (model_cache, quantizer, pipeline)."""
 from __future__ import annotations
 
+import asyncio
 import json
+import os
+import threading
 import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -16,9 +19,13 @@ from tools.gimo_server.inference.contracts import (
     ModelSpec,
     QuantizationType,
 )
+from tools.gimo_server.inference.compiler import graph_optimizer, quantizer
+from tools.gimo_server.inference.compiler import model_cache as model_cache_mod
 from tools.gimo_server.inference.compiler.model_cache import (
     ModelCache,
+    cached_checksum,
     compute_checksum,
+    source_fingerprint,
 )
 from tools.gimo_server.inference.compiler.quantizer import (
     recommend_quantization,
@@ -141,6 +148,171 @@ class TestModelCache:
         assert gpu is not None
 
 
+# ---------------------------------------------------------------------------
+# ModelCache ledger + source-keyed slots
+# ---------------------------------------------------------------------------
+
+def _slot_info(root: Path, model_id: str, size: int = 1000) -> CompiledModelInfo:
+    """Compiled artefact stored under the cache root, so it counts towards the quota."""
+    artefact = root / model_id / "artefacts" / "model.onnx"
+    artefact.parent.mkdir(parents=True, exist_ok=True)
+    artefact.write_bytes(b"\x00" * size)
+    return CompiledModelInfo(
+        model_id=model_id,
+        compiled_path=artefact,
+        target_device=HardwareTarget.CPU,
+        execution_provider=ExecutionProviderType.CPU,
+        quantization=QuantizationType.INT8,
+        compiled_size_bytes=size,
+    )
+
+
+def _disk_bytes(root: Path) -> int:
+    return sum(
+        p.stat().st_size for p in root.rglob("*")
+        if p.is_file() and p.name != "ledger.jsonl"
+    )
+
+
+class TestModelCacheLedger:
+    def test_ledger_tracks_sizes_without_walking(self, tmp_path, monkeypatch):
+        cache = ModelCache(cache_dir=tmp_path)
+        for i in range(3):
+            cache.put(_slot_info(tmp_path, f"m{i}"))
+        assert cache.total_size_bytes() == _disk_bytes(tmp_path)
+
+        def _no_walk(*_a, **_k):
+            raise AssertionError("cache tree walked")
+
+        monkeypatch.setattr(Path, "rglob", _no_walk)
+        reopened = ModelCache(cache_dir=tmp_path)
+        assert reopened.total_size_bytes() == cache.total_size_bytes()
+        reopened.evict_lru(0)
+        assert reopened.stats()["slots"] == 0 and cache.total_size_bytes() == 0
+
+    def test_eviction_follows_ledger_access_order(self, tmp_path):
+        cache = ModelCache(cache_dir=tmp_path)
+        for name in ("a", "b", "c"):
+            cache.put(_slot_info(tmp_path, name))
+        assert cache.get("a", HardwareTarget.CPU, QuantizationType.INT8) is not None
+        per_slot = cache.total_size_bytes() // 3
+        cache.evict_lru(2 * per_slot + 10)
+        assert cache.get("b", HardwareTarget.CPU, QuantizationType.INT8) is None
+        assert cache.exists("a", HardwareTarget.CPU, QuantizationType.INT8)
+        assert cache.exists("c", HardwareTarget.CPU, QuantizationType.INT8)
+        assert cache.stats()["evictions"] == 1
+
+    def test_replaced_source_misses_and_drops_stale_variant(self, tmp_path):
+        cache = ModelCache(cache_dir=tmp_path / "cache")
+        source = tmp_path / "model.onnx"
+        source.write_bytes(b"v1")
+        info = _compiled_info(tmp_path)
+        cache.put(info, source=source)
+        assert cache.get("test-model", HardwareTarget.CPU, QuantizationType.INT8, source=source)
+        old_slot = next((tmp_path / "cache" / "test-model").iterdir())
+        assert old_slot.name == f"cpu_int8-{source_fingerprint(source)}"
+
+        source.write_bytes(b"version 2")
+        assert cache.get("test-model", HardwareTarget.CPU, QuantizationType.INT8, source=source) is None
+        cache.put(info, source=source)
+        assert not old_slot.exists() and cache.stats()["slots"] == 1
+        assert cache.get("test-model", HardwareTarget.CPU, QuantizationType.INT8, source=source)
+
+    def test_hashed_sources_survive_touch_and_persist_digest(self, tmp_path, monkeypatch):
+        cache = ModelCache(cache_dir=tmp_path / "cache", hash_sources=True)
+        source = tmp_path / "model.onnx"
+        source.write_bytes(b"weights")
+        cache.put(_compiled_info(tmp_path), source=source)
+
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        calls = []
+        real = model_cache_mod.compute_checksum
+        monkeypatch.setattr(model_cache_mod, "compute_checksum", lambda p: calls.append(p) or real(p))
+
+        reopened = ModelCache(cache_dir=tmp_path / "cache", hash_sources=True)
+        for _ in range(3):
+            assert reopened.get("test-model", HardwareTarget.CPU, QuantizationType.INT8, source=source)
+        assert len(calls) == 1  # re-hashed once for the new fingerprint, then from the ledger
+
+    def test_ledger_rebuilt_from_existing_slots(self, tmp_path):
+        cache = ModelCache(cache_dir=tmp_path)
+        cache.put(_slot_info(tmp_path, "m0"))
+        cache.put(_slot_info(tmp_path, "m1"))
+        (tmp_path / "ledger.jsonl").unlink()
+        rebuilt = ModelCache(cache_dir=tmp_path)
+        assert rebuilt.stats()["slots"] == 2
+        assert rebuilt.total_size_bytes() == _disk_bytes(tmp_path)
+
+    def test_instances_share_ledger_and_journal_stays_compact(self, tmp_path):
+        writer = ModelCache(cache_dir=tmp_path)
+        reader = ModelCache(cache_dir=tmp_path)
+        writer.put(_slot_info(tmp_path, "m0"))
+        assert reader.total_size_bytes() == writer.total_size_bytes() > 0
+        for _ in range(1000):
+            reader.get("m0", HardwareTarget.CPU, QuantizationType.INT8)
+        lines = (tmp_path / "ledger.jsonl").read_text().splitlines()
+        assert len(lines) <= 260
+        assert writer.stats()["slots"] == 1
+
+
+def _legacy_evict_lru(root: Path, target_bytes: int) -> None:
+    """Previous eviction: sort slots by atime, then re-walk the whole root per slot."""
+    import shutil
+
+    def total():
+        return sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
+
+    slots = sorted(
+        (s for d in root.iterdir() if d.is_dir() for s in d.iterdir() if s.is_dir()),
+        key=lambda s: (s / "metadata.json").stat().st_atime,
+    )
+    for slot in slots:
+        if total() <= target_bytes:
+            break
+        shutil.rmtree(slot)
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+def test_eviction_over_500_slots_never_walks_the_cache_root(tmp_path, monkeypatch):
+    """put() + LRU eviction over 500 slots: ledger vs per-slot tree walks."""
+    n = 500
+    walks = []
+    real_rglob = Path.rglob
+    monkeypatch.setattr(Path, "rglob", lambda self, pattern: walks.append(self) or real_rglob(self, pattern))
+
+    def _populate(root: Path, cache: ModelCache = None):
+        for i in range(n):
+            slot = root / f"model-{i}" / "cpu_int8"
+            slot.mkdir(parents=True, exist_ok=True)
+            info = _compiled_info(slot, f"model-{i}")
+            (slot / "model.onnx").write_bytes(b"\x00" * 4096)
+            if cache is not None:
+                cache.put(info)
+            else:
+                (slot / "metadata.json").write_text(json.dumps({"model_id": info.model_id}))
+
+    legacy_root = tmp_path / "legacy"
+    legacy_root.mkdir()
+    _populate(legacy_root)
+    total = sum(p.stat().st_size for p in real_rglob(legacy_root, "*") if p.is_file())
+    _legacy_evict_lru(legacy_root, total // 2)
+    legacy_walks = walks.count(legacy_root)
+
+    walks.clear()
+    cache = ModelCache(cache_dir=tmp_path / "ledger", max_cache_gb=1.0)
+    _populate(tmp_path / "ledger", cache)
+    cache.evict_lru(cache.total_size_bytes() // 2)
+    reopened = ModelCache(cache_dir=tmp_path / "ledger")
+
+    assert legacy_walks > n // 2  # one walk of the whole root per evicted slot
+    assert tmp_path / "ledger" not in walks
+    assert len(walks) == n  # each put() measures only its own slot
+    assert reopened.total_size_bytes() == cache.total_size_bytes() <= _disk_bytes(tmp_path / "ledger")
+    assert reopened.stats()["slots"] == n - cache.stats()["evictions"]
+
+
 # ---------------------------------------------------------------------------
 # compute_checksum
 # ---------------------------------------------------------------------------
@@ -300,3 +472,167 @@ class TestCompilationPipeline:
 
         # compile_time_seconds should differ (recompiled).
         assert info2.compiled_at >= info1.compiled_at
+
+
+# ---------------------------------------------------------------------------
+# CompilationPipeline concurrency: pool, single-flight, atomic publish
+# ---------------------------------------------------------------------------
+
+class _SleepingOptimizer:
+    """Stand-in for the ORT optimiser: blocks its worker thread, then writes output."""
+
+    def __init__(self, delay: float, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.threads: set = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, input_path, output_path, for_transformer, optimization_level):
+        with self._lock:
+            self.calls += 1
+            self.threads.add(threading.get_ident())
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("optimizer crashed")
+            Path(output_path).write_bytes(Path(input_path).read_bytes() + b"-optimized")
+            return True
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _onnx_spec(tmp_path: Path, model_id: str = "test-model") -> ModelSpec:
+    model_file = tmp_path / f"{model_id}.onnx"
+    model_file.write_bytes(b"onnx-bytes")
+    spec = _spec(model_id)
+    spec.path = model_file
+    return spec
+
+
+@pytest.fixture
+def sleeping_optimizer(monkeypatch):
+    def _install(delay: float, fail: bool = False) -> _SleepingOptimizer:
+        fake = _SleepingOptimizer(delay, fail)
+        monkeypatch.setattr(graph_optimizer, "_optimize_sync", fake)
+        monkeypatch.setattr(quantizer, "_quantize_dynamic_sync", lambda *a: False)
+        return fake
+    return _install
+
+
+class TestCompilationConcurrency:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_compile_off_loop(self, tmp_path, sleeping_optimizer):
+        fake = sleeping_optimizer(0.3)
+        spec = _onnx_spec(tmp_path)
+        pipeline = CompilationPipeline(cache=ModelCache(cache_dir=tmp_path / "cache"), tmp_dir=tmp_path / "tmp")
+
+        infos = await asyncio.gather(*(pipeline.compile(spec, HardwareTarget.CPU) for _ in range(5)))
+
+        assert fake.calls == 1
+        assert pipeline.stats() == {"compiles": 1, "joined": 4, "inflight": 0}
+        assert len({info.compiled_path for info in infos}) == 1
+        compiled = infos[0].compiled_path
+        assert compiled.is_relative_to(tmp_path / "cache") and compiled.read_bytes() == b"onnx-bytes-optimized"
+        assert infos[0].checksum == compute_checksum(compiled)
+        assert list((tmp_path / "tmp").iterdir()) == []  # per-attempt work dir removed
+        assert threading.get_ident() not in fake.threads  # ran on the pool, not the loop
+
+        again = await pipeline.compile(spec, HardwareTarget.CPU)
+        assert again.compiled_path == compiled and fake.calls == 1  # cache hit
+
+    @pytest.mark.asyncio
+    async def test_distinct_keys_compile_in_parallel_on_bounded_pool(self, tmp_path, sleeping_optimizer):
+        fake = sleeping_optimizer(0.15)
+        specs = [_onnx_spec(tmp_path, f"m{i}") for i in range(4)]
+        pipeline = CompilationPipeline(
+            cache=ModelCache(cache_dir=tmp_path / "cache"), tmp_dir=tmp_path / "tmp", max_workers=2,
+        )
+        infos = await asyncio.gather(*(pipeline.compile(s, HardwareTarget.CPU) for s in specs))
+
+        assert fake.calls == 4 and fake.peak == 2
+        assert len({info.compiled_path for info in infos}) == 4
+
+    @pytest.mark.asyncio
+    async def test_callers_stop_waiting_at_their_timeout_without_killing_the_compile(
+        self, tmp_path, sleeping_optimizer
+    ):
+        fake = sleeping_optimizer(0.3)
+        spec = _onnx_spec(tmp_path)
+        pipeline = CompilationPipeline(
+            cache=ModelCache(cache_dir=tmp_path / "cache"), tmp_dir=tmp_path / "tmp", compile_timeout_s=0.05,
+        )
+        impatient = asyncio.ensure_future(pipeline.compile(spec, HardwareTarget.CPU))
+        patient = asyncio.ensure_future(pipeline.compile(spec, HardwareTarget.CPU, timeout=5))
+
+        with pytest.raises(TimeoutError, match="test-model"):
+            await impatient
+        info = await patient
+        assert info.compiled_path.exists() and fake.calls == 1
+        assert pipeline.stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_compile_propagates_to_all_callers_and_cleans_up(self, tmp_path, sleeping_optimizer):
+        fake = sleeping_optimizer(0.05, fail=True)
+        spec = _onnx_spec(tmp_path)
+        cache = ModelCache(cache_dir=tmp_path / "cache")
+        pipeline = CompilationPipeline(cache=cache, tmp_dir=tmp_path / "tmp")
+
+        results = await asyncio.gather(
+            *(pipeline.compile(spec, HardwareTarget.CPU) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results) and fake.calls == 1
+        assert pipeline.stats()["inflight"] == 0
+        assert list((tmp_path / "tmp").iterdir()) == []
+        assert cache.get(spec.model_id, HardwareTarget.CPU, QuantizationType.INT8, source=spec.path) is None
+
+        fake.fail = False
+        info = await pipeline.compile(spec, HardwareTarget.CPU)
+        assert info.compiled_path.exists() and fake.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_gguf_checksum_runs_off_loop_and_is_reused(self, tmp_path, monkeypatch):
+        model_file = tmp_path / "big.gguf"
+        with model_file.open("wb") as f:
+            f.write(os.urandom(1 << 20) * 96)  # 96 MB
+        spec = ModelSpec(
+            model_id="big", path=model_file, format=ModelFormat.GGUF,
+            size_bytes=model_file.stat().st_size, param_count_b=7.0,
+        )
+        pipeline = CompilationPipeline(cache=ModelCache(cache_dir=tmp_path / "cache"), tmp_dir=tmp_path / "tmp")
+        real = model_cache_mod.compute_checksum
+        threads = []
+        monkeypatch.setattr(
+            model_cache_mod, "compute_checksum", lambda p: threads.append(threading.get_ident()) or real(p)
+        )
+
+        info = await pipeline.compile(spec, HardwareTarget.CPU)
+        assert info.checksum == compute_checksum(model_file)
+        assert (tmp_path / "big.gguf.sha256").exists()
+        assert threads and threading.get_ident() not in threads  # hashed on the pool, not the loop
+
+        hashed = []
+        monkeypatch.setattr(model_cache_mod, "compute_checksum", lambda p: hashed.append(p) or real(p))
+        again = await pipeline.compile(spec, HardwareTarget.CPU, force=True)
+        assert again.checksum == info.checksum and hashed == []  # size + mtime unchanged
+
+        with model_file.open("ab") as f:
+            f.write(b"tail")
+        changed = await pipeline.compile(spec, HardwareTarget.CPU, force=True)
+        assert len(hashed) == 1 and changed.checksum != info.checksum
+
+    def test_cached_checksum_tolerates_read_only_sidecar(self, tmp_path, monkeypatch):
+        artefact = tmp_path / "model.onnx"
+        artefact.write_bytes(b"weights")
+
+        def _deny(*_a, **_k):
+            raise PermissionError("read-only")
+
+        monkeypatch.setattr(Path, "write_text", _deny)
+        assert cached_checksum(artefact) == compute_checksum(artefact)
+        assert not (tmp_path / "model.onnx.sha256").exists()
@@ -8,6 +8,7 @@ from tools.gimo_server import config
 def test_load_settings_defaults_repo_root_to_base_dir(tmp_path: Path, monkeypatch) -> None:
     repo_root = (tmp_path / "repo_root").resolve()
     monkeypatch.delenv("ORCH_REPO_ROOT", raising=False)
+    monkeypatch.delenv("ORCH_DATA_DIR", raising=False)
     monkeypatch.setattr(config, "_get_base_dir", lambda: repo_root)
     monkeypatch.setattr(config, "_migrate_to_unified_credentials", lambda: None)
 
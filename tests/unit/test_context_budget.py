@@ -0,0 +1,199 @@
+"""Tests for token accounting and structure-aware trimming in the agentic loop."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from tools.gimo_server.services import context_budget
+from tools.gimo_server.services.agentic_loop_service import AgenticLoopService
+from tools.gimo_server.services.context_budget import (
+    ContextBudget,
+    HeuristicTokenizer,
+    TokenCounter,
+    model_family,
+    register_tokenizer,
+    tokenizer_for,
+    trim_messages,
+)
+
+CODE = (
+    "def handler(request: Request) -> Dict[str, Any]:\n"
+    "    payload = {\"id\": request.id, \"items\": [x.to_dict() for x in request.items]}\n"
+    "    if not payload[\"items\"]:\n"
+    "        raise ValueError(f\"empty request {request.id!r}\")\n"
+    "    return payload\n"
+)
+
+
+class _CountingTokenizer:
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return max(1, len(text) // 4)
+
+
+def _snapshot(messages):
+    return json.dumps(messages, sort_keys=True)
+
+
+def _thread(n_exchanges: int, tool_output: str = CODE * 20) -> list[dict]:
+    messages: list[dict] = [{"role": "system", "content": "You are GIMO.\n" + "Workspace tree\n" * 20}]
+    for i in range(n_exchanges):
+        messages.append({"role": "user", "content": f"Step {i}: please inspect module_{i}.py"})
+        messages.append({
+            "role": "assistant",
+            "content": f"Reading module_{i}.py",
+            "tool_calls": [{"id": f"c{i}", "type": "function",
+                            "function": {"name": "read_file", "arguments": json.dumps({"path": f"module_{i}.py"})}}],
+        })
+        messages.append({"role": "tool", "tool_call_id": f"c{i}", "content": f"# module_{i}.py\n" + tool_output})
+    return messages
+
+
+def test_model_family_and_registered_tokenizer(monkeypatch):
+    assert model_family("gpt-4o-mini") == "openai"
+    assert model_family("anthropic/claude-3-5-sonnet") == "anthropic"
+    assert model_family("qwen2.5-coder:7b") == "llama"
+    assert model_family("some-local-model") == "default"
+
+    custom = HeuristicTokenizer("custom-llama", word_chars=3.0)
+    monkeypatch.setattr(context_budget, "_OVERRIDES", {})
+    register_tokenizer("llama", custom)
+    assert tokenizer_for("llama3.1:8b") is custom
+    assert context_budget.token_counter("llama3.1:8b").tokenizer is custom
+    assert tokenizer_for("gpt-4o") is not custom
+
+
+def test_heuristic_counts_code_and_cjk_above_char_estimate():
+    tok = HeuristicTokenizer("default")
+    prose = "The orchestrator keeps the conversation within the provider budget."
+    cjk = "这是一个用于测试上下文预算的中文句子，包含标点符号。"
+    assert abs(tok.count(prose) - len(prose) / 4) <= 5
+    assert tok.count(CODE) > 1.5 * (len(CODE) / 4)
+    assert tok.count(cjk) >= len(cjk)
+    assert tok.count("") == 0
+
+
+def test_counter_caches_by_content_hash():
+    tokenizer = _CountingTokenizer()
+    counter = TokenCounter(tokenizer)
+    first = counter.count_message({"role": "tool", "content": CODE})
+    again = counter.count_message({"role": "tool", "content": CODE})  # new dict, same content
+    assert first == again == context_budget.MESSAGE_OVERHEAD_TOKENS + len(CODE) // 4
+    assert tokenizer.calls == 1 and counter.stats()["hits"] == 1
+
+    counter.count_message({"role": "assistant", "content": None, "tool_calls": [
+        {"function": {"name": "read_file", "arguments": {"path": "a.py"}}},
+    ]})
+    assert tokenizer.calls == 3  # name + arguments
+
+
+def test_budget_tracker_counts_only_appended_messages():
+    tokenizer = _CountingTokenizer()
+    tracker = ContextBudget(TokenCounter(tokenizer))
+    messages = _thread(3, tool_output="x" * 400)
+    total = tracker.sync(messages)
+    calls = tokenizer.calls
+
+    messages.append({"role": "user", "content": "and one more thing"})
+    assert tracker.sync(messages) == total + context_budget.MESSAGE_OVERHEAD_TOKENS + 4
+    assert tokenizer.calls == calls + 1
+
+    shorter = messages[:4]
+    assert tracker.sync(shorter) == sum(tracker.counts) and len(tracker.counts) == 4
+    assert tokenizer.calls == calls + 1  # dropped suffix needs no recount
+
+
+def test_trim_within_budget_returns_same_list():
+    messages = _thread(2)
+    out = AgenticLoopService._trim_messages_to_budget(messages, 128_000, 0, model="gpt-4o")
+    assert out is messages
+
+
+def test_trim_elides_old_tool_outputs_first_without_copying():
+    messages = _thread(6)
+    before = _snapshot(messages)
+    counter = TokenCounter(HeuristicTokenizer("default"))
+    full = sum(counter.count_message(m) for m in messages)
+
+    out, counts = trim_messages(messages, full // 2, counter)
+
+    assert _snapshot(messages) == before  # caller's messages untouched
+    assert len(out) == len(messages) and sum(counts) <= full // 2
+    assert counts == [counter.count_message(m) for m in out]
+    changed = [i for i, (a, b) in enumerate(zip(messages, out)) if a is not b]
+    assert changed and all(messages[i]["role"] == "tool" for i in changed)
+    assert changed == sorted(changed) and changed[0] == 3  # oldest first
+    assert out[-1] is messages[-1]  # latest tool output kept verbatim
+    assert out[changed[0]]["content"].startswith("[earlier tool output elided")
+    assert "# module_0.py" in out[changed[0]]["content"]
+
+
+def test_trim_drops_whole_exchanges_before_user_turns():
+    messages = _thread(8)
+    counter = TokenCounter(HeuristicTokenizer("default"))
+    # Room for the system prompt, every user turn and the latest exchange only.
+    tight = sum(counter.count_message(m) for m in messages if m["role"] in ("system", "user"))
+    tight += sum(counter.count_message(m) for m in messages[-2:])
+
+    out, counts = trim_messages(messages, tight, counter)
+
+    assert sum(counts) <= tight
+    assert out[0] is messages[0] and out[-3:] == messages[-3:]
+    ids = {m.get("tool_call_id") for m in out if m["role"] == "tool"}
+    calls = {tc["id"] for m in out for tc in m.get("tool_calls") or []}
+    assert ids == calls  # no orphaned tool results or calls
+    assert [m for m in out if m["role"] == "user"] == [m for m in messages if m["role"] == "user"]
+    assert [m["role"] for m in out[-3:]] == ["user", "assistant", "tool"]
+    assert sum(m["role"] == "assistant" for m in out) == 1
+
+    out, counts = trim_messages(messages, tight // 2, counter)
+    assert out[0]["role"] == "system" and out[-3:-1] == messages[-3:-1]
+    assert out[-1]["tool_call_id"] == messages[-1]["tool_call_id"]
+    assert sum(m["role"] == "user" for m in out) < 8  # then the oldest user turns
+
+
+def test_loop_trim_keeps_tracker_in_step():
+    messages = _thread(10)
+    tracker = ContextBudget(context_budget.token_counter("gpt-4o"))
+    budget = 6000
+
+    trimmed = AgenticLoopService._trim_messages_to_budget(messages, budget, 500, model="gpt-4o", tracker=tracker)
+    available = AgenticLoopService._compute_available_budget(budget, 500)
+    assert tracker.total == sum(tracker.counts) <= available
+    assert AgenticLoopService._estimate_messages_tokens(trimmed, "gpt-4o") == tracker.total
+
+    trimmed.append({"role": "user", "content": "next"})
+    again = AgenticLoopService._trim_messages_to_budget(trimmed, budget, 500, model="gpt-4o", tracker=tracker)
+    assert again is trimmed
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(120)
+def test_per_turn_tokenizer_calls_on_a_200_message_thread():
+    """Per-turn budgeting cost on a growing 200-message, code-heavy thread."""
+    base = _thread(66)  # system + 198 messages
+    tokenizer = _CountingTokenizer()
+    tracker = ContextBudget(TokenCounter(tokenizer))
+    budget = 32_000
+    messages = list(base)
+    calls = []
+    for i in range(30):
+        before = tokenizer.calls
+        messages = AgenticLoopService._trim_messages_to_budget(messages, budget, 1_000, tracker=tracker)
+        calls.append(tokenizer.calls - before)
+        messages.append({"role": "assistant", "content": f"turn {i}", "tool_calls": [
+            {"id": f"t{i}", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}]})
+        messages.append({"role": "tool", "tool_call_id": f"t{i}", "content": CODE * 20})
+
+    assert tracker.total <= AgenticLoopService._compute_available_budget(budget, 1_000)
+    assert messages[0] is base[0]
+    assert calls[0] == 374  # every distinct text of the thread, once
+    # Afterwards only the appended exchange (content, tool name, arguments,
+    # tool output) and at most one newly elided tool output are counted.
+    assert max(calls[1:]) <= 5
@@ -0,0 +1,398 @@
+"""ContinuousBatcher — windowed collection, mid-flight admission, per-caller
+streaming and ONNX dynamic-batch runs, plus a throughput/latency benchmark
+against a deterministic fake decoder."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tools.gimo_server.inference.contracts import HardwareTarget, InferenceRequest, TaskSemantic
+from tools.gimo_server.inference.router.hardware_scheduler import HardwareScheduler
+from tools.gimo_server.inference.runtime import onnx_adapter as onnx_mod
+from tools.gimo_server.inference.runtime.base_adapter import SessionHandle
+from tools.gimo_server.inference.runtime.batcher import (
+    BatchingConfig,
+    ContinuousBatcher,
+    DecodeStep,
+    supports_batching,
+)
+
+# Fake device costs (seconds): a forward pass has a fixed part and a small
+# per-sequence part, which is what makes batching pay off on real hardware.
+_PREFILL_S = 0.002
+_STEP_S = 0.004
+_PER_SEQ_S = 0.00025
+
+
+class _FakeDecoder:
+    """Deterministic multi-sequence decoder: replies ``t0 t1 …`` then stops.
+
+    ``inputs["max_tokens"]`` sets the reply length.  One asyncio lock stands
+    in for the device, so passes never overlap.
+    """
+
+    def __init__(self, *, fail_on_step: int = -1) -> None:
+        self.device = asyncio.Lock()
+        self.passes = 0
+        self.batch_sizes: list[int] = []
+        self.released: list[int] = []
+        self.fail_on_step = fail_on_step
+
+    async def _pass(self, n: int, base: float) -> None:
+        async with self.device:
+            self.passes += 1
+            await asyncio.sleep(base + _PER_SEQ_S * n)
+
+    @staticmethod
+    def _next(seq) -> DecodeStep:
+        pos = seq.state
+        seq.state += 1
+        return DecodeStep(text=f"t{pos} ", finished=seq.state >= seq.inputs.get("max_tokens", 4))
+
+    async def prefill_batch(self, session, seqs):
+        await self._pass(len(seqs), _PREFILL_S)
+        for seq in seqs:
+            seq.state = 0
+        return [self._next(s) for s in seqs]
+
+    async def decode_batch(self, session, seqs):
+        self.batch_sizes.append(len(seqs))
+        if len(self.batch_sizes) == self.fail_on_step:
+            raise RuntimeError("device lost")
+        await self._pass(len(seqs), _STEP_S)
+        return [self._next(s) for s in seqs]
+
+    async def release_sequences(self, session, seqs):
+        self.released.extend(s.seq_id for s in seqs)
+
+    async def run(self, session, inputs):
+        """Unbatched path: the same passes, one sequence at a time."""
+        n = inputs.get("max_tokens", 4)
+        start = time.monotonic()
+        await self._pass(1, _PREFILL_S)
+        for _ in range(n - 1):
+            await self._pass(1, _STEP_S)
+        elapsed = time.monotonic() - start
+        return {
+            "text": "".join(f"t{i} " for i in range(n)),
+            "tokens_generated": n,
+            "tokens_per_second": n / elapsed,
+        }
+
+
+def _request(i: int, max_tokens: int = 4, priority: int = 5) -> InferenceRequest:
+    return InferenceRequest(
+        request_id=f"r{i}",
+        model_id="fake",
+        task=TaskSemantic.GENERAL,
+        inputs={"prompt": f"q{i}", "max_tokens": max_tokens},
+        priority=priority,
+    )
+
+
+def _batcher(adapter, *, window_ms=5.0, max_batch_size=8, scheduler=None, on_idle=None, **config) -> ContinuousBatcher:
+    return ContinuousBatcher(
+        adapter,
+        SessionHandle(model_id="fake"),
+        BatchingConfig(window_ms=window_ms, max_batch_size=max_batch_size, **config),
+        scheduler=scheduler or HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1}),
+        device=HardwareTarget.CPU,
+        on_idle=on_idle,
+    )
+
+
+@pytest.mark.asyncio
+async def test_window_collects_a_burst_into_one_batch():
+    adapter = _FakeDecoder()
+    batcher = _batcher(adapter, window_ms=20)
+    handles = []
+    for i in range(5):
+        handles.append(batcher.submit(_request(i)))
+        await asyncio.sleep(0.002)
+    outs = await asyncio.gather(*[h.result() for h in handles])
+
+    assert all(o["text"] == "t0 t1 t2 t3 " and o["tokens_generated"] == 4 for o in outs)
+    assert adapter.batch_sizes == [5, 5, 5]
+    assert sorted(adapter.released) == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size_and_mid_flight_admission():
+    adapter = _FakeDecoder()
+    batcher = _batcher(adapter, window_ms=1, max_batch_size=3)
+    long = [batcher.submit(_request(i, max_tokens=10)) for i in range(2)]
+    short = batcher.submit(_request(2, max_tokens=2))
+    queued = [batcher.submit(_request(3 + i, max_tokens=3)) for i in range(2)]
+    await asyncio.gather(*[h.result() for h in long + [short] + queued])
+
+    assert max(adapter.batch_sizes) == 3
+    # The short request left after one decode step; a queued one took its
+    # place while the long ones were still running.
+    assert adapter.batch_sizes[:2] == [3, 2]
+    assert all(h.tokens == 10 for h in long)
+    assert batcher.mean_batch_size > 2
+
+
+@pytest.mark.asyncio
+async def test_each_caller_streams_its_own_tokens_in_order():
+    batcher = _batcher(_FakeDecoder())
+    handles = [batcher.submit(_request(i, max_tokens=3 + i)) for i in range(3)]
+
+    async def _collect(h):
+        return [piece async for piece in h]
+
+    streams = await asyncio.gather(*[_collect(h) for h in handles])
+    for i, pieces in enumerate(streams):
+        assert pieces == [f"t{k} " for k in range(3 + i)]
+        assert (await handles[i].result())["finish_reason"] == "stop"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_the_batch():
+    adapter = _FakeDecoder()
+    batcher = _batcher(adapter, window_ms=1)
+    keep = batcher.submit(_request(0, max_tokens=6))
+    drop = batcher.submit(_request(1, max_tokens=50))
+    await asyncio.sleep(0.02)
+    drop.cancel()
+    await keep.result()
+    with pytest.raises(asyncio.CancelledError):
+        await drop.result()
+    assert drop.sequence.seq_id in adapter.released
+    assert drop.tokens < 50
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_every_caller_and_frees_the_slot():
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    idle = []
+    batcher = _batcher(_FakeDecoder(fail_on_step=2), scheduler=scheduler, on_idle=idle.append)
+    handles = [batcher.submit(_request(i)) for i in range(3)]
+    for h in handles:
+        with pytest.raises(RuntimeError, match="device lost"):
+            await h.result()
+    await asyncio.sleep(0)
+    assert idle == [batcher]
+    assert scheduler.get_status()[0]["active"] == 0
+
+
+class _StuckDecoder(_FakeDecoder):
+    """Prefill never returns, like a wedged device."""
+
+    async def prefill_batch(self, session, seqs):
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_result_wait_is_bounded_by_the_timeout():
+    batcher = _batcher(_StuckDecoder(), window_ms=1)
+    handle = batcher.submit(_request(0))
+    with pytest.raises(TimeoutError, match="r0"):
+        await handle.result(timeout=0.05)
+    assert handle.cancelled
+    batcher._task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_stopped_loop_fails_in_flight_and_queued_callers():
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    idle = []
+    batcher = _batcher(_StuckDecoder(), scheduler=scheduler, window_ms=1, max_batch_size=1, on_idle=idle.append)
+    in_flight = batcher.submit(_request(0))
+    queued = batcher.submit(_request(1))
+    await asyncio.sleep(0.02)
+    batcher._task.cancel()
+    for h in (in_flight, queued):
+        with pytest.raises(RuntimeError, match="batcher stopped"):
+            await asyncio.wait_for(h.result(), 1)
+    assert idle == [batcher]
+    assert scheduler.get_status()[0]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batcher_holds_one_scheduler_slot_while_busy():
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    batcher = _batcher(_FakeDecoder(), scheduler=scheduler, window_ms=1)
+    handles = [batcher.submit(_request(i, max_tokens=8)) for i in range(4)]
+    await asyncio.sleep(0.01)
+    status = scheduler.get_status()[0]
+    assert status["active"] == 1 and status["queued"] == 0
+
+    # Another tenant of the device waits for the whole batch.
+    other = await scheduler.enqueue(_request(99), HardwareTarget.CPU)
+    with pytest.raises(TimeoutError):
+        await other.wait(timeout=0.005)
+    await asyncio.gather(*[h.result() for h in handles])
+    assert scheduler.get_status()[0]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_long_batch_yields_the_slot_to_queued_work():
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    batcher = _batcher(_FakeDecoder(), scheduler=scheduler, window_ms=1, max_hold_steps=3)
+    handles = [batcher.submit(_request(i, max_tokens=20)) for i in range(2)]
+    await asyncio.sleep(0.01)
+
+    # Queued behind the batch, the other tenant gets the slot within a few
+    # steps instead of after all 20.
+    other = await scheduler.enqueue(_request(99), HardwareTarget.CPU)
+    await other.wait(timeout=1)
+    assert batcher.slot_yields == 1
+    assert not any(h._done.done() for h in handles)
+    scheduler.release(other)
+
+    outs = await asyncio.gather(*[h.result() for h in handles])
+    assert all(o["tokens_generated"] == 20 for o in outs)
+    assert scheduler.get_status()[0]["active"] == 0
+
+
+def test_adapters_without_batching_are_rejected():
+    assert not supports_batching(SimpleNamespace(run=None))
+    with pytest.raises(TypeError):
+        ContinuousBatcher(object(), SessionHandle(), BatchingConfig(), scheduler=None, device=HardwareTarget.CPU)
+
+
+# ---------------------------------------------------------------------------
+# ONNX dynamic batch dimension
+# ---------------------------------------------------------------------------
+
+class _FakeOrtSession:
+    """Doubles its input; records the batch size of every run."""
+
+    def __init__(self, batch_dim="batch") -> None:
+        self.batch_dim = batch_dim
+        self.runs: list[int] = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="x", shape=[self.batch_dim, 3])]
+
+    def get_outputs(self):
+        return [SimpleNamespace(name="y")]
+
+    def run(self, names, feed):
+        self.runs.append(len(feed["x"]))
+        return [np.asarray(feed["x"]) * 2]
+
+
+async def _onnx_run_batch(monkeypatch, batch_dim):
+    """Run four requests (one of another shape) through ``run_batch``; returns the run sizes."""
+    monkeypatch.setattr(onnx_mod, "_ORT_AVAILABLE", True)
+    ort_session = _FakeOrtSession(batch_dim)
+    session = SessionHandle(model_id="clf", _backend=ort_session)
+    inputs = [
+        {"x": np.full((1, 3), 1.0, dtype=np.float32)},
+        {"x": np.full((2, 3), 2.0, dtype=np.float32)},
+        {"x": np.full((1, 4), 3.0, dtype=np.float32)},  # different shape: runs alone
+        {"x": np.full((1, 3), 4.0, dtype=np.float32)},
+    ]
+    adapter = onnx_mod.OnnxAdapter()
+    assert supports_batching(adapter)
+
+    outs = await adapter.run_batch(session, inputs)
+
+    for given, out in zip(inputs, outs):
+        np.testing.assert_array_equal(out["y"], given["x"] * 2)
+    return sorted(ort_session.runs)
+
+
+@pytest.mark.asyncio
+async def test_onnx_run_batch_concatenates_on_dynamic_batch_dim(monkeypatch):
+    # The three (n, 3) requests share one run.
+    assert await _onnx_run_batch(monkeypatch, "batch") == [1, 4]
+
+
+@pytest.mark.asyncio
+async def test_onnx_run_batch_on_fixed_batch_dim_runs_each_request(monkeypatch):
+    assert await _onnx_run_batch(monkeypatch, 1) == [1, 1, 1, 2]
+
+
+class _PooledOrtSession(_FakeOrtSession):
+    """Also returns a pooled output (sum over the batch) with no batch dimension."""
+
+    def get_outputs(self):
+        return [SimpleNamespace(name="y"), SimpleNamespace(name="total")]
+
+    def run(self, names, feed):
+        self.runs.append(len(feed["x"]))
+        x = np.asarray(feed["x"])
+        return [x * 2, x.sum(axis=0)]
+
+
+@pytest.mark.asyncio
+async def test_onnx_run_batch_runs_each_request_when_an_output_is_not_batch_major(monkeypatch):
+    monkeypatch.setattr(onnx_mod, "_ORT_AVAILABLE", True)
+    ort_session = _PooledOrtSession()
+    session = SessionHandle(model_id="clf", _backend=ort_session)
+    inputs = [{"x": np.full((1, 3), float(i), dtype=np.float32)} for i in range(1, 3)]
+
+    outs = await onnx_mod.OnnxAdapter().run_batch(session, inputs)
+
+    assert ort_session.runs == [2, 1, 1]  # merged pass discarded
+    for given, out in zip(inputs, outs):
+        np.testing.assert_array_equal(out["total"], given["x"].sum(axis=0))
+
+
+@pytest.mark.asyncio
+async def test_run_batch_adapter_is_collected_into_one_pass(monkeypatch):
+    monkeypatch.setattr(onnx_mod, "_ORT_AVAILABLE", True)
+    ort_session = _FakeOrtSession()
+    batcher = ContinuousBatcher(
+        onnx_mod.OnnxAdapter(),
+        SessionHandle(model_id="clf", _backend=ort_session),
+        BatchingConfig(window_ms=10, max_batch_size=4),
+        scheduler=HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1}),
+        device=HardwareTarget.CPU,
+    )
+    reqs = []
+    for i in range(6):
+        r = _request(i)
+        r.inputs = {"x": np.full((1, 3), float(i), dtype=np.float32)}
+        reqs.append(r)
+    handles = [batcher.submit(r) for r in reqs]
+    outs = await asyncio.gather(*[h.result() for h in handles])
+
+    assert ort_session.runs == [4, 2]
+    for i, out in enumerate(outs):
+        assert out["y"][0][0] == 2.0 * i
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+async def _drive(n_requests: int, tokens: int, batched: bool) -> _FakeDecoder:
+    adapter = _FakeDecoder()
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    batcher = _batcher(adapter, scheduler=scheduler, window_ms=5, max_batch_size=8)
+
+    async def _one(i: int) -> str:
+        await asyncio.sleep(0.001 * i)  # staggered arrivals
+        req = _request(i, max_tokens=tokens)
+        if batched:
+            return (await batcher.submit(req).result())["text"]
+        ticket = await scheduler.enqueue(req, HardwareTarget.CPU)
+        await ticket.wait(timeout=60)
+        try:
+            return (await adapter.run(None, req.inputs))["text"]
+        finally:
+            scheduler.release(ticket)
+
+    texts = await asyncio.gather(*[_one(i) for i in range(n_requests)])
+    assert texts == ["".join(f"t{i} " for i in range(tokens))] * n_requests
+    return adapter
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(60)
+@pytest.mark.asyncio
+async def test_continuous_batching_cuts_device_passes():
+    """32 staggered requests of 16 tokens: device passes, one per slot vs batched."""
+    serial = await _drive(32, 16, batched=False)
+    batched = await _drive(32, 16, batched=True)
+    assert serial.passes == 32 * 16
+    assert batched.passes < serial.passes / 4
+    assert max(batched.batch_sizes) == 8
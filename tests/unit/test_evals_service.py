@@ -0,0 +1,255 @@
+"""Tests for the concurrent EvalsService regression harness."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from tools.gimo_server.ops_models import (
+    EvalDataset,
+    EvalGateConfig,
+    EvalGoldenCase,
+    EvalJudgeConfig,
+    WorkflowGraph,
+    WorkflowNode,
+)
+from tools.gimo_server.services import evals_service
+from tools.gimo_server.services.evals_service import EvalsService
+
+
+class _MockProvider:
+    """Local provider with injected latency; echoes the prompt upper-cased."""
+
+    def __init__(self, latency: float = 0.0, latency_for=None, fail_on: str | None = None):
+        self.latency = latency
+        self.latency_for = latency_for
+        self.fail_on = fail_on
+        self.calls: list[tuple[str, dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started_at: list[float] = []
+
+    async def generate(self, prompt, context):
+        self.calls.append((prompt, dict(context)))
+        self.started_at.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_for(prompt) if self.latency_for else self.latency)
+            if self.fail_on and self.fail_on in prompt:
+                raise RuntimeError(f"provider failed on {prompt}")
+            return {
+                "content": prompt.upper(),
+                "provider": context.get("provider") or "mock",
+                "model": context.get("model") or "mock-model",
+                "tokens_used": 5,
+                "cost_usd": 0.001,
+            }
+        finally:
+            self.in_flight -= 1
+
+
+class _FakeEngine:
+    """Stand-in for GraphEngine: one provider call per case."""
+
+    def __init__(self, workflow, provider_service=None, **_kwargs):
+        self.provider = provider_service
+
+    async def execute(self, initial_state=None):
+        state = dict(initial_state or {})
+        context = {
+            "model": state.get("model", "m1"),
+            "temperature": state.get("temperature", 0.0),
+            "top_p": state.get("top_p"),
+            "provider": state.get("provider"),
+            "node_id": "A",
+        }
+        resp = await self.provider.generate(state["prompt"], context)
+        return SimpleNamespace(data={**state, "result": resp["content"]})
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    EvalsService._output_cache.clear()
+    yield
+    EvalsService._output_cache.clear()
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    monkeypatch.setattr(evals_service, "GraphEngine", _FakeEngine)
+
+
+@pytest.fixture
+def binding(monkeypatch):
+    """Provider config stand-in: ``binding["provider"]`` is what calls resolve to."""
+    current = {"provider": "p1", "default_model": "default-model"}
+    cfg = SimpleNamespace(active="p1", providers={})
+    monkeypatch.setattr(evals_service.ProviderService, "get_config", classmethod(lambda cls: cfg))
+
+    def _resolve(cls, _cfg, context, task_type):
+        return current["provider"], context.get("model") or current["default_model"]
+
+    monkeypatch.setattr(
+        evals_service.ProviderService, "_resolve_effective_provider_and_model", classmethod(_resolve)
+    )
+    return current
+
+
+def _workflow() -> WorkflowGraph:
+    return WorkflowGraph(id="wf_eval", nodes=[WorkflowNode(id="A", type="transform", config={})], edges=[])
+
+
+def _dataset(n: int, *, failing: set[int] = frozenset(), **state) -> EvalDataset:
+    cases = []
+    for i in range(n):
+        expected = "WRONG" if i in failing else f"CASE {i}"
+        cases.append(EvalGoldenCase(
+            case_id=f"c{i:03d}",
+            input_state={"prompt": f"case {i}", **state},
+            expected_state={"result": expected},
+        ))
+    return EvalDataset(workflow_id="wf_eval", name="golden", cases=cases)
+
+
+async def _run(dataset, provider, gate=None, **kwargs):
+    return await EvalsService.run_regression(
+        workflow=_workflow(),
+        dataset=dataset,
+        judge=EvalJudgeConfig(enabled=False),
+        gate=gate or EvalGateConfig(min_pass_rate=1.0, min_avg_score=1.0),
+        provider_service=provider,
+        **kwargs,
+    )
+
+
+def test_results_keep_dataset_order_under_bounded_concurrency(fake_engine):
+    # Later cases finish first.
+    provider = _MockProvider(latency_for=lambda prompt: 0.05 - int(prompt.split()[1]) * 0.004)
+
+    report = asyncio.run(_run(_dataset(12), provider, concurrency=3))
+
+    assert [r.case_id for r in report.results] == [f"c{i:03d}" for i in range(12)]
+    assert report.passed_cases == 12 and report.gate_passed
+    assert provider.max_in_flight == 3
+    assert not report.aborted and report.skipped_cases == 0
+
+
+def test_per_provider_rate_limits(fake_engine):
+    provider = _MockProvider()
+    dataset = _dataset(6, provider="limited")
+
+    started = time.monotonic()
+    report = asyncio.run(_run(dataset, provider, concurrency=6, provider_rate_limits={"limited": 20.0}))
+    elapsed = time.monotonic() - started
+
+    assert report.gate_passed
+    gaps = [b - a for a, b in zip(provider.started_at, provider.started_at[1:])]
+    assert min(gaps) >= 0.04
+    assert elapsed >= 0.24
+
+    # Providers without a limit (and no "*" entry) are not throttled.
+    provider = _MockProvider()
+    started = time.monotonic()
+    asyncio.run(_run(_dataset(6, provider="free"), provider, concurrency=6, provider_rate_limits={"limited": 1.0}))
+    assert time.monotonic() - started < 0.2
+
+
+def test_early_abort_when_pass_rate_cannot_reach_gate(fake_engine):
+    provider = _MockProvider(latency=0.01)
+    dataset = _dataset(40, failing={0, 1, 2})
+    gate = EvalGateConfig(min_pass_rate=0.95, min_avg_score=0.0)
+
+    report = asyncio.run(_run(dataset, provider, gate=gate, concurrency=2, early_abort=True))
+
+    assert report.aborted and not report.gate_passed
+    assert report.skipped_cases > 0
+    assert report.total_cases + report.skipped_cases == 40
+    assert len(provider.calls) < 40
+    ids = [r.case_id for r in report.results]
+    assert ids == sorted(ids)
+
+    # Without early abort every case runs.
+    provider = _MockProvider()
+    report = asyncio.run(_run(dataset, provider, gate=gate, concurrency=2, reuse_cached_outputs=False))
+    assert not report.aborted and report.total_cases == 40 and len(provider.calls) == 40
+
+
+def test_reachable_gate_is_never_aborted(fake_engine):
+    provider = _MockProvider()
+    report = asyncio.run(_run(
+        _dataset(20, failing={5}), provider,
+        gate=EvalGateConfig(min_pass_rate=0.9, min_avg_score=0.0), early_abort=True,
+    ))
+    assert not report.aborted and report.total_cases == 20 and report.gate_passed
+
+
+def test_cached_outputs_are_reused_for_unchanged_cases(fake_engine, binding):
+    provider = _MockProvider()
+    first = asyncio.run(_run(_dataset(10), provider, reuse_cached_outputs=True))
+    assert first.cached_outputs == 0 and len(provider.calls) == 10
+
+    second = asyncio.run(_run(_dataset(10), provider, reuse_cached_outputs=True))
+    assert second.cached_outputs == 10 and len(provider.calls) == 10
+    assert [r.model_dump() for r in second.results] == [r.model_dump() for r in first.results]
+
+    # Different params or model: cache miss.
+    asyncio.run(_run(_dataset(10, top_p=0.5), provider, reuse_cached_outputs=True))
+    asyncio.run(_run(_dataset(10, model="m2"), provider, reuse_cached_outputs=True))
+    assert len(provider.calls) == 30
+
+    # Reuse is opt-in.
+    report = asyncio.run(_run(_dataset(10), provider))
+    assert report.cached_outputs == 0 and len(provider.calls) == 40
+
+
+def test_provider_or_default_model_change_misses_the_cache(fake_engine, binding):
+    provider = _MockProvider()
+    # No model in the context: the provider's configured default is used.
+    asyncio.run(_run(_dataset(5, model=None), provider, reuse_cached_outputs=True))
+    binding["default_model"] = "new-default"
+    report = asyncio.run(_run(_dataset(5, model=None), provider, reuse_cached_outputs=True))
+    assert report.cached_outputs == 0 and len(provider.calls) == 10
+
+    binding["provider"] = "p2"
+    report = asyncio.run(_run(_dataset(5, model=None), provider, reuse_cached_outputs=True))
+    assert report.cached_outputs == 0 and len(provider.calls) == 15
+
+
+def test_sampled_outputs_are_never_cached(fake_engine, binding):
+    provider = _MockProvider()
+    for _ in range(2):
+        report = asyncio.run(_run(_dataset(5, temperature=0.7), provider, reuse_cached_outputs=True))
+        assert report.cached_outputs == 0
+    assert len(provider.calls) == 10 and len(EvalsService._output_cache) == 0
+
+
+def test_case_error_cancels_remaining_cases(fake_engine):
+    provider = _MockProvider(latency=0.02, fail_on="case 3")
+    with pytest.raises(RuntimeError, match="case 3"):
+        asyncio.run(_run(_dataset(50), provider, concurrency=4))
+    assert len(provider.calls) < 50
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(120)
+def test_regression_concurrency_and_cache_at_scale(fake_engine):
+    """200 cases against a mock provider with 25 ms injected latency."""
+    dataset = _dataset(200)
+
+    def _regression(**kwargs):
+        provider = _MockProvider(latency=0.025)
+        return asyncio.run(_run(dataset, provider, **kwargs)), provider
+
+    serial_report, serial_provider = _regression(concurrency=1, reuse_cached_outputs=False)
+    report, provider = _regression(concurrency=16, reuse_cached_outputs=False)
+    _regression(concurrency=16, reuse_cached_outputs=True)  # warm the output cache
+    cached_report, cached_provider = _regression(concurrency=16, reuse_cached_outputs=True)
+
+    assert serial_report.total_cases == report.total_cases == 200
+    assert [r.model_dump() for r in report.results] == [r.model_dump() for r in serial_report.results]
+    assert (serial_provider.max_in_flight, provider.max_in_flight) == (1, 16)
+    assert len(provider.calls) == 200
+    assert cached_report.cached_outputs == 200 and not cached_provider.calls
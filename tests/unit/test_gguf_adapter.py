@@ -0,0 +1,262 @@
+"""GgufAdapter — per-session serialisation, prompt-prefix KV reuse and token
+streaming, against a fake llama backend that counts evaluated tokens."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tools.gimo_server.inference.runtime.gguf_adapter import (
+    GgufAdapter,
+    SessionQueueFull,
+    _GgufSessionHandle,
+    _split_stop,
+)
+
+_BOS, _EOS = 1, 2
+
+
+class _FakeLlama:
+    """Byte-level stand-in for ``llama_cpp.Llama`` (one token per byte).
+
+    Replies with *reply* then EOS.  Tracks the tokens in its "KV cache" the
+    way llama.cpp does (``n_tokens`` truncates, ``eval`` appends) and counts
+    how many prompt tokens each request evaluated.
+    """
+
+    def __init__(self, reply: str = "Hi there", *, n_ctx: int = 8192, eval_delay: float = 0.0) -> None:
+        self.reply = reply.encode()
+        self._n_ctx = n_ctx
+        self.eval_delay = eval_delay
+        self.input_ids: list[int] = []
+        self.n_tokens = 0
+        self.prompt_evals: list[int] = []  # prompt tokens evaluated, per request
+        self.sampled = 0
+        self.saves = 0
+        self.overlaps = 0
+        self.threads: set[str] = set()
+        self._busy = threading.Lock()
+        self._new_request = False
+        self._pos = 0
+
+    def _enter(self) -> None:
+        if not self._busy.acquire(blocking=False):
+            self.overlaps += 1
+            self._busy.acquire()
+        self.threads.add(threading.current_thread().name)
+
+    def n_ctx(self) -> int:
+        return self._n_ctx
+
+    def tokenize(self, text: bytes) -> list[int]:
+        self._new_request = True
+        self._pos = 0
+        return [_BOS] + [b + 3 for b in text]
+
+    def detokenize(self, tokens) -> bytes:
+        return bytes(t - 3 for t in tokens if t >= 3)
+
+    def token_eos(self) -> int:
+        return _EOS
+
+    def eval(self, tokens) -> None:
+        self._enter()
+        try:
+            time.sleep(self.eval_delay)
+            del self.input_ids[self.n_tokens:]
+            self.input_ids.extend(tokens)
+            self.n_tokens = len(self.input_ids)
+            if self._new_request:
+                self.prompt_evals.append(len(tokens))
+                self._new_request = False
+        finally:
+            self._busy.release()
+
+    def sample(self, temp: float, top_p: float) -> int:
+        self._enter()
+        try:
+            self.sampled += 1
+            if self._pos >= len(self.reply):
+                return _EOS
+            self._pos += 1
+            return self.reply[self._pos - 1] + 3
+        finally:
+            self._busy.release()
+
+    def save_state(self):
+        self.saves += 1
+        return list(self.input_ids[:self.n_tokens])
+
+    def load_state(self, state) -> None:
+        self.input_ids = list(state)
+        self.n_tokens = len(state)
+
+
+def _session(llama: _FakeLlama) -> _GgufSessionHandle:
+    return _GgufSessionHandle(model_id="fake-gguf", _backend=llama)
+
+
+SYSTEM = "You are a careful agent. " * 80  # ~2000 tokens shared by every turn
+
+
+@pytest.mark.asyncio
+async def test_consecutive_turns_only_evaluate_the_new_suffix():
+    llama = _FakeLlama(reply="Done.")
+    adapter = GgufAdapter()
+    session = _session(llama)
+
+    turn1 = SYSTEM + "User: list files\nAssistant:"
+    out1 = await adapter.run(session, {"prompt": turn1})
+    assert out1["text"] == "Done." and out1["finish_reason"] == "stop"
+    assert llama.prompt_evals == [len(turn1) + 1] and out1["tokens_prompt_cached"] == 0
+
+    turn2 = turn1 + out1["text"] + "\nUser: now read README\nAssistant:"
+    out2 = await adapter.run(session, {"prompt": turn2})
+    evaluated = llama.prompt_evals[-1]
+    assert evaluated == out2["tokens_prompt"] - out2["tokens_prompt_cached"]
+    # The previous prompt and reply are already in the KV.
+    assert out2["tokens_prompt_cached"] == len(turn1) + 1 + len("Done.")
+    assert evaluated < 50
+
+    # Identical prompt: only the final token is re-evaluated (for logits).
+    await adapter.run(session, {"prompt": turn2})
+    assert llama.prompt_evals[-1] == 1
+    assert llama.saves == 0  # never diverged from the live KV
+    await adapter.unload(session)
+
+
+async def _interleaved_evals(prefix_states):
+    """Prompt tokens evaluated when returning to conversation A after B."""
+    llama = _FakeLlama(reply="ok")
+    adapter = GgufAdapter(prefix_states=prefix_states)
+    session = _session(llama)
+
+    a1 = SYSTEM + "Context A: " + "alpha " * 50 + "\nAssistant:"
+    b1 = SYSTEM + "Context B: " + "beta " * 50 + "\nAssistant:"
+    await adapter.run(session, {"prompt": a1})
+    await adapter.run(session, {"prompt": b1})
+    out = await adapter.run(session, {"prompt": a1 + " ok\nUser: next\nAssistant:"})
+    assert llama.prompt_evals[-1] == out["tokens_prompt"] - out["tokens_prompt_cached"]
+    # A's KV is saved when B diverges from it, B's when A returns.
+    assert llama.saves == (2 if prefix_states else 0)
+    await adapter.unload(session)
+    return llama.prompt_evals[-1]
+
+
+@pytest.mark.asyncio
+async def test_short_divergent_tail_is_not_snapshotted():
+    llama = _FakeLlama(reply="ok")
+    adapter = GgufAdapter()
+    session = _session(llama)
+
+    await adapter.run(session, {"prompt": SYSTEM + "User: one"})
+    await adapter.run(session, {"prompt": SYSTEM + "User: two"})
+    assert llama.saves == 0
+    await adapter.unload(session)
+
+
+@pytest.mark.asyncio
+async def test_interleaved_conversations_use_kv_snapshots():
+    # A's context is restored from its snapshot.
+    assert await _interleaved_evals(prefix_states=2) < 40
+
+
+@pytest.mark.asyncio
+async def test_interleaved_conversations_without_snapshots_share_only_the_system_prompt():
+    assert await _interleaved_evals(prefix_states=0) < 400
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_serialised_on_the_session_thread():
+    llama = _FakeLlama(reply="abc", eval_delay=0.002)
+    adapter = GgufAdapter(max_queue_per_session=16)
+    session = _session(llama)
+
+    outs = await asyncio.gather(*[
+        adapter.run(session, {"prompt": f"{SYSTEM}q{i}"}) for i in range(10)
+    ])
+    assert all(o["text"] == "abc" for o in outs)
+    assert llama.overlaps == 0
+    assert len(llama.threads) == 1 and next(iter(llama.threads)).startswith("gguf-fake-gguf")
+    await adapter.unload(session)
+
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_per_session():
+    llama = _FakeLlama(reply="x" * 20, eval_delay=0.01)
+    adapter = GgufAdapter(max_queue_per_session=2)
+    session = _session(llama)
+
+    running = [asyncio.ensure_future(adapter.run(session, {"prompt": "p"})) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(SessionQueueFull):
+        await adapter.run(session, {"prompt": "p"})
+    await asyncio.gather(*running)
+    # Capacity returns once the queue drains.
+    assert (await adapter.run(session, {"prompt": "p"}))["tokens_generated"] == 20
+    await adapter.unload(session)
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_tokens_and_honours_stop_sequences():
+    llama = _FakeLlama(reply="Hello world. STOP ignored")
+    adapter = GgufAdapter()
+    session = _session(llama)
+
+    pieces = [p async for p in adapter.stream(session, {"prompt": "hi", "stop": ["STOP"]})]
+    assert len(pieces) > 5
+    assert "".join(pieces) == "Hello world. "
+
+    full = await adapter.run(session, {"prompt": "hi"})
+    assert full["text"] == "Hello world. STOP ignored" and full["tokens_generated"] == 25
+    await adapter.unload(session)
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_stops_generation():
+    llama = _FakeLlama(reply="y" * 500, eval_delay=0.001)
+    adapter = GgufAdapter()
+    session = _session(llama)
+
+    stream = adapter.stream(session, {"prompt": "go", "max_tokens": 500})
+    got = []
+    async for piece in stream:
+        got.append(piece)
+        if len(got) == 3:
+            break
+    await stream.aclose()
+    await asyncio.sleep(0.05)
+    assert llama.sampled < 100
+
+    await adapter.unload(session)
+    with pytest.raises(RuntimeError):
+        await adapter.run(session, {"prompt": "again"})
+
+
+@pytest.mark.asyncio
+async def test_unload_cancels_queued_work_and_drops_kv_state_on_the_session_thread():
+    llama = _FakeLlama(reply="z" * 80, eval_delay=0.002)
+    adapter = GgufAdapter(prefix_states=2)
+    session = _session(llama)
+    await adapter.run(session, {"prompt": SYSTEM + "A"})
+    runner = session._runner
+
+    running = asyncio.ensure_future(adapter.run(session, {"prompt": SYSTEM + "B" * 100}))
+    queued = asyncio.ensure_future(adapter.run(session, {"prompt": SYSTEM + "C"}))
+    await asyncio.sleep(0.01)
+    await adapter.unload(session)
+    assert runner._states  # still owned by the running generation
+
+    assert (await running)["tokens_generated"] == 80
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    await asyncio.get_running_loop().run_in_executor(None, runner._executor.shutdown)
+    assert not runner._states and runner._kv_tokens == []
+
+
+def test_split_stop_holds_back_partial_matches():
+    assert _split_stop("Hello ST", ["STOP"]) == ("Hello ", "ST", False)
+    assert _split_stop("Hello STOP more", ["STOP"]) == ("Hello ", "", True)
+    assert _split_stop("plain", []) == ("plain", "", False)
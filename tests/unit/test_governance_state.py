@@ -0,0 +1,225 @@
+"""Governance snapshot and proof pipeline behind SagpGateway.evaluate_action."""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from tools.gimo_server.models.surface import SurfaceIdentity
+from tools.gimo_server.services.governance_state import GovernanceState, ProofPipeline
+from tools.gimo_server.services.sagp_gateway import SagpGateway
+from tools.gimo_server.services.storage.trust_storage import TrustStorage
+from tools.gimo_server.services.storage_service import StorageService
+
+
+class _FakeGics:
+    """Dict-backed GICS stand-in; counts operations, optional per-op delay."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.items: dict = {}
+        self.ops = 0
+        self.delay_s = delay_s
+        self.failing_puts = 0  # the next N proof puts raise
+        self._lock = threading.Lock()
+
+    def _op(self) -> None:
+        self.ops += 1
+        if self.delay_s:
+            time.sleep(self.delay_s)
+
+    def put(self, key, fields):
+        self._op()
+        with self._lock:
+            if self.failing_puts and key.startswith("ops:proof:"):
+                self.failing_puts -= 1
+                raise ConnectionError("daemon restarting")
+            self.items[key] = dict(fields)
+
+    def get(self, key):
+        self._op()
+        fields = self.items.get(key)
+        return {"key": key, "fields": dict(fields)} if fields is not None else None
+
+    def scan(self, prefix="", include_fields=True):
+        self._op()
+        with self._lock:
+            snapshot = list(self.items.items())
+        return [{"key": k, "fields": dict(v)} for k, v in snapshot if k.startswith(prefix)]
+
+
+@pytest.fixture
+def gics(monkeypatch):
+    monkeypatch.delenv("DEBUG", raising=False)
+    monkeypatch.delenv("ORCH_DEBUG", raising=False)
+    fake = _FakeGics()
+    monkeypatch.setattr(StorageService, "_shared_gics", fake)
+    GovernanceState.reset()
+    ProofPipeline.reset()
+    yield fake
+    ProofPipeline.flush()
+    ProofPipeline.reset()
+    GovernanceState.reset()
+
+
+@pytest.fixture
+def surface():
+    return SurfaceIdentity(surface_type="cli", surface_name="test")
+
+
+def _trust_events(gics, dimension_key: str, outcome: str, count: int, *, start: datetime | None = None) -> None:
+    storage = TrustStorage(gics_service=gics)
+    start = start or datetime.now(timezone.utc)
+    for i in range(count):
+        storage.save_trust_event({
+            "dimension_key": dimension_key,
+            "tool": "shell_exec",
+            "context": "test",
+            "outcome": outcome,
+            "timestamp": start + timedelta(microseconds=i),
+        })
+
+
+def test_warm_verdicts_do_not_touch_gics(gics, surface):
+    _trust_events(gics, "tool", "approved", 30, start=datetime.now(timezone.utc) - timedelta(hours=1))
+    first = SagpGateway.evaluate_action(surface=surface, tool_name="read_file", tool_args={"model": "gpt-4o"})
+    assert first.trust_score > 0.9 and first.circuit_breaker_state == "closed"
+
+    gics.ops = 0
+    for _ in range(50):
+        verdict = SagpGateway.evaluate_action(surface=surface, tool_name="read_file", tool_args={"model": "gpt-4o"})
+    assert gics.ops == 0
+    assert verdict.trust_score == first.trust_score
+    assert verdict.estimated_cost_usd == first.estimated_cost_usd > 0
+
+
+def test_circuit_open_is_visible_within_bounded_delay(gics, surface):
+    assert SagpGateway.evaluate_action(surface=surface, tool_name="read_file").allowed
+
+    started = time.monotonic()
+    _trust_events(gics, "provider", "error", 5)
+    while True:
+        verdict = SagpGateway.evaluate_action(surface=surface, tool_name="read_file")
+        if verdict.circuit_breaker_state == "open":
+            break
+        assert time.monotonic() - started < 0.5, "circuit open not reflected within 500 ms"
+        time.sleep(0.001)
+    assert verdict.allowed is False
+    assert "Circuit breaker is OPEN" in verdict.reasoning
+
+
+def test_stale_snapshot_refreshes_in_background(gics, surface, monkeypatch):
+    SagpGateway.evaluate_action(surface=surface, tool_name="read_file")
+    # Written by another process: no event reaches this one.
+    for i in range(5):
+        ts = (datetime.now(timezone.utc) + timedelta(microseconds=i)).isoformat()
+        gics.put(f"te:provider:{ts}", {"dimension_key": "provider", "outcome": "timeout", "timestamp": ts})
+    assert SagpGateway.evaluate_action(surface=surface, tool_name="read_file").circuit_breaker_state == "closed"
+
+    monkeypatch.setenv("ORCH_GOVERNANCE_SNAPSHOT_TTL_S", "0")
+    deadline = time.monotonic() + 1.0
+    while SagpGateway.evaluate_action(surface=surface, tool_name="read_file").circuit_breaker_state != "open":
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_pre_action_proofs_keep_call_order(gics, surface):
+    proof_ids = [
+        SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="t1").proof_id
+        for _ in range(40)
+    ]
+    result = SagpGateway.verify_proof_chain(thread_id="t1")
+    assert result["valid"] and result["length"] == 40
+
+    from tools.gimo_server.security.execution_proof import ExecutionProofChain
+
+    chain = ExecutionProofChain.from_records("t1", StorageService(gics).list_proofs("t1"))
+    assert [p.proof_id for p in chain.to_list()] == proof_ids
+    assert SagpGateway.evaluate_action(surface=surface, tool_name="read_file").proof_id.startswith("ephemeral_")
+
+
+def test_failed_proof_writes_are_retried_not_dropped(gics, surface, monkeypatch):
+    from tools.gimo_server.security.execution_proof import ExecutionProofChain
+
+    monkeypatch.setattr(ProofPipeline, "RETRY_BASE_S", 0.01)
+    gics.failing_puts = 3
+    proof_ids = [
+        SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="t-retry").proof_id
+        for _ in range(10)
+    ]
+    assert all(p.startswith("proof_") for p in proof_ids)
+    assert ProofPipeline.flush(timeout=5)
+    assert ProofPipeline.write_failures >= 1
+
+    chain = ExecutionProofChain.from_records("t-retry", StorageService(gics).list_proofs("t-retry"))
+    assert [p.proof_id for p in chain.to_list()] == proof_ids
+    assert chain.verification_state() == "present"
+
+
+def test_reader_flush_is_scoped_to_its_thread(gics, surface, monkeypatch):
+    monkeypatch.setattr(ProofPipeline, "RETRY_BASE_S", 60.0)
+    gics.failing_puts = 1000
+    SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="t-down")
+    # One failed attempt and the thread waits out its backoff.
+    deadline = time.monotonic() + 2
+    while ProofPipeline.write_failures == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    assert not ProofPipeline.flush("t-down", timeout=1)
+    assert ProofPipeline.pending("t-down") == 1
+
+    # Another chain is written by its reader without waiting on t-down.
+    gics.failing_puts = 0
+    SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="t-up")
+    result = SagpGateway.verify_proof_chain(thread_id="t-up")
+    assert result["valid"] and result["length"] == 1
+    assert ProofPipeline.flush("t-down") and ProofPipeline.pending() == 0
+
+
+def test_no_gics_returns_ephemeral_proof_ids(gics, surface, monkeypatch):
+    monkeypatch.setattr(StorageService, "_shared_gics", None)
+    verdict = SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="t-none")
+    assert verdict.proof_id.startswith("ephemeral_")
+    assert ProofPipeline.pending() == 0
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+def test_evaluate_action_over_3000_trust_events_only_writes_proofs(gics, surface):
+    """3000 trust events: GICS operations per verdict, legacy path vs snapshot."""
+    from tools.gimo_server.security.execution_proof import ExecutionProofChain
+    from tools.gimo_server.services.economy.cost_service import CostService
+    from tools.gimo_server.services.trust_engine import TrustEngine
+
+    start = datetime.now(timezone.utc) - timedelta(days=1)
+    for i in range(3000):
+        dim = ("tool", "provider", "model", f"tool:t{i % 40}")[i % 4]
+        ts = (start + timedelta(seconds=i)).isoformat()
+        gics.items[f"te:{dim}:{ts}"] = {"dimension_key": dim, "outcome": "approved", "timestamp": ts}
+    rounds = 300
+
+    def _legacy_overhead(thread_id):
+        storage = TrustStorage(gics_service=gics)
+        TrustEngine(trust_store=storage).query_dimension("tool")
+        TrustEngine(trust_store=storage).query_dimension("provider")
+        CostService.calculate_cost(model="gpt-4o", input_tokens=1000, output_tokens=500)
+        chain = ExecutionProofChain.from_records(thread_id, StorageService(gics).list_proofs(thread_id))
+        proof = chain.append("read_file", {"kind": "pre_action"}, {"allowed": True}, mood="pre_action")
+        gics.put(f"ops:proof:{thread_id}:{proof.proof_id}", proof.to_dict())
+
+    _legacy_overhead("bench-legacy")
+    gics.ops = 0
+    _legacy_overhead("bench-legacy")
+    legacy_ops = gics.ops
+
+    SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="bench")
+    assert ProofPipeline.flush()
+    gics.ops = 0
+    for _ in range(rounds):
+        SagpGateway.evaluate_action(surface=surface, tool_name="read_file", thread_id="bench")
+    assert ProofPipeline.flush(timeout=60)
+
+    assert legacy_ops == 108  # trust scans, record reads and writes, proof listing and put
+    assert gics.ops == rounds  # one proof put per verdict, off the caller's path
+    assert SagpGateway.verify_proof_chain(thread_id="bench")["length"] == rounds + 1
@@ -145,7 +145,7 @@ async def test_graph_engine_persists_checkpoints_when_enabled():
         def save_workflow(self, workflow_id, data):
             self.workflow_saved = (workflow_id, data)
 
-        def save_checkpoint(self, workflow_id, node_id, state, output, status):
+        def save_checkpoint(self, workflow_id, node_id, state, output, status, kind="full", **delta):
             self.checkpoints.append(
                 {
                     "workflow_id": workflow_id,
@@ -153,6 +153,8 @@ async def test_graph_engine_persists_checkpoints_when_enabled():
                     "state": state,
                     "output": output,
                     "status": status,
+                    "kind": kind,
+                    **delta,
                 }
             )
 
@@ -173,6 +175,10 @@ async def test_graph_engine_persists_checkpoints_when_enabled():
     assert len(storage.checkpoints) == 2
     assert [cp["node_id"] for cp in storage.checkpoints] == ["A", "B"]
     assert all(cp["status"] == "completed" for cp in storage.checkpoints)
+    assert [cp["kind"] for cp in storage.checkpoints] == ["full", "delta"]
+    assert storage.checkpoints[0]["state"]["start"] is True
+    assert "start" not in storage.checkpoints[1]["state"]  # only changed keys
+    assert storage.checkpoints[1]["state"]["v"] == 2
 
 
 @pytest.mark.asyncio
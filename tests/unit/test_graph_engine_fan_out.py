@@ -0,0 +1,279 @@
+"""Delta checkpoints and concurrent fan-out in GraphEngine."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from tools.gimo_server.ops_models import WorkflowCheckpoint, WorkflowEdge, WorkflowGraph, WorkflowNode
+from tools.gimo_server.services.graph import GraphEngine
+from tools.gimo_server.services.storage.workflow_storage import WorkflowStorage
+
+
+class _FakeGics:
+    def __init__(self) -> None:
+        self.items: dict = {}
+        self.bytes_written = 0
+
+    def put(self, key, fields):
+        self.items[key] = fields
+        self.bytes_written += sum(len(v) for v in fields.values() if isinstance(v, str))
+
+    def scan(self, prefix="", include_fields=False):
+        return [{"key": k, "fields": v} for k, v in sorted(self.items.items()) if k.startswith(prefix)]
+
+
+def _chain(n: int, graph_id: str = "chain") -> WorkflowGraph:
+    nodes = [WorkflowNode(id=f"n{i}", type="transform", config={"i": i}) for i in range(n)]
+    edges = [WorkflowEdge(**{"from": f"n{i}", "to": f"n{i + 1}"}) for i in range(n - 1)]
+    return WorkflowGraph(id=graph_id, nodes=nodes, edges=edges)
+
+
+async def _chain_step(node, state):
+    await asyncio.sleep(0)
+    i = node.config["i"]
+    out = {f"k{i % 7}": i, "last": node.id}
+    if i % 5 == 4:
+        out["counter"] = {"seen": i}
+    if i == 6:
+        state.pop("drop_me", None)
+    return out
+
+
+def _engine(graph, **kwargs) -> GraphEngine:
+    engine = GraphEngine(graph, max_iterations=1000, **kwargs)
+    engine._execute_node = _chain_step
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_delta_checkpoints_rebuild_the_same_states_as_full_snapshots():
+    full_gics, delta_gics = _FakeGics(), _FakeGics()
+    full = _engine(_chain(23, "wf_full"), storage=WorkflowStorage(gics=full_gics),
+                   persist_checkpoints=True, checkpoint_full_every=1)
+    delta = _engine(_chain(23, "wf_delta"), storage=WorkflowStorage(gics=delta_gics),
+                    persist_checkpoints=True, checkpoint_full_every=10)
+    await full.execute({"big": "x" * 10_000, "drop_me": 1})
+    await delta.execute({"big": "x" * 10_000, "drop_me": 1})
+
+    assert [cp.kind for cp in full.state.checkpoints] == ["full"] * 23
+    kinds = [cp.kind for cp in delta.state.checkpoints]
+    assert [i for i, k in enumerate(kinds) if k == "full"] == [0, 10, 20]
+    assert "big" not in delta.state.checkpoints[1].state
+    assert delta.state.checkpoints[6].removed == ["drop_me"]
+    assert set(delta.state.checkpoints[3].appended) == {"step_logs"}
+
+    # Rebuilt from persisted records, every delta state equals the full snapshot.
+    reloaded = GraphEngine(_chain(23, "wf_delta"))
+    reloaded.state.checkpoints = [
+        WorkflowCheckpoint.model_validate(item) for item in WorkflowStorage(gics=delta_gics).list_checkpoints("wf_delta")
+    ]
+    persisted_full = WorkflowStorage(gics=full_gics).list_checkpoints("wf_full")
+    for i, expected in enumerate(persisted_full):
+        rebuilt = json.loads(json.dumps(reloaded.materialize_checkpoint(i)))
+        expected_state = dict(expected["state"])
+        for state in (rebuilt, expected_state):
+            state.pop("trace_id")
+            for log in state.get("step_logs", []):
+                log.pop("duration_ms")
+        assert rebuilt == expected_state, f"checkpoint {i}"
+    # Listing rebuilds every state in one pass, with the same result.
+    assert GraphEngine.materialize_checkpoints(reloaded.state.checkpoints) == [
+        reloaded.materialize_checkpoint(i) for i in range(len(reloaded.state.checkpoints))
+    ]
+    assert delta_gics.bytes_written < full_gics.bytes_written / 3
+
+
+@pytest.mark.asyncio
+async def test_resume_from_delta_checkpoint():
+    engine = _engine(_chain(12), checkpoint_full_every=5)
+    await engine.execute({"seed": 1})
+    assert engine.state.checkpoints[7].kind == "delta"
+
+    next_node = engine.resume_from_checkpoint(7)
+    assert next_node == "n8"
+    assert engine.state.data["last"] == "n7" and engine.state.data["seed"] == 1
+    assert len(engine.state.data["step_logs"]) == 7  # log of n7 is appended after its checkpoint
+
+    state = await engine.execute()
+    assert state.data["last"] == "n11"
+    assert state.checkpoints[12].kind == "full"  # state replaced on resume: fresh base
+
+
+def _fan_out_graph(width: int, *, writes: bool = True, fan_out: bool = True) -> WorkflowGraph:
+    nodes = [WorkflowNode(id="start", type="transform", config={"fan_out": fan_out})]
+    edges = []
+    for i in range(width):
+        config = {"delay": 0.02 * (width - i), "writes": [f"b{i}"]} if writes else {"delay": 0.02 * (width - i)}
+        nodes.append(WorkflowNode(id=f"b{i}", type="transform", config=config))
+        edges.append(WorkflowEdge(**{"from": "start", "to": f"b{i}"}))
+        edges.append(WorkflowEdge(**{"from": f"b{i}", "to": "join"}))
+    nodes.append(WorkflowNode(id="join", type="transform", config={}))
+    return WorkflowGraph(id=f"fan_{width}", nodes=nodes, edges=edges)
+
+
+def _branch_keys(state):
+    return sorted(k for k in state if k[0] == "b" and k[1:].isdigit())
+
+
+def _fan_out_engine(graph, executed, in_flight=None):
+    """*in_flight*, when given, tracks running branches under "now" and "peak"."""
+    engine = GraphEngine(graph)
+    in_flight = in_flight if in_flight is not None else {}
+
+    async def _execute(node, state):
+        executed.append(node.id)
+        if node.id == "join":
+            return {"joined": _branch_keys(state)}
+        if node.id == "start":
+            return {}
+        in_flight["now"] = in_flight.get("now", 0) + 1
+        in_flight["peak"] = max(in_flight.get("peak", 0), in_flight["now"])
+        try:
+            await asyncio.sleep(node.config["delay"])
+        finally:
+            in_flight["now"] -= 1
+        seen = _branch_keys(state)
+        return {node.id: {"saw": seen}}
+
+    engine._execute_node = _execute
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_disjoint_branches_concurrently_and_merges_in_edge_order():
+    executed: list = []
+    in_flight: dict = {}
+    engine = _fan_out_engine(_fan_out_graph(5), executed, in_flight)
+
+    state = await engine.execute()
+
+    assert in_flight == {"now": 0, "peak": 5}
+    assert executed[-1] == "join" and executed.count("join") == 1
+    assert executed[1:6] == ["b0", "b1", "b2", "b3", "b4"]
+    # Completion order was b4..b0; merge, checkpoints and logs follow edge order.
+    assert [cp.node_id for cp in state.checkpoints] == ["start", "b0", "b1", "b2", "b3", "b4", "join"]
+    assert [log["node_id"] for log in state.data["step_logs"]] == [cp.node_id for cp in state.checkpoints]
+    assert [log["step_id"] for log in state.data["step_logs"]][-1] == "step_7"
+    assert all(state.data[f"b{i}"]["saw"] == [] for i in range(5))  # isolated from siblings
+    assert state.data["joined"] == [f"b{i}" for i in range(5)]
+    assert state.data["budget_counters"]["steps"] == 7
+
+
+@pytest.mark.asyncio
+async def test_fan_out_without_disjoint_writes_runs_in_edge_order():
+    executed: list = []
+    in_flight: dict = {}
+    engine = _fan_out_engine(_fan_out_graph(3, writes=False), executed, in_flight)
+    state = await engine.execute()
+    assert [state.data[f"b{i}"]["saw"] for i in range(3)] == [[], ["b0"], ["b0", "b1"]]
+    assert in_flight["peak"] == 1
+    assert executed == ["start", "b0", "b1", "b2", "join"]
+
+
+@pytest.mark.asyncio
+async def test_without_fan_out_flag_only_first_edge_is_followed():
+    executed: list = []
+    engine = _fan_out_engine(_fan_out_graph(3, fan_out=False), executed)
+    await engine.execute()
+    assert executed == ["start", "b0", "join"]
+
+
+@pytest.mark.asyncio
+async def test_failed_branch_aborts_after_merging_earlier_branches():
+    executed: list = []
+    engine = _fan_out_engine(_fan_out_graph(3), executed)
+    inner = engine._execute_node
+
+    async def _execute(node, state):
+        if node.id == "b1":
+            raise RuntimeError("branch exploded")
+        return await inner(node, state)
+
+    engine._execute_node = _execute
+    state = await engine.execute()
+    assert state.data["aborted_reason"] == "node_failure"
+    assert [(cp.node_id, cp.status) for cp in state.checkpoints] == [
+        ("start", "completed"), ("b0", "completed"), ("b1", "failed"),
+    ]
+    assert "b0" in state.data and "b2" not in state.data and "join" not in executed
+
+
+@pytest.mark.asyncio
+async def test_paused_branch_pauses_the_run_and_resumes_there():
+    executed: list = []
+    engine = _fan_out_engine(_fan_out_graph(3, writes=False), executed)
+    inner = engine._execute_node
+    approved = {"b1": False}
+
+    async def _execute(node, state):
+        if node.id == "b1" and not approved["b1"]:
+            executed.append(node.id)
+            return {"pause_execution": True, "pause_reason": "human_review_pending"}
+        return await inner(node, state)
+
+    engine._execute_node = _execute
+    state = await engine.execute()
+    assert state.data["execution_paused"] and state.data["pause_reason"] == "human_review_pending"
+    assert executed == ["start", "b0", "b1"]
+    assert [cp.node_id for cp in state.checkpoints] == ["start", "b0"]
+    assert state.data["step_logs"][-1]["node_id"] == "b1" and state.data["step_logs"][-1]["status"] == "paused"
+
+    approved["b1"] = True
+    state = await engine.execute()
+    assert executed[3:] == ["b1", "join"]
+    assert not state.data["execution_paused"]
+
+
+@pytest.mark.asyncio
+async def test_budget_is_checked_after_each_branch():
+    executed: list = []
+    engine = _fan_out_engine(_fan_out_graph(4), executed)
+    inner = engine._execute_node
+
+    async def _execute(node, state):
+        out = await inner(node, state)
+        if node.id.startswith("b"):
+            out["tokens_used"] = 6
+        return out
+
+    engine._execute_node = _execute
+    state = await engine.execute({"budget": {"max_tokens": 10, "on_exceed": "pause"}})
+    assert state.data["execution_paused"] and state.data["pause_reason"] == "budget_max_tokens_exceeded"
+    assert [cp.node_id for cp in state.checkpoints] == ["start", "b0", "b1"]
+    assert "b2" not in state.data and "join" not in executed
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+@pytest.mark.asyncio
+async def test_checkpoint_bytes_and_fan_out_width_at_scale():
+    """1 MB state over 200 steps (full snapshots vs deltas) and a 40-wide fan-out."""
+    blob = {f"doc{i}": "y" * 1000 for i in range(1000)}  # ~1 MB over 1000 keys
+
+    async def _run(full_every):
+        gics = _FakeGics()
+        engine = _engine(_chain(200, f"bench_{full_every}"), storage=WorkflowStorage(gics=gics),
+                         persist_checkpoints=True, checkpoint_full_every=full_every)
+        await engine.execute(dict(blob))
+        return gics.bytes_written, engine
+
+    full_bytes, _ = await _run(1)
+    delta_bytes, engine = await _run(50)
+    kinds = [cp.kind for cp in engine.state.checkpoints]
+    assert [i for i, k in enumerate(kinds) if k == "full"] == [0, 50, 100, 150]
+    assert engine.materialize_checkpoint(199)["last"] == "n199"
+    assert delta_bytes < full_bytes / 40
+
+    async def _fan(width, writes):
+        executed: list = []
+        in_flight: dict = {}
+        graph = _fan_out_graph(width, writes=writes)
+        for node in graph.nodes:
+            node.config["delay"] = 0.02
+        await _fan_out_engine(graph, executed, in_flight).execute()
+        return in_flight["peak"]
+
+    assert await _fan(40, writes=False) == 1
+    assert await _fan(40, writes=True) == 40
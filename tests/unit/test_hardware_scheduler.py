@@ -0,0 +1,204 @@
+"""HardwareScheduler queueing: priority aging, same-model grouping within a
+fairness window, queue-wait histograms, plus a simulated mixed workload."""
+from __future__ import annotations
+
+import heapq
+import random
+
+import pytest
+
+from tools.gimo_server.inference.contracts import HardwareTarget, InferenceRequest, TaskSemantic
+from tools.gimo_server.inference.router.hardware_scheduler import (
+    DeviceQueue,
+    ExecutionTicket,
+    HardwareScheduler,
+    WaitHistogram,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ticket(model_id: str, priority: int = 5) -> ExecutionTicket:
+    return ExecutionTicket(request_id=f"{model_id}-p{priority}", model_id=model_id, priority=priority)
+
+
+def _queue(clock, **kwargs) -> DeviceQueue:
+    return DeviceQueue(HardwareTarget.CPU, 1, clock=clock, **kwargs)
+
+
+def test_aging_lets_old_low_priority_requests_overtake():
+    clock = _Clock()
+    q = _queue(clock, aging_s=1.0)
+    holder = _ticket("m")
+    q.submit(holder)
+
+    low = _ticket("m", priority=9)
+    q.submit(low)
+    clock.now += 5
+    fresh_high = _ticket("m", priority=1)
+    q.submit(fresh_high)
+    clock.now += 5
+    late_high = _ticket("m", priority=1)
+    q.submit(late_high)
+
+    order = []
+    for _ in range(3):
+        q.release(next(iter(q._active.values())))
+        order.append(next(iter(q._active.values())))
+    # low waited 10 s (aged to -1); the first high 5 s (-4); the second none (1).
+    assert order == [fresh_high, low, late_high]
+
+
+def test_resident_model_is_grouped_within_fairness_window():
+    clock = _Clock()
+    q = _queue(clock, aging_s=5.0, fairness_window_s=2.0)
+    running = _ticket("a")
+    q.submit(running)
+
+    other = _ticket("b")
+    q.submit(other)
+    clock.now += 1
+    same = _ticket("a")
+    q.submit(same)
+    clock.now += 2
+    too_late = _ticket("a")
+    q.submit(too_late)
+
+    q.release(running)
+    assert same._ready.is_set() and not other._ready.is_set()
+    q.release(same)
+    # too_late arrived 3 s after the head: beyond the 2 s window.
+    assert other._ready.is_set() and not too_late._ready.is_set()
+    q.release(other)
+    assert too_late._ready.is_set()
+    assert q.grouped_grants == 1 and q.model_swaps == 2
+
+
+def test_grouping_disabled_keeps_strict_order():
+    clock = _Clock()
+    q = _queue(clock, fairness_window_s=0)
+    running = _ticket("a")
+    q.submit(running)
+    other, same = _ticket("b"), _ticket("a")
+    q.submit(other)
+    q.submit(same)
+    q.release(running)
+    assert other._ready.is_set() and not same._ready.is_set()
+
+
+def test_wait_histogram_buckets_and_quantiles():
+    hist = WaitHistogram(bounds_ms=(10, 100))
+    for wait in [1, 2, 3, 50, 5000]:
+        hist.observe(wait)
+    data = hist.to_dict()
+    assert data["buckets"] == {"le_10": 3, "le_100": 1, "inf": 1}
+    assert data["p50_ms"] == 10 and data["p99_ms"] == 5000 and data["count"] == 5
+
+
+@pytest.mark.asyncio
+async def test_timed_out_ticket_leaves_the_queue():
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    req = lambda: InferenceRequest(request_id="r", model_id="m", task=TaskSemantic.GENERAL, inputs={})  # noqa: E731
+    holder = await scheduler.enqueue(req(), HardwareTarget.CPU)
+    waiting = await scheduler.enqueue(req(), HardwareTarget.CPU)
+    with pytest.raises(TimeoutError):
+        await waiting.wait(timeout=0.01)
+    assert scheduler.queue_depth(HardwareTarget.CPU) == 0
+
+    nxt = await scheduler.enqueue(req(), HardwareTarget.CPU)
+    scheduler.release(holder)
+    await nxt.wait(timeout=1.0)
+    status = scheduler.get_status()[0]
+    assert status["active"] == 1 and status["queue_wait"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_release_after_cpu_fallback_frees_the_slot():
+    scheduler = HardwareScheduler(concurrency_overrides={HardwareTarget.CPU: 1})
+    req = InferenceRequest(request_id="r", model_id="m", task=TaskSemantic.GENERAL, inputs={})
+    ticket = await scheduler.enqueue(req, HardwareTarget.GPU)
+    await ticket.wait(timeout=1.0)
+    scheduler.release(ticket)
+    assert scheduler.get_status()[0]["active"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Simulation benchmark
+# ---------------------------------------------------------------------------
+
+_SERVICE_S = 0.05
+_SWAP_S = 0.4
+
+
+def _simulate(aging_s: float, fairness_window_s: float, *, seed: int = 7, horizon_s: float = 120.0):
+    """One sequential device, virtual time.
+
+    High-priority requests (p1) for two models arrive at 6/s, more than the
+    device can serve if it swaps models often; low-priority (p9) requests
+    for a third model arrive every 2 s.  Arrivals stop at 60 s.
+    """
+    rng = random.Random(seed)
+    clock = _Clock()
+    start = clock.now
+    q = _queue(clock, aging_s=aging_s, fairness_window_s=fairness_window_s)
+    events = []
+    seq = 0
+
+    def _push(at, kind, ticket):
+        nonlocal seq
+        seq += 1
+        heapq.heappush(events, (at, seq, kind, ticket))
+
+    t = 0.0
+    while t < 60.0:
+        t += rng.expovariate(6.0)
+        _push(start + t, "arrive", _ticket(rng.choice("ab"), priority=1))
+    for i in range(30):
+        _push(start + i * 2.0, "arrive", _ticket("c", priority=9))
+
+    tickets, started = [], set()
+    device_model = None
+
+    while events and events[0][0] <= start + horizon_s:
+        clock.now, _, kind, ticket = heapq.heappop(events)
+        if kind == "arrive":
+            tickets.append(ticket)
+            q.submit(ticket)
+        else:
+            q.release(ticket)
+        for granted in list(q._active.values()):
+            if granted.ticket_id in started:
+                continue
+            started.add(granted.ticket_id)
+            cost = _SERVICE_S + (_SWAP_S if device_model not in (None, granted.model_id) else 0.0)
+            device_model = granted.model_id
+            _push(clock.now + cost, "done", granted)
+
+    waits = sorted(t.queue_wait_ms if t.grant_time else (clock.now - t.enqueue_time) * 1000 for t in tickets)
+    low = [t for t in tickets if t.priority == 9]
+    starved = sum(1 for t in low if not t.grant_time or t.queue_wait_ms > 30_000)
+    return {
+        "swaps": q.model_swaps,
+        "p99_ms": waits[int(0.99 * (len(waits) - 1))],
+        "low_max_ms": max((t.queue_wait_ms if t.grant_time else horizon_s * 1000) for t in low),
+        "starved": starved,
+        "served": sum(1 for t in tickets if t.grant_time),
+        "total": len(tickets),
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(120)
+def test_simulated_aging_and_grouping_cut_swaps_and_starvation():
+    legacy = _simulate(aging_s=0, fairness_window_s=0)
+    current = _simulate(aging_s=5.0, fairness_window_s=2.0)
+    assert legacy["starved"] > 0
+    assert current["starved"] == 0 and current["served"] == current["total"]
+    assert current["swaps"] < 0.75 * legacy["swaps"]
+    assert current["p99_ms"] * 2 < legacy["p99_ms"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import asyncio
 import sys
+import threading
 import time
 import types
 import uuid
@@ -338,3 +339,225 @@ class TestInferenceEngineServiceInfer:
             device_types = [d.device_type for d in engine._devices]
             assert HardwareTarget.NPU not in device_types
             await engine.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Plan cache (memoised budget + shard plan)
+# ---------------------------------------------------------------------------
+
+class _StubAdapter:
+    """Backend stub: instant load and forward pass."""
+
+    async def load_model(self, spec, device):
+        from tools.gimo_server.inference.runtime.base_adapter import SessionHandle
+        return SessionHandle(model_id=spec.model_id, hardware_target=device, memory_mb=10.0)
+
+    async def run(self, session, inputs):
+        return {"tokens_generated": 1, "tokens_per_second": 1.0}
+
+    async def unload(self, session):
+        return None
+
+
+def _model_file(tmp_path: Path, model_id: str = "test-model", size: int = 4096) -> ModelSpec:
+    path = tmp_path / f"{model_id}.onnx"
+    path.write_bytes(b"\0" * size)
+    return ModelSpec(model_id=model_id, path=path, format=ModelFormat.ONNX, size_bytes=size)
+
+
+async def _engine_with_stub(tmp_path: Path, devices=None) -> InferenceEngineService:
+    with patch(
+        "tools.gimo_server.inference.engine_service.get_devices",
+        return_value=devices or [_cpu_device()],
+    ):
+        engine = InferenceEngineService(model_cache_dir=tmp_path / "cache")
+        await engine.initialize()
+    engine._onnx = _StubAdapter()
+    return engine
+
+
+class TestPlanCache:
+    @pytest.mark.asyncio
+    async def test_repeat_requests_hit_plan_cache(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        engine.register_model(_model_file(tmp_path))
+        with patch.object(
+            engine._memory_manager, "calculate_budget",
+            wraps=engine._memory_manager.calculate_budget,
+        ) as budget_spy:
+            for _ in range(5):
+                result = await engine.infer(_request())
+                assert result.error is None
+        assert budget_spy.call_count == 1
+        plan = engine.get_metrics()["plan_cache"]
+        assert plan["misses"] == 1
+        assert plan["hits"] == 4
+        await engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_replaced_model_file_replans(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        spec = _model_file(tmp_path)
+        engine.register_model(spec)
+        await engine.infer(_request())
+        spec.path.write_bytes(b"\0" * 8192)  # new size → new fingerprint
+        await engine.infer(_request())
+        assert engine._plan_cache.misses == 2
+        await engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unload_invalidates_model_plans(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        spec = _model_file(tmp_path)
+        engine.register_model(spec)
+        await engine.infer(_request())
+        assert len(engine._plan_cache) == 1
+        await engine.unload_model(spec.model_id)
+        assert len(engine._plan_cache) == 0
+        assert engine._plan_cache.invalidations == 1
+        await engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_free_memory_bucket_change_replans(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        engine.register_model(_model_file(tmp_path))
+        await engine.infer(_request())
+        # Small drift inside the bucket: still a hit.
+        engine._devices[0].free_memory_gb = 20.2
+        await engine.infer(_request())
+        assert engine._plan_cache.hits == 1
+        # Out of the bucket: new plan.
+        engine._devices[0].free_memory_gb = 12.0
+        await engine.infer(_request())
+        assert engine._plan_cache.misses == 2
+        await engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_context_bucket_is_part_of_key(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        engine.register_model(_model_file(tmp_path))
+        short, long = _request(), _request()
+        short.max_tokens, long.max_tokens = 1000, 30_000
+        await engine.infer(short)
+        await engine.infer(long)
+        assert engine._plan_cache.misses == 2
+        await engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cached_plans_skip_budget_and_sharding(self, tmp_path):
+        """Per-request planning work: recomputed on every call vs served from cache."""
+        engine = await _engine_with_stub(tmp_path)
+        spec = _model_file(tmp_path)
+        engine.register_model(spec)
+        req = _request()
+        n = 300
+        manager = engine._memory_manager
+        with patch.object(manager, "calculate_budget", wraps=manager.calculate_budget) as budget_spy, \
+             patch.object(manager, "plan_sharding", wraps=manager.plan_sharding) as shard_spy:
+            for _ in range(n):
+                engine._plan_cache.clear()
+                engine._plan_for(spec, req)
+            assert budget_spy.call_count == shard_spy.call_count == n
+
+            for _ in range(n):
+                engine._plan_for(spec, req)
+            assert budget_spy.call_count == shard_spy.call_count == n
+        assert engine._plan_cache.hits == n
+        await engine.shutdown()
+
+
+    @pytest.mark.asyncio
+    async def test_hardware_refresh_runs_off_loop_and_reaches_routing(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        engine.register_model(_model_file(tmp_path))
+        await engine.infer(_request())
+        gpu = DeviceCapability(
+            device_type=HardwareTarget.GPU,
+            device_name="Test GPU",
+            total_memory_gb=24.0,
+            free_memory_gb=20.0,
+            execution_providers=[ExecutionProviderType.CUDA],
+        )
+        threads = []
+
+        def _detect(force_refresh=False):
+            threads.append(threading.get_ident())
+            return [_cpu_device(), gpu]
+
+        async def _refresh():
+            engine._devices_refreshed_at = float("-inf")
+            engine._hardware_snapshot()
+            await engine._hardware_refresh
+
+        with patch("tools.gimo_server.inference.engine_service.get_devices", side_effect=_detect):
+            await _refresh()
+            assert threads and threading.get_ident() not in threads
+            assert engine._task_router._devices is engine._devices
+            assert engine._load_balancer._devices is engine._devices
+            assert HardwareTarget.GPU in engine._scheduler._queues
+            await engine.infer(_request())
+            assert engine._plan_cache.misses == 2
+
+            # Same device set and buckets: nothing is pushed downstream.
+            pushed = engine._task_router._devices
+            await _refresh()
+            assert len(threads) == 2
+            assert engine._task_router._devices is pushed
+        await engine.shutdown()
+
+
+class _BatchingStubAdapter(_StubAdapter):
+    """Stub that also decodes several sequences per pass (two tokens each)."""
+
+    def __init__(self) -> None:
+        self.passes: List[int] = []
+
+    async def prefill_batch(self, session, seqs):
+        from tools.gimo_server.inference.runtime.batcher import DecodeStep
+        await asyncio.sleep(0.002)
+        self.passes.append(len(seqs))
+        return [DecodeStep(text="a") for _ in seqs]
+
+    async def decode_batch(self, session, seqs):
+        from tools.gimo_server.inference.runtime.batcher import DecodeStep
+        await asyncio.sleep(0.002)
+        self.passes.append(len(seqs))
+        return [DecodeStep(text="b", finished=True) for _ in seqs]
+
+    async def release_sequences(self, session, seqs):
+        return None
+
+
+class TestBatching:
+    @pytest.mark.asyncio
+    async def test_opted_in_model_shares_passes(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        engine._onnx = adapter = _BatchingStubAdapter()
+        engine.register_model(_model_file(tmp_path))
+        engine.enable_batching("test-model", window_ms=20, max_batch_size=8)
+
+        results = await asyncio.gather(*[engine.infer(_request()) for _ in range(6)])
+        assert all(r.error is None and r.outputs["text"] == "ab" for r in results)
+        assert all(r.tokens_generated == 2 for r in results)
+        assert adapter.passes == [6, 6]
+        assert engine._batchers == {}
+        assert engine.get_status()["batching"]["models"]["test-model"]["max_batch_size"] == 8
+
+        engine.disable_batching("test-model")
+        result = await engine.infer(_request())
+        assert result.tokens_generated == 1 and adapter.passes == [6, 6]
+        await engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_adapter_without_batching_keeps_per_request_path(self, tmp_path):
+        engine = await _engine_with_stub(tmp_path)
+        engine.register_model(_model_file(tmp_path))
+        engine.enable_batching("test-model")
+        results = await asyncio.gather(*[engine.infer(_request()) for _ in range(3)])
+        assert all(r.error is None and r.tokens_generated == 1 for r in results)
+        await engine.shutdown()
+
+    def test_invalid_batching_config_rejected(self):
+        engine = InferenceEngineService()
+        with pytest.raises(ValueError):
+            engine.enable_batching("m", max_batch_size=0)
@@ -19,6 +19,12 @@ from tools.gimo_server.services.workspace.repo_override_service import RepoOverr
 from tools.gimo_server.services.runtime_policy_service import RuntimePolicyService
 
 
+def _async_check(ok, output):
+    async def _fake(*_args, **_kwargs):
+        return ok, output
+    return _fake
+
+
 def _override_admin() -> AuthContext:
     return AuthContext(token="test-token", role="admin")
 
@@ -209,7 +215,7 @@ async def test_phase10_account_mode_token_expired_during_critical_execution(monk
 
 def test_phase10_merge_conflict_main_intact(tmp_path, monkeypatch):
     _, approved = _seed_draft_and_approved(tmp_path, draft_id="d10_merge", approved_id="a10_merge")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     from tools.gimo_server.services import merge_gate_service as mgs
 
     # Provide workspace/authoritative paths to satisfy resolve_* functions
@@ -218,9 +224,9 @@ def test_phase10_merge_conflict_main_intact(tmp_path, monkeypatch):
     monkeypatch.setattr(mgs, "resolve_workspace_path", lambda *a, **kw: workspace)
     monkeypatch.setattr(mgs, "resolve_authoritative_repo_path", lambda *a, **kw: workspace)
     monkeypatch.setattr(mgs.GitService, "is_worktree_clean", lambda _base: True)
-    monkeypatch.setattr(mgs.GitService, "run_tests", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "dry_run_merge", lambda _b, _s, _t: (False, "conflict"))
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _async_check(False, "conflict"))
 
     assert asyncio.run(MergeGateService.execute_run(run.id)) is True
     updated = OpsService.get_run(run.id)
@@ -284,13 +290,13 @@ def test_phase10_stuck_merge_lock_recovery_controlled(tmp_path):
 
 def test_phase10_worker_crash_during_merge_or_rollback_is_recoverable(tmp_path, monkeypatch):
     _, approved = _seed_draft_and_approved(tmp_path, draft_id="d10_crash", approved_id="a10_crash")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     from tools.gimo_server.services import merge_gate_service as mgs
 
     monkeypatch.setattr(mgs.GitService, "is_worktree_clean", lambda _base: True)
-    monkeypatch.setattr(mgs.GitService, "run_tests", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "dry_run_merge", lambda _b, _s, _t: (True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _async_check(True, "ok"))
     monkeypatch.setattr(mgs.GitService, "get_head_commit", lambda _base: "head_before")
 
     def _raise_runtime(*args, **kwargs):
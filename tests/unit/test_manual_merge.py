@@ -19,9 +19,9 @@ async def test_merge_gate_stops_at_awaiting_merge():
          patch("tools.gimo_server.services.ops.OpsService.append_log"), \
          patch("tools.gimo_server.services.ops.OpsService.set_run_stage"), \
          patch("tools.gimo_server.services.ops.OpsService.update_run_merge_metadata"), \
-         patch("tools.gimo_server.services.git_service.GitService.dry_run_merge") as mock_dry_run, \
-         patch("tools.gimo_server.services.git_service.GitService.run_tests") as mock_tests, \
-         patch("tools.gimo_server.services.git_service.GitService.run_lint_typecheck") as mock_lint, \
+         patch("tools.gimo_server.services.git_service.GitService.dry_run_merge_async") as mock_dry_run, \
+         patch("tools.gimo_server.services.git_service.GitService.run_tests_async") as mock_tests, \
+         patch("tools.gimo_server.services.git_service.GitService.run_lint_typecheck_async") as mock_lint, \
          patch("tools.gimo_server.services.git_service.GitService.get_head_commit") as mock_head, \
          patch("tools.gimo_server.services.merge_gate_service.resolve_authoritative_repo_path", return_value=Path("/repo")), \
          patch("tools.gimo_server.services.merge_gate_service.resolve_workspace_path", return_value=Path("/tmp/ws")), \
@@ -0,0 +1,235 @@
+"""Tests for MCP bridge start-up: cached schemas, lazy tools, pooled client."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, Header
+from mcp.server.fastmcp import FastMCP
+
+from tools.gimo_server.mcp_bridge import bridge, registrar, server, spec_cache
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "mcp_cache"
+    monkeypatch.setenv("ORCH_MCP_CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def asgi_backend(monkeypatch):
+    app = FastAPI()
+    hits: list[dict] = []
+
+    @app.get("/ops/items/{item_id}")
+    async def get_item(item_id: str, verbose: bool = False, authorization: str | None = Header(None)):
+        hits.append({"item_id": item_id, "verbose": verbose, "auth": authorization})
+        return {"id": item_id, "verbose": verbose}
+
+    @app.post("/ops/items")
+    async def create_item(payload: dict):
+        return payload
+
+    monkeypatch.setenv("ORCH_TOKEN", "tok-123")
+    bridge.use_asgi_app(app)
+    yield app, hits
+    bridge.use_asgi_app(None)
+
+
+def test_version_hash_tracks_source_changes(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    module = tmp_path / "pkg" / "routes.py"
+    module.write_text("x = 1\n")
+    (tmp_path / "pkg" / "__pycache__").mkdir()
+
+    first = spec_cache.app_version_hash(tmp_path)
+    assert spec_cache.app_version_hash(tmp_path) == first
+
+    (tmp_path / "pkg" / "__pycache__" / "routes.cpython-311.pyc").write_bytes(b"junk")
+    (tmp_path / "README.md").write_text("docs")
+    assert spec_cache.app_version_hash(tmp_path) == first
+
+    module.write_text("x = 22\n")
+    assert spec_cache.app_version_hash(tmp_path) != first
+
+    changed = spec_cache.app_version_hash(tmp_path)
+    (tmp_path / "pkg" / "extra.py").write_text("")
+    assert spec_cache.app_version_hash(tmp_path) != changed
+
+
+def test_load_or_build_persists_and_prunes(cache_dir):
+    builds = []
+
+    def _build():
+        builds.append(1)
+        return {"value": len(builds)}
+
+    assert spec_cache.load_or_build("art", "v1", _build) == {"value": 1}
+    assert spec_cache.load_or_build("art", "v1", _build) == {"value": 1}
+    assert len(builds) == 1
+
+    assert spec_cache.load_or_build("art", "v2", _build) == {"value": 2}
+    assert sorted(p.name for p in cache_dir.iterdir()) == ["art-v2.json"]
+
+    (cache_dir / "art-v2.json").write_text("{not json")
+    assert spec_cache.load_or_build("art", "v2", _build) == {"value": 3}
+    assert json.loads((cache_dir / "art-v2.json").read_text()) == {"value": 3}
+
+
+def _lazy_server(name: str) -> FastMCP:
+    mcp = FastMCP(name, tools=registrar.manifest_tools())
+    registrar.register_aliases(mcp)
+    return mcp
+
+
+def test_bridge_startup_registers_manifest_tools(cache_dir, monkeypatch):
+    monkeypatch.setattr(server, "mcp", server.mcp)
+    server._register_manifest()
+
+    tools = {t.name for t in asyncio.run(server.mcp.list_tools())}
+    assert "get_draft_ops_drafts__draft_id__get" in tools
+    assert {"plan_create", "plan_execute", "cost_estimate"} <= tools
+
+
+def test_lazy_registration_publishes_eager_schemas(cache_dir, monkeypatch):
+    eager = FastMCP("eager")
+    registrar.register_all(eager)
+
+    built = []
+    real_build = registrar._build_wrapper
+    monkeypatch.setattr(registrar, "_build_wrapper", lambda t_def: built.append(t_def["name"]) or real_build(t_def))
+
+    _lazy_server("lazy")  # cold: builds schemas once and persists them
+    built.clear()
+    warm = _lazy_server("warm")
+    assert built == []  # warm start generates no wrappers
+
+    listed = {t.name: t.model_dump() for t in asyncio.run(warm.list_tools())}
+    expected = {t.name: t.model_dump() for t in asyncio.run(eager.list_tools())}
+    assert listed == expected
+    assert {"plan_create", "plan_execute", "cost_estimate"} <= set(listed)
+
+
+def test_lazy_tool_generates_wrapper_on_first_call(cache_dir, monkeypatch):
+    tools = registrar.manifest_tools()
+    mcp = FastMCP("lazy", tools=tools)
+    calls = []
+
+    async def _fake_proxy(method, path, **kwargs):
+        calls.append((method, path, kwargs))
+        return "ok"
+
+    monkeypatch.setattr(registrar, "proxy_to_api", _fake_proxy)
+    tool = next(t for t in tools if t.name == "get_draft_ops_drafts__draft_id__get")
+    assert isinstance(tool, registrar.LazyManifestTool) and not tool.resolved
+
+    asyncio.run(mcp.call_tool(tool.name, {"draft_id": "d1"}))
+    assert tool.resolved
+    assert calls == [("GET", "/ops/drafts/{draft_id}", {
+        "__path_params": {"draft_id": "d1"}, "__query": {}, "__body": None,
+    })]
+    assert asyncio.run(tool.fn(draft_id="d2")) == "ok"
+
+    with pytest.raises(Exception, match="draft_id"):
+        asyncio.run(mcp.call_tool(tool.name, {}))
+
+
+def test_proxy_reuses_one_client_per_loop(asgi_backend):
+    _app, hits = asgi_backend
+
+    async def _calls():
+        results = [
+            await bridge.proxy_to_api("GET", "/ops/items/{item_id}", __path_params={"item_id": str(i)},
+                                      __query={"verbose": True})
+            for i in range(3)
+        ]
+        return results, bridge.get_client()
+
+    results, client = asyncio.run(_calls())
+    assert all(r.startswith("✅ Success (200)") for r in results)
+    assert [h["item_id"] for h in hits] == ["0", "1", "2"]
+    assert {h["auth"] for h in hits} == {"Bearer tok-123"}
+    assert hits[0]["verbose"] is True
+
+    async def _again():
+        await bridge.proxy_to_api("POST", "/ops/items", __body={"a": 1})
+        same = bridge.get_client()
+        await bridge.aclose_client()
+        return same
+
+    other = asyncio.run(_again())
+    assert other is not client  # new event loop, new client
+    assert other.is_closed
+
+
+def test_proxy_reports_backend_errors(asgi_backend):
+    result = asyncio.run(bridge.proxy_to_api("GET", "/ops/missing"))
+    assert result.startswith("❌ Error (404)")
+
+
+_STARTUP_SCRIPT = """
+import asyncio
+import sys
+from mcp.server.fastmcp import FastMCP
+from tools.gimo_server.mcp_bridge import registrar
+built = []
+real_build = registrar._build_wrapper
+registrar._build_wrapper = lambda t_def: built.append(t_def["name"]) or real_build(t_def)
+if sys.argv[1] == "lazy":
+    mcp = FastMCP("bench", tools=registrar.manifest_tools())
+    registrar.register_aliases(mcp)
+else:
+    mcp = FastMCP("bench")
+    registrar.register_all(mcp)
+print(len(built), len(asyncio.run(mcp.list_tools())), int("tools.gimo_server.main" in sys.modules))
+"""
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+def test_bridge_startup_builds_no_wrappers_from_a_warm_cache(tmp_path):
+    """Bridge process start-up: eager wrappers vs lazy tools from a cold and warm cache."""
+    env = {**os.environ, "ORCH_MCP_CACHE_DIR": str(tmp_path / "cache"), "PYTHONPATH": str(REPO_ROOT)}
+
+    def _start(mode: str):
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SCRIPT, mode],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        built, tools, app_imported = (int(v) for v in out[-3:])
+        return built, tools, bool(app_imported)
+
+    eager = _start("eager")
+    cold = _start("lazy")
+    warm = _start("lazy")
+
+    async def _proxy_burst(n: int) -> set:
+        app = FastAPI()
+
+        @app.get("/ops/ping")
+        async def ping():
+            return {"ok": True}
+
+        bridge.use_asgi_app(app)
+        try:
+            clients = set()
+            for _ in range(n):
+                await bridge.proxy_to_api("GET", "/ops/ping")
+                clients.add(id(bridge.get_client()))
+            return clients
+        finally:
+            await bridge.aclose_client()
+            bridge.use_asgi_app(None)
+
+    assert eager[1] == cold[1] == warm[1]
+    assert eager[0] > 0 and cold[0] > 0
+    assert warm[0] == 0 and not warm[2]  # no wrappers built, app never imported
+    assert len(asyncio.run(_proxy_burst(200))) == 1
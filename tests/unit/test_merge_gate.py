@@ -38,7 +38,7 @@ async def test_no_run_without_validated_task_spec_and_no_prompt(mock_ops_service
     appr = OpsApproved(id="appr_1", draft_id="d_1", content="test", prompt="")
     _persist_approved_stub(appr)
 
-    run = mock_ops_service.create_run(appr.id)
+    run = await mock_ops_service.create_run(appr.id)
     run_meta = mock_ops_service.get_run(run.id)
     run_meta.validated_task_spec = None
     mock_ops_service._persist_run(run_meta)
@@ -61,7 +61,7 @@ async def test_worker_context_is_scoped_by_task_spec(mock_ops_service, tmp_path)
     appr = OpsApproved(id="appr_2", draft_id="d_2", content="test", prompt="test")
     _persist_approved_stub(appr)
 
-    run = mock_ops_service.create_run(appr.id)
+    run = await mock_ops_service.create_run(appr.id)
     run.validated_task_spec = {
         "base_commit": "HEAD",
         "repo_handle": "h_repo",
@@ -226,7 +226,7 @@ async def test_run_worker_rejects_malformed_validated_task_spec(mock_ops_service
     # Missing required fields
     appr = OpsApproved(id="appr_3", draft_id="d_3", content="test", prompt="test")
     _persist_approved_stub(appr)
-    run = mock_ops_service.create_run(appr.id)
+    run = await mock_ops_service.create_run(appr.id)
     run.validated_task_spec = {
         "base_commit": "HEAD",
         # Missing repo_handle and others
@@ -270,7 +270,7 @@ async def test_allowed_paths_survives_engine_context_merge(mock_ops_service, tmp
     appr = OpsApproved(id="appr_4", draft_id="d_4", content="test", prompt="test")
     _persist_approved_stub(appr)
 
-    run = mock_ops_service.create_run(appr.id)
+    run = await mock_ops_service.create_run(appr.id)
     run.validated_task_spec = {
         "base_commit": "HEAD",
         "repo_handle": "h1",
@@ -328,7 +328,7 @@ async def test_prompt_based_run_routes_to_engine_without_task_spec(mock_ops_serv
     # Runs with a prompt but no ValidatedTaskSpec should route to EngineService (not be rejected).
     appr = OpsApproved(id="appr_5", draft_id="d_5", content="test", prompt="test")
     _persist_approved_stub(appr)
-    run = mock_ops_service.create_run(appr.id)
+    run = await mock_ops_service.create_run(appr.id)
     # No validated_task_spec
 
     worker = RunWorker()
@@ -347,7 +347,7 @@ async def test_execution_without_repo_context_pack_is_rejected_or_blocked(mock_o
     appr = OpsApproved(id="appr_6", draft_id="d_6", content="test", prompt="test")
     _persist_approved_stub(appr)
     
-    run = mock_ops_service.create_run(appr.id)
+    run = await mock_ops_service.create_run(appr.id)
     run.validated_task_spec = {
         "base_commit": "HEAD",
         "repo_handle": "INVALID_HANDLE",
@@ -0,0 +1,305 @@
+"""Tests for the concurrent merge gate checks, check cache and affected-test selection."""
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from tools.gimo_server.services import gate_checks
+from tools.gimo_server.services import merge_gate_service as mgs
+from tools.gimo_server.services.gate_checks import CHECK_CACHE, CheckResultCache, select_affected_tests
+from tools.gimo_server.services.git_service import GitService
+from tools.gimo_server.services.merge_gate_service import MergeGateService
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch):
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "commit.gpgSign")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "false")
+    monkeypatch.delenv("ORCH_MERGE_GATE_TEST_SELECTION", raising=False)
+    CHECK_CACHE.clear()
+    yield
+    CHECK_CACHE.clear()
+
+
+@pytest.fixture
+def gate_log(monkeypatch):
+    log = {"stages": [], "statuses": [], "logs": []}
+    monkeypatch.setattr(mgs.OpsService, "set_run_stage", lambda run_id, stage, msg=None: log["stages"].append(stage))
+    monkeypatch.setattr(mgs.OpsService, "append_log", lambda run_id, level, msg: log["logs"].append(msg))
+    monkeypatch.setattr(mgs.OpsService, "update_run_status", lambda run_id, status, msg=None: log["statuses"].append(status))
+    monkeypatch.setattr(mgs.OpsService, "update_run_merge_metadata", lambda run_id, **kw: None)
+    return log
+
+
+def _write(root: Path, rel: str, text: str) -> None:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _make_fixture_repo(root: Path, *, test_sleep: float = 0.0, lint_modules: int = 5) -> Path:
+    """Repo with ``main`` and a ``feature`` branch that changes ``pkg/alpha.py``."""
+    root.mkdir(parents=True)
+    GitService._run_git(root, ["init", "-q"])
+    GitService._run_git(root, ["checkout", "-q", "-B", "main"])
+    _write(root, ".gitignore", "__pycache__/\n.pytest_cache/\n")
+    _write(root, "pkg/__init__.py", "")
+    _write(root, "pkg/alpha.py", "def alpha():\n    return 1\n")
+    _write(root, "pkg/beta.py", "def beta():\n    return 2\n")
+    _write(root, "tests/test_alpha.py", (
+        "import time\nfrom pkg.alpha import alpha\n\n"
+        f"def test_alpha():\n    time.sleep({test_sleep})\n    assert alpha() >= 1\n"
+    ))
+    _write(root, "tests/test_beta.py", (
+        "import time\nfrom pkg import beta\n\n"
+        f"def test_beta():\n    time.sleep({test_sleep})\n    assert beta.beta() == 2\n"
+    ))
+    _write(root, "tools/gimo_server/__init__.py", "")
+    for i in range(lint_modules):
+        _write(root, f"tools/gimo_server/m{i:04d}.py", f"VALUE_{i} = {i}\n" * 20)
+    GitService.commit_all(root, "base")
+    GitService._run_git(root, ["checkout", "-q", "-b", "feature"])
+    _write(root, "pkg/alpha.py", "def alpha():\n    return 3\n")
+    GitService.commit_all(root, "feature")
+    return root
+
+
+async def _run_pipeline(repo: Path) -> None:
+    await MergeGateService._pipeline(
+        "run-1",
+        repo_id="default",
+        source_ref="feature",
+        target_ref="main",
+        provided_workspace=str(repo),
+        authoritative_repo=str(repo),
+    )
+
+
+# ----------------------------------------------------------------------
+# Affected-test selection
+# ----------------------------------------------------------------------
+
+
+def test_select_affected_tests_maps_modules_to_importing_tests(tmp_path):
+    _write(tmp_path, "pkg/alpha.py", "")
+    _write(tmp_path, "pkg/beta.py", "")
+    _write(tmp_path, "tests/test_alpha.py", "from pkg.alpha import alpha\n")
+    _write(tmp_path, "tests/test_beta.py", "from pkg import (\n    gamma,\n    beta,\n)\n")
+    _write(tmp_path, "tests/test_other.py", "import json\n")
+
+    assert select_affected_tests(tmp_path, ["pkg/alpha.py"]) == ["tests/test_alpha.py"]
+    assert select_affected_tests(tmp_path, ["pkg/beta.py"]) == ["tests/test_beta.py"]
+    assert select_affected_tests(tmp_path, ["tests/test_other.py", "README.md"]) == ["tests/test_other.py"]
+
+
+def test_select_affected_tests_falls_back_to_full_suite(tmp_path):
+    _write(tmp_path, "pkg/alpha.py", "")
+    _write(tmp_path, "pkg/orphan.py", "")
+    _write(tmp_path, "tests/test_alpha.py", "from pkg.alpha import alpha\n")
+
+    assert select_affected_tests(tmp_path, []) is None
+    assert select_affected_tests(tmp_path, ["pkg/alpha.py", "pyproject.toml"]) is None
+    assert select_affected_tests(tmp_path, ["tests/conftest.py"]) is None
+    assert select_affected_tests(tmp_path, ["pkg/alpha.py", "pkg/data.json"]) is None
+    assert select_affected_tests(tmp_path, ["pkg/orphan.py"]) is None
+    assert select_affected_tests(tmp_path, ["docs/guide.md"]) is None
+
+
+def test_check_result_cache_is_bounded_lru():
+    cache = CheckResultCache(max_entries=2)
+    k1, k2, k3 = (("t1", ("a",), "tc"), ("t2", ("a",), "tc"), ("t3", ("a",), "tc"))
+    cache.put(k1, "one")
+    cache.put(k2, "two")
+    assert cache.get(k1) == "one"
+    cache.put(k3, "three")
+    assert cache.get(k2) is None
+    assert len(cache) == 2
+    assert cache.to_dict()["hits"] == 1
+
+
+# ----------------------------------------------------------------------
+# GitService async primitives
+# ----------------------------------------------------------------------
+
+
+def test_worktree_tree_hash_tracks_content_without_touching_index(tmp_path):
+    repo = _make_fixture_repo(tmp_path / "repo")
+    index_before = (repo / ".git" / "index").read_bytes()
+
+    clean = asyncio.run(GitService.worktree_tree_hash_async(repo))
+    assert clean == GitService._run_git(repo, ["rev-parse", "HEAD^{tree}"])[1]
+
+    _write(repo, "pkg/new_module.py", "X = 1\n")
+    dirty = asyncio.run(GitService.worktree_tree_hash_async(repo))
+    assert dirty and dirty != clean
+    assert (repo / ".git" / "index").read_bytes() == index_before
+    assert GitService.get_changed_files(repo) == ["pkg/new_module.py"]
+
+    (repo / "pkg" / "new_module.py").unlink()
+    assert asyncio.run(GitService.worktree_tree_hash_async(repo)) == clean
+    assert asyncio.run(GitService.worktree_tree_hash_async(tmp_path)) is None
+
+
+def test_changed_paths_against_target_branch(tmp_path):
+    repo = _make_fixture_repo(tmp_path / "repo")
+    _write(repo, "notes.md", "untracked")
+
+    changed = asyncio.run(GitService.changed_paths_async(repo, "main"))
+    assert changed == ["notes.md", "pkg/alpha.py"]
+    assert asyncio.run(GitService.changed_paths_async(repo, "origin/main")) is None
+
+
+def test_run_tests_async_timeout_kills_and_fails(tmp_path):
+    _write(tmp_path, "test_slow.py", "import time\n\ndef test_slow():\n    time.sleep(30)\n")
+
+    started = time.perf_counter()
+    ok, out = asyncio.run(GitService.run_tests_async(tmp_path, timeout=2))
+    assert not ok
+    assert "timed out" in out
+    assert time.perf_counter() - started < 10
+
+
+def test_passing_checks_are_cached_by_tree_hash(tmp_path):
+    repo = _make_fixture_repo(tmp_path / "repo")
+    tree = asyncio.run(GitService.worktree_tree_hash_async(repo))
+
+    ok, _ = asyncio.run(GitService.run_tests_async(repo, tree_hash=tree))
+    assert ok and len(CHECK_CACHE) == 1
+    ok, _ = asyncio.run(GitService.run_tests_async(repo, tree_hash=tree))
+    assert ok and CHECK_CACHE.hits == 1
+
+    # Different command line or toolchain: separate entries.
+    ok, _ = asyncio.run(GitService.run_tests_async(repo, test_paths=["tests/test_alpha.py"], tree_hash=tree))
+    assert ok and len(CHECK_CACHE) == 2
+    gate_checks._toolchain_memo = (time.monotonic(), "other-toolchain")
+    try:
+        asyncio.run(GitService.run_tests_async(repo, tree_hash=tree))
+    finally:
+        gate_checks._toolchain_memo = (0.0, "")
+    assert len(CHECK_CACHE) == 3
+
+    # Failures are never cached.
+    _write(repo, "tests/test_fail.py", "def test_fail():\n    assert False\n")
+    dirty = asyncio.run(GitService.worktree_tree_hash_async(repo))
+    ok, _ = asyncio.run(GitService.run_tests_async(repo, tree_hash=dirty))
+    assert not ok and len(CHECK_CACHE) == 3
+
+
+# ----------------------------------------------------------------------
+# Pipeline
+# ----------------------------------------------------------------------
+
+
+def _fake_check(ok: bool, delay: float, started: list, name: str):
+    async def _check(*_args, **_kwargs):
+        started.append(name)
+        await asyncio.sleep(delay)
+        return ok, name
+    return _check
+
+
+@pytest.mark.parametrize(
+    "tests_ok, lint_ok, dry_ok, expected, stages",
+    [
+        (False, False, True, "VALIDATION_FAILED_TESTS", ["gate_tests"]),
+        (True, False, False, "VALIDATION_FAILED_LINT", ["gate_tests", "gate_lint"]),
+        (True, True, False, "MERGE_CONFLICT", ["gate_tests", "gate_lint", "dry_run_merge"]),
+        (True, True, True, "AWAITING_MERGE", ["gate_tests", "gate_lint", "dry_run_merge"]),
+    ],
+)
+def test_pipeline_verdict_follows_check_priority(
+    monkeypatch, tmp_path, gate_log, tests_ok, lint_ok, dry_ok, expected, stages,
+):
+    started: list = []
+    # Lower-priority checks finish first: the verdict must still follow priority.
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _fake_check(tests_ok, 0.2, started, "tests"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _fake_check(lint_ok, 0.1, started, "lint"))
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _fake_check(dry_ok, 0.0, started, "dry"))
+    monkeypatch.setattr(mgs.GitService, "get_head_commit", lambda _base: "c1")
+
+    asyncio.run(_run_pipeline(tmp_path))
+
+    assert gate_log["statuses"] == [expected]
+    assert sorted(started) == ["dry", "lint", "tests"]
+    # A stage is entered once every higher-priority check has passed.
+    assert gate_log["stages"] == stages
+
+
+def test_pipeline_cancels_remaining_checks_once_verdict_is_known(monkeypatch, tmp_path, gate_log):
+    cancelled = []
+
+    async def _slow_lint(*_args, **_kwargs):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append("lint")
+            raise
+        return True, "ok"
+
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _fake_check(False, 0.05, [], "tests"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _slow_lint)
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _fake_check(True, 0.0, [], "dry"))
+
+    asyncio.run(_run_pipeline(tmp_path))
+    assert gate_log["statuses"] == ["VALIDATION_FAILED_TESTS"]
+    assert cancelled == ["lint"]
+
+
+def test_pipeline_affected_mode_passes_selected_tests(monkeypatch, tmp_path, gate_log):
+    repo = _make_fixture_repo(tmp_path / "repo")
+    seen = {}
+
+    async def _tests(base_dir, *, test_paths=None, tree_hash=None, timeout=None):
+        seen["test_paths"] = test_paths
+        seen["tree_hash"] = tree_hash
+        return True, "ok"
+
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _tests)
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _fake_check(True, 0.0, [], "lint"))
+
+    asyncio.run(_run_pipeline(repo))
+    assert seen["test_paths"] is None
+    assert seen["tree_hash"] == GitService._run_git(repo, ["rev-parse", "HEAD^{tree}"])[1]
+
+    monkeypatch.setenv("ORCH_MERGE_GATE_TEST_SELECTION", "affected")
+    asyncio.run(_run_pipeline(repo))
+    assert seen["test_paths"] == ["tests/test_alpha.py"]
+    assert gate_log["statuses"] == ["AWAITING_MERGE", "AWAITING_MERGE"]
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(180)
+def test_gate_check_commands_cold_cached_and_affected(monkeypatch, tmp_path, gate_log):
+    """Check subprocesses launched by a cold gate, a cached rerun and an affected-only run."""
+    repo = _make_fixture_repo(tmp_path / "repo")
+    launched: list = []
+    run_command = GitService._run_command_async
+
+    async def _recording(base_dir, argv, **kwargs):
+        launched.append(argv)
+        return await run_command(base_dir, argv, **kwargs)
+
+    monkeypatch.setattr(GitService, "_run_command_async", staticmethod(_recording))
+
+    def _gate() -> list:
+        launched.clear()
+        asyncio.run(_run_pipeline(repo))
+        return [argv for argv in launched if argv[0] != "git"]
+
+    CHECK_CACHE.clear()
+    cold = _gate()
+    cached = _gate()
+    CHECK_CACHE.clear()
+    monkeypatch.setenv("ORCH_MERGE_GATE_TEST_SELECTION", "affected")
+    affected = _gate()
+
+    assert gate_log["statuses"] == ["AWAITING_MERGE"] * 3
+    assert ["python", "-m", "pytest", "-q"] in cold and len(cold) >= 2  # tests + lint/typecheck
+    assert cached == []
+    assert CHECK_CACHE.to_dict()["misses"] == len(cold)
+    assert ["python", "-m", "pytest", "-q", "tests/test_alpha.py"] in affected
+    assert len(affected) == len(cold)
@@ -54,17 +54,26 @@ async def test_pipeline_pauses_at_awaiting_merge(monkeypatch, tmp_path):
         lambda run_id, status, msg=None: statuses.append(status),
     )
 
+    async def _tests(base_dir, **_kwargs):
+        calls["tests"].append(base_dir)
+        return True, "ok"
+
+    async def _lint(base_dir, **_kwargs):
+        calls["lint"].append(base_dir)
+        return True, "ok"
+
+    async def _dry(base_dir, src, tgt, **_kwargs):
+        calls["dry"].append(base_dir)
+        return True, "ok"
+
     monkeypatch.setattr(
-        "tools.gimo_server.services.merge_gate_service.GitService.run_tests",
-        lambda base_dir: (calls["tests"].append(base_dir) or True, "ok"),
+        "tools.gimo_server.services.merge_gate_service.GitService.run_tests_async", _tests
     )
     monkeypatch.setattr(
-        "tools.gimo_server.services.merge_gate_service.GitService.run_lint_typecheck",
-        lambda base_dir: (calls["lint"].append(base_dir) or True, "ok"),
+        "tools.gimo_server.services.merge_gate_service.GitService.run_lint_typecheck_async", _lint
     )
     monkeypatch.setattr(
-        "tools.gimo_server.services.merge_gate_service.GitService.dry_run_merge",
-        lambda base_dir, src, tgt: (calls["dry"].append(base_dir) or True, "ok"),
+        "tools.gimo_server.services.merge_gate_service.GitService.dry_run_merge_async", _dry
     )
     monkeypatch.setattr(
         "tools.gimo_server.services.merge_gate_service.GitService.get_head_commit",
@@ -0,0 +1,282 @@
+"""Batch task assignment (min-cost matching) + cached telemetry profiles.
+
+Includes a poll-round simulator that compares the greedy first-fit path
+with the optimal matching on makespan and decision latency.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Generator, List, Tuple
+
+import pytest
+
+from tools.gimo_server.models.mesh import (
+    ConnectionState,
+    DeviceCapabilities,
+    DeviceMode,
+    MeshDeviceInfo,
+    MeshTask,
+    OperationalState,
+    ThermalEvent,
+    UtilityTaskType,
+)
+from tools.gimo_server.services.mesh import telemetry as telemetry_mod
+from tools.gimo_server.services.mesh.assignment import (
+    INFEASIBLE,
+    build_cost_matrix,
+    solve_min_cost_assignment,
+)
+from tools.gimo_server.services.mesh.telemetry import TelemetryService
+
+
+@pytest.fixture()
+def mesh_tmpdir() -> Generator[Path, None, None]:
+    d = Path(tempfile.mkdtemp(prefix="mesh_assign_"))
+    yield d
+    shutil.rmtree(d, ignore_errors=True)
+
+
+@pytest.fixture()
+def telemetry(mesh_tmpdir: Path, monkeypatch: pytest.MonkeyPatch) -> TelemetryService:
+    monkeypatch.setattr(telemetry_mod, "_MESH_DIR", mesh_tmpdir / "mesh")
+    monkeypatch.setattr(telemetry_mod, "_PROFILES_DIR", mesh_tmpdir / "mesh" / "thermal_profiles")
+    monkeypatch.setattr(telemetry_mod, "_LOCK_FILE", mesh_tmpdir / "mesh" / ".telemetry.lock")
+    monkeypatch.setattr(telemetry_mod, "_singleton_instance", None)
+    return TelemetryService()
+
+
+def _brute_force(cost: List[List[float]]) -> float:
+    rows, cols = len(cost), len(cost[0])
+    best = float("inf")
+    if rows <= cols:
+        for perm in itertools.permutations(range(cols), rows):
+            best = min(best, sum(cost[r][c] for r, c in enumerate(perm)))
+    else:
+        for perm in itertools.permutations(range(rows), cols):
+            best = min(best, sum(cost[r][c] for c, r in enumerate(perm)))
+    return best
+
+
+def _device(device_id: str, cores: int = 4, cpu: float = 10.0, **kwargs) -> MeshDeviceInfo:
+    return MeshDeviceInfo(
+        device_id=device_id,
+        device_mode=DeviceMode.utility,
+        connection_state=ConnectionState.connected,
+        operational_state=OperationalState.idle,
+        cpu_percent=cpu,
+        capabilities=DeviceCapabilities(cpu_cores=cores, ram_total_mb=4096),
+        **kwargs,
+    )
+
+
+def _task(task_id: str, task_type: UtilityTaskType) -> MeshTask:
+    return MeshTask(task_id=task_id, task_type=task_type)
+
+
+# ── Solver ──────────────────────────────────────────────────
+
+
+class TestSolver:
+    @pytest.mark.parametrize("shape", [(3, 3), (2, 5), (5, 2), (4, 6)])
+    def test_matches_brute_force(self, shape):
+        rng = random.Random(sum(shape))
+        rows, cols = shape
+        for _ in range(20):
+            cost = [[rng.uniform(0, 10) for _ in range(cols)] for _ in range(rows)]
+            pairs = solve_min_cost_assignment(cost)
+            assert len(pairs) == min(rows, cols)
+            assert len({r for r, _ in pairs}) == len(pairs)
+            assert len({c for _, c in pairs}) == len(pairs)
+            total = sum(cost[r][c] for r, c in pairs)
+            assert total == pytest.approx(_brute_force(cost))
+
+    def test_infeasible_pairs_are_dropped(self):
+        cost = [
+            [INFEASIBLE, 1.0],
+            [INFEASIBLE, 2.0],
+        ]
+        pairs = solve_min_cost_assignment(cost)
+        assert pairs == [(0, 1)]
+
+    def test_infeasible_does_not_steal_feasible_column(self):
+        # Row 0 can only use col 0; row 1 could use either. Max feasible = 2.
+        cost = [
+            [5.0, INFEASIBLE],
+            [1.0, 3.0],
+        ]
+        assert solve_min_cost_assignment(cost) == [(0, 0), (1, 1)]
+
+    def test_empty(self):
+        assert solve_min_cost_assignment([]) == []
+        assert solve_min_cost_assignment([[]]) == []
+
+    def test_heavy_task_goes_to_strong_device(self):
+        tasks = [_task("t-light", UtilityTaskType.ping), _task("t-heavy", UtilityTaskType.shell_exec)]
+        devices = [_device("weak", cores=2, cpu=80.0), _device("strong", cores=8)]
+        cost = build_cost_matrix(tasks, devices, lambda d, t: True)
+        pairs = solve_min_cost_assignment(cost)
+        mapping = {tasks[t].task_id: devices[d].device_id for t, d in pairs}
+        assert mapping == {"t-light": "weak", "t-heavy": "strong"}
+
+    def test_thermal_health_lowers_device_preference(self):
+        tasks = [_task("t-heavy", UtilityTaskType.file_hash)]
+        devices = [_device("hot", cores=8), _device("cool", cores=6)]
+        cost = build_cost_matrix(tasks, devices, lambda d, t: True, {"hot": 20.0, "cool": 100.0})
+        assert solve_min_cost_assignment(cost) == [(0, 1)]
+
+
+# ── TaskQueue integration ───────────────────────────────────
+
+
+class TestTaskQueueOptimal:
+    @pytest.fixture()
+    def registry(self, mesh_tmpdir: Path, monkeypatch: pytest.MonkeyPatch):
+        from tools.gimo_server.services.mesh import registry as registry_mod
+        from tools.gimo_server.services.mesh.registry import MeshRegistry
+
+        monkeypatch.setattr(registry_mod, "OPS_DATA_DIR", mesh_tmpdir)
+        monkeypatch.setattr(MeshRegistry, "MESH_DIR", mesh_tmpdir / "mesh")
+        monkeypatch.setattr(MeshRegistry, "DEVICES_DIR", mesh_tmpdir / "mesh" / "devices")
+        monkeypatch.setattr(MeshRegistry, "TOKENS_DIR", mesh_tmpdir / "mesh" / "tokens")
+        monkeypatch.setattr(MeshRegistry, "THERMAL_LOG", mesh_tmpdir / "mesh" / "thermal_events.jsonl")
+        monkeypatch.setattr(MeshRegistry, "LOCK_FILE", mesh_tmpdir / "mesh" / ".mesh.lock")
+        return MeshRegistry()
+
+    @pytest.fixture()
+    def task_queue(self, registry, mesh_tmpdir: Path, monkeypatch: pytest.MonkeyPatch, telemetry):
+        from tools.gimo_server.services.mesh import workspace_service as ws_mod
+        from tools.gimo_server.services.mesh.task_queue import TaskQueue
+
+        monkeypatch.setattr(ws_mod, "_BASE", mesh_tmpdir / "mesh" / "workspaces")
+        monkeypatch.setattr(ws_mod, "_LOCK", mesh_tmpdir / "mesh" / ".workspaces.lock")
+        monkeypatch.setattr(TaskQueue, "TASKS_DIR", mesh_tmpdir / "mesh" / "tasks")
+        monkeypatch.setattr(TaskQueue, "LOCK_FILE", mesh_tmpdir / "mesh" / ".tasks.lock")
+        return TaskQueue(registry)
+
+    def _add_device(self, registry, device_id: str, mode: DeviceMode, cores: int, cpu: float):
+        registry.enroll_device(device_id, name=device_id, device_mode=mode)
+        registry.approve_device(device_id)
+        dev = registry.get_device(device_id)
+        dev.connection_state = ConnectionState.connected
+        dev.operational_state = OperationalState.idle
+        dev.cpu_percent = cpu
+        dev.capabilities = DeviceCapabilities(cpu_cores=cores, ram_total_mb=8192)
+        registry.save_device(dev)
+
+    def test_optimal_places_heavy_task_on_strong_device(self, registry, task_queue):
+        self._add_device(registry, "core", DeviceMode.server, cores=8, cpu=10.0)
+        # Greedy would hand the first (heavy) task to "weak" — it comes first.
+        self._add_device(registry, "a-weak", DeviceMode.utility, cores=2, cpu=70.0)
+        self._add_device(registry, "b-strong", DeviceMode.utility, cores=8, cpu=5.0)
+
+        heavy = task_queue.create_task(UtilityTaskType.file_hash, {})
+        light = task_queue.create_task(UtilityTaskType.ping, {})
+
+        assigned = task_queue.auto_assign_pending(mesh_enabled=True, optimal=True)
+        assert assigned == 2
+        assert task_queue.get_task(heavy.task_id).assigned_device_id == "b-strong"
+        assert task_queue.get_task(light.task_id).assigned_device_id == "a-weak"
+
+    def test_optimal_respects_capability_gate(self, registry, task_queue):
+        self._add_device(registry, "core", DeviceMode.server, cores=8, cpu=10.0)
+        self._add_device(registry, "busy", DeviceMode.utility, cores=16, cpu=95.0)
+        task = task_queue.create_task(UtilityTaskType.shell_exec, {})
+
+        assert task_queue.auto_assign_pending(mesh_enabled=True, optimal=True) == 0
+        assert task_queue.get_task(task.task_id).status.value == "pending"
+
+    def test_env_switch_enables_optimal(self, registry, task_queue, monkeypatch):
+        self._add_device(registry, "core", DeviceMode.server, cores=8, cpu=10.0)
+        self._add_device(registry, "a-weak", DeviceMode.utility, cores=2, cpu=70.0)
+        self._add_device(registry, "b-strong", DeviceMode.utility, cores=8, cpu=5.0)
+        heavy = task_queue.create_task(UtilityTaskType.file_hash, {})
+        task_queue.create_task(UtilityTaskType.ping, {})
+
+        monkeypatch.setenv("ORCH_MESH_OPTIMAL_ASSIGN", "true")
+        task_queue.auto_assign_pending(mesh_enabled=True)
+        assert task_queue.get_task(heavy.task_id).assigned_device_id == "b-strong"
+
+
+# ── Telemetry cache ─────────────────────────────────────────
+
+
+class TestTelemetryProfileCache:
+    def test_get_profile_does_not_reread_disk(self, telemetry: TelemetryService, monkeypatch):
+        telemetry.ingest_thermal_event(ThermalEvent(
+            device_id="phone-01", event_type="warning", trigger_sensor="cpu",
+            trigger_value=76.0, trigger_threshold=75.0,
+        ))
+        monkeypatch.setattr(
+            telemetry_mod.json, "loads",
+            lambda *_a, **_k: pytest.fail("profile re-read from disk"),
+        )
+        for _ in range(10):
+            assert telemetry.get_profile("phone-01").warnings == 1
+
+    def test_refresh_picks_up_external_write(self, telemetry: TelemetryService):
+        assert telemetry.get_profile("phone-02").throttles == 0
+        path = telemetry_mod._PROFILES_DIR / "phone-02.json"
+        path.write_text('{"throttles": 3, "health_score": 94.0}', encoding="utf-8")
+
+        # Cached value still served until the heartbeat refresh runs.
+        assert telemetry.get_profile("phone-02").throttles == 0
+        assert telemetry.refresh_profile("phone-02").throttles == 3
+        assert telemetry.get_profile("phone-02").health_score == 94.0
+
+    def test_ingest_merges_with_a_concurrent_write(self, telemetry: TelemetryService):
+        warning = ThermalEvent(
+            device_id="phone-03", event_type="warning", trigger_sensor="cpu",
+            trigger_value=76.0, trigger_threshold=75.0,
+        )
+        telemetry.ingest_thermal_event(warning)
+        # Another process ingested two throttles after this one cached the profile.
+        path = telemetry_mod._PROFILES_DIR / "phone-03.json"
+        path.write_text('{"total_events": 3, "warnings": 1, "throttles": 2}', encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        profile = telemetry.ingest_thermal_event(warning)
+        assert (profile.total_events, profile.warnings, profile.throttles) == (4, 2, 2)
+        assert telemetry.get_profile("phone-03").throttles == 2
+
+
+# ── Simulator ───────────────────────────────────────────
+
+
+def _simulate(
+    speeds: List[float], waves: List[List[float]], optimal: bool
+) -> Tuple[float, int]:
+    """Poll-round simulation: each wave of tasks is assigned to the idle fleet
+    and the next wave waits for the slowest device (the round's makespan).
+
+    Returns (total makespan, tasks assigned).
+    """
+    makespan = 0.0
+    assigned = 0
+    for weights in waves:
+        if optimal:
+            cost = [[w / s for s in speeds] for w in weights]
+            pairs = solve_min_cost_assignment(cost)
+        else:
+            pairs = list(zip(range(len(weights)), range(len(speeds))))
+        assigned += len(pairs)
+        makespan += max(weights[t] / speeds[d] for t, d in pairs)
+    return makespan, assigned
+
+
+def test_simulated_makespan():
+    rng = random.Random(26)
+    speeds = [rng.choice([0.5, 1.0, 2.0, 8.0]) for _ in range(24)]
+    waves = [[rng.choice([0.1, 1.0, 2.0, 3.0, 4.0]) for _ in range(24)] for _ in range(20)]
+
+    greedy_makespan, greedy_assigned = _simulate(speeds, waves, optimal=False)
+    optimal_makespan, optimal_assigned = _simulate(speeds, waves, optimal=True)
+
+    assert greedy_assigned == optimal_assigned == 24 * 20
+    assert optimal_makespan < greedy_makespan * 0.75
@@ -0,0 +1,156 @@
+"""Tests for MmapEngine — zero-copy layer reads, madvise hints, prefetcher."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from tools.gimo_server.inference.mmap_engine import MmapEngine
+
+
+def _model_file(tmp_path: Path, num_layers: int = 8, layer_size: int = 16384) -> Path:
+    path = tmp_path / "model.bin"
+    with open(path, "wb") as fh:
+        for i in range(num_layers):
+            fh.write(bytes([i % 256]) * layer_size)
+    return path
+
+
+class TestZeroCopyReads:
+    def test_read_layer_returns_view_of_layer(self, tmp_path):
+        path = _model_file(tmp_path)
+        with MmapEngine(path, num_layers=8) as engine:
+            view = engine.read_layer(3)
+            assert isinstance(view, memoryview)
+            assert view.readonly
+            assert len(view) == 16384
+            assert view[0] == 3 and view[-1] == 3
+            view.release()
+            assert engine.stats["bytes_copied"] == 0
+            assert engine.stats["bytes_viewed"] == 16384
+
+    def test_read_layer_bytes_counts_copy(self, tmp_path):
+        path = _model_file(tmp_path)
+        with MmapEngine(path, num_layers=8) as engine:
+            data = engine.read_layer_bytes(5)
+            assert data == bytes([5]) * 16384
+            assert engine.stats["bytes_copied"] == 16384
+
+    def test_read_layer_array_shares_memory(self, tmp_path):
+        np = pytest.importorskip("numpy")
+        path = _model_file(tmp_path)
+        with MmapEngine(path, num_layers=8) as engine:
+            arr = engine.read_layer_array(2, dtype=np.uint16)
+            assert arr.shape == (8192,)
+            assert not arr.flags.writeable
+            assert not arr.flags.owndata
+            assert int(arr[0]) == 0x0202
+            del arr
+            assert engine.stats["bytes_copied"] == 0
+
+    def test_out_of_range_and_closed(self, tmp_path):
+        path = _model_file(tmp_path)
+        engine = MmapEngine(path, num_layers=8)
+        with pytest.raises(RuntimeError):
+            engine.read_layer(0)
+        with engine:
+            with pytest.raises(IndexError):
+                engine.read_layer(8)
+            with pytest.raises(IndexError):
+                engine.read_layer(-1)
+
+    def test_close_with_live_view_does_not_raise(self, tmp_path):
+        path = _model_file(tmp_path)
+        engine = MmapEngine(path, num_layers=8).open()
+        view = engine.read_layer(1)
+        engine.close()
+        assert not engine.is_open
+        assert view[0] == 1  # mapping survives until the view is dropped
+        view.release()
+
+    def test_hints_are_safe_on_unaligned_layers(self, tmp_path):
+        path = _model_file(tmp_path, num_layers=3, layer_size=5000)
+        with MmapEngine(path, num_layers=3) as engine:
+            engine.prefetch_hint(1)
+            engine.prefetch_hint(2)
+            engine.evict_hint(1)
+            assert bytes(engine.read_layer(2)[:4]) == b"\x02" * 4
+
+
+class TestPrefetcher:
+    def test_stays_depth_layers_ahead(self, tmp_path):
+        path = _model_file(tmp_path, num_layers=16)
+        with MmapEngine(path, num_layers=16) as engine:
+            engine.start_prefetcher(depth=3)
+            assert engine.wait_prefetched(2)
+            for idx in range(10):
+                engine.read_layer(idx).release()
+                assert engine.wait_prefetched(idx + 3)
+                # Bounded: never more than depth layers past the cursor.
+                assert engine.stats["prefetched_to"] <= idx + 3
+            engine.read_layer(15).release()
+            assert engine.wait_prefetched(15)
+            assert engine.stats["prefetched_to"] == 15
+
+    def test_restarts_window_on_backward_jump(self, tmp_path):
+        path = _model_file(tmp_path, num_layers=16)
+        with MmapEngine(path, num_layers=16) as engine:
+            engine.start_prefetcher(depth=2, evict_behind=True)
+            for idx in range(16):
+                engine.read_layer(idx).release()
+            assert engine.wait_prefetched(15)
+            engine.read_layer(0).release()  # next token pass
+            assert engine.wait_prefetched(2)
+            assert engine.stats["prefetched_to"] == 2
+
+    def test_close_stops_thread(self, tmp_path):
+        path = _model_file(tmp_path)
+        engine = MmapEngine(path, num_layers=8).open()
+        engine.start_prefetcher(depth=2)
+        thread = engine._prefetch_thread
+        engine.close()
+        assert thread is not None and not thread.is_alive()
+
+    def test_invalid_depth(self, tmp_path):
+        path = _model_file(tmp_path)
+        with MmapEngine(path, num_layers=8) as engine:
+            with pytest.raises(ValueError):
+                engine.start_prefetcher(depth=0)
+
+
+@pytest.mark.slow
+class TestMmapBenchmark:
+    """Layer sweep over a sparse multi-GB file: copy path vs zero-copy views.
+
+    Size via ``GIMO_MMAP_BENCH_GB`` (default 2).  Compares bytes copied and
+    viewed by each path.
+    """
+
+    def test_zero_copy_vs_copy(self, tmp_path):
+        size_gb = float(os.environ.get("GIMO_MMAP_BENCH_GB", "2"))
+        num_layers = 64
+        layer_size = int(size_gb * 1024**3) // num_layers
+        path = tmp_path / "big.bin"
+        with open(path, "wb") as fh:
+            fh.truncate(layer_size * num_layers)  # sparse
+
+        with MmapEngine(path, num_layers=num_layers) as engine:
+            for idx in range(num_layers):
+                data = engine.read_layer_bytes(idx)
+                del data
+            copied = dict(engine.stats)
+
+        with MmapEngine(path, num_layers=num_layers) as engine:
+            engine.start_prefetcher(depth=2, evict_behind=True)
+            checksum = 0
+            for idx in range(num_layers):
+                view = engine.read_layer(idx)
+                checksum += view[len(view) - 1]
+                view.release()
+            viewed = dict(engine.stats)
+
+        assert checksum == 0
+        assert copied["bytes_copied"] == layer_size * num_layers
+        assert viewed["bytes_copied"] == 0
+        assert viewed["bytes_viewed"] == layer_size * num_layers
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import shutil
 import tempfile
 from pathlib import Path
@@ -161,3 +162,56 @@ class TestCaching:
         # SHA-256 is lazy — verify via get_model
         m2_full = svc.get_model("changing")
         assert m2_full.sha256 == _sha256(b"y" * 2048)
+
+
+# ═══════════════════════════════════════════════════════════════
+# Chunk manifests
+# ═══════════════════════════════════════════════════════════════
+
+class TestManifest:
+    def test_chunks_and_root(self, svc: ModelCatalogService, models_dir: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(catalog_mod, "MANIFEST_CHUNK_SIZE", 1000)
+        content = bytes(range(256)) * 10
+        (models_dir / "chunked.gguf").write_bytes(content)
+        manifest = svc.get_manifest("chunked")
+        assert manifest.size_bytes == 2560 and manifest.chunk_size == 1000
+        assert manifest.chunks == [_sha256(content[i:i + 1000]) for i in (0, 1000, 2000)]
+        assert manifest.root_hash == catalog_mod.compute_root_hash(manifest.chunks)
+        assert manifest.sha256 == _sha256(content)
+        assert manifest.chunk_range(2) == (2000, 560)
+        assert svc.get_manifest("ghost") is None
+
+    def test_persisted_and_reused(self, svc: ModelCatalogService, models_dir: Path, monkeypatch: pytest.MonkeyPatch):
+        _write_fake_gguf(models_dir, "persisted.gguf", size=4096)
+        first = svc.get_manifest("persisted")
+        assert catalog_mod.manifest_path(models_dir, "persisted.gguf").is_file()
+
+        def _no_rehash(*args, **kwargs):
+            raise AssertionError("manifest recomputed")
+
+        monkeypatch.setattr(ModelCatalogService, "_compute_manifest", staticmethod(_no_rehash))
+        # A fresh service (e.g. after restart) reads the persisted manifest.
+        assert ModelCatalogService().get_manifest("persisted") == first
+        assert ModelCatalogService().get_model("persisted").sha256 == first.sha256
+
+    def test_invalidated_by_mtime(self, svc: ModelCatalogService, models_dir: Path):
+        path = _write_fake_gguf(models_dir, "touched.gguf", size=2048)
+        first = svc.get_manifest("touched")
+        path.write_bytes(b"z" * 2048)  # same size, new content
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, first.mtime_ns + 1_000_000))
+        second = svc.get_manifest("touched")
+        assert second.sha256 == _sha256(b"z" * 2048) != first.sha256
+        assert svc.get_model("touched").sha256 == second.sha256
+
+    def test_get_model_does_not_list_directory(self, svc: ModelCatalogService, models_dir: Path, monkeypatch: pytest.MonkeyPatch):
+        _write_fake_gguf(models_dir, "Spaced Name.gguf")
+        _write_fake_gguf(models_dir, "direct.gguf")
+        assert svc.get_model("spaced-name").filename == "Spaced Name.gguf"  # one scan to learn the id
+
+        def _no_listing(self):
+            raise AssertionError("list_models called")
+
+        monkeypatch.setattr(ModelCatalogService, "list_models", _no_listing)
+        assert svc.get_model("direct").model_id == "direct"
+        assert svc.get_model_path("spaced-name").name == "Spaced Name.gguf"
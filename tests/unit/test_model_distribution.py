@@ -0,0 +1,187 @@
+"""Parallel, chunk-verified model download from several mesh peers.
+
+Each stand-in peer is a local HTTP server serving ``/ops/mesh/models`` from
+its own temp dir, with knobs to make it corrupt chunks or go away.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from tools.gimo_server.services.mesh import model_catalog as catalog_mod
+from tools.gimo_server.services.mesh.model_catalog import ModelCatalogService, load_manifest
+from tools.gimo_server.services.mesh.model_distribution import (
+    HttpModelPeer,
+    ModelDistributionError,
+    download_model,
+    peers_holding,
+)
+
+CHUNK = 64 * 1024
+FILENAME = "tiny_1b_q4_0.gguf"
+MODEL_ID = "tiny_1b_q4_0"
+
+
+class _Peer:
+    def __init__(self, root: Path, token: str = "tok") -> None:
+        self.root = root
+        self.token = token
+        self.ranges: list[int] = []
+        self.corrupt: set[int] = set()  # chunk starts served with a flipped byte
+        self.fail_after: int | None = None  # range requests before returning 503
+        self._lock = threading.Lock()
+        peer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.headers.get("Authorization") != f"Bearer {peer.token}":
+                    return self._send(401, b"")
+                m = re.match(r"^/ops/mesh/models/([^/]+)/(download|manifest)$", self.path)
+                path = peer.root / f"{m.group(1)}.gguf" if m else None
+                if path is None or not path.is_file():
+                    return self._send(404, b"")
+                if m.group(2) == "manifest":
+                    manifest = ModelCatalogService._compute_manifest(path, CHUNK)
+                    return self._send(200, manifest.model_dump_json().encode())
+                start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", self.headers["Range"]).groups())
+                with peer._lock:
+                    peer.ranges.append(start)
+                    failing = peer.fail_after is not None and len(peer.ranges) > peer.fail_after
+                if failing:
+                    return self._send(503, b"")
+                with open(path, "rb") as f:
+                    f.seek(start)
+                    data = bytearray(f.read(end - start + 1))
+                if start in peer.corrupt:
+                    data[0] ^= 0xFF
+                self._send(206, bytes(data), {"Content-Range": f"bytes {start}-{end}/{path.stat().st_size}"})
+
+            def _send(self, code, body, headers=None):
+                self.send_response(code)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.client = HttpModelPeer(f"http://127.0.0.1:{self.server.server_address[1]}", token)
+
+
+@pytest.fixture
+def content() -> bytes:
+    # 20 full chunks plus a short tail.
+    return os.urandom(20 * CHUNK + 1234)
+
+
+@pytest.fixture
+def source(tmp_path, content, monkeypatch):
+    models = tmp_path / "source"
+    models.mkdir()
+    (models / FILENAME).write_bytes(content)
+    monkeypatch.setattr(catalog_mod, "_MODELS_DIR", models)
+    monkeypatch.setattr(catalog_mod, "MANIFEST_CHUNK_SIZE", CHUNK)
+    return ModelCatalogService().get_manifest(MODEL_ID)
+
+
+@pytest.fixture
+def peers(tmp_path, content):
+    started = []
+    for i in range(3):
+        root = tmp_path / f"peer{i}"
+        root.mkdir()
+        (root / FILENAME).write_bytes(content)
+        started.append(_Peer(root))
+    yield started
+    for peer in started:
+        peer.server.shutdown()
+        peer.server.server_close()
+
+
+def test_parallel_download_spreads_chunks_over_peers(source, peers, tmp_path, content):
+    dest = tmp_path / "dest"
+    result = download_model(source, [p.client for p in peers], dest)
+
+    assert (dest / FILENAME).read_bytes() == content
+    assert result.chunks_fetched == 21 and result.chunks_resumed == 0
+    assert result.bytes_transferred == len(content)
+    assert all(len(p.ranges) >= 3 for p in peers), [len(p.ranges) for p in peers]
+    assert sorted(s for p in peers for s in p.ranges) == [i * CHUNK for i in range(21)]
+    assert not list(dest.glob("*.part*"))
+    # The new copy is servable without re-hashing.
+    assert load_manifest(dest / FILENAME, CHUNK).root_hash == source.root_hash
+
+
+def test_corrupt_and_failing_peers_are_routed_around(source, peers, tmp_path, content):
+    peers[0].corrupt = {i * CHUNK for i in range(21)}  # every chunk it serves is bad
+    peers[1].fail_after = 2
+    result = download_model(source, [p.client for p in peers], tmp_path / "dest")
+
+    assert (tmp_path / "dest" / FILENAME).read_bytes() == content
+    assert result.bytes_by_peer[peers[0].client.peer_id] == 0
+    assert result.bytes_by_peer[peers[2].client.peer_id] >= 18 * CHUNK
+
+
+def test_interrupted_download_resumes(source, peers, tmp_path, content):
+    dest = tmp_path / "dest"
+    for p in peers:
+        p.fail_after = 3
+    with pytest.raises(ModelDistributionError):
+        download_model(source, [p.client for p in peers], dest)
+    state = json.loads((dest / f"{FILENAME}.part.json").read_text())
+    assert 0 < len(state["done"]) < 21
+
+    # A chunk marked done whose bytes never hit the disk is fetched again.
+    lost = state["done"][0]
+    with open(dest / f"{FILENAME}.part", "r+b") as f:
+        f.seek(lost * CHUNK)
+        f.write(b"\0" * 16)
+
+    for p in peers:
+        p.fail_after = None
+        p.ranges.clear()
+    result = download_model(source, [p.client for p in peers], dest)
+    assert (dest / FILENAME).read_bytes() == content
+    assert result.chunks_resumed == len(state["done"]) - 1
+    assert result.chunks_fetched == 21 - result.chunks_resumed
+    refetched = sorted(s for p in peers for s in p.ranges)
+    assert lost * CHUNK in refetched and len(refetched) == result.chunks_fetched
+
+    # Already present: nothing is fetched.
+    again = download_model(source, [p.client for p in peers], dest)
+    assert again.bytes_transferred == 0
+
+
+def test_download_fails_when_no_peer_has_a_chunk(source, peers, tmp_path):
+    for p in peers:
+        p.corrupt = {5 * CHUNK}
+    with pytest.raises(ModelDistributionError, match="chunk 5"):
+        download_model(source, [p.client for p in peers], tmp_path / "dest")
+    assert not (tmp_path / "dest" / FILENAME).exists()
+
+
+def test_peers_holding_filters_on_root_hash(source, peers, tmp_path):
+    (peers[1].root / FILENAME).write_bytes(b"other build")
+    unreachable = HttpModelPeer("http://127.0.0.1:9", "tok", timeout=1)
+    wrong_token = HttpModelPeer(peers[2].client.base_url, "nope")
+    holding = peers_holding(source, [p.client for p in peers] + [unreachable, wrong_token])
+    assert holding == [peers[0].client, peers[2].client]
+
+
+def test_inconsistent_manifest_is_rejected(source, peers, tmp_path):
+    tampered = source.model_copy(update={"chunks": source.chunks[:-1] + [hashlib.sha256(b"x").hexdigest()]})
+    with pytest.raises(ModelDistributionError, match="inconsistent"):
+        download_model(tampered, [p.client for p in peers], tmp_path / "dest")
@@ -59,3 +59,140 @@ def test_publish_disconnects_permanently_saturated_subscriber():
 
     metrics = NotificationService.get_metrics()
     assert metrics["circuit_opens"] >= 1
+
+
+def test_filters_by_scope_and_event_type():
+    async def _run():
+        run_q = await NotificationService.subscribe(run_id="r1")
+        thread_q = await NotificationService.subscribe(thread_id="t1", event_types=["item_created"])
+        all_q = await NotificationService.subscribe()
+        await NotificationService._broadcast_now("run_progress", {"run_id": "r1"})
+        await NotificationService._broadcast_now("run_progress", {"run_id": "r2"})
+        await NotificationService._broadcast_now("item_created", {"thread_id": "t1"})
+        await NotificationService._broadcast_now("item_delta", {"thread_id": "t1"})
+        return run_q, thread_q, all_q
+
+    run_q, thread_q, all_q = asyncio.run(_run())
+    assert [json.loads(run_q.get_nowait())["data"]["run_id"] for _ in range(run_q.qsize())] == ["r1"]
+    assert [json.loads(m)["event"] for m in [thread_q.get_nowait()]] == ["item_created"]
+    assert thread_q.empty()
+    assert all_q.qsize() == 4
+    metrics = NotificationService.get_metrics()
+    assert metrics["filtered"] == 3 + 3
+    assert metrics["serialized"] == 4
+
+
+def test_event_serialized_once_and_shared():
+    async def _run():
+        queues = [await NotificationService.subscribe() for _ in range(3)]
+        await NotificationService._broadcast_now("evt", {"run_id": "r", "n": 1})
+        return [q.get_nowait() for q in queues]
+
+    messages = asyncio.run(_run())
+    assert messages[0] is messages[1] is messages[2]
+    assert messages[0].event_id == 1
+    assert messages[0].sse_frame == f"id: 1\ndata: {messages[0]}\n\n"
+    assert NotificationService.get_metrics()["serialized"] == 1
+
+
+def test_replay_uses_ring_and_sequence_numbers():
+    NotificationService._replay_buffer_max = 5
+    NotificationService.reset_state_for_tests()
+    NotificationService.configure(queue_maxsize=50)
+
+    async def _run():
+        await NotificationService.subscribe()
+        for i in range(12):
+            await NotificationService._broadcast_now("evt", {"run_id": f"r{i % 2}", "i": i})
+        late = await NotificationService.subscribe(last_event_id=9)
+        gap = await NotificationService.subscribe(last_event_id=2)  # older than the ring
+        scoped = await NotificationService.subscribe(last_event_id=7, run_id="r1")
+        return late, gap, scoped
+
+    try:
+        late, gap, scoped = asyncio.run(_run())
+        ids = lambda q: [q.get_nowait().event_id for _ in range(q.qsize())]  # noqa: E731
+        assert ids(late) == [10, 11, 12]
+        assert ids(gap) == [8, 9, 10, 11, 12]
+        assert ids(scoped) == [8, 10, 12]  # event i is id i+1; r1 = odd i
+        assert NotificationService.get_metrics()["replay_buffer_size"] == 5
+    finally:
+        NotificationService._replay_buffer_max = 500
+
+
+def test_drop_policy_keeps_oldest_and_counts():
+    NotificationService.configure(queue_maxsize=2)
+
+    async def _run():
+        drop_q = await NotificationService.subscribe(slow_policy="drop")
+        coalesce_q = await NotificationService.subscribe(slow_policy="coalesce")
+        for seq in range(1, 4):
+            await NotificationService._broadcast_now("evt", {"seq": seq})
+        return drop_q, coalesce_q
+
+    drop_q, coalesce_q = asyncio.run(_run())
+    assert [json.loads(drop_q.get_nowait())["data"]["seq"] for _ in range(2)] == [1, 2]
+    assert [json.loads(coalesce_q.get_nowait())["data"]["seq"] for _ in range(2)] == [2, 3]
+    drop_stats, coalesce_stats = NotificationService.get_subscriber_stats()
+    assert (drop_stats["dropped"], drop_stats["coalesced"]) == (1, 0)
+    assert (coalesce_stats["dropped"], coalesce_stats["coalesced"]) == (1, 1)
+
+
+def test_publish_nowait_from_worker_thread_and_loop():
+    async def _run():
+        queue = await NotificationService.subscribe(run_id="r1", event_types=["run_status"])
+        await asyncio.to_thread(
+            NotificationService.publish_nowait, "run_status", {"run_id": "r1", "status": "running"}
+        )
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert NotificationService._pending["r1:run_status"]["data"]["status"] == "running"
+        NotificationService.publish_nowait("run_status", {"run_id": "r1", "status": "done", "critical": True})
+        return json.loads(await asyncio.wait_for(queue.get(), timeout=1))
+
+    assert asyncio.run(_run())["data"]["status"] == "done"
+    NotificationService.reset_state_for_tests()
+    NotificationService.publish_nowait("run_status", {"run_id": "r1"})  # no subscribers: no-op
+
+
+def test_critical_event_supersedes_pending_coalesced_one():
+    async def _run():
+        queue = await NotificationService.subscribe()
+        await NotificationService.publish("run_status", {"run_id": "r1", "status": "running"})
+        await NotificationService.publish("run_status", {"run_id": "r1", "status": "done", "critical": True})
+        return queue
+
+    queue = asyncio.run(_run())
+    assert NotificationService._pending == {}
+    assert json.loads(queue.get_nowait())["data"]["status"] == "done"
+    assert queue.empty()
+
+
+def test_unknown_slow_policy_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(NotificationService.subscribe(slow_policy="block"))
+
+
+def test_fanout_500_subscribers_filters_before_enqueueing():
+    """500 subscribers, each watching one of 50 runs, vs 500 unfiltered ones."""
+    n_subs, n_runs, n_events = 500, 50, 2000
+
+    async def _fanout(filtered: bool):
+        NotificationService.reset_state_for_tests()
+        NotificationService.configure(queue_maxsize=n_events)
+        queues = [
+            await NotificationService.subscribe(run_id=f"r{i % n_runs}" if filtered else None)
+            for i in range(n_subs)
+        ]
+        for i in range(n_events):
+            await NotificationService._broadcast_now("run_progress", {"run_id": f"r{i % n_runs}", "i": i})
+        delivered = sum(q.qsize() for q in queues)
+        return delivered, dict(NotificationService.get_metrics())
+
+    base_delivered, base_m = asyncio.run(_fanout(False))
+    filt_delivered, filt_m = asyncio.run(_fanout(True))
+    assert base_m["serialized"] == filt_m["serialized"] == n_events
+    assert base_delivered == n_subs * n_events
+    assert filt_delivered == n_subs * n_events // n_runs
+    assert filt_m["filtered"] == n_subs * n_events - filt_delivered
+    assert base_m["filtered"] == 0
@@ -195,3 +195,179 @@ async def test_provider_service_handles_missing_usage_gracefully():
             assert result["content"] == "Hello world"
             assert result["tokens_used"] == 0
             assert result["cost_usd"] == pytest.approx(0.0)
+
+
+# ---------------------------------------------------------------------------
+# Streaming stage quantiles, trace index, cached run health
+# ---------------------------------------------------------------------------
+
+import random
+
+from datetime import datetime, timedelta, timezone
+
+from tools.gimo_server.services.observability_pkg.quantile_sketch import DDSketch, WindowedSketch
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ddsketch_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3.0, 1.2) for _ in range(20000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+    assert sketch.count == len(values)
+
+
+def test_ddsketch_merge_matches_single_sketch():
+    a, b, whole = DDSketch(), DDSketch(), DDSketch()
+    for i in range(1, 1001):
+        (a if i % 2 else b).add(i)
+        whole.add(i)
+    a.merge(b)
+    for q in (0.1, 0.5, 0.99):
+        assert a.quantile(q) == whole.quantile(q)
+
+
+def test_ddsketch_bucket_cap_bounds_memory():
+    sketch = DDSketch(relative_accuracy=0.01, max_buckets=64)
+    for i in range(1, 100000, 7):
+        sketch.add(i * 0.001)
+    assert sketch.bucket_count <= 64
+    assert sketch.quantile(0.99) == pytest.approx(99.99 * 0.99, rel=0.05)
+
+
+def test_windowed_sketch_expires_old_windows():
+    clock = _Clock()
+    sketch = WindowedSketch(window_seconds=10, num_windows=3, clock=clock)
+    for _ in range(100):
+        sketch.add(1000.0)
+    clock.now += 40  # past the 3 × 10 s horizon
+    for _ in range(100):
+        sketch.add(5.0)
+    assert sketch.merged().quantile(0.99) == pytest.approx(5.0, rel=0.02)
+    assert sketch.total_count == 200
+    assert sketch.mean == pytest.approx(502.5)
+
+
+def test_metrics_expose_stage_quantiles():
+    ObservabilityService.reset()
+    for ms in range(1, 101):
+        ObservabilityService.record_structured_event(
+            event_type="stage", status="OK", trace_id="t", request_id="r", run_id="run",
+            stage="plan", latency_ms=ms,
+        )
+    metrics = ObservabilityService.get_metrics()
+    assert metrics["latency_ms_by_stage"]["plan"] == pytest.approx(50.5)
+    q = metrics["latency_quantiles_by_stage"]["plan"]
+    assert q["count"] == 100
+    assert q["p50"] == pytest.approx(50, rel=0.03)
+    assert q["p99"] == pytest.approx(99, rel=0.03)
+
+
+def test_trace_index_follows_span_eviction(monkeypatch):
+    from collections import deque
+
+    ObservabilityService.reset()
+    monkeypatch.setattr(ObservabilityService, "_ui_spans", deque(maxlen=10))
+    for i in range(25):
+        ObservabilityService.record_span(
+            "node", f"n{i}", {"trace_id": f"trace-{i % 4}", "status": "completed", "duration_ms": 1},
+        )
+    index = ObservabilityService._trace_index
+    assert sum(len(b) for b in index.values()) == len(ObservabilityService._ui_spans) == 10
+    traces = ObservabilityService.list_traces(limit=10)
+    assert {t["trace_id"] for t in traces} == set(index)
+    assert ObservabilityService.get_trace("trace-1")["spans"] == list(index["trace-1"])
+
+    # Cached summaries are rebuilt only for the trace that changed.
+    ObservabilityService.record_span("node", "late", {"trace_id": "trace-2", "duration_ms": 1})
+    assert "trace-2" not in ObservabilityService._trace_summaries
+    ObservabilityService.list_traces()
+    assert len(ObservabilityService._trace_summaries) == len(index)
+    ObservabilityService.reset()
+
+
+def test_run_health_cached_and_updated_by_events(monkeypatch):
+    from tools.gimo_server.services.ops import OpsService
+
+    ObservabilityService.reset()
+    now = datetime.now(timezone.utc)
+    calls = {"n": 0}
+
+    class _Run:
+        def __init__(self, run_id, status, anchor):
+            self.id = run_id
+            self.status = status
+            self.created_at = self.started_at = self.heartbeat_at = anchor
+
+    def _list_runs():
+        calls["n"] += 1
+        return [_Run("r_old", "running", now - timedelta(hours=2)), _Run("r_done", "done", now)]
+
+    monkeypatch.setattr(OpsService, "list_runs", _list_runs)
+
+    first = ObservabilityService.get_metrics()
+    assert (first["active_runs"], first["terminal_runs"], first["stuck_runs"]) == (1, 1, 1)
+
+    ObservabilityService.observe_run("r_new", status="pending", created_at=now)
+    ObservabilityService.observe_run("r_old", heartbeat_at=now.isoformat())
+    second = ObservabilityService.get_metrics()
+    assert (second["active_runs"], second["stuck_runs"]) == (2, 0)
+
+    ObservabilityService.observe_run("r_new", status="done")
+    ObservabilityService.forget_run("r_done")
+    third = ObservabilityService.get_metrics()
+    assert (third["active_runs"], third["terminal_runs"]) == (1, 1)
+    assert calls["n"] == 1
+
+    # Periodic resync picks up out-of-band writes.
+    monkeypatch.setattr(ObservabilityService, "_run_health_resync_seconds", 0.0)
+    ObservabilityService.get_metrics()
+    assert calls["n"] == 2
+    ObservabilityService.reset()
+
+
+@pytest.mark.slow
+def test_soak_memory_constant_after_1m_spans():
+    """1M spans + stage samples: retained memory stops growing once buffers fill."""
+    ObservabilityService.reset()
+    clock = _Clock()
+    stage = WindowedSketch(clock=clock)
+    append = ObservabilityService._append_ui_span
+    lock = ObservabilityService._lock
+    rng = random.Random(1)
+
+    def _feed(start: int, stop: int) -> None:
+        with lock:
+            for i in range(start, stop):
+                append({"kind": "node", "trace_id": f"t{i // 8}", "timestamp": "", "duration_ms": 1})
+                stage.add(rng.expovariate(0.02))
+                if i % 1000 == 0:
+                    clock.now += 10.0  # one 60 s window per 6k spans
+
+    def _retained():
+        index = ObservabilityService._trace_index
+        return (
+            len(ObservabilityService._ui_spans),
+            sum(len(b) for b in index.values()),
+            len(index),
+            stage.window_count,
+        )
+
+    _feed(0, 200_000)  # fill the span ring and every sketch window
+    warm = _retained()
+    _feed(200_000, 1_000_000)
+
+    assert _retained() == warm == (5000, 5000, 5000 // 8, stage.num_windows)
+    ObservabilityService.reset()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -48,7 +49,7 @@ def _seed_run(tmp_path) -> str:
     )
     OpsService._draft_path(draft.id).write_text(draft.model_dump_json(indent=2), encoding="utf-8")
     OpsService._approved_path(approved.id).write_text(approved.model_dump_json(indent=2), encoding="utf-8")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     OpsService.update_run_merge_metadata(run.id, commit_before="c_before", commit_after="c_after")
     return run.id
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from unittest.mock import AsyncMock
 
 import pytest
 from fastapi.testclient import TestClient
@@ -98,7 +99,7 @@ def test_phase4_approve_explicit_auto_run_overrides_eligibility(monkeypatch, cli
 
     monkeypatch.setattr(run_router.OpsService, "get_draft", lambda _id: draft)
     monkeypatch.setattr(run_router.OpsService, "approve_draft", lambda *_args, **_kwargs: approved)
-    monkeypatch.setattr(run_router.OpsService, "create_run", lambda _approved_id: mock_run)
+    monkeypatch.setattr(run_router.OpsService, "create_run", AsyncMock(return_value=mock_run))
     monkeypatch.setattr(run_router.OpsService, "update_run_status", lambda *a, **kw: mock_run)
     monkeypatch.setattr(run_router, "_spawn_run", lambda *a, **kw: None)
 
@@ -130,7 +131,7 @@ def test_phase4_approve_default_auto_run_respects_eligibility(monkeypatch, clien
 
     monkeypatch.setattr(run_router.OpsService, "get_draft", lambda _id: draft)
     monkeypatch.setattr(run_router.OpsService, "approve_draft", lambda *_args, **_kwargs: approved)
-    monkeypatch.setattr(run_router.OpsService, "create_run", lambda _approved_id: called.__setitem__("create_run", True))
+    monkeypatch.setattr(run_router.OpsService, "create_run", AsyncMock(side_effect=lambda _approved_id: called.__setitem__("create_run", True)))
 
     # No auto_run param → uses config default, which should respect eligibility
     res = client.post("/ops/drafts/d_phase4_default/approve")
@@ -174,7 +175,7 @@ def test_phase4_approve_auto_run_enters_running_immediately(monkeypatch, client)
 
     monkeypatch.setattr(run_router.OpsService, "get_draft", lambda _id: draft)
     monkeypatch.setattr(run_router.OpsService, "approve_draft", lambda *_args, **_kwargs: approved)
-    monkeypatch.setattr(run_router.OpsService, "create_run", lambda _approved_id: created_run)
+    monkeypatch.setattr(run_router.OpsService, "create_run", AsyncMock(return_value=created_run))
     monkeypatch.setattr(run_router.OpsService, "update_run_status", lambda *_a, **_k: updated_run)
 
     def _capture_task(coro, *, name=None, context=None):
@@ -291,7 +292,7 @@ def test_phase4_rerun_returns_201_and_links_source(monkeypatch, client):
         attempt=2,
     )
 
-    monkeypatch.setattr(run_router.OpsService, "rerun", lambda _run_id: rerun)
+    monkeypatch.setattr(run_router.OpsService, "rerun", AsyncMock(return_value=rerun))
     monkeypatch.setattr(run_router.OpsService, "update_run_status", lambda *_a, **_k: rerun)
 
     res = client.post("/ops/runs/r_old_1/rerun")
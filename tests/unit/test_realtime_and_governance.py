@@ -130,7 +130,7 @@ def test_resource_governor_defers_on_high_cpu_and_vram():
 def test_append_only_state_and_materialized_read():
     approved = OpsService.create_draft(prompt="p", content="c")
     appr = OpsService.approve_draft(approved.id, approved_by="t")
-    run = OpsService.create_run(appr.id)
+    run = asyncio.run(OpsService.create_run(appr.id))
 
     OpsService.update_run_status(run.id, "running", msg="start")
     OpsService.set_run_stage(run.id, "stage-1")
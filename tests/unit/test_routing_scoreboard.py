@@ -0,0 +1,196 @@
+"""Routing scoreboard: router decisions without per-candidate GICS reads."""
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from tools.gimo_server.ops_models import ProviderRoleBinding
+from tools.gimo_server.services import benchmark_enrichment_service as bes
+from tools.gimo_server.services.capability_profile_service import CapabilityProfileService
+from tools.gimo_server.services.model_inventory_service import ModelEntry
+from tools.gimo_server.services.model_router_service import TASK_REQUIREMENTS, ModelRouterService
+from tools.gimo_server.services.ops import OpsService
+from tools.gimo_server.services.routing_scoreboard import RoutingScoreboard
+
+
+class _FakeGics:
+    """In-memory stand-in for the GICS client; counts reads, optional per-read delay."""
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.items: dict = {}
+        self.reliability: dict = {}
+        self.reads = 0
+        self.delay_s = delay_s
+
+    def _read(self) -> None:
+        self.reads += 1
+        if self.delay_s:
+            time.sleep(self.delay_s)
+
+    def get(self, key):
+        self._read()
+        fields = self.items.get(key)
+        return {"key": key, "fields": fields} if fields is not None else None
+
+    def put(self, key, fields):
+        self.items[key] = dict(fields)
+
+    def get_model_reliability(self, *, provider_type, model_id):
+        self._read()
+        return self.reliability.get((provider_type, model_id))
+
+    def record_model_outcome(self, *, provider_type, model_id, success, **_kwargs):
+        current = dict(self.reliability.get((provider_type, model_id)) or {"score": 0.5})
+        current["anomaly"] = not success
+        self.reliability[(provider_type, model_id)] = current
+        return current
+
+
+def _entry(model_id: str, provider_type: str = "openai") -> ModelEntry:
+    return ModelEntry(
+        model_id=model_id,
+        provider_id=provider_type,
+        provider_type=provider_type,
+        is_local=False,
+        quality_tier=3,
+        capabilities={"chat", "code"},
+    )
+
+
+@pytest.fixture
+def gics(monkeypatch):
+    fake = _FakeGics()
+    monkeypatch.setattr(OpsService, "_gics", fake)
+    RoutingScoreboard.reset()
+    yield fake
+    RoutingScoreboard.reset()
+
+
+def _decide(entries, task_type="code_generation"):
+    by_model = {e.model_id: e for e in entries}
+    bindings = [ProviderRoleBinding(provider_id=e.provider_id, model=e.model_id) for e in entries]
+    with patch(
+        "tools.gimo_server.services.providers.topology_service.ProviderTopologyService.constrain_bindings",
+        side_effect=lambda candidates, **_: candidates,
+    ), patch(
+        "tools.gimo_server.services.providers.service.ProviderService.get_config", return_value=None,
+    ), patch.object(
+        ModelRouterService, "_inventory_entry_for_binding", side_effect=lambda b: by_model[b.model],
+    ):
+        return ModelRouterService.choose_binding_from_candidates(task_type=task_type, candidates=bindings)
+
+
+def test_warm_decisions_do_not_read_gics(gics):
+    entries = [_entry(f"model-{i}") for i in range(5)]
+    gics.reliability[("openai", "model-3")] = {"score": 0.9, "anomaly": False}
+    for _ in range(3):
+        CapabilityProfileService.record_task_outcome(
+            provider_type="openai", model_id="model-3", task_type="code_generation", success=True,
+        )
+    RoutingScoreboard.load_benchmarks({})
+    reads = RoutingScoreboard.prewarm(entries, TASK_REQUIREMENTS)
+    assert reads == 5 * 2 + 1  # reliability + task index per model, one recorded capability
+
+    gics.reads = 0
+    first = _decide(entries)
+    second = _decide(entries)
+    assert gics.reads == 0
+    assert first.model == second.model == "model-3"
+    assert "gics_task_success=1.00/samples=3" in first.reason
+    assert RoutingScoreboard.stats()["scores"] == 5
+
+
+def test_outcome_events_update_the_scoreboard(gics):
+    entries = [_entry("alpha"), _entry("beta")]
+    gics.reliability[("openai", "alpha")] = {"score": 0.9, "anomaly": False}
+    gics.reliability[("openai", "beta")] = {"score": 0.6, "anomaly": False}
+    RoutingScoreboard.load_benchmarks({})
+    RoutingScoreboard.prewarm(entries, ["code_generation"])
+    assert _decide(entries).model == "alpha"
+
+    gics.reads = 0
+    OpsService.record_model_outcome(provider_type="openai", model_id="alpha", success=False)
+    decision = _decide(entries)
+    assert gics.reads == 0
+    assert decision.model == "beta"
+
+    for _ in range(4):
+        CapabilityProfileService.record_task_outcome(
+            provider_type="openai", model_id="alpha", task_type="code_generation", success=False,
+        )
+    cap = RoutingScoreboard.capability("openai", "alpha", "code_generation")
+    assert cap.samples == 4 and cap.success_rate == 0.0
+
+
+def test_ttl_expiry_reads_through(gics, monkeypatch):
+    entries = [_entry("alpha")]
+    RoutingScoreboard.load_benchmarks({})
+    _decide(entries)
+    monkeypatch.setenv("ORCH_ROUTING_SCOREBOARD_TTL_S", "0")
+    gics.reads = 0
+    _decide(entries)
+    assert gics.reads == 2  # reliability + capability re-read
+
+
+def test_without_gics_the_scoreboard_is_bypassed(monkeypatch):
+    monkeypatch.setattr(OpsService, "_gics", None)
+    RoutingScoreboard.reset()
+    with patch.object(OpsService, "get_model_reliability", return_value={"score": 0.8}) as reliability:
+        RoutingScoreboard.reliability("openai", "alpha")
+        RoutingScoreboard.reliability("openai", "alpha")
+    assert reliability.call_count == 2
+    assert RoutingScoreboard.stats()["reliability"] == 0
+
+
+def test_benchmark_index_resolves_like_lookup_model():
+    profiles = bes._load_stale_cache() or {}
+    assert profiles
+    index = bes.BenchmarkIndex(profiles)
+    names = list(profiles)[:80] + [
+        "qwen2.5-coder:7b", "llama3.1:8b", "gpt-4o-mini", "claude-3-5-sonnet-20241022",
+        "mistral:latest", "deepseek-r1:14b", "no-such-model-anywhere",
+    ]
+    for name in names:
+        assert index.lookup(name) is bes.lookup_model(name, profiles), name
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(300)
+def test_routing_decisions_over_100_models_read_nothing_when_warm(gics, monkeypatch):
+    """100 candidate models: GICS reads and alias scans per decision, legacy vs scoreboard."""
+    profiles = bes._load_stale_cache() or {}
+    entries = [_entry(model_id) for model_id in list(profiles)[:90]]
+    entries += [_entry(f"unbenchmarked-{i}") for i in range(100 - len(entries))]
+    rounds = 20
+    scans = []
+
+    def _lookup(model_id):
+        scans.append(model_id)
+        return bes.lookup_model(model_id, profiles)
+
+    # Legacy: every decision reads reliability + capability per candidate and
+    # resolves benchmark profiles with the linear alias scan.
+    monkeypatch.setenv("ORCH_ROUTING_SCOREBOARD_TTL_S", "0")
+    with patch.object(RoutingScoreboard, "benchmark_profile", side_effect=_lookup):
+        _decide(entries)
+        gics.reads = 0
+        scans.clear()
+        for _ in range(rounds):
+            legacy = _decide(entries)
+    assert gics.reads == rounds * 2 * len(entries)
+    assert len(scans) >= rounds * len(entries)
+
+    monkeypatch.setenv("ORCH_ROUTING_SCOREBOARD_TTL_S", "600")
+    RoutingScoreboard.reset()
+    RoutingScoreboard.load_benchmarks(profiles)
+    assert RoutingScoreboard.prewarm(entries, TASK_REQUIREMENTS) == 2 * len(entries)
+    _decide(entries)
+    gics.reads = 0
+    for _ in range(rounds):
+        warm = _decide(entries)
+
+    assert warm.model == legacy.model
+    assert gics.reads == 0
+    assert RoutingScoreboard.stats()["scores"] == len(entries)
@@ -23,6 +23,12 @@ from tools.gimo_server.services.merge_gate_service import MergeGateService
 from tools.gimo_server.services.ops import OpsService
 
 
+def _async_check(ok, output):
+    async def _fake(*_args, **_kwargs):
+        return ok, output
+    return _fake
+
+
 def _override_auth() -> AuthContext:
     return AuthContext(token="test-token", role="admin")
 
@@ -174,10 +180,10 @@ def test_phase7_create_run_conflicts_when_active_run_exists(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d1", approved_id="a1")
 
-    run1 = OpsService.create_run(approved.id)
+    run1 = asyncio.run(OpsService.create_run(approved.id))
 
     with pytest.raises(RuntimeError) as exc:
-        OpsService.create_run(approved.id)
+        asyncio.run(OpsService.create_run(approved.id))
 
     assert str(exc.value).startswith("RUN_ALREADY_ACTIVE")
     assert run1.run_key is not None
@@ -187,10 +193,10 @@ def test_phase7_create_run_creates_new_instance_after_terminal(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d1t", approved_id="a1t")
 
-    run1 = OpsService.create_run(approved.id)
+    run1 = asyncio.run(OpsService.create_run(approved.id))
     OpsService.update_run_status(run1.id, "done", msg="completed")
 
-    run2 = OpsService.create_run(approved.id)
+    run2 = asyncio.run(OpsService.create_run(approved.id))
 
     assert run1.id != run2.id
     assert run1.run_key == run2.run_key
@@ -286,10 +292,10 @@ def test_phase7_rerun_creates_new_instance_with_parent_link(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d_rerun", approved_id="a_rerun")
 
-    run1 = OpsService.create_run(approved.id)
+    run1 = asyncio.run(OpsService.create_run(approved.id))
     OpsService.update_run_status(run1.id, "done", msg="completed")
 
-    run2 = OpsService.rerun(run1.id)
+    run2 = asyncio.run(OpsService.rerun(run1.id))
 
     assert run2.id != run1.id
     assert run2.rerun_of == run1.id
@@ -301,10 +307,10 @@ def test_phase7_rerun_conflicts_when_source_key_has_active_instance(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d_rerun_active", approved_id="a_rerun_active")
 
-    run1 = OpsService.create_run(approved.id)
+    run1 = asyncio.run(OpsService.create_run(approved.id))
 
     with pytest.raises(RuntimeError) as exc:
-        OpsService.rerun(run1.id)
+        asyncio.run(OpsService.rerun(run1.id))
 
     assert str(exc.value).startswith("RERUN_SOURCE_ACTIVE")
 
@@ -313,10 +319,10 @@ def test_phase7_cancel_then_rerun_creates_new_attempt(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d_cancel_rerun", approved_id="a_cancel_rerun")
 
-    run1 = OpsService.create_run(approved.id)
+    run1 = asyncio.run(OpsService.create_run(approved.id))
     OpsService.update_run_status(run1.id, "cancelled", msg="operator cancelled")
 
-    run2 = OpsService.rerun(run1.id)
+    run2 = asyncio.run(OpsService.rerun(run1.id))
 
     assert run2.id != run1.id
     assert run2.rerun_of == run1.id
@@ -327,7 +333,7 @@ def test_phase7_cancel_then_rerun_creates_new_attempt(tmp_path):
 def test_phase7_merge_lock_ttl_heartbeat_and_recovery(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d2", approved_id="a2")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
 
     lock = OpsService.acquire_merge_lock("repoA", run.id, ttl_seconds=2)
     assert lock["run_id"] == run.id
@@ -383,7 +389,7 @@ def test_phase7_generic_execution_lock_ttl_heartbeat_and_recovery(tmp_path):
 def test_phase7_merge_gate_lock_conflict_sets_merge_locked(tmp_path, monkeypatch):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d3", approved_id="a3")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     _provision_merge_gate_contract(monkeypatch, tmp_path)
 
     OpsService.acquire_merge_lock("repoA", "other_run", ttl_seconds=30)
@@ -398,15 +404,15 @@ def test_phase7_merge_gate_lock_conflict_sets_merge_locked(tmp_path, monkeypatch
 def test_phase7_merge_gate_tests_failure_sets_validation_failed_tests(tmp_path, monkeypatch):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d4", approved_id="a4")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
 
     from tools.gimo_server.services import merge_gate_service as mgs
     _provision_merge_gate_contract(monkeypatch, tmp_path)
 
     monkeypatch.setattr(mgs.GitService, "is_worktree_clean", lambda _base: True)
-    monkeypatch.setattr(mgs.GitService, "run_tests", lambda _base: (False, "tests failed"))
-    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "dry_run_merge", lambda _b, _s, _t: (True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _async_check(False, "tests failed"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _async_check(True, "ok"))
     monkeypatch.setattr(mgs.GitService, "get_head_commit", lambda _base: "abc")
     monkeypatch.setattr(mgs.GitService, "perform_merge", lambda _b, _s, _t: (True, "ok"))
 
@@ -420,14 +426,14 @@ def test_phase7_merge_gate_tests_failure_sets_validation_failed_tests(tmp_path,
 def test_phase7_merge_gate_lint_failure_sets_validation_failed_lint(tmp_path, monkeypatch):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d7", approved_id="a7")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
 
     from tools.gimo_server.services import merge_gate_service as mgs
     _provision_merge_gate_contract(monkeypatch, tmp_path)
 
     monkeypatch.setattr(mgs.GitService, "is_worktree_clean", lambda _base: True)
-    monkeypatch.setattr(mgs.GitService, "run_tests", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck", lambda _base: (False, "lint failed"))
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _async_check(False, "lint failed"))
 
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is True
@@ -439,15 +445,15 @@ def test_phase7_merge_gate_lint_failure_sets_validation_failed_lint(tmp_path, mo
 def test_phase7_merge_gate_dry_run_conflict_sets_merge_conflict(tmp_path, monkeypatch):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d8", approved_id="a8")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
 
     from tools.gimo_server.services import merge_gate_service as mgs
     _provision_merge_gate_contract(monkeypatch, tmp_path)
 
     monkeypatch.setattr(mgs.GitService, "is_worktree_clean", lambda _base: True)
-    monkeypatch.setattr(mgs.GitService, "run_tests", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "dry_run_merge", lambda _b, _s, _t: (False, "conflict"))
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _async_check(False, "conflict"))
 
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is True
@@ -463,7 +469,7 @@ def test_phase7_merge_gate_detects_baseline_tamper(tmp_path):
     draft.context["policy_hash_runtime"] = "hash_b"
     OpsService._draft_path(draft.id).write_text(draft.model_dump_json(indent=2), encoding="utf-8")
 
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is True
     updated = OpsService.get_run(run.id)
@@ -474,7 +480,7 @@ def test_phase7_merge_gate_detects_baseline_tamper(tmp_path):
 def test_phase7_merge_gate_risk_60_is_hard_block(tmp_path):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d6", approved_id="a6", risk_score=60.0)
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is True
     updated = OpsService.get_run(run.id)
@@ -488,7 +494,7 @@ def test_phase7_merge_gate_requires_policy_decision_id(tmp_path):
     draft.context.pop("policy_decision_id", None)
     OpsService._draft_path(draft.id).write_text(draft.model_dump_json(indent=2), encoding="utf-8")
 
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is True
     updated = OpsService.get_run(run.id)
@@ -502,7 +508,7 @@ def test_phase7_merge_gate_policy_review_requires_human(tmp_path):
     draft.context["policy_decision"] = "review"
     OpsService._draft_path(draft.id).write_text(draft.model_dump_json(indent=2), encoding="utf-8")
 
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is True
     updated = OpsService.get_run(run.id)
@@ -513,7 +519,7 @@ def test_phase7_merge_gate_policy_review_requires_human(tmp_path):
 def test_resume_run_route_requeues_same_run(tmp_path, client):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d_resume", approved_id="a_resume")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     OpsService.update_run_status(run.id, "running", msg="Execution started")
     OpsService.update_run_status(run.id, "HUMAN_APPROVAL_REQUIRED", msg="Awaiting handover")
 
@@ -539,7 +545,7 @@ def test_phase7_merge_gate_missing_intent_defaults_low_risk_path(tmp_path):
     draft.context.pop("intent_effective", None)
     OpsService._draft_path(draft.id).write_text(draft.model_dump_json(indent=2), encoding="utf-8")
 
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
     ok = asyncio.run(MergeGateService.execute_run(run.id))
     assert ok is False
     updated = OpsService.get_run(run.id)
@@ -550,15 +556,15 @@ def test_phase7_merge_gate_missing_intent_defaults_low_risk_path(tmp_path):
 def test_phase7_merge_gate_post_merge_failure_triggers_rollback(tmp_path, monkeypatch):
     _setup_ops_dirs(tmp_path)
     _, approved = _seed_draft_and_approved(draft_id="d12", approved_id="a12")
-    run = OpsService.create_run(approved.id)
+    run = asyncio.run(OpsService.create_run(approved.id))
 
     from tools.gimo_server.services import merge_gate_service as mgs
     _provision_merge_gate_contract(monkeypatch, tmp_path)
 
     monkeypatch.setattr(mgs.GitService, "is_worktree_clean", lambda _base: True)
-    monkeypatch.setattr(mgs.GitService, "run_tests", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck", lambda _base: (True, "ok"))
-    monkeypatch.setattr(mgs.GitService, "dry_run_merge", lambda _b, _s, _t: (True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_tests_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "run_lint_typecheck_async", _async_check(True, "ok"))
+    monkeypatch.setattr(mgs.GitService, "dry_run_merge_async", _async_check(True, "ok"))
     monkeypatch.setattr(mgs.GitService, "perform_merge", lambda _b, _s, _t: (True, "ok"))
     monkeypatch.setattr(mgs.GitService, "rollback_to_commit", lambda _b, _c: (True, "rollback ok"))
 
@@ -0,0 +1,268 @@
+"""Run leases: atomic claims, expiry-driven reclamation, fair-share admission
+and several worker processes sharing one ops store."""
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tools.gimo_server.ops_models import OpsConfig, OpsRun
+from tools.gimo_server.services.execution import run_worker as rw_mod
+from tools.gimo_server.services.ops import OpsService
+
+
+def _point_ops_at(ops_dir: Path) -> None:
+    OpsService.OPS_DIR = ops_dir
+    OpsService.DRAFTS_DIR = ops_dir / "drafts"
+    OpsService.APPROVED_DIR = ops_dir / "approved"
+    OpsService.RUNS_DIR = ops_dir / "runs"
+    OpsService.RUN_EVENTS_DIR = ops_dir / "run_events"
+    OpsService.RUN_LOGS_DIR = ops_dir / "run_logs"
+    OpsService.LOCKS_DIR = ops_dir / "locks"
+    OpsService.LOCK_FILE = ops_dir / ".ops.lock"
+    OpsService.ensure_dirs()
+
+
+@pytest.fixture
+def ops_dir(monkeypatch, tmp_path):
+    for attr in (
+        "OPS_DIR", "DRAFTS_DIR", "APPROVED_DIR", "RUNS_DIR", "RUN_EVENTS_DIR",
+        "RUN_LOGS_DIR", "LOCKS_DIR", "LOCK_FILE",
+    ):
+        monkeypatch.setattr(OpsService, attr, getattr(OpsService, attr))
+    _point_ops_at(tmp_path / "ops")
+    return tmp_path / "ops"
+
+
+def _pending(run_id: str, *, repo_id: str = "default", priority: int = 0, age_s: float = 0.0) -> OpsRun:
+    run = OpsRun(
+        id=run_id,
+        approved_id=f"a_{run_id}",
+        status="pending",
+        repo_id=repo_id,
+        priority=priority,
+        created_at=datetime.now(timezone.utc) - timedelta(seconds=age_s),
+    )
+    OpsService._persist_run(run)
+    return run
+
+
+def test_claim_is_exclusive_until_the_lease_expires(ops_dir):
+    _pending("r1")
+    lease = OpsService.claim_run("r1", "w1", ttl_seconds=0.3, share_key="repo-a")
+    assert lease and lease["owner_id"] == "w1"
+    assert OpsService.get_run("r1").status == "running"
+    assert OpsService.claim_run("r1", "w2", ttl_seconds=0.3) is None
+    assert OpsService.renew_run_lease("r1", "w1", ttl_seconds=0.3)
+    assert not OpsService.renew_run_lease("r1", "w2", ttl_seconds=0.3)
+    assert OpsService.reclaim_expired_run_leases() == []
+
+    time.sleep(0.35)
+    assert OpsService.reclaim_expired_run_leases() == ["r1"]
+    assert OpsService.get_run("r1").status == "pending"
+    assert OpsService.list_run_leases() == []
+    # The crashed owner cannot resurrect its lease; a new owner can claim.
+    assert not OpsService.renew_run_lease("r1", "w1", ttl_seconds=0.3)
+    assert OpsService.claim_run("r1", "w2", ttl_seconds=5)
+    OpsService.release_run_lease("r1", "w1")  # not the owner: no-op
+    assert len(OpsService.list_run_leases()) == 1
+    OpsService.release_run_lease("r1", "w2")
+    assert OpsService.list_run_leases() == []
+
+
+def test_finished_runs_are_not_reclaimed(ops_dir):
+    _pending("r1")
+    assert OpsService.claim_run("r1", "w1", ttl_seconds=0.05)
+    OpsService.update_run_status("r1", "done")
+    time.sleep(0.1)
+    assert OpsService.reclaim_expired_run_leases() == []
+    assert OpsService.get_run("r1").status == "done"
+    assert OpsService.list_run_leases() == []
+
+
+def test_admission_order_priority_then_weighted_share():
+    def run(run_id, repo, priority=0, age=0):
+        return SimpleNamespace(
+            id=run_id, repo_id=repo, priority=priority,
+            created_at=datetime(2026, 1, 1, tzinfo=timezone.utc) - timedelta(seconds=age),
+        )
+
+    flood = [run(f"a{i}", "a", age=100 - i) for i in range(6)]
+    pending = flood + [run("b0", "b", age=10), run("b1", "b", age=9), run("c0", "c", age=5), run("urgent", "d", priority=5)]
+    order = [r.id for r in rw_mod._admission_order(pending, active={}, weights={})]
+    assert order[0] == "urgent"
+    assert order[1:7] == ["a0", "b0", "c0", "a1", "b1", "a2"]
+
+    # "a" already holds two leases elsewhere; "b" weighs twice as much.
+    order = [r.id for r in rw_mod._admission_order(pending[:8], active={"a": 2}, weights={"b": 2.0})]
+    assert order[:3] == ["b0", "b1", "a0"]
+
+
+@pytest.mark.asyncio
+async def test_tick_lists_pending_once_and_skips_runs_claimed_elsewhere():
+    runs = [SimpleNamespace(id=f"r{i}", status="pending", repo_id=None) for i in range(3)]
+    with patch.object(rw_mod, "OpsService") as ops, \
+         patch.dict("sys.modules", {"tools.gimo_server.services.authority": MagicMock(
+             ExecutionAuthority=MagicMock(get=MagicMock(side_effect=RuntimeError("not initialized"))),
+         )}):
+        ops.get_config.return_value = SimpleNamespace(max_concurrent_runs=2, run_share_weights={})
+        ops.list_pending_runs.return_value = runs
+        ops.list_run_leases.return_value = []
+        ops.reclaim_expired_run_leases.return_value = []
+        ops.claim_run.side_effect = lambda run_id, *a, **k: None if run_id == "r0" else {"run_id": run_id}
+        worker = rw_mod.RunWorker()
+        with patch.object(worker, "_execute_leased_run", new=MagicMock(side_effect=lambda run_id: asyncio.sleep(0))):
+            await worker._tick()
+    assert ops.list_pending_runs.call_count == 1
+    assert worker._running_ids == {"r1", "r2"}
+    ops.get_runs_by_status.assert_called_once_with("running")
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_cancels_the_local_execution(monkeypatch):
+    monkeypatch.setattr(rw_mod, "RUN_LEASE_TTL_SECONDS", 0.15)
+    started = asyncio.Event()
+    cancelled = []
+
+    async def _long_run(run_id):
+        started.set()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(run_id)
+            raise
+
+    with patch.object(rw_mod, "OpsService") as ops:
+        ops.renew_run_lease.return_value = False
+        worker = rw_mod.RunWorker()
+        monkeypatch.setattr(worker, "_execute_run", _long_run)
+        await asyncio.wait_for(worker._execute_leased_run("r1"), timeout=2)
+    assert cancelled == ["r1"]
+    ops.release_run_lease.assert_called_once_with("r1", worker._owner_id)
+
+
+# ---------------------------------------------------------------------------
+# Multi-process soak
+# ---------------------------------------------------------------------------
+
+def _journal(path: Path, **event) -> None:
+    line = (json.dumps({**event, "pid": os.getpid(), "t": time.time()}) + "\n").encode()
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _soak_worker(ops_dir: str, journal: str, crash_p: float, seed: int, deadline: float) -> None:
+    _point_ops_at(Path(ops_dir))
+    rw_mod.RUN_LEASE_TTL_SECONDS = 0.6
+    rw_mod.RECLAIM_TIMEOUT_SECONDS = 3600
+    OpsService.get_config = classmethod(lambda cls: OpsConfig(max_concurrent_runs=2))
+    rng = random.Random(seed)
+    journal_path = Path(journal)
+
+    async def _fake_execute(self, run_id):
+        _journal(journal_path, event="start", run=run_id)
+        await asyncio.sleep(rng.uniform(0.02, 0.08))
+        if rng.random() < crash_p:
+            _journal(journal_path, event="crash", run=run_id)
+            os._exit(3)
+        OpsService.update_run_status(run_id, "done")
+        _journal(journal_path, event="end", run=run_id)
+        self._running_ids.discard(run_id)
+
+    rw_mod.RunWorker._execute_run = _fake_execute
+
+    async def _main():
+        worker = rw_mod.RunWorker()
+        while time.time() < deadline:
+            await worker._tick()
+            await asyncio.sleep(0.02)
+            if not worker._run_tasks and not OpsService.list_run_leases() and not OpsService.list_pending_runs():
+                break
+        await asyncio.gather(*worker._run_tasks, return_exceptions=True)
+
+    asyncio.run(_main())
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(180)
+def test_soak_multi_process_workers_with_crashes(ops_dir, tmp_path):
+    """Four workers over one store; some die mid-run and are replaced.
+
+    Checks: every run finishes exactly once, a run is never executed by two
+    live workers at the same time, and the flooding workspace does not
+    starve the others.
+    """
+    journal = tmp_path / "journal.jsonl"
+    for i in range(40):
+        _pending(f"a{i:02d}", repo_id="repo-a", age_s=100 - i)
+    for tenant in ("b", "c"):
+        for i in range(6):
+            _pending(f"{tenant}{i:02d}", repo_id=f"repo-{tenant}", age_s=50 - i)
+    total = 52
+
+    ctx = multiprocessing.get_context("fork")
+    deadline = time.time() + 120
+    seed = 0
+    procs = []
+    crashed_pids = set()
+
+    def _spawn(crash_p):
+        nonlocal seed
+        seed += 1
+        proc = ctx.Process(target=_soak_worker, args=(str(ops_dir), str(journal), crash_p, seed, deadline))
+        proc.start()
+        procs.append(proc)
+
+    for _ in range(4):
+        _spawn(0.08)
+    while time.time() < deadline:
+        for proc in list(procs):
+            if proc.exitcode is None:
+                continue
+            procs.remove(proc)
+            if proc.exitcode != 0:
+                crashed_pids.add(proc.pid)
+                _spawn(0.08 if len(crashed_pids) < 6 else 0.0)
+        if not procs:
+            break
+        time.sleep(0.05)
+    for proc in procs:
+        proc.join(timeout=10)
+
+    events = [json.loads(line) for line in journal.read_text().splitlines()]
+    crash_at = {e["pid"]: e["t"] for e in events if e["event"] == "crash"}
+    assert set(crash_at) == crashed_pids
+
+    ends = [e["run"] for e in events if e["event"] == "end"]
+    assert sorted(ends) == sorted(set(ends)) and len(ends) == total
+    assert all(run.status == "done" for run in OpsService.list_runs())
+
+    # Attempts of one run never overlap: each attempt but the last belongs to
+    # a worker that died before the next attempt started.
+    attempts = {}
+    for e in events:
+        if e["event"] == "start":
+            attempts.setdefault(e["run"], []).append(e)
+    for run_id, starts in attempts.items():
+        starts.sort(key=lambda e: e["t"])
+        for prev, nxt in zip(starts, starts[1:]):
+            assert prev["pid"] in crash_at, f"{run_id} restarted while {prev['pid']} was alive"
+            assert crash_at[prev["pid"]] <= nxt["t"]
+
+    # Fairness: "a" queued 40 runs before "b"/"c" queued 6 each, yet within
+    # the first 18 admissions each small workspace gets most of its runs.
+    first_starts = sorted((starts[0]["t"], run_id) for run_id, starts in attempts.items())
+    head = [run_id[0] for _, run_id in first_starts[:18]]
+    assert head.count("b") >= 4 and head.count("c") >= 4
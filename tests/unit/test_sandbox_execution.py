@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import json
 from pathlib import Path
@@ -64,9 +65,21 @@ async def test_merge_gate_does_not_require_source_worktree(monkeypatch, tmp_path
 
     monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.add_worktree", _add)
     monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.remove_worktree", _remove)
-    monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.run_tests", lambda base_dir: (calls["tests"].append(base_dir) or True, "ok"))
-    monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.run_lint_typecheck", lambda base_dir: (calls["lint"].append(base_dir) or True, "ok"))
-    monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.dry_run_merge", lambda *a: (calls["dry"].append(a) or True, "ok"))
+    async def _tests(base_dir, **_kwargs):
+        calls["tests"].append(base_dir)
+        return True, "ok"
+
+    async def _lint(base_dir, **_kwargs):
+        calls["lint"].append(base_dir)
+        return True, "ok"
+
+    async def _dry(*a, **_kwargs):
+        calls["dry"].append(a)
+        return True, "ok"
+
+    monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.run_tests_async", _tests)
+    monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.run_lint_typecheck_async", _lint)
+    monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.dry_run_merge_async", _dry)
     monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.get_head_commit", lambda base_dir: "c1")
     monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.perform_merge", lambda *a: (calls["merge"].append(a) or True, "ok"))
     monkeypatch.setattr("tools.gimo_server.services.merge_gate_service.GitService.rollback_to_commit", lambda *a: (True, "ok"))
@@ -414,13 +427,84 @@ def test_create_run_provisions_workspace_and_copies_validated_task_spec(monkeypa
         lambda run_id, repo_path, base_ref="main": SimpleNamespace(worktree_path=workspace),
     )
 
-    run = OpsService.create_run("a_1")
+    run = asyncio.run(OpsService.create_run("a_1"))
 
     assert run.validated_task_spec is not None
     assert run.validated_task_spec["workspace_path"] == str(workspace)
     assert run.validated_task_spec["repo_handle"] == "repo_h"
 
 
+def test_create_run_draws_from_sandbox_pool_and_returns_slot_on_failure(monkeypatch, tmp_path):
+    from tools.gimo_server.config import get_settings
+    from tools.gimo_server.models.core import OpsApproved, OpsDraft
+
+    _setup_spawn_ops_dirs(tmp_path)
+    spec = {"base_commit": "abc123", "repo_handle": "repo_h", "allowed_paths": ["app.py"]}
+    for suffix in ("ok", "fail"):
+        draft = OpsDraft(id=f"d_pool_{suffix}", prompt="p", context={"validated_task_spec": spec})
+        approved = OpsApproved(id=f"a_pool_{suffix}", draft_id=draft.id, prompt="p", content="p")
+        OpsService._draft_path(draft.id).write_text(draft.model_dump_json(indent=2), encoding="utf-8")
+        OpsService._approved_path(approved.id).write_text(approved.model_dump_json(indent=2), encoding="utf-8")
+
+    class _Pool:
+        def __init__(self):
+            self.acquired, self.released = [], []
+
+        async def acquire(self, source_repo, base_ref, *, branch_name):
+            path = get_settings().ephemeral_repos_dir / "_pool" / f"slot{len(self.acquired)}"
+            self.acquired.append((base_ref, path))
+            return path
+
+        def release(self, sandbox_path, *, reusable=True):
+            self.released.append(sandbox_path)
+            return True
+
+    pool = _Pool()
+    monkeypatch.setenv("ORCH_SANDBOX_POOL", "1")
+    monkeypatch.setattr(SandboxService, "_pool", pool)
+    monkeypatch.setattr(
+        "tools.gimo_server.services.app_session_service.AppSessionService.get_path_from_handle",
+        lambda handle: str(tmp_path / "repo"),
+    )
+
+    run = asyncio.run(OpsService.create_run("a_pool_ok"))
+    assert pool.acquired == [("abc123", get_settings().ephemeral_repos_dir / "_pool" / "slot0")]
+    assert run.validated_task_spec["workspace_path"] == str(pool.acquired[0][1])
+
+    # An active run for the same key is rejected before any sandbox is taken.
+    with pytest.raises(RuntimeError, match="RUN_ALREADY_ACTIVE"):
+        asyncio.run(OpsService.create_run("a_pool_ok"))
+    assert len(pool.acquired) == 1
+
+    def _fail(*_args, **_kwargs):
+        raise RuntimeError("RUN_ALREADY_ACTIVE:r_raced")
+
+    monkeypatch.setattr(OpsService, "_register_run", _fail)
+    with pytest.raises(RuntimeError, match="r_raced"):
+        asyncio.run(OpsService.create_run("a_pool_fail"))
+    assert pool.released == [pool.acquired[1][1].resolve()]
+
+
+def test_unpooled_sandbox_is_cloned_off_the_event_loop(monkeypatch):
+    import threading
+
+    monkeypatch.delenv("ORCH_SANDBOX_POOL", raising=False)
+    threads = []
+
+    def _clone(run_id, repo_path, base_ref="main"):
+        threads.append(threading.get_ident())
+        return SimpleNamespace(worktree_path=Path(repo_path) / run_id)
+
+    monkeypatch.setattr(SandboxService, "create_worktree_handle", _clone)
+
+    async def _acquire():
+        handle = await SandboxService.acquire_worktree_handle("r_1", "/repo", base_ref="HEAD")
+        return handle, threading.get_ident()
+
+    handle, loop_thread = asyncio.run(_acquire())
+    assert handle.worktree_path == Path("/repo") / "r_1"
+    assert threads and loop_thread not in threads
+
 def test_create_run_can_target_source_repo_for_sovereign_surface(monkeypatch, tmp_path):
     from tools.gimo_server.models.core import OpsApproved, OpsDraft
     from tools.gimo_server.services.ops import OpsService
@@ -469,7 +553,7 @@ def test_create_run_can_target_source_repo_for_sovereign_surface(monkeypatch, tm
         lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("sandbox must not be created")),
     )
 
-    run = OpsService.create_run("a_2")
+    run = asyncio.run(OpsService.create_run("a_2"))
 
     assert run.validated_task_spec is not None
     assert run.validated_task_spec["workspace_mode"] == "source_repo"
@@ -538,7 +622,7 @@ def test_create_run_uses_app_bound_snapshot_for_chatgpt_surface(monkeypatch, tmp
         _create_handle,
     )
 
-    run = OpsService.create_run("a_app")
+    run = asyncio.run(OpsService.create_run("a_app"))
 
     assert observed_repo_paths == [str(app_snapshot)]
     assert run.validated_task_spec is not None
@@ -597,4 +681,4 @@ def test_create_run_for_chatgpt_surface_fails_closed_without_bound_snapshot(monk
     )
 
     with pytest.raises(RuntimeError, match="CHATGPT_APP_REPO_SNAPSHOT_UNAVAILABLE"):
-        OpsService.create_run("a_app_missing")
+        asyncio.run(OpsService.create_run("a_app_missing"))
@@ -0,0 +1,216 @@
+"""Tests for SandboxPool — shared-clone sandboxes recycled across runs."""
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from tools.gimo_server.services.execution.sandbox_pool import SandboxPool
+from tools.gimo_server.services.execution.sandbox_service import SandboxHandle, SandboxService
+from tools.gimo_server.services.git_service import GitService
+
+
+@pytest.fixture(autouse=True)
+def _disable_commit_signing(monkeypatch):
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "commit.gpgSign")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "false")
+
+
+def _make_repo(path: Path, files: int = 3) -> tuple[str, str]:
+    path.mkdir(parents=True)
+    GitService._run_git(path, ["init", "-q"])
+    for i in range(files):
+        (path / f"f{i}.txt").write_text(f"v1-{i}")
+    first = GitService.commit_all(path, "first")
+    (path / "f0.txt").write_text("v2")
+    (path / "added.txt").write_text("new")
+    second = GitService.commit_all(path, "second")
+    return first, second
+
+
+def _branches(path: Path) -> list[str]:
+    _, out, _ = GitService._run_git(path, ["for-each-ref", "--format=%(refname:short)", "refs/heads"])
+    return out.splitlines()
+
+
+def test_acquire_checks_out_base_in_shared_clone(tmp_path):
+    first, _ = _make_repo(tmp_path / "src")
+    pool = SandboxPool(tmp_path / "pool")
+
+    path = asyncio.run(pool.acquire(tmp_path / "src", first, branch_name="gimo_a"))
+
+    assert path.is_relative_to(tmp_path / "pool")
+    assert (path / ".git" / "objects" / "info" / "alternates").exists()
+    assert GitService.get_head_commit(path) == first
+    assert GitService.get_current_branch(path) == "gimo_a"
+    assert (path / "f0.txt").read_text() == "v1-0"
+    assert not (path / "added.txt").exists()
+
+
+def test_release_recycles_and_resets_dirty_tree(tmp_path):
+    first, second = _make_repo(tmp_path / "src")
+    pool = SandboxPool(tmp_path / "pool")
+
+    async def _run():
+        a = await pool.acquire(tmp_path / "src", first, branch_name="gimo_a")
+        (a / "f1.txt").write_text("dirty")
+        (a / "scratch.log").write_text("junk")
+        (a / "build").mkdir()
+        assert pool.release(a)
+        b = await pool.acquire(tmp_path / "src", second, branch_name="gimo_b")
+        return a, b
+
+    a, b = asyncio.run(_run())
+    assert a == b
+    assert GitService.get_head_commit(b) == second
+    assert (b / "f1.txt").read_text() == "v1-1"
+    assert (b / "f0.txt").read_text() == "v2"
+    assert not (b / "scratch.log").exists() and not (b / "build").exists()
+    assert _branches(b) == ["gimo_b"]
+    assert pool.stats()["created"] == 1 and pool.stats()["reused"] == 1
+
+
+def test_max_idle_and_overflow_limits(tmp_path):
+    first, _ = _make_repo(tmp_path / "src")
+    pool = SandboxPool(tmp_path / "pool", max_size=2, max_idle=1)
+
+    async def _run():
+        return await asyncio.gather(*(
+            pool.acquire(tmp_path / "src", first, branch_name=f"gimo_{i}") for i in range(3)
+        ))
+
+    paths = asyncio.run(_run())
+    assert len(set(paths)) == 3
+    assert pool.stats()["overflow"] == 1
+    for p in paths:
+        pool.release(p)
+    stats = pool.stats()
+    assert (stats["idle"], stats["in_use"]) == (1, 0)
+    assert sum(1 for p in paths if p.exists()) == 1
+
+
+def test_tampered_sandbox_is_destroyed(tmp_path):
+    first, _ = _make_repo(tmp_path / "src")
+    pool = SandboxPool(tmp_path / "pool")
+    path = asyncio.run(pool.acquire(tmp_path / "src", first, branch_name="gimo_a"))
+    hook = path / ".git" / "hooks" / "post-checkout"
+    hook.write_text("#!/bin/sh\necho pwned\n")
+
+    assert pool.release(path)
+    assert not path.exists()
+    assert pool.stats()["tampered"] == 1
+    assert pool.release(path) is False
+
+
+def test_idle_ttl_expires_slots(tmp_path):
+    first, _ = _make_repo(tmp_path / "src")
+    pool = SandboxPool(tmp_path / "pool", idle_ttl_seconds=0.0)
+    a = asyncio.run(pool.acquire(tmp_path / "src", first, branch_name="gimo_a"))
+    pool.release(a)
+    assert pool.stats()["idle"] == 0
+    assert not a.exists()
+
+
+def test_sandbox_service_uses_pool_when_enabled(monkeypatch, tmp_path):
+    first, _ = _make_repo(tmp_path / "src")
+    settings = SimpleNamespace(
+        ephemeral_repos_dir=tmp_path / "ephemeral",
+        repo_mirrors_dir=tmp_path / "mirrors",
+        purge_quarantine_dir=tmp_path / "quarantine",
+    )
+    monkeypatch.setattr("tools.gimo_server.services.execution.sandbox_service.get_settings", lambda: settings)
+    monkeypatch.setattr(SandboxService, "_pool", None)
+
+    cloned = []
+    monkeypatch.setattr(
+        SandboxService, "create_worktree_handle",
+        classmethod(lambda cls, run_id, repo_path, base_ref="main": cloned.append(run_id) or "clone"),
+    )
+    monkeypatch.delenv("ORCH_SANDBOX_POOL", raising=False)
+    assert asyncio.run(SandboxService.acquire_worktree_handle("r0", str(tmp_path / "src"), first)) == "clone"
+    assert cloned == ["r0"]
+
+    monkeypatch.setenv("ORCH_SANDBOX_POOL", "1")
+    handle = asyncio.run(SandboxService.acquire_worktree_handle("r1", str(tmp_path / "src"), first))
+    assert isinstance(handle, SandboxHandle) and handle.pooled
+    assert handle.worktree_path.is_relative_to(settings.ephemeral_repos_dir / "_pool")
+    assert SandboxService.cleanup_worktree(handle) is True
+    assert handle.worktree_path.exists()  # recycled, not destroyed
+    assert SandboxService.get_pool().stats()["idle"] == 1
+
+
+def _private_bytes(root: Path, shared_inodes: set) -> int:
+    total = 0
+    seen = set()
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            st = os.lstat(os.path.join(dirpath, name))
+            key = (st.st_dev, st.st_ino)
+            if key in shared_inodes or key in seen:
+                continue
+            seen.add(key)
+            total += st.st_blocks * 512
+    return total
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(900)
+def test_benchmark_acquisition_latency_and_disk(tmp_path, monkeypatch):
+    """Per-run clone vs pooled shared clone on a repo with many files.
+
+    File count via ``GIMO_SANDBOX_BENCH_FILES`` (default 50000).
+    """
+    from tools.gimo_server.services.ephemeral_repo_service import EphemeralRepoService
+
+    n_files = int(os.environ.get("GIMO_SANDBOX_BENCH_FILES", "50000"))
+    # A full clone of a 50k-file tree can exceed the default git timeout.
+    monkeypatch.setattr("tools.gimo_server.services.git_service.SUBPROCESS_TIMEOUT", 600)
+    src = tmp_path / "src"
+    src.mkdir()
+    GitService._run_git(src, ["init", "-q"])
+    for i in range(n_files):
+        d = src / f"d{i // 1000:03d}"
+        if i % 1000 == 0:
+            d.mkdir()
+        (d / f"f{i}.py").write_text(f"x = {i}\n")
+    GitService._run_git(src, ["add", "-A"], timeout=600)
+    GitService._run_git(
+        src, ["-c", "user.name=b", "-c", "user.email=b@x", "commit", "-qm", "bulk"], timeout=600,
+    )
+    base = GitService.get_head_commit(src)
+    shared = {
+        (st.st_dev, st.st_ino)
+        for dirpath, _d, files in os.walk(src / ".git")
+        for st in (os.lstat(os.path.join(dirpath, f)) for f in files)
+    }
+    runs = 3
+
+    svc = EphemeralRepoService(tmp_path / "eph", tmp_path / "mir", tmp_path / "q")
+    clone_bytes = []
+    for i in range(runs):
+        ws = svc.create_ephemeral_workspace(src, base, branch_name=f"gimo_{i}", workspace_id=f"w{i}")
+        clone_bytes.append(_private_bytes(ws, shared))
+        svc.destroy_workspace(ws)
+
+    pool = SandboxPool(tmp_path / "eph" / "_pool", max_idle=1)
+
+    async def _pooled():
+        sizes = []
+        for i in range(runs):
+            ws = await pool.acquire(src, base, branch_name=f"gimo_{i}")
+            (ws / "d000" / "f0.py").write_text("changed\n")
+            sizes.append(_private_bytes(ws, shared))
+            pool.release(ws)
+        return sizes
+
+    pool_bytes = asyncio.run(_pooled())
+    # Clones allocate a fresh tree per run; the pool allocates one slot and
+    # rewrites only changed files afterwards.
+    clone_total, pool_total = sum(clone_bytes), pool_bytes[-1]
+    assert pool_total < clone_total / 2
+    stats = pool.stats()
+    assert (stats["created"], stats["reused"], stats["recycled"]) == (1, runs - 1, runs)
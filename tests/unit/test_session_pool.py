@@ -1,4 +1,4 @@
-"""Unit tests for SessionPool — LRU eviction and concurrent access."""
+"""Unit tests for SessionPool — LRU eviction, single-flight loads and refcounting."""
 from __future__ import annotations
 
 import asyncio
@@ -17,7 +17,11 @@ from tools.gimo_server.inference.contracts import (
     QuantizationType,
 )
 from tools.gimo_server.inference.runtime.base_adapter import SessionHandle
-from tools.gimo_server.inference.runtime.session_pool import SessionPool, _pool_key
+from tools.gimo_server.inference.runtime.session_pool import (
+    PoolAdmissionError,
+    SessionPool,
+    _pool_key,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -61,12 +65,31 @@ class FakeAdapter:
         session._backend = None
 
 
-def _spec(model_id: str) -> ModelSpec:
+class SlowAdapter(FakeAdapter):
+    """Fake adapter whose load takes *delay* seconds (simulates a multi-GB GGUF)."""
+
+    def __init__(self, delay: float, memory_per_session_mb: float = 1000.0) -> None:
+        super().__init__(memory_per_session_mb)
+        self._delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def load_model(self, spec: ModelSpec, device: HardwareTarget) -> SessionHandle:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+            return await super().load_model(spec, device)
+        finally:
+            self.in_flight -= 1
+
+
+def _spec(model_id: str, size_mb: float = 0.0) -> ModelSpec:
     return ModelSpec(
         model_id=model_id,
         path=Path(f"/fake/{model_id}.onnx"),
         format=ModelFormat.ONNX,
-        size_bytes=0,
+        size_bytes=int(size_mb * 1024 * 1024),
     )
 
 
@@ -248,6 +271,137 @@ class TestLoadError:
         assert pool.metrics.load_errors == 1
 
 
+# ---------------------------------------------------------------------------
+# Tests — concurrency: single-flight, lock-free hits, refcounting, admission
+# ---------------------------------------------------------------------------
+
+class TestConcurrentLoading:
+    @pytest.mark.asyncio
+    async def test_hit_not_blocked_by_cold_load(self):
+        pool = SessionPool(max_sessions=4)
+        fast = FakeAdapter()
+        await pool.get_or_load(_spec("warm"), HardwareTarget.CPU, fast)
+
+        slow = SlowAdapter(delay=0.5)
+        cold = asyncio.create_task(pool.get_or_load(_spec("cold"), HardwareTarget.CPU, slow))
+        await asyncio.sleep(0.01)  # cold load is now in progress
+
+        await pool.get_or_load(_spec("warm"), HardwareTarget.CPU, fast)
+
+        assert not cold.done()  # the hit returned while the cold load was still running
+        await cold
+
+    @pytest.mark.asyncio
+    async def test_unrelated_loads_run_in_parallel(self):
+        pool = SessionPool(max_sessions=4)
+        slow = SlowAdapter(delay=0.2)
+        await asyncio.gather(
+            pool.get_or_load(_spec("a"), HardwareTarget.CPU, slow),
+            pool.get_or_load(_spec("b"), HardwareTarget.CPU, slow),
+            pool.get_or_load(_spec("c"), HardwareTarget.CPU, slow),
+        )
+        assert slow.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_same_key_is_single_flight(self):
+        pool = SessionPool(max_sessions=4)
+        slow = SlowAdapter(delay=0.1)
+        handles = await asyncio.gather(*[
+            pool.get_or_load(_spec("m1"), HardwareTarget.CPU, slow) for _ in range(5)
+        ])
+        assert slow.loaded == ["m1"]
+        assert len({h.session_id for h in handles}) == 1
+        assert pool.metrics.misses == 1
+        assert pool.metrics.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_load_propagates_to_waiters(self):
+        pool = SessionPool(max_sessions=4)
+
+        class BrokenSlow(SlowAdapter):
+            async def load_model(self, spec, device):
+                await asyncio.sleep(0.05)
+                raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *[pool.get_or_load(_spec("m1"), HardwareTarget.CPU, BrokenSlow(0)) for _ in range(3)],
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert pool.metrics.load_errors == 1
+        assert pool.loading_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_the_load_to_a_waiter(self):
+        pool = SessionPool(max_sessions=4)
+        slow = SlowAdapter(delay=0.1)
+        leader = asyncio.create_task(pool.get_or_load(_spec("m1"), HardwareTarget.CPU, slow))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(pool.get_or_load(_spec("m1"), HardwareTarget.CPU, slow)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        handles = await asyncio.gather(*waiters)
+        assert leader.cancelled()
+        assert len({h.session_id for h in handles}) == 1
+        assert slow.loaded == ["m1"]
+        assert pool.metrics.misses == 2  # the abandoned load and one takeover
+        assert pool.loading_count() == 0
+
+
+class TestRefcounting:
+    @pytest.mark.asyncio
+    async def test_in_use_session_not_evicted_by_lru(self):
+        pool = SessionPool(max_sessions=1)
+        adapter = FakeAdapter()
+        async with pool.acquire(_spec("m1"), HardwareTarget.CPU, adapter):
+            await pool.get_or_load(_spec("m2"), HardwareTarget.CPU, adapter)
+            assert "m1" not in adapter.unloaded
+            assert pool.is_loaded("m1", HardwareTarget.CPU)
+
+    @pytest.mark.asyncio
+    async def test_explicit_evict_deferred_until_release(self):
+        pool = SessionPool(max_sessions=4)
+        adapter = FakeAdapter()
+        async with pool.acquire(_spec("m1"), HardwareTarget.CPU, adapter) as handle:
+            await pool.evict("m1", HardwareTarget.CPU)
+            assert not pool.is_loaded("m1", HardwareTarget.CPU)
+            assert adapter.unloaded == []
+            assert handle._backend is not None
+        assert adapter.unloaded == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_admission_rejects_when_memory_is_busy(self):
+        pool = SessionPool(max_sessions=4, max_memory_mb=1500.0)
+        adapter = FakeAdapter(memory_per_session_mb=1000.0)
+        async with pool.acquire(_spec("m1"), HardwareTarget.CPU, adapter):
+            with pytest.raises(PoolAdmissionError):
+                await pool.get_or_load(_spec("m2", size_mb=1000.0), HardwareTarget.CPU, adapter)
+        assert pool.metrics.rejected == 1
+        assert adapter.loaded == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_admission_evicts_idle_before_loading(self):
+        pool = SessionPool(max_sessions=4, max_memory_mb=1500.0)
+        adapter = FakeAdapter(memory_per_session_mb=1000.0)
+        await pool.get_or_load(_spec("m1"), HardwareTarget.CPU, adapter)
+        await pool.get_or_load(_spec("m2", size_mb=1000.0), HardwareTarget.CPU, adapter)
+        assert adapter.unloaded == ["m1"]
+        assert pool.total_memory_mb() == pytest.approx(1000.0)
+
+    @pytest.mark.asyncio
+    async def test_admission_counts_in_flight_reservations(self):
+        pool = SessionPool(max_sessions=4, max_memory_mb=1500.0)
+        slow = SlowAdapter(delay=0.1)
+        first = asyncio.create_task(
+            pool.get_or_load(_spec("m1", size_mb=1000.0), HardwareTarget.CPU, slow)
+        )
+        await asyncio.sleep(0.01)
+        with pytest.raises(PoolAdmissionError):
+            await pool.get_or_load(_spec("m2", size_mb=1000.0), HardwareTarget.CPU, slow)
+        await first
+
+
 # ---------------------------------------------------------------------------
 # Tests — _pool_key helper
 # ---------------------------------------------------------------------------
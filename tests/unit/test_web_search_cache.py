@@ -0,0 +1,304 @@
+"""Tests for web search result/page caching and single-flight de-duplication."""
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from tools.gimo_server.models.web_search import (
+    WebSearchFusionResponse,
+    WebSearchQuery,
+    WebSearchResult,
+)
+from tools.gimo_server.services import web_search_cache, web_search_providers
+from tools.gimo_server.services.web_search_cache import PageCache, SearchResultCache, normalize_query
+from tools.gimo_server.services.web_search_content_extractor import extract_content_for_results
+from tools.gimo_server.services.web_search_service import WebSearchService
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _StubBackend:
+    """Local search provider: counts calls, optional latency and failure."""
+
+    def __init__(self, provider: str = "duckduckgo", latency: float = 0.0, fail: bool = False):
+        self.provider = provider
+        self.latency = latency
+        self.fail = fail
+        self.calls: list[tuple[str, int]] = []
+
+    async def __call__(self, query: str, max_results: int):
+        self.calls.append((query, max_results))
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [
+            WebSearchResult(
+                title=f"{query} #{i}",
+                url=f"https://example.com/{self.provider}/{i}",
+                provider=self.provider,
+                relevance_score=round(1.0 - i * 0.01, 2),
+                position=i,
+            )
+            for i in range(max_results)
+        ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(web_search_cache, "RESULT_CACHE", SearchResultCache(ttl_seconds=60, clock=clock))
+    monkeypatch.setattr(web_search_cache, "PAGE_CACHE", PageCache(ttl_seconds=60, clock=clock))
+    return clock
+
+
+@pytest.fixture
+def backend(monkeypatch, clock):
+    stub = _StubBackend()
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "duckduckgo", stub)
+    return stub
+
+
+def _search(text: str, **kwargs):
+    return asyncio.run(WebSearchService.search(WebSearchQuery(query=text, **kwargs)))
+
+
+def test_normalize_query():
+    assert normalize_query("  Python   ASYNCIO?  ") == "python asyncio"
+    assert normalize_query("ｐｙｔｈｏｎ\tasyncio.") == "python asyncio"
+    assert normalize_query("c++ templates") != normalize_query("c templates")
+
+
+def test_near_identical_queries_hit_the_cache(backend):
+    first = _search("Python asyncio", max_results=5)
+    second = _search("  python   ASYNCIO? ", max_results=5)
+
+    assert len(backend.calls) == 1
+    assert not first.cached and second.cached
+    assert second.query == "  python   ASYNCIO? "
+    assert [r.url for r in second.results] == [r.url for r in first.results]
+
+
+def test_smaller_max_results_served_from_wider_entry(backend):
+    _search("rust lifetimes", max_results=10)
+    narrow = _search("rust lifetimes", max_results=3)
+    assert len(backend.calls) == 1 and narrow.cached and len(narrow.results) == 3
+
+    wide = _search("rust lifetimes", max_results=20)
+    assert len(backend.calls) == 2 and not wide.cached and len(wide.results) == 20
+
+
+def test_provider_set_is_part_of_the_key(backend, monkeypatch):
+    monkeypatch.setitem(web_search_providers.PROVIDER_REGISTRY, "brave", _StubBackend("brave"))
+    _search("same query")
+    _search("same query", providers=["brave"])
+    _search("same query", providers=["duckduckgo", "brave"])
+    assert len(backend.calls) == 2
+
+
+def test_ttl_expiry_and_bypass(backend, clock):
+    _search("ttl query")
+    clock.now += 59
+    assert _search("ttl query").cached
+    clock.now += 2
+    assert not _search("ttl query").cached
+    assert len(backend.calls) == 2
+
+    assert not _search("ttl query", use_cache=False).cached
+    assert len(backend.calls) == 3
+
+
+def test_failures_are_not_cached(backend):
+    backend.fail = True
+    failed = _search("outage")
+    assert failed.providers_failed and not failed.results
+
+    backend.fail = False
+    recovered = _search("outage")
+    assert recovered.results and not recovered.cached
+    assert len(backend.calls) == 2
+
+
+def test_result_cache_entry_cap():
+    cache = SearchResultCache(max_entries=2)
+    for text in ("a", "b", "c"):
+        cache.put(cache.key(text, ["duckduckgo"]), WebSearchFusionResponse(query=text), 10)
+    assert len(cache) == 2
+    assert cache.get(cache.key("a", ["duckduckgo"]), 10) is None
+    assert cache.get(cache.key("c", ["duckduckgo"]), 10) is not None
+
+
+def test_cached_results_are_isolated_from_caller_mutation(backend):
+    first = _search("mutation")
+    first.results[0].content = "scribbled"
+    assert _search("mutation").results[0].content is None
+
+
+def test_concurrent_identical_queries_share_one_upstream_call(backend):
+    backend.latency = 0.1
+
+    async def _burst():
+        return await asyncio.gather(*[
+            WebSearchService.search(WebSearchQuery(query=q, max_results=5))
+            for q in ["Parallel Agents"] * 5 + ["parallel agents?"] * 5
+        ])
+
+    responses = asyncio.run(_burst())
+
+    assert len(backend.calls) == 1
+    assert len({id(r) for r in responses}) == 10
+    assert [r.query for r in responses[5:]] == ["parallel agents?"] * 5
+    responses[0].results[0].title = "changed"
+    assert responses[1].results[0].title != "changed"
+    assert len(web_search_cache.SEARCH_FLIGHTS) == 0
+
+
+def test_single_flight_survives_leader_cancellation():
+    flights = web_search_cache.SingleFlight()
+    calls = []
+
+    async def _work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def _main():
+        leader = asyncio.create_task(flights.do("k", _work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", _work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(_main()) == "done"
+    assert calls == [1] and flights.shared == 1
+
+
+class _Origin:
+    """Local page server honouring ETag / Last-Modified validators."""
+
+    def __init__(self) -> None:
+        self.pages: dict[str, dict] = {}
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        page = self.pages.get(str(request.url))
+        if page is None:
+            return httpx.Response(404)
+        headers = dict(page.get("headers", {}))
+        etag = headers.get("ETag")
+        modified = headers.get("Last-Modified")
+        if (etag and request.headers.get("if-none-match") == etag) or (
+            not etag and modified and request.headers.get("if-modified-since") == modified
+        ):
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, text=page["body"], headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def _extract(origin: _Origin, urls):
+    results = [WebSearchResult(title=u, url=u, provider="duckduckgo") for u in urls]
+
+    async def _run():
+        async with origin.client() as client:
+            return await extract_content_for_results(results, client=client)
+
+    return [r.content for r in asyncio.run(_run())]
+
+
+def test_page_cache_revalidates_with_etag(clock):
+    origin = _Origin()
+    url = "https://docs.example.com/a"
+    origin.pages[url] = {"body": "<p>v1</p>", "headers": {"ETag": '"v1"'}}
+
+    assert _extract(origin, [url]) == ["v1"]
+    assert _extract(origin, [url]) == ["v1"]
+    assert len(origin.requests) == 1  # fresh: no request
+
+    clock.now += 61
+    assert _extract(origin, [url]) == ["v1"]
+    assert len(origin.requests) == 2
+    assert origin.requests[-1].headers["if-none-match"] == '"v1"'
+    assert web_search_cache.PAGE_CACHE.revalidated == 1
+
+    # 304 refreshed the entry.
+    assert _extract(origin, [url]) == ["v1"] and len(origin.requests) == 2
+
+    origin.pages[url] = {"body": "<p>v2</p>", "headers": {"ETag": '"v2"'}}
+    clock.now += 61
+    assert _extract(origin, [url]) == ["v2"]
+    assert _extract(origin, [url]) == ["v2"] and len(origin.requests) == 3
+
+
+def test_page_cache_revalidates_with_last_modified(clock):
+    origin = _Origin()
+    url = "https://docs.example.com/b"
+    stamp = "Wed, 21 Oct 2026 07:28:00 GMT"
+    origin.pages[url] = {"body": "<b>hello</b>", "headers": {"Last-Modified": stamp}}
+
+    _extract(origin, [url])
+    clock.now += 61
+    assert _extract(origin, [url]) == ["hello"]
+    assert origin.requests[-1].headers["if-modified-since"] == stamp
+    assert web_search_cache.PAGE_CACHE.revalidated == 1
+
+
+def test_pages_without_validators_or_with_no_store_are_refetched(clock):
+    origin = _Origin()
+    plain, private = "https://docs.example.com/plain", "https://docs.example.com/private"
+    origin.pages[plain] = {"body": "plain"}
+    origin.pages[private] = {"body": "secret", "headers": {"Cache-Control": "no-store"}}
+
+    _extract(origin, [plain, private])
+    _extract(origin, [plain, private])
+    assert [str(r.url) for r in origin.requests].count(private) == 2
+    assert [str(r.url) for r in origin.requests].count(plain) == 1
+
+    clock.now += 61
+    _extract(origin, [plain])
+    assert "if-none-match" not in origin.requests[-1].headers
+    assert [str(r.url) for r in origin.requests].count(plain) == 2
+
+
+def test_stale_page_served_when_origin_fails(clock):
+    origin = _Origin()
+    url = "https://docs.example.com/flaky"
+    origin.pages[url] = {"body": "kept", "headers": {"ETag": '"k"'}}
+    _extract(origin, [url])
+
+    del origin.pages[url]
+    clock.now += 61
+    assert _extract(origin, [url]) == ["kept"]
+    assert _extract(origin, ["https://docs.example.com/missing"]) == [None]
+
+
+def test_page_cache_byte_cap_evicts_lru():
+    cache = PageCache(max_bytes=10)
+    cache.put("a", "aaaa", etag=None, last_modified=None)
+    cache.put("b", "bbbb", etag=None, last_modified=None)
+    cache.lookup("a")
+    cache.put("c", "cccc", etag=None, last_modified=None)
+
+    assert cache.total_bytes == 8 and len(cache) == 2
+    assert cache.lookup("b") == (None, False)
+    cache.put("huge", "x" * 11, etag=None, last_modified=None)
+    assert cache.lookup("huge") == (None, False) and len(cache) == 2
+
+
+def test_concurrent_fetches_of_one_url_share_a_request(clock):
+    origin = _Origin()
+    url = "https://docs.example.com/popular"
+    origin.pages[url] = {"body": "popular", "headers": {"ETag": '"p"'}}
+
+    assert _extract(origin, [url] * 5) == ["popular"] * 5
+    assert len(origin.requests) == 1
@@ -370,15 +370,18 @@ def _build_settings() -> Settings:
     actions_max_payload_bytes = int(os.environ.get("ORCH_ACTIONS_MAX_PAYLOAD_BYTES", str(64 * 1024)))
     subprocess_timeout = int(os.environ.get("ORCH_SUBPROCESS_TIMEOUT", "10"))
     search_exclude_dirs = {"tools", "scripts"}
-    audit_log_path = base_dir / "logs" / "orchestrator_audit.log"
+    audit_log_path = Path(
+        os.environ.get("ORCH_AUDIT_LOG_PATH", str(base_dir / "logs" / "orchestrator_audit.log"))
+    )
     audit_log_max_bytes = int(os.environ.get("ORCH_AUDIT_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
     audit_log_backup_count = int(os.environ.get("ORCH_AUDIT_LOG_BACKUP_COUNT", "5"))
-    ops_data_dir = repo_root_dir / ".orch_data" / "ops"
-    worktrees_dir = repo_root_dir / ".orch_data" / "worktrees"
-    ephemeral_repos_dir = repo_root_dir / ".orch_data" / "ephemeral_repos"
-    repo_mirrors_dir = repo_root_dir / ".orch_data" / "repo_mirrors"
-    app_sessions_dir = repo_root_dir / ".orch_data" / "app_sessions"
-    purge_quarantine_dir = repo_root_dir / ".orch_data" / "purge_quarantine"
+    data_dir = Path(os.environ.get("ORCH_DATA_DIR", str(repo_root_dir / ".orch_data"))).resolve()
+    ops_data_dir = data_dir / "ops"
+    worktrees_dir = data_dir / "worktrees"
+    ephemeral_repos_dir = data_dir / "ephemeral_repos"
+    repo_mirrors_dir = data_dir / "repo_mirrors"
+    app_sessions_dir = data_dir / "app_sessions"
+    purge_quarantine_dir = data_dir / "purge_quarantine"
     ops_run_ttl = int(os.environ.get("ORCH_OPS_RUN_TTL", "86400"))
     debug = os.environ.get("DEBUG", "false").lower() in ("true", "1", "yes")
     log_level = os.environ.get("LOG_LEVEL", "DEBUG" if debug else "INFO").upper()
@@ -1,5 +1,5 @@
 """GIMO Inference Engine — Model Compiler."""
-from .model_cache import ModelCache, compute_checksum
+from .model_cache import ModelCache, cached_checksum, compute_checksum, source_fingerprint
 from .pipeline import CompilationPipeline
 from .quantizer import recommend_quantization, quantize_dynamic
 from .graph_optimizer import optimize as optimize_graph
@@ -7,7 +7,9 @@ from .graph_optimizer import optimize as optimize_graph
 __all__ = [
     "CompilationPipeline",
     "ModelCache",
+    "cached_checksum",
     "compute_checksum",
+    "source_fingerprint",
     "recommend_quantization",
     "quantize_dynamic",
     "optimize_graph",
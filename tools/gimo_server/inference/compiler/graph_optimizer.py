@@ -11,6 +11,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from concurrent.futures import Executor
+from typing import Optional
 
 logger = logging.getLogger("gie.compiler.graph_optimizer")
 
@@ -21,6 +23,7 @@ async def optimize(
     *,
     for_transformer: bool = True,
     optimization_level: str = "all",
+    executor: Optional[Executor] = None,
 ) -> bool:
     """Optimize an ONNX graph and save to *output_path*.
 
@@ -29,13 +32,14 @@ async def optimize(
         output_path:      Destination (may be the same as input for in-place).
         for_transformer:  Apply transformer-specific op fusions (LayerNorm, Gelu, …).
         optimization_level: "basic", "extended", or "all".
+        executor:         Worker pool to run in (default: the loop's executor).
 
     Returns:
         True if optimisation succeeded, False if onnxruntime is unavailable.
     """
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(
-        None,
+        executor,
         _optimize_sync,
         input_path,
         output_path,
@@ -3,16 +3,25 @@
 Cache structure::
 
     ~/.gimo/models/
+        ledger.jsonl            # slot sizes + last-access times (journal)
         <model_id>/
-            <target>_<quant>/
+            <target>_<quant>[-<source tag>]/
                 model.onnx          # compiled artefact
                 metadata.json       # CompiledModelInfo serialised
 
 Invalidation keys:
-    - Source model file SHA-256 hash
+    - Source model tag, part of the slot name: a cheap fingerprint of the
+      source file (size, mtime, inode), or — with ``hash_sources=True`` — its
+      SHA-256, persisted in the ledger and only recomputed when the
+      fingerprint changes.  A replaced source therefore misses, and the stale
+      variant is dropped on the next ``put``.
     - Compiler version string (bumped on breaking changes)
 
 LRU eviction based on last-access timestamp, respecting ``max_cache_gb``.
+Sizes and access times live in an append-only ledger updated on put / get /
+evict, so ``total_size_bytes`` and eviction never walk the cache tree.  The
+journal is compacted once it holds several records per live slot; other
+processes sharing the root pick up appended records on their next access.
 """
 from __future__ import annotations
 
@@ -20,8 +29,12 @@ import hashlib
 import json
 import logging
 import os
+import shutil
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from ..contracts import (
     CompiledModelInfo,
@@ -33,24 +46,145 @@ from ..contracts import (
 logger = logging.getLogger("gie.compiler.cache")
 
 _COMPILER_VERSION = "1.0.0"   # bump when compiled format changes
+_LEDGER_NAME = "ledger.jsonl"
+_COMPACT_MIN_RECORDS = 256    # compact when records > max(this, 4 × live entries)
+
+
+class _SlotLedger:
+    """Append-only journal of ``slot -> {size, atime, ...}`` and source hashes.
+
+    Slots are keyed by their path relative to the cache root.  The in-memory
+    view is rebuilt by replaying the journal; ``refresh`` replays only records
+    appended since the last read (or everything after another process
+    compacted the file).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self.slots: Dict[str, Dict[str, Any]] = {}
+        self.sources: Dict[str, Dict[str, str]] = {}
+        self.total_bytes = 0
+        self._records = 0
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self.lock = threading.RLock()
+
+    def load(self) -> bool:
+        """Replay the journal; returns False if there is none yet."""
+        if not self._path.exists():
+            return False
+        self.refresh()
+        return True
+
+    def refresh(self) -> None:
+        try:
+            st = self._path.stat()
+        except OSError:
+            return
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            self.slots.clear()
+            self.sources.clear()
+            self.total_bytes = 0
+            self._records = 0
+            self._offset = 0
+            self._inode = st.st_ino
+        if st.st_size == self._offset:
+            return
+        try:
+            with self._path.open("rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except OSError as exc:
+            logger.warning("Cannot read cache ledger %s: %s", self._path, exc)
+            return
+        end = chunk.rfind(b"\n") + 1   # ignore a partially written last line
+        for line in chunk[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                logger.debug("Skipping corrupt ledger record: %r", line[:80])
+        self._offset += end
+
+    def record(self, rec: Dict[str, Any]) -> None:
+        self.refresh()
+        self._apply(rec)
+        line = (json.dumps(rec, separators=(",", ":")) + "\n").encode()
+        try:
+            with self._path.open("ab") as f:
+                f.write(line)
+            if self._inode is None:
+                self._inode = self._path.stat().st_ino
+            self._offset += len(line)
+        except OSError as exc:
+            logger.warning("Cannot append to cache ledger %s: %s", self._path, exc)
+        if self._records > max(_COMPACT_MIN_RECORDS, 4 * (len(self.slots) + len(self.sources))):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the journal as one record per live slot / source."""
+        records = [
+            {"op": "source", "path": path, **entry} for path, entry in self.sources.items()
+        ] + [
+            {"op": "put", "slot": key, **entry} for key, entry in self.slots.items()
+        ]
+        payload = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+        tmp = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(payload)
+            os.replace(tmp, self._path)
+            self._inode = self._path.stat().st_ino
+        except OSError as exc:
+            logger.warning("Cannot compact cache ledger %s: %s", self._path, exc)
+            return
+        self._offset = len(payload)
+        self._records = len(records)
+
+    def _apply(self, rec: Dict[str, Any]) -> None:
+        self._records += 1
+        op = rec["op"]
+        if op == "put":
+            entry = {k: v for k, v in rec.items() if k not in ("op", "slot")}
+            old = self.slots.get(rec["slot"])
+            self.total_bytes += int(entry["size"]) - (int(old["size"]) if old else 0)
+            self.slots[rec["slot"]] = entry
+        elif op == "touch":
+            entry = self.slots.get(rec["slot"])
+            if entry is not None:
+                entry["atime"] = rec["atime"]
+        elif op == "evict":
+            old = self.slots.pop(rec["slot"], None)
+            if old is not None:
+                self.total_bytes -= int(old["size"])
+        elif op == "source":
+            self.sources[rec["path"]] = {"fp": rec["fp"], "sha256": rec["sha256"]}
 
 
 class ModelCache:
     """Disk-backed cache for compiled model artefacts.
 
     Args:
-        cache_dir:    Root directory; defaults to ``~/.gimo/models``.
-        max_cache_gb: Soft cap.  LRU eviction runs when exceeded.
+        cache_dir:     Root directory; defaults to ``~/.gimo/models``.
+        max_cache_gb:  Soft cap.  LRU eviction runs when exceeded.
+        hash_sources:  Key slots on the source's SHA-256 (persisted per
+                       fingerprint) instead of the size/mtime/inode fingerprint,
+                       so a touched-but-identical source still hits.
     """
 
     def __init__(
         self,
         cache_dir: Optional[Path] = None,
         max_cache_gb: float = 50.0,
+        *,
+        hash_sources: bool = False,
     ) -> None:
         self._root = cache_dir or (Path.home() / ".gimo" / "models")
         self._max_bytes = int(max_cache_gb * 1024**3)
         self._root.mkdir(parents=True, exist_ok=True)
+        self._hash_sources = hash_sources
+        self._ledger = _SlotLedger(self._root / _LEDGER_NAME)
+        self.evictions = 0
+        if not self._ledger.load():
+            self._rebuild_ledger()
 
     # ------------------------------------------------------------------
     # Read
@@ -61,9 +195,15 @@ class ModelCache:
         model_id: str,
         target: HardwareTarget,
         quantization: QuantizationType,
+        *,
+        source: Optional[Path] = None,
     ) -> Optional[CompiledModelInfo]:
-        """Return cached metadata if a valid compiled model exists, else None."""
-        slot = self._slot(model_id, target, quantization)
+        """Return cached metadata if a valid compiled model exists, else None.
+
+        With *source*, only an artefact compiled from that exact source file
+        (see module docstring) is returned.
+        """
+        slot = self._slot(model_id, target, quantization, source)
         meta_path = slot / "metadata.json"
         compiled_path = slot / "model.onnx"
 
@@ -91,11 +231,8 @@ class ModelCache:
             self._evict_slot(slot)
             return None
 
-        # Update atime for LRU purposes.
-        try:
-            os.utime(meta_path)
-        except OSError:
-            pass
+        # Update last access for LRU purposes.
+        self._touch(slot, data)
 
         return CompiledModelInfo(
             model_id=data["model_id"],
@@ -114,16 +251,22 @@ class ModelCache:
         model_id: str,
         target: HardwareTarget,
         quantization: QuantizationType,
+        *,
+        source: Optional[Path] = None,
     ) -> bool:
-        return self.get(model_id, target, quantization) is not None
+        return self.get(model_id, target, quantization, source=source) is not None
 
     # ------------------------------------------------------------------
     # Write
     # ------------------------------------------------------------------
 
-    def put(self, info: CompiledModelInfo) -> None:
-        """Store compiled model metadata in the cache."""
-        slot = self._slot(info.model_id, info.target_device, info.quantization)
+    def put(self, info: CompiledModelInfo, *, source: Optional[Path] = None) -> None:
+        """Store compiled model metadata in the cache.
+
+        With *source*, the slot is keyed on that source file and variants
+        compiled from an older version of it are evicted.
+        """
+        slot = self._slot(info.model_id, info.target_device, info.quantization, source)
         slot.mkdir(parents=True, exist_ok=True)
 
         data = {
@@ -142,30 +285,77 @@ class ModelCache:
         with meta_path.open("w") as f:
             json.dump(data, f, indent=2)
 
+        variant = _variant(info.target_device, info.quantization)
+        key = self._slot_key(slot)
+        with self._ledger.lock:
+            self._ledger.record({
+                "op": "put",
+                "slot": key,
+                "size": self._measure_slot(slot, info.compiled_path),
+                "atime": time.time(),
+                "model_id": info.model_id,
+                "variant": variant,
+            })
+            if source is not None:
+                stale = [
+                    k for k, entry in self._ledger.slots.items()
+                    if k != key and entry.get("model_id") == info.model_id
+                    and entry.get("variant") == variant
+                ]
+                for k in stale:
+                    logger.info("Source of %s changed; dropping %s", info.model_id, k)
+                    self._evict_slot(self._root / k)
+
         logger.info("Cached compiled model: %s / %s", info.model_id, slot.name)
         self._maybe_evict()
 
+    def publish(
+        self,
+        artefact: Path,
+        model_id: str,
+        target: HardwareTarget,
+        quantization: QuantizationType,
+        *,
+        source: Optional[Path] = None,
+    ) -> Path:
+        """Move a finished *artefact* into its slot atomically; returns the final path.
+
+        Readers see either the previous artefact or the complete new one, never
+        a partial file.  Blocking (copies across filesystems): call off the loop.
+        """
+        slot = self._slot(model_id, target, quantization, source)
+        slot.mkdir(parents=True, exist_ok=True)
+        dest = slot / "model.onnx"
+        try:
+            os.replace(artefact, dest)
+        except OSError:
+            staging = slot / f".model.onnx.{uuid.uuid4().hex}.partial"
+            try:
+                shutil.copy2(artefact, staging)
+                os.replace(staging, dest)
+            finally:
+                staging.unlink(missing_ok=True)
+        return dest
+
     # ------------------------------------------------------------------
     # Eviction
     # ------------------------------------------------------------------
 
     def total_size_bytes(self) -> int:
-        total = 0
-        for path in self._root.rglob("*"):
-            if path.is_file():
-                try:
-                    total += path.stat().st_size
-                except OSError:
-                    pass
-        return total
+        """Bytes held by cached slots, as recorded in the ledger."""
+        with self._ledger.lock:
+            self._ledger.refresh()
+            return self._ledger.total_bytes
 
     def evict_lru(self, target_bytes: int) -> None:
         """Evict LRU slots until total size ≤ target_bytes."""
-        slots = sorted(self._all_slots(), key=lambda p: self._last_access(p))
-        for slot in slots:
-            if self.total_size_bytes() <= target_bytes:
-                break
-            self._evict_slot(slot)
+        with self._ledger.lock:
+            self._ledger.refresh()
+            order = sorted(self._ledger.slots.items(), key=lambda kv: kv[1].get("atime", 0.0))
+            for key, _entry in order:
+                if self._ledger.total_bytes <= target_bytes:
+                    break
+                self._evict_slot(self._root / key)
 
     def _maybe_evict(self) -> None:
         if self.total_size_bytes() > self._max_bytes:
@@ -174,12 +364,90 @@ class ModelCache:
             self.evict_lru(target)
 
     def _evict_slot(self, slot: Path) -> None:
-        import shutil
         try:
             shutil.rmtree(slot)
             logger.info("Evicted cache slot: %s", slot.name)
         except OSError as exc:
-            logger.warning("Failed to evict %s: %s", slot, exc)
+            if slot.exists():
+                logger.warning("Failed to evict %s: %s", slot, exc)
+                return
+        self.evictions += 1
+        with self._ledger.lock:
+            self._ledger.record({"op": "evict", "slot": self._slot_key(slot)})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._ledger.lock:
+            self._ledger.refresh()
+            return {
+                "slots": len(self._ledger.slots),
+                "total_bytes": self._ledger.total_bytes,
+                "max_bytes": self._max_bytes,
+                "evictions": self.evictions,
+                "hashed_sources": len(self._ledger.sources),
+            }
+
+    # ------------------------------------------------------------------
+    # Ledger
+    # ------------------------------------------------------------------
+
+    def _touch(self, slot: Path, data: Dict[str, Any]) -> None:
+        key = self._slot_key(slot)
+        with self._ledger.lock:
+            self._ledger.refresh()
+            if key in self._ledger.slots:
+                self._ledger.record({"op": "touch", "slot": key, "atime": time.time()})
+                return
+            # Slot written by another process before its record reached us,
+            # or by an older cache version: adopt it.
+            self._ledger.record({
+                "op": "put",
+                "slot": key,
+                "size": self._measure_slot(slot, Path(data["compiled_path"])),
+                "atime": time.time(),
+                "model_id": data["model_id"],
+                "variant": slot.name.split("-", 1)[0],
+            })
+
+    def _rebuild_ledger(self) -> None:
+        """Seed the ledger from the slots on disk (first run or lost ledger)."""
+        with self._ledger.lock:
+            for slot in self._all_slots():
+                meta = slot / "metadata.json"
+                if not meta.exists():
+                    continue
+                try:
+                    data = json.loads(meta.read_text())
+                    model_id, compiled = data["model_id"], Path(data["compiled_path"])
+                except (OSError, ValueError, KeyError):
+                    model_id, compiled = slot.parent.name, slot / "model.onnx"
+                self._ledger.record({
+                    "op": "put",
+                    "slot": self._slot_key(slot),
+                    "size": self._measure_slot(slot, compiled),
+                    "atime": self._last_access(slot),
+                    "model_id": model_id,
+                    "variant": slot.name.split("-", 1)[0],
+                })
+            if self._ledger.slots:
+                logger.info("Rebuilt model cache ledger: %d slot(s)", len(self._ledger.slots))
+                self._ledger.compact()
+
+    def _measure_slot(self, slot: Path, compiled_path: Path) -> int:
+        """Bytes under *slot*, plus the artefact if it lives elsewhere in the root."""
+        total = 0
+        for path in slot.rglob("*"):
+            try:
+                if path.is_file():
+                    total += path.stat().st_size
+            except OSError:
+                pass
+        try:
+            compiled = compiled_path.resolve()
+            if compiled.is_relative_to(self._root.resolve()) and not compiled.is_relative_to(slot.resolve()):
+                total += compiled.stat().st_size
+        except (OSError, ValueError):
+            pass
+        return total
 
     # ------------------------------------------------------------------
     # Helpers
@@ -190,11 +458,34 @@ class ModelCache:
         model_id: str,
         target: HardwareTarget,
         quantization: QuantizationType,
+        source: Optional[Path] = None,
     ) -> Path:
-        """Return the directory path for a given (model, target, quant) key."""
-        key = f"{target.value}_{quantization.value}"
+        """Return the directory path for a given (model, target, quant, source) key."""
+        key = _variant(target, quantization)
+        tag = self._source_tag(source) if source is not None else None
+        if tag:
+            key = f"{key}-{tag}"
         return self._root / model_id / key
 
+    def _source_tag(self, source: Path) -> Optional[str]:
+        fingerprint = source_fingerprint(source)
+        if fingerprint is None or not self._hash_sources:
+            return fingerprint
+        path = str(Path(source).resolve())
+        with self._ledger.lock:
+            self._ledger.refresh()
+            known = self._ledger.sources.get(path)
+            if known is not None and known["fp"] == fingerprint:
+                return known["sha256"][:16]
+            digest = compute_checksum(Path(source))
+            if not digest:
+                return fingerprint
+            self._ledger.record({"op": "source", "path": path, "fp": fingerprint, "sha256": digest})
+            return digest[:16]
+
+    def _slot_key(self, slot: Path) -> str:
+        return slot.relative_to(self._root).as_posix()
+
     def _all_slots(self) -> Iterator[Path]:
         for model_dir in self._root.iterdir():
             if model_dir.is_dir():
@@ -211,10 +502,29 @@ class ModelCache:
             return 0.0
 
 
+def _variant(target: HardwareTarget, quantization: QuantizationType) -> str:
+    return f"{target.value}_{quantization.value}"
+
+
 # ---------------------------------------------------------------------------
-# Source model checksum
+# Source model identity
 # ---------------------------------------------------------------------------
 
+def source_fingerprint(path: Path) -> Optional[str]:
+    """Cheap identity of *path* from (size, mtime_ns, inode); None if missing.
+
+    No file content is read, so this is safe to call per request on
+    multi-GB models.  Any replacement (copy, rename-over, re-download)
+    changes at least one of the three.
+    """
+    try:
+        st = Path(path).stat()
+    except (OSError, TypeError, ValueError):
+        return None
+    raw = f"{st.st_size}:{st.st_mtime_ns}:{st.st_ino}".encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
 def compute_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
     """Return SHA-256 hex digest of *path* (for cache invalidation)."""
     h = hashlib.sha256()
@@ -225,3 +535,35 @@ def compute_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
     except OSError:
         return ""
     return h.hexdigest()
+
+
+def cached_checksum(path: Path) -> str:
+    """SHA-256 of *path*, persisted beside it and reused while unchanged.
+
+    The digest is stored in ``<path>.sha256`` together with the file's size
+    and mtime; a later call with both unchanged skips reading the file.
+    The sidecar is best-effort — in a read-only directory the digest is
+    simply recomputed.  Blocking: call off the event loop.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+    except OSError:
+        return ""
+    sidecar = path.with_name(path.name + ".sha256")
+    try:
+        data = json.loads(sidecar.read_text())
+        if data["size"] == st.st_size and data["mtime_ns"] == st.st_mtime_ns and data["sha256"]:
+            return data["sha256"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    digest = compute_checksum(path)
+    if digest:
+        tmp = sidecar.with_name(f"{sidecar.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp.write_text(json.dumps({"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}))
+            os.replace(tmp, sidecar)
+        except OSError as exc:
+            tmp.unlink(missing_ok=True)
+            logger.debug("Cannot persist checksum for %s: %s", path, exc)
+    return digest
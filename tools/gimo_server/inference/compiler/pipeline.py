@@ -10,14 +10,29 @@ Orchestrates the full compile workflow:
 
 This module is the single entry point for the engine when it needs a
 production-ready, hardware-optimised model.
+
+Concurrency:
+    - Every blocking step (ORT optimise/quantise, copies, checksums) runs on a
+      bounded worker pool owned by the pipeline, never on the event loop.
+    - Compiles are single-flight per (model, target, quant): concurrent callers
+      await the one compile already in progress, each for at most its timeout.
+    - Each attempt works in its own temp directory and the final artefact is
+      published into the cache slot with an atomic rename.
+    - Checksums are persisted beside the artefact and reused while its size
+      and mtime are unchanged (a GGUF "artefact" is the multi-GB source).
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import re
 import shutil
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from ..contracts import (
     CompiledModelInfo,
@@ -28,11 +43,13 @@ from ..contracts import (
     QuantizationType,
 )
 from .graph_optimizer import optimize
-from .model_cache import ModelCache, compute_checksum
+from .model_cache import ModelCache, cached_checksum
 from .quantizer import quantize_dynamic, recommend_quantization
 
 logger = logging.getLogger("gie.compiler.pipeline")
 
+_CompileKey = Tuple[str, HardwareTarget, QuantizationType]
+
 
 class CompilationPipeline:
     """Compiles a model for a specific hardware target and stores it in cache.
@@ -41,6 +58,8 @@ class CompilationPipeline:
         cache:              ModelCache instance (controls where artefacts live).
         tmp_dir:            Working directory for intermediate files.
         available_vram_gb:  Used to pick optimal quantization for GPU target.
+        max_workers:        Size of the worker pool for blocking compile steps.
+        compile_timeout_s:  Default bound on how long a caller waits for a compile.
     """
 
     def __init__(
@@ -48,11 +67,20 @@ class CompilationPipeline:
         cache: Optional[ModelCache] = None,
         tmp_dir: Optional[Path] = None,
         available_vram_gb: float = 0.0,
+        max_workers: int = 2,
+        compile_timeout_s: float = 1800.0,
     ) -> None:
         self._cache = cache or ModelCache()
         self._tmp = tmp_dir or (Path.home() / ".gimo" / "tmp")
         self._tmp.mkdir(parents=True, exist_ok=True)
         self._vram_gb = available_vram_gb
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="gie-compile"
+        )
+        self._inflight: Dict[_CompileKey, asyncio.Task] = {}
+        self._timeout_s = compile_timeout_s
+        self.compiles = 0
+        self.joined = 0
 
     async def compile(
         self,
@@ -60,23 +88,35 @@ class CompilationPipeline:
         target: HardwareTarget,
         *,
         force: bool = False,
+        timeout: Optional[float] = None,
     ) -> CompiledModelInfo:
         """Compile *model* for *target* and return metadata.
 
-        Uses cache unless *force* is True.
+        Uses cache unless *force* is True.  A call that arrives while the same
+        (model, target, quant) is compiling joins that compile.  A caller
+        waits at most *timeout* seconds (default ``compile_timeout_s``); the
+        compile itself keeps running for the others.
 
         Raises:
             ValueError: If the model format is not supported.
             FileNotFoundError: If the model file does not exist.
             RuntimeError: If compilation fails irrecoverably.
+            TimeoutError: If the compile does not finish within *timeout*.
         """
         quant = recommend_quantization(
             model, target, available_vram_gb=self._vram_gb
         )
+        model_path = Path(model.path)
+        key = (model.model_id, target, quant)
 
-        # Cache hit (skip recompile unless forced).
-        if not force:
-            cached = self._cache.get(model.model_id, target, quant)
+        # Cache hit (skip recompile unless forced).  Keyed on the source file,
+        # so a replaced model is recompiled; looked up on the pool because
+        # keying may hash the source (ModelCache(hash_sources=True)).
+        if not force and key not in self._inflight:
+            cached = await asyncio.get_running_loop().run_in_executor(
+                self._pool,
+                lambda: self._cache.get(model.model_id, target, quant, source=model_path),
+            )
             if cached is not None and cached.compiled_path.exists():
                 logger.info(
                     "Cache hit: %s / %s / %s — skipping compilation",
@@ -86,6 +126,44 @@ class CompilationPipeline:
                 )
                 return cached
 
+        task = self._inflight.get(key)
+        if task is not None:
+            self.joined += 1
+            logger.info("Joining in-flight compile of %s / %s", model.model_id, target.value)
+        else:
+            task = asyncio.ensure_future(self._compile_uncached(model, model_path, target, quant))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        # Shielded: one caller giving up must not cancel the compile for the others.
+        timeout = self._timeout_s if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Compile of {model.model_id} / {target.value} did not finish within {timeout:g}s"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"compiles": self.compiles, "joined": self.joined, "inflight": len(self._inflight)}
+
+    def _forget(self, key: _CompileKey, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved by the awaiting callers; silence "never retrieved"
+
+    def close(self) -> None:
+        """Stop the worker pool (running steps finish first)."""
+        self._pool.shutdown(wait=True)
+
+    async def _compile_uncached(
+        self,
+        model: ModelSpec,
+        model_path: Path,
+        target: HardwareTarget,
+        quant: QuantizationType,
+    ) -> CompiledModelInfo:
+        self.compiles += 1
         logger.info(
             "Compiling %s for %s (quant=%s)",
             model.model_id,
@@ -93,14 +171,24 @@ class CompilationPipeline:
             quant.value,
         )
         t0 = time.monotonic()
+        loop = asyncio.get_running_loop()
 
         # Determine compilation steps based on model format.
-        model_path = Path(model.path)
         if not model_path.exists():
             raise FileNotFoundError(f"Model not found: {model_path}")
 
         if model.format == ModelFormat.ONNX:
-            compiled_path = await self._compile_onnx(model_path, model.model_id, target, quant)
+            work_dir = Path(tempfile.mkdtemp(prefix=f"{_safe_name(model.model_id)}-", dir=self._tmp))
+            try:
+                artefact = await self._compile_onnx(model_path, work_dir, quant)
+                compiled_path = await loop.run_in_executor(
+                    self._pool,
+                    lambda: self._cache.publish(
+                        artefact, model.model_id, target, quant, source=model_path
+                    ),
+                )
+            finally:
+                await loop.run_in_executor(self._pool, lambda: shutil.rmtree(work_dir, ignore_errors=True))
         elif model.format == ModelFormat.GGUF:
             # GGUF models are handled by GgufAdapter directly — no ONNX compilation.
             compiled_path = model_path
@@ -112,7 +200,7 @@ class CompilationPipeline:
             compiled_path = model_path
 
         elapsed = time.monotonic() - t0
-        checksum = compute_checksum(compiled_path)
+        checksum = await loop.run_in_executor(self._pool, cached_checksum, compiled_path)
         compiled_size = compiled_path.stat().st_size if compiled_path.exists() else 0
 
         ep = _ep_for_target(target)
@@ -127,7 +215,7 @@ class CompilationPipeline:
             compiled_size_bytes=compiled_size,
             checksum=checksum,
         )
-        self._cache.put(info)
+        await loop.run_in_executor(self._pool, lambda: self._cache.put(info, source=model_path))
         logger.info(
             "Compiled %s → %s in %.1f s",
             model.model_id,
@@ -143,28 +231,27 @@ class CompilationPipeline:
     async def _compile_onnx(
         self,
         model_path: Path,
-        model_id: str,
-        target: HardwareTarget,
+        work_dir: Path,
         quant: QuantizationType,
     ) -> Path:
-        work_dir = self._tmp / model_id
-        work_dir.mkdir(parents=True, exist_ok=True)
-
         # Step 1: Graph optimisation.
         opt_path = work_dir / "optimized.onnx"
         opt_ok = await optimize(
             str(model_path),
             str(opt_path),
             for_transformer=True,
+            executor=self._pool,
         )
         if not opt_ok or not opt_path.exists():
             # Fallback: use original model without optimisation.
-            shutil.copy2(model_path, opt_path)
+            await asyncio.get_running_loop().run_in_executor(
+                self._pool, shutil.copy2, model_path, opt_path
+            )
 
         # Step 2: Quantization (only if not already quantised).
         if quant in (QuantizationType.INT8, QuantizationType.INT4):
             quant_path = work_dir / f"quantized_{quant.value}.onnx"
-            await quantize_dynamic(str(opt_path), str(quant_path), quant)
+            await quantize_dynamic(str(opt_path), str(quant_path), quant, executor=self._pool)
             if quant_path.exists():
                 return quant_path
 
@@ -175,6 +262,10 @@ class CompilationPipeline:
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _safe_name(model_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_id)[:64] or "model"
+
+
 def _ep_for_target(target: HardwareTarget) -> ExecutionProviderType:
     """Map HardwareTarget to the primary EP for compilation."""
     return {
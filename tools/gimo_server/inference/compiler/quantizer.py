@@ -13,7 +13,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict, List
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional
 
 from ..contracts import HardwareTarget, ModelSpec, QuantizationType
 
@@ -68,15 +69,17 @@ async def quantize_dynamic(
     model_path: str,
     output_path: str,
     quantization: QuantizationType = QuantizationType.INT8,
+    executor: Optional[Executor] = None,
 ) -> bool:
     """Apply dynamic quantization to an ONNX model (no calibration data).
 
     Returns True on success.  Falls back gracefully if onnxruntime is not
-    installed — the unquantized model can still be used.
+    installed — the unquantized model can still be used.  Runs in
+    *executor* (default: the loop's executor).
     """
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(
-        None,
+        executor,
         _quantize_dynamic_sync,
         model_path,
         output_path,
@@ -119,6 +122,7 @@ async def quantize_static(
     output_path: str,
     calibration_data: List[Dict[str, Any]],
     quantization: QuantizationType = QuantizationType.INT8,
+    executor: Optional[Executor] = None,
 ) -> bool:
     """Apply static quantization using calibration data.
 
@@ -127,7 +131,7 @@ async def quantize_static(
     """
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(
-        None,
+        executor,
         _quantize_static_sync,
         model_path,
         output_path,
@@ -14,11 +14,13 @@ Inference flow:
     1. TaskRouter.route(request)       → device + fallback
     2. LoadBalancer.select(device)     → specific device instance
     3. ModelSelector.select(task, ...) → best model for this task
-    4. MemoryManager.calculate_budget  → memory plan
-    5. MemoryManager.plan_sharding     → shard strategy
-    6. SessionPool.get_or_load         → load model if not cached
+    4. MemoryManager.calculate_budget  → memory plan      ┐ memoised in
+    5. MemoryManager.plan_sharding     → shard strategy   ┘ PlanCache
+    6. SessionPool.acquire             → load model if not cached, pin while running
     7. HardwareScheduler.enqueue       → wait for execution slot
     8. RuntimeAdapter.run              → forward pass
+       (models opted in via enable_batching() go through the session's
+       ContinuousBatcher instead, which owns steps 7–8 for the whole batch)
     9. Release ticket, record metrics
 """
 from __future__ import annotations
@@ -41,16 +43,24 @@ from .contracts import (
 from .hardware.device_detector import get_devices
 from .memory_manager import MemoryManager
 from .metrics import InferenceMetrics
+from .plan_cache import PlanCache, device_key, free_memory_key, plan_key
 from .router.hardware_scheduler import HardwareScheduler
 from .router.load_balancer import LoadBalancer
 from .router.model_selector import ModelSelector
 from .router.task_router import TaskRouter
 from .runtime.onnx_adapter import OnnxAdapter
+from .runtime.batcher import BatchingConfig, ContinuousBatcher, supports_batching
 from .runtime.gguf_adapter import GgufAdapter
 from .runtime.session_pool import SessionPool
+from .shard_planner import ShardPlan
 
 logger = logging.getLogger("gie.engine")
 
+# How often infer() re-reads the (TTL-cached) hardware snapshot so plan keys
+# follow free-memory drift. Matches device_detector's own cache TTL, so every
+# refresh shells out to nvidia-smi / PowerShell; it runs in a worker thread.
+_HARDWARE_REFRESH_S = 30.0
+
 
 class InferenceEngineService:
     """Singleton inference engine.
@@ -98,12 +108,20 @@ class InferenceEngineService:
         self._load_balancer: Optional[LoadBalancer] = None
         self._model_selector: Optional[ModelSelector] = None
 
+        self._plan_cache = PlanCache()
+        self._devices_refreshed_at = 0.0
+        self._hardware_key: tuple = ()
+        self._hardware_refresh: Optional[asyncio.Task] = None
+
         self._metrics = InferenceMetrics()
         self._initialized = False
         self._lock = asyncio.Lock()
         # In-memory model registry: model_id → ModelSpec.
         # Populated via register_model() or a future ModelInventoryService integration.
         self._registry: Dict[str, ModelSpec] = {}
+        # Continuous batching: opted-in models, and one live batcher per session.
+        self._batching: Dict[str, BatchingConfig] = {}
+        self._batchers: Dict[str, ContinuousBatcher] = {}
 
     # ------------------------------------------------------------------
     # Singleton
@@ -130,10 +148,10 @@ class InferenceEngineService:
                 return
 
             logger.info("Initializing GIMO Inference Engine…")
-            self._devices = get_devices(force_refresh=True)
-
-            if not self._npu_enabled:
-                self._devices = [d for d in self._devices if d.device_type != HardwareTarget.NPU]
+            devices = await asyncio.to_thread(get_devices, force_refresh=True)
+            self._devices = self._filter_devices(devices)
+            self._hardware_key = self._devices_key(self._devices)
+            self._devices_refreshed_at = time.monotonic()
 
             self._task_router    = TaskRouter(devices=self._devices)
             self._scheduler      = HardwareScheduler(devices=self._devices)
@@ -151,6 +169,9 @@ class InferenceEngineService:
 
     async def shutdown(self) -> None:
         """Release all sessions and stop background tasks."""
+        if self._hardware_refresh is not None:
+            self._hardware_refresh.cancel()
+            self._hardware_refresh = None
         await self._pool.evict_all()
         self._initialized = False
         logger.info("GIE shut down")
@@ -199,35 +220,45 @@ class InferenceEngineService:
             if model_spec is None:
                 raise ValueError(f"Model '{model_id}' not found in registry")
 
-            # 4. Compute memory budget and shard plan.
-            budget = self._memory_manager.calculate_budget(model_spec, self._devices)
-            shard_plan = self._memory_manager.plan_sharding(budget, model_spec, self._devices)
+            # 4. Compute memory budget and shard plan (memoised).
+            shard_plan = self._plan_for(model_spec, request)
 
             if shard_plan.reject_reason:
                 raise RuntimeError(
                     f"Cannot load model: {shard_plan.reject_reason}"
                 )
 
-            # 5. Load session (or get from pool).
+            # 5. Load session (or get from pool), pinned for the whole request
+            #    so a concurrent load cannot evict it mid-run.
             adapter = self._gguf if model_spec.format.value == "gguf" else self._onnx
-            session = await self._pool.get_or_load(
+            async with self._pool.acquire(
                 model_spec,
                 device.device_type if device else HardwareTarget.CPU,
                 adapter,
-            )
-            ep_name = session.execution_provider.value
-
-            # 6. Enqueue with scheduler (wait for execution slot).
-            ticket = await self._scheduler.enqueue(request, hardware_used)  # type: ignore[union-attr]
-            await ticket.wait(timeout=request.timeout_seconds)
-
-            try:
-                # 7. Run inference.
-                outputs = await adapter.run(session, request.inputs)
+            ) as session:
+                ep_name = session.execution_provider.value
+
+                batch_config = self._batching.get(model_spec.model_id)
+                if batch_config is not None and supports_batching(adapter):
+                    # 6–7. Join the session's batch; the batcher holds the
+                    #      scheduler slot for every request in it.
+                    handle = self._batcher_for(session, adapter, batch_config, hardware_used).submit(request)
+                    try:
+                        outputs = await handle.result(timeout=request.timeout_seconds)
+                    finally:
+                        handle.cancel()
+                else:
+                    # 6. Enqueue with scheduler (wait for execution slot).
+                    ticket = await self._scheduler.enqueue(request, hardware_used)  # type: ignore[union-attr]
+                    await ticket.wait(timeout=request.timeout_seconds)
+
+                    try:
+                        # 7. Run inference.
+                        outputs = await adapter.run(session, request.inputs)
+                    finally:
+                        self._scheduler.release(ticket)  # type: ignore[union-attr]
                 tokens_generated = outputs.get("tokens_generated", 0)
                 tps = outputs.get("tokens_per_second", 0.0)
-            finally:
-                self._scheduler.release(ticket)  # type: ignore[union-attr]
 
         except Exception as exc:
             error = str(exc)
@@ -250,6 +281,8 @@ class InferenceEngineService:
         )
         pool_m = self._pool.metrics
         self._metrics.update_pool_stats(pool_m.hits, pool_m.misses, pool_m.evictions)
+        pc = self._plan_cache
+        self._metrics.update_plan_cache_stats(pc.hits, pc.misses, pc.invalidations)
 
         # Update latency EWMA in router.
         if self._task_router:
@@ -270,10 +303,59 @@ class InferenceEngineService:
             error=error,
         )
 
+    def _batcher_for(
+        self,
+        session: Any,
+        adapter: Any,
+        config: BatchingConfig,
+        device: HardwareTarget,
+    ) -> ContinuousBatcher:
+        batcher = self._batchers.get(session.session_id)
+        if batcher is None:
+            batcher = ContinuousBatcher(
+                adapter,
+                session,
+                config,
+                scheduler=self._scheduler,
+                device=device,
+                on_idle=lambda b: self._batchers.pop(b.session.session_id, None),
+            )
+            self._batchers[session.session_id] = batcher
+        return batcher
+
     # ------------------------------------------------------------------
     # Model management
     # ------------------------------------------------------------------
 
+    def enable_batching(
+        self,
+        model_id: str,
+        *,
+        window_ms: float = 5.0,
+        max_batch_size: int = 8,
+        max_hold_steps: int = 16,
+        max_hold_ms: float = 200.0,
+    ) -> None:
+        """Batch concurrent requests for *model_id* (see ``runtime/batcher.py``).
+
+        Only takes effect when the model's adapter supports batching; other
+        adapters keep running one request per scheduler slot.
+        """
+        if max_batch_size < 1 or window_ms < 0:
+            raise ValueError("max_batch_size must be >= 1 and window_ms >= 0")
+        if max_hold_steps < 1 or max_hold_ms <= 0:
+            raise ValueError("max_hold_steps must be >= 1 and max_hold_ms > 0")
+        self._batching[model_id] = BatchingConfig(
+            window_ms=window_ms,
+            max_batch_size=max_batch_size,
+            max_hold_steps=max_hold_steps,
+            max_hold_ms=max_hold_ms,
+        )
+
+    def disable_batching(self, model_id: str) -> None:
+        """Stop batching new requests for *model_id*; running batches finish."""
+        self._batching.pop(model_id, None)
+
     async def load_model(self, model_id: str, target: HardwareTarget) -> bool:
         """Explicitly pre-load a model into the session pool."""
         spec = self._resolve_model(model_id)
@@ -281,6 +363,7 @@ class InferenceEngineService:
             logger.warning("Cannot load unknown model: %s", model_id)
             return False
         adapter = self._gguf if spec.format.value == "gguf" else self._onnx
+        self._plan_cache.invalidate_model(model_id)
         try:
             await self._pool.get_or_load(spec, target, adapter)
             return True
@@ -290,6 +373,7 @@ class InferenceEngineService:
 
     async def unload_model(self, model_id: str) -> bool:
         """Evict a model from the session pool."""
+        self._plan_cache.invalidate_model(model_id)
         await self._pool.evict(model_id)
         return True
 
@@ -319,6 +403,11 @@ class InferenceEngineService:
                 "metrics": self._pool.metrics.to_dict(),
             },
             "scheduler": self._scheduler.get_status() if self._scheduler else [],
+            "plan_cache": self._plan_cache.to_dict(),
+            "batching": {
+                "models": {m: vars(c) for m, c in self._batching.items()},
+                "active": [b.status() for b in self._batchers.values()],
+            },
         }
 
     def get_loaded_models(self) -> List[Dict[str, Any]]:
@@ -348,11 +437,13 @@ class InferenceEngineService:
         live lookup, but the registered specs will remain as a fallback.
         """
         self._registry[spec.model_id] = spec
+        self._plan_cache.invalidate_model(spec.model_id)
         logger.info("Model registered: %s (%s, %.1fB params)", spec.model_id, spec.format.value, spec.param_count_b)
 
     def unregister_model(self, model_id: str) -> None:
         """Remove a model from the in-memory registry."""
         self._registry.pop(model_id, None)
+        self._plan_cache.invalidate_model(model_id)
 
     def list_registered_models(self) -> List[ModelSpec]:
         return list(self._registry.values())
@@ -361,6 +452,67 @@ class InferenceEngineService:
     # Internal
     # ------------------------------------------------------------------
 
+    def _filter_devices(self, devices: List[DeviceCapability]) -> List[DeviceCapability]:
+        if self._npu_enabled:
+            return list(devices)
+        return [d for d in devices if d.device_type != HardwareTarget.NPU]
+
+    @staticmethod
+    def _devices_key(devices: List[DeviceCapability]) -> tuple:
+        """The part of a plan key that depends on the hardware snapshot."""
+        return device_key(devices), free_memory_key(devices)
+
+    def _hardware_snapshot(self) -> List[DeviceCapability]:
+        """Current device list; starts a background re-read every ``_HARDWARE_REFRESH_S``.
+
+        Detection shells out, so the refresh runs in a worker thread and the
+        caller keeps using the previous snapshot until it lands.
+        """
+        now = time.monotonic()
+        if now - self._devices_refreshed_at >= _HARDWARE_REFRESH_S and self._hardware_refresh is None:
+            self._devices_refreshed_at = now
+            self._hardware_refresh = asyncio.get_running_loop().create_task(self._refresh_hardware())
+        return self._devices
+
+    async def _refresh_hardware(self) -> None:
+        try:
+            devices = self._filter_devices(await asyncio.to_thread(get_devices))
+        except Exception as exc:
+            logger.warning("Hardware snapshot refresh failed: %s", exc)
+            return
+        finally:
+            self._hardware_refresh = None
+        self._apply_devices(devices)
+
+    def _apply_devices(self, devices: List[DeviceCapability]) -> None:
+        """Adopt *devices*, pushing them to the router, balancer and scheduler
+        when the device set or a free-memory bucket changed."""
+        self._devices = devices
+        key = self._devices_key(devices)
+        if key == self._hardware_key:
+            return
+        self._hardware_key = key
+        if self._task_router:
+            self._task_router.update_devices(devices)
+        if self._load_balancer:
+            self._load_balancer.update_devices(devices)
+        if self._scheduler:
+            self._scheduler.update_devices(devices)
+
+    def _plan_for(self, spec: ModelSpec, request: InferenceRequest) -> ShardPlan:
+        """Budget + shard plan for *spec*, served from the plan cache when the
+        model file, device set, context bucket and free-memory bucket match."""
+        devices = self._hardware_snapshot()
+        context_tokens = int(request.metadata.get("context_tokens", 0) or request.max_tokens)
+        key = plan_key(spec, devices, context_tokens)
+        cached = self._plan_cache.get(key)
+        if cached is not None:
+            return cached[1]
+        budget = self._memory_manager.calculate_budget(spec, devices)
+        shard_plan = self._memory_manager.plan_sharding(budget, spec, devices)
+        self._plan_cache.put(key, budget, shard_plan)
+        return shard_plan
+
     def _resolve_model(self, model_id: str) -> Optional[ModelSpec]:
         """Look up a model spec in the registry.
 
@@ -54,6 +54,11 @@ class InferenceMetrics:
         self._pool_misses: int = 0
         self._pool_evictions: int = 0
 
+        # Budget/shard plan cache stats (injected by the engine).
+        self._plan_hits: int = 0
+        self._plan_misses: int = 0
+        self._plan_invalidations: int = 0
+
         # Queue depths (snapshotted periodically).
         self._queue_snapshot: Dict[str, int] = {}
 
@@ -105,6 +110,11 @@ class InferenceMetrics:
         self._pool_misses = misses
         self._pool_evictions = evictions
 
+    def update_plan_cache_stats(self, hits: int, misses: int, invalidations: int) -> None:
+        self._plan_hits = hits
+        self._plan_misses = misses
+        self._plan_invalidations = invalidations
+
     def update_queue_snapshot(self, queue_depths: Dict[str, int]) -> None:
         self._queue_snapshot = dict(queue_depths)
 
@@ -152,6 +162,8 @@ class InferenceMetrics:
         # Pool cache hit rate.
         total_pool = self._pool_hits + self._pool_misses
         hit_rate = self._pool_hits / total_pool if total_pool else 0.0
+        total_plan = self._plan_hits + self._plan_misses
+        plan_hit_rate = self._plan_hits / total_plan if total_plan else 0.0
 
         return {
             "uptime_seconds": round(uptime_s, 1),
@@ -172,6 +184,12 @@ class InferenceMetrics:
                 "evictions": self._pool_evictions,
                 "hit_rate": round(hit_rate, 3),
             },
+            "plan_cache": {
+                "hits": self._plan_hits,
+                "misses": self._plan_misses,
+                "invalidations": self._plan_invalidations,
+                "hit_rate": round(plan_hit_rate, 3),
+            },
             "model_load_avg_ms": round(avg_load, 1),
             "queue_depths": self._queue_snapshot,
         }
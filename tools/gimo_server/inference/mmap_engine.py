@@ -14,8 +14,12 @@ sequentially, which improves throughput for autoregressive token generation.
 Architecture:
     MmapEngine wraps a model file path and provides:
     - open() / close() context manager
-    - read_layer(layer_idx) → bytes — read model weights for one layer
+    - read_layer(layer_idx) → memoryview — zero-copy view of one layer
+    - read_layer_array(layer_idx, dtype) → numpy array over the same pages
+    - read_layer_bytes(layer_idx) → bytes — explicit (counted) copy
     - prefetch_hint(layer_idx) — hint OS to load upcoming layer pages
+    - start_prefetcher(depth) — background thread that keeps *depth*
+      layers ahead of the last layer read
 """
 from __future__ import annotations
 
@@ -23,18 +27,22 @@ import logging
 import mmap
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger("gie.mmap_engine")
 
 # Page-aligned read size for prefetch: 4 MB (typical huge-page size).
 _PREFETCH_CHUNK_BYTES = 4 * 1024 * 1024
 
-# madvise constants (Linux only).
-_MADV_SEQUENTIAL = 2
-_MADV_WILLNEED   = 3
-_MADV_DONTNEED   = 4
+# madvise options.  ``mmap.madvise`` (3.8+) works on the real mapping address;
+# the constants are absent on platforms without madvise, where hints no-op.
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+_MADV_WILLNEED = getattr(mmap, "MADV_WILLNEED", None)
+_MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+_PAGE_SIZE = mmap.PAGESIZE
 
 
 class MmapEngine:
@@ -44,10 +52,15 @@ class MmapEngine:
 
         engine = MmapEngine(model_path, num_layers=32)
         with engine:
-            weights = engine.read_layer(0)
-            engine.prefetch_hint(1)
+            engine.start_prefetcher(depth=2)
+            weights = engine.read_layer(0)   # memoryview, no copy
             ...
 
+    Views returned by ``read_layer`` / ``read_layer_array`` point straight
+    into the mapping.  Release them (``view.release()`` or drop the array)
+    before ``close()``; if any are still alive the mapping is kept until
+    they are garbage-collected.
+
     Thread safety: ``read_layer`` is safe to call from multiple threads as
     long as each thread uses its own slice of the mmap (reads are concurrent,
     the underlying file is immutable).
@@ -71,9 +84,25 @@ class MmapEngine:
         self._layer_size_bytes = layer_size_bytes
         self._file: Optional[object] = None
         self._mm: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
         self._file_size: int = 0
         self._is_linux = sys.platform.startswith("linux")
 
+        # Read-path counters (see ``stats``).
+        self._layers_read = 0
+        self._bytes_viewed = 0
+        self._bytes_copied = 0
+
+        # Background prefetcher state.
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_cond = threading.Condition()
+        self._prefetch_stop = False
+        self._prefetch_depth = 0
+        self._prefetch_evict_behind = False
+        self._cursor = -1           # last layer handed to a reader
+        self._prefetched_to = -1    # highest layer already hinted
+        self._layers_prefetched = 0
+
     # ------------------------------------------------------------------
     # Context manager
     # ------------------------------------------------------------------
@@ -87,6 +116,7 @@ class MmapEngine:
             0,                     # 0 = map entire file
             access=mmap.ACCESS_READ,
         )
+        self._view = memoryview(self._mm)
         self._file_size = os.path.getsize(self._path)
         if self._layer_size_bytes is None and self._num_layers > 0:
             self._layer_size_bytes = self._file_size // self._num_layers
@@ -102,9 +132,17 @@ class MmapEngine:
         return self
 
     def close(self) -> None:
+        self.stop_prefetcher()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
         if self._mm:
             try:
                 self._mm.close()
+            except BufferError:
+                # A caller still holds a layer view; the mapping is unmapped
+                # once the last view is garbage-collected.
+                logger.debug("MmapEngine close deferred: layer views still exported")
             except Exception:
                 pass
             self._mm = None
@@ -125,66 +163,132 @@ class MmapEngine:
     # Public API
     # ------------------------------------------------------------------
 
-    def read_layer(self, layer_idx: int) -> bytes:
-        """Return raw bytes for layer *layer_idx*.
+    def read_layer(self, layer_idx: int) -> memoryview:
+        """Return a zero-copy view of layer *layer_idx*.
 
-        The caller is responsible for deserialising the bytes into tensors.
+        The view aliases the page cache — no bytes are copied until the
+        caller touches them.  The caller is responsible for deserialising
+        the buffer into tensors (``numpy.frombuffer`` works directly).
         """
-        if self._mm is None:
+        if self._view is None:
             raise RuntimeError("MmapEngine is not open — use 'with engine:' or call open()")
-        offset = self._layer_offset(layer_idx)
-        size = self._layer_size_bytes or 0
-        if size <= 0 or offset + size > self._file_size:
-            raise IndexError(
-                f"Layer {layer_idx} out of bounds (offset={offset}, size={size}, "
-                f"file_size={self._file_size})"
-            )
-        self._mm.seek(offset)
-        return self._mm.read(size)
+        offset, size = self._layer_span(layer_idx)
+        self._layers_read += 1
+        self._bytes_viewed += size
+        self._advance(layer_idx)
+        return self._view[offset:offset + size]
+
+    def read_layer_array(self, layer_idx: int, dtype: Any = "uint8") -> Any:
+        """Return layer *layer_idx* as a read-only numpy array (no copy).
+
+        numpy is optional; ``ImportError`` is raised when it is missing.
+        """
+        try:
+            import numpy as np  # type: ignore[import]
+        except ImportError as exc:
+            raise ImportError("numpy is required for read_layer_array") from exc
+        return np.frombuffer(self.read_layer(layer_idx), dtype=dtype)
+
+    def read_layer_bytes(self, layer_idx: int) -> bytes:
+        """Return a private ``bytes`` copy of layer *layer_idx*.
+
+        Only for consumers that must own the buffer; the copy is counted in
+        ``stats["bytes_copied"]``.
+        """
+        view = self.read_layer(layer_idx)
+        try:
+            data = view.tobytes()
+        finally:
+            view.release()
+        self._bytes_copied += len(data)
+        return data
 
     def prefetch_hint(self, layer_idx: int) -> None:
         """Hint the OS to load the pages for *layer_idx* into RAM now.
 
-        Uses madvise(MADV_WILLNEED) on Linux.  On other platforms this is a no-op.
-        The call is asynchronous from the OS perspective — it returns immediately
-        and the kernel issues read-ahead I/O in the background.
+        Uses madvise(MADV_WILLNEED) where available.  On other platforms this
+        is a no-op.  The call is asynchronous from the OS perspective — it
+        returns immediately and the kernel issues read-ahead I/O in the
+        background.
         """
-        if not self._is_linux or self._mm is None:
+        if self._mm is None:
             return
         try:
             offset = self._layer_offset(layer_idx)
             size = self._layer_size_bytes or _PREFETCH_CHUNK_BYTES
-            size = min(size, self._file_size - offset)
-            if size > 0:
-                # madvise via ctypes on Linux.
-                import ctypes
-                libc = ctypes.CDLL("libc.so.6", use_errno=True)
-                ctypes.c_char_p(bytes(self._mm))
-                libc.madvise(
-                    ctypes.c_void_p(id(self._mm) + offset),  # approximate; works for hint
-                    ctypes.c_size_t(size),
-                    ctypes.c_int(_MADV_WILLNEED),
-                )
+            self._madvise(_MADV_WILLNEED, offset, size)
         except Exception as exc:
             logger.debug("prefetch_hint failed: %s", exc)
 
     def evict_hint(self, layer_idx: int) -> None:
         """Hint the OS that pages for *layer_idx* can be reclaimed (MADV_DONTNEED)."""
-        if not self._is_linux or self._mm is None:
+        if self._mm is None:
             return
         try:
-            import ctypes
-            libc = ctypes.CDLL("libc.so.6", use_errno=True)
             offset = self._layer_offset(layer_idx)
             size = self._layer_size_bytes or _PREFETCH_CHUNK_BYTES
-            libc.madvise(
-                ctypes.c_void_p(id(self._mm) + offset),
-                ctypes.c_size_t(size),
-                ctypes.c_int(_MADV_DONTNEED),
-            )
+            self._madvise(_MADV_DONTNEED, offset, size)
         except Exception as exc:
             logger.debug("evict_hint failed: %s", exc)
 
+    # ------------------------------------------------------------------
+    # Background prefetcher
+    # ------------------------------------------------------------------
+
+    def start_prefetcher(self, depth: int = 2, *, evict_behind: bool = False) -> None:
+        """Start a daemon thread that keeps *depth* layers hinted ahead.
+
+        Every ``read_layer`` call advances the cursor; the thread then issues
+        WILLNEED for ``cursor+1 … cursor+depth`` (touching one byte per page
+        where madvise is unavailable).  With *evict_behind* the layer just
+        left behind is hinted DONTNEED so resident memory stays bounded to
+        roughly ``depth + 1`` layers.
+        """
+        if self._mm is None:
+            raise RuntimeError("MmapEngine is not open — use 'with engine:' or call open()")
+        if depth < 1:
+            raise ValueError("prefetch depth must be >= 1")
+        if self._prefetch_thread is not None:
+            return
+        with self._prefetch_cond:
+            self._prefetch_depth = depth
+            self._prefetch_evict_behind = evict_behind
+            self._prefetch_stop = False
+            self._prefetched_to = self._cursor
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch_loop, name="gie-mmap-prefetch", daemon=True,
+        )
+        self._prefetch_thread.start()
+
+    def stop_prefetcher(self) -> None:
+        thread = self._prefetch_thread
+        if thread is None:
+            return
+        with self._prefetch_cond:
+            self._prefetch_stop = True
+            self._prefetch_cond.notify_all()
+        thread.join(timeout=5.0)
+        self._prefetch_thread = None
+
+    def wait_prefetched(self, layer_idx: int, timeout: float = 1.0) -> bool:
+        """Block until the prefetcher has hinted *layer_idx* (test/bench helper)."""
+        target = min(layer_idx, self._num_layers - 1)
+        with self._prefetch_cond:
+            return self._prefetch_cond.wait_for(
+                lambda: self._prefetched_to >= target or self._prefetch_stop,
+                timeout=timeout,
+            )
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "layers_read": self._layers_read,
+            "bytes_viewed": self._bytes_viewed,
+            "bytes_copied": self._bytes_copied,
+            "layers_prefetched": self._layers_prefetched,
+            "prefetched_to": self._prefetched_to,
+        }
+
     @property
     def file_size_gb(self) -> float:
         return self._file_size / 1024**3
@@ -202,16 +306,80 @@ class MmapEngine:
             raise IndexError(f"Layer index {layer_idx} out of range [0, {self._num_layers})")
         return layer_idx * (self._layer_size_bytes or 0)
 
-    def _madvise_sequential(self) -> None:
-        if not self._is_linux or self._mm is None:
+    def _layer_span(self, layer_idx: int) -> tuple[int, int]:
+        offset = self._layer_offset(layer_idx)
+        size = self._layer_size_bytes or 0
+        if size <= 0 or offset + size > self._file_size:
+            raise IndexError(
+                f"Layer {layer_idx} out of bounds (offset={offset}, size={size}, "
+                f"file_size={self._file_size})"
+            )
+        return offset, size
+
+    def _advance(self, layer_idx: int) -> None:
+        if self._prefetch_thread is None:
+            self._cursor = layer_idx
             return
+        with self._prefetch_cond:
+            self._cursor = layer_idx
+            if layer_idx < self._prefetched_to - self._prefetch_depth:
+                # Reader jumped backwards (new token pass) — restart the window.
+                self._prefetched_to = layer_idx
+            self._prefetch_cond.notify_all()
+
+    def _prefetch_loop(self) -> None:
+        behind = -1
+        while True:
+            with self._prefetch_cond:
+                self._prefetch_cond.wait_for(
+                    lambda: self._prefetch_stop or self._prefetched_to < min(
+                        self._cursor + self._prefetch_depth, self._num_layers - 1,
+                    ),
+                )
+                if self._prefetch_stop:
+                    return
+                cursor = self._cursor
+                target = min(cursor + self._prefetch_depth, self._num_layers - 1)
+                nxt = max(self._prefetched_to + 1, cursor + 1)
+                if nxt > target:
+                    # Reader is on the last layer — nothing left to warm.
+                    self._prefetched_to = target
+                    self._prefetch_cond.notify_all()
+                    continue
+            if self._prefetch_evict_behind and 0 <= cursor - 1 != behind:
+                behind = cursor - 1
+                self.evict_hint(behind)
+            try:
+                self._warm_layer(nxt)
+            except Exception as exc:  # mapping closed underneath us
+                logger.debug("prefetcher stopped: %s", exc)
+                return
+            with self._prefetch_cond:
+                self._prefetched_to = max(self._prefetched_to, nxt)
+                self._layers_prefetched += 1
+                self._prefetch_cond.notify_all()
+
+    def _warm_layer(self, layer_idx: int) -> None:
+        offset, size = self._layer_span(layer_idx)
+        if _MADV_WILLNEED is not None:
+            self._madvise(_MADV_WILLNEED, offset, size)
+            return
+        view = self._view
+        if view is None:
+            return
+        # No madvise: fault the pages in by touching one byte per page.
+        view[offset:offset + size:_PAGE_SIZE].tobytes()
+
+    def _madvise(self, option: Optional[int], offset: int, size: int) -> None:
+        if option is None or self._mm is None:
+            return
+        start = offset - (offset % _PAGE_SIZE)  # madvise needs page alignment
+        length = min(size + (offset - start), self._file_size - start)
+        if length > 0:
+            self._mm.madvise(option, start, length)
+
+    def _madvise_sequential(self) -> None:
         try:
-            import ctypes
-            libc = ctypes.CDLL("libc.so.6", use_errno=True)
-            libc.madvise(
-                ctypes.c_void_p(id(self._mm)),
-                ctypes.c_size_t(self._file_size),
-                ctypes.c_int(_MADV_SEQUENTIAL),
-            )
+            self._madvise(_MADV_SEQUENTIAL, 0, self._file_size)
         except Exception:
             pass  # non-fatal
@@ -0,0 +1,134 @@
+"""Plan cache — memoises (MemoryBudget, ShardPlan) between inference requests.
+
+``MemoryManager.calculate_budget`` probes the disk cache (``mkdir`` +
+``disk_usage``) and ``plan_sharding`` walks the shard decision tree on every
+call, yet the inputs rarely change between requests.  Plans are keyed by:
+
+- model id + model file fingerprint (size, mtime) — a replaced file re-plans;
+- device set (type + name);
+- context bucket (next power of two of the requested context);
+- free-memory bucket per device (``FREE_MEM_BUCKET_GB`` granularity).
+
+A hardware snapshot that drifts out of its bucket simply produces a new key.
+Entries also expire after ``ttl_seconds`` so disk-cache drift (which is not
+part of the key) stays bounded.  ``invalidate_model`` drops every plan for a
+model when it is (re)loaded, registered or unregistered.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .contracts import DeviceCapability, MemoryBudget, ModelSpec
+from .shard_planner import ShardPlan
+
+logger = logging.getLogger("gie.plan_cache")
+
+FREE_MEM_BUCKET_GB = 0.5
+_MIN_CONTEXT_BUCKET = 256
+
+PlanKey = Tuple[Any, ...]
+
+
+def model_fingerprint(spec: ModelSpec) -> Tuple[int, int]:
+    """Cheap (size, mtime_ns) fingerprint of the model file.
+
+    Falls back to ``(spec.size_bytes, 0)`` when the path cannot be stat'ed
+    (e.g. registry entries pointing at not-yet-downloaded files).
+    """
+    try:
+        st = spec.path.stat()
+        return st.st_size, st.st_mtime_ns
+    except (OSError, TypeError, ValueError):
+        return spec.size_bytes, 0
+
+
+def context_bucket(tokens: int) -> int:
+    """Round *tokens* up to the next power of two (min 256)."""
+    n = max(int(tokens or 0), _MIN_CONTEXT_BUCKET)
+    return 1 << (n - 1).bit_length()
+
+
+def device_key(devices: List[DeviceCapability]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((d.device_type.value, d.device_name) for d in devices))
+
+
+def free_memory_key(devices: List[DeviceCapability]) -> Tuple[int, ...]:
+    ordered = sorted(devices, key=lambda d: (d.device_type.value, d.device_name))
+    return tuple(int(d.free_memory_gb // FREE_MEM_BUCKET_GB) for d in ordered)
+
+
+def plan_key(spec: ModelSpec, devices: List[DeviceCapability], context_tokens: int) -> PlanKey:
+    return (
+        spec.model_id,
+        model_fingerprint(spec),
+        device_key(devices),
+        context_bucket(context_tokens),
+        free_memory_key(devices),
+    )
+
+
+@dataclass
+class _PlanEntry:
+    budget: MemoryBudget
+    plan: ShardPlan
+    created_at: float
+
+
+class PlanCache:
+    """Bounded LRU of shard plans with hit/miss/invalidation counters."""
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: float = 300.0) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[PlanKey, _PlanEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: PlanKey) -> Optional[Tuple[MemoryBudget, ShardPlan]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.created_at > self._ttl_seconds:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.budget, entry.plan
+
+    def put(self, key: PlanKey, budget: MemoryBudget, plan: ShardPlan) -> None:
+        self._entries[key] = _PlanEntry(budget=budget, plan=plan, created_at=time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_model(self, model_id: str) -> int:
+        stale = [k for k in self._entries if k[0] == model_id]
+        for k in stale:
+            del self._entries[k]
+        if stale:
+            self.invalidations += len(stale)
+            logger.debug("Plan cache: dropped %d plan(s) for %s", len(stale), model_id)
+        return len(stale)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
@@ -2,9 +2,14 @@
 
 Manages three separate queues (GPU, NPU, CPU) and enforces:
 - Concurrent session limits per device (VRAM / RAM bounded)
-- Priority ordering within each queue (1 = highest, 10 = lowest)
+- Priority ordering within each queue (1 = highest, 10 = lowest), with
+  aging: a queued request gains one priority level every ``aging_s``
+  seconds, so low-priority work cannot starve under sustained load
 - Timeout detection for stalled requests
-- Batch grouping for the same model (amortises load cost)
+- Batch grouping for the same model (amortises load cost): a request for a
+  model already resident on the device may overtake the queue head, but only
+  while it is within ``fairness_window_s`` of aged priority behind it
+- Queue-wait histograms and model-swap counts per device
 
 Usage::
 
@@ -19,11 +24,15 @@ Usage::
 from __future__ import annotations
 
 import asyncio
+import bisect
+import heapq
+import itertools
 import logging
 import time
 import uuid
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from ..contracts import (
     DeviceCapability,
@@ -41,6 +50,15 @@ _DEFAULT_CONCURRENCY = {
     HardwareTarget.AUTO: 1,
 }
 
+# Seconds of queueing worth one priority level (0 disables aging).
+_DEFAULT_AGING_S = 5.0
+# How far (in seconds of aged priority) a resident-model request may overtake
+# the queue head to avoid a model swap (0 disables grouping).
+_DEFAULT_FAIRNESS_WINDOW_S = 2.0
+
+# Upper bounds (ms) of the queue-wait histogram buckets; the last is open.
+_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
 
 @dataclass
 class ExecutionTicket:
@@ -54,12 +72,18 @@ class ExecutionTicket:
     priority: int = 5
     # Event set by the scheduler when this request may run.
     _ready: asyncio.Event = field(default_factory=asyncio.Event)
+    # Queue holding the ticket; told when the caller gives up waiting.
+    _queue: Optional["DeviceQueue"] = field(default=None, repr=False)
 
     async def wait(self, timeout: float = 120.0) -> None:
         """Wait until the scheduler grants execution rights."""
         try:
             await asyncio.wait_for(self._ready.wait(), timeout=timeout)
         except asyncio.TimeoutError:
+            # Drop out of the queue; a slot granted in the meantime is freed,
+            # since the caller will never release it.
+            if self._queue is not None:
+                self._queue.abandon(self)
             raise TimeoutError(
                 f"Request {self.request_id} timed out waiting for {self.device.value} slot"
             )
@@ -71,66 +95,199 @@ class ExecutionTicket:
         return (time.monotonic() - self.enqueue_time) * 1000
 
 
-@dataclass
+@dataclass(order=True)
 class _QueueEntry:
-    ticket: ExecutionTicket
-    priority: int   # lower = higher priority
+    # priority + enqueue_time / aging_s: aging lowers every waiting entry's
+    # effective priority at the same rate, so this fixed key orders them
+    # exactly as their aged priorities would at any later instant.
+    sort_key: float
+    seq: int
+    ticket: ExecutionTicket = field(compare=False)
+    done: bool = field(default=False, compare=False)
+
+
+class WaitHistogram:
+    """Fixed-bucket histogram of queue waits (ms)."""
+
+    def __init__(self, bounds_ms: tuple = _WAIT_BUCKETS_MS) -> None:
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ms, wait_ms)] += 1
+        self.count += 1
+        self.sum_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the *q* quantile (max if open)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds_ms, self.counts):
+            seen += n
+            if seen >= rank:
+                return float(min(bound, self.max_ms))
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in self.bounds_ms] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
 
 
 class DeviceQueue:
-    """Priority queue + semaphore for one hardware device."""
+    """Priority queue + concurrency limit for one hardware device.
+
+    Pending tickets sit in a heap keyed by aged priority, and again in a
+    per-model heap so the best request for a resident model is found without
+    scanning.  Entries are removed lazily: a granted or abandoned entry is
+    flagged and skipped when it reaches the top of either heap.
+
+    All methods run on the event loop thread, so dispatch happens inline in
+    ``enqueue``/``release`` without locks.
+    """
 
-    def __init__(self, device_type: HardwareTarget, max_concurrent: int) -> None:
+    def __init__(
+        self,
+        device_type: HardwareTarget,
+        max_concurrent: int,
+        *,
+        aging_s: float = _DEFAULT_AGING_S,
+        fairness_window_s: float = _DEFAULT_FAIRNESS_WINDOW_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.device_type = device_type
         self.max_concurrent = max_concurrent
-        self._sem = asyncio.Semaphore(max_concurrent)
+        self.aging_s = aging_s
+        self.fairness_window_s = fairness_window_s
+        self._clock = clock
         self._active: Dict[str, ExecutionTicket] = {}
-        self._pending: List[_QueueEntry] = []
-        self._lock = asyncio.Lock()
-        # Strong refs for fire-and-forget dispatch tasks (prevents premature GC).
-        self._dispatch_tasks: set[asyncio.Task] = set()
-
-    def _spawn_dispatch(self) -> None:
-        task = asyncio.create_task(self._try_dispatch())
-        self._dispatch_tasks.add(task)
-        task.add_done_callback(self._dispatch_tasks.discard)
+        self._heap: List[_QueueEntry] = []
+        self._by_model: Dict[str, List[_QueueEntry]] = {}
+        self._entries: Dict[str, _QueueEntry] = {}
+        self._seq = itertools.count()
+        # Models currently running here, and the last one granted: requests
+        # for these run without loading another model onto the device.
+        self._active_models: Counter = Counter()
+        self._last_model: Optional[str] = None
+        self.wait_histogram = WaitHistogram()
+        self.model_swaps = 0
+        self.grouped_grants = 0
+
+    def _sort_key(self, ticket: ExecutionTicket) -> float:
+        if self.aging_s > 0:
+            return ticket.priority + ticket.enqueue_time / self.aging_s
+        return float(ticket.priority)
 
     async def enqueue(self, ticket: ExecutionTicket) -> None:
         """Add ticket to queue and grant immediately if capacity allows."""
-        async with self._lock:
-            self._pending.append(_QueueEntry(ticket=ticket, priority=ticket.priority))
-            self._pending.sort(key=lambda e: e.priority)
-        self._spawn_dispatch()
-
-    async def _try_dispatch(self) -> None:
-        """Attempt to dispatch the next pending ticket."""
-        if not await self._sem.acquire_timeout():
-            return
-        async with self._lock:
-            if not self._pending:
-                self._sem.release()
+        self.submit(ticket)
+
+    def submit(self, ticket: ExecutionTicket) -> None:
+        """Synchronous :meth:`enqueue`."""
+        ticket.enqueue_time = self._clock()
+        ticket._queue = self
+        entry = _QueueEntry(self._sort_key(ticket), next(self._seq), ticket)
+        heapq.heappush(self._heap, entry)
+        heapq.heappush(self._by_model.setdefault(ticket.model_id, []), entry)
+        self._entries[ticket.ticket_id] = entry
+        self._dispatch()
+
+    @staticmethod
+    def _peek(heap: Optional[List[_QueueEntry]]) -> Optional[_QueueEntry]:
+        while heap and heap[0].done:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _resident_models(self) -> set:
+        resident = set(self._active_models)
+        if self._last_model is not None:
+            resident.add(self._last_model)
+        return resident
+
+    def _pick(self) -> Optional[_QueueEntry]:
+        head = self._peek(self._heap)
+        if head is None:
+            return None
+        resident = self._resident_models()
+        if head.ticket.model_id in resident or self.fairness_window_s <= 0 or not resident:
+            return head
+        limit = head.sort_key + self.fairness_window_s / (self.aging_s if self.aging_s > 0 else 1.0)
+        best = None
+        for model_id in resident:
+            heap = self._by_model.get(model_id)
+            candidate = self._peek(heap)
+            if candidate is None:
+                self._by_model.pop(model_id, None)
+                continue
+            if candidate.sort_key <= limit and (best is None or candidate < best):
+                best = candidate
+        if best is None:
+            return head
+        self.grouped_grants += 1
+        return best
+
+    def _dispatch(self) -> None:
+        while len(self._active) < self.max_concurrent:
+            entry = self._pick()
+            if entry is None:
                 return
-            entry = self._pending.pop(0)
+            self._grant(entry)
+
+    def _grant(self, entry: _QueueEntry) -> None:
+        entry.done = True
         ticket = entry.ticket
-        ticket.grant_time = time.monotonic()
+        self._entries.pop(ticket.ticket_id, None)
+        # A granted entry is always the top of its model heap: drop it now.
+        if self._peek(self._by_model.get(ticket.model_id)) is None:
+            self._by_model.pop(ticket.model_id, None)
+        if self._last_model is not None and ticket.model_id not in self._resident_models():
+            self.model_swaps += 1
+        self._active_models[ticket.model_id] += 1
+        self._last_model = ticket.model_id
+        ticket.grant_time = self._clock()
         self._active[ticket.ticket_id] = ticket
+        wait_ms = (ticket.grant_time - ticket.enqueue_time) * 1000
+        self.wait_histogram.observe(wait_ms)
         ticket._ready.set()
         logger.debug(
-            "Dispatched request %s on %s (wait=%.0f ms)",
+            "Dispatched %s on %s (wait=%.0f ms)",
             ticket.request_id,
             self.device_type.value,
-            ticket.queue_wait_ms,
+            wait_ms,
         )
 
     def release(self, ticket: ExecutionTicket) -> None:
         """Called when a request finishes execution."""
-        self._active.pop(ticket.ticket_id, None)
-        self._sem.release()
-        self._spawn_dispatch()
+        if self._active.pop(ticket.ticket_id, None) is None:
+            return
+        self._active_models[ticket.model_id] -= 1
+        if self._active_models[ticket.model_id] <= 0:
+            del self._active_models[ticket.model_id]
+        self._dispatch()
+
+    def abandon(self, ticket: ExecutionTicket) -> None:
+        """Forget a ticket whose caller stopped waiting for it."""
+        entry = self._entries.pop(ticket.ticket_id, None)
+        if entry is not None:
+            entry.done = True
+            return
+        self.release(ticket)
 
     @property
     def queue_depth(self) -> int:
-        return len(self._pending)
+        return len(self._entries)
 
     @property
     def active_count(self) -> int:
@@ -142,6 +299,9 @@ class DeviceQueue:
             "max_concurrent": self.max_concurrent,
             "active": self.active_count,
             "queued": self.queue_depth,
+            "model_swaps": self.model_swaps,
+            "grouped_grants": self.grouped_grants,
+            "queue_wait": self.wait_histogram.to_dict(),
         }
 
 
@@ -156,15 +316,31 @@ class HardwareScheduler:
         self,
         devices: Optional[List[DeviceCapability]] = None,
         concurrency_overrides: Optional[Dict[HardwareTarget, int]] = None,
+        *,
+        aging_s: float = _DEFAULT_AGING_S,
+        fairness_window_s: float = _DEFAULT_FAIRNESS_WINDOW_S,
     ) -> None:
-        overrides = concurrency_overrides or {}
+        self._overrides = concurrency_overrides or {}
+        self._aging_s = aging_s
+        self._fairness_window_s = fairness_window_s
         self._queues: Dict[HardwareTarget, DeviceQueue] = {}
-        detected = {d.device_type for d in (devices or [])}
+        self.update_devices(devices or [])
+
+    def update_devices(self, devices: List[DeviceCapability]) -> None:
+        """Add a queue for every newly detected device type.
+
+        Existing queues are kept, with their pending and active tickets, even
+        if their device disappears; the router simply stops sending work there.
+        """
+        detected = {d.device_type for d in devices}
         for dtype in (HardwareTarget.GPU, HardwareTarget.NPU, HardwareTarget.CPU):
+            if dtype in self._queues:
+                continue
             if dtype in detected or dtype == HardwareTarget.CPU:
-                concurrency = overrides.get(dtype, _DEFAULT_CONCURRENCY.get(dtype, 1))
-                q = _AsyncDeviceQueue(dtype, concurrency)
-                self._queues[dtype] = q  # type: ignore[assignment]
+                concurrency = self._overrides.get(dtype, _DEFAULT_CONCURRENCY.get(dtype, 1))
+                self._queues[dtype] = DeviceQueue(
+                    dtype, concurrency, aging_s=self._aging_s, fairness_window_s=self._fairness_window_s,
+                )
 
     async def enqueue(
         self,
@@ -197,7 +373,8 @@ class HardwareScheduler:
 
     def release(self, ticket: ExecutionTicket) -> None:
         """Release the slot held by *ticket*."""
-        queue = self._queues.get(ticket.device)
+        # The ticket may sit on the CPU queue after a fallback from its device.
+        queue = ticket._queue or self._queues.get(ticket.device)
         if queue:
             queue.release(ticket)
 
@@ -207,50 +384,3 @@ class HardwareScheduler:
     def queue_depth(self, device: HardwareTarget) -> int:
         q = self._queues.get(device)
         return q.queue_depth if q else 0
-
-
-# ---------------------------------------------------------------------------
-# Async-compatible DeviceQueue (overrides _try_dispatch with proper semaphore)
-# ---------------------------------------------------------------------------
-
-class _AsyncDeviceQueue(DeviceQueue):
-    """DeviceQueue that correctly handles asyncio semaphore acquire."""
-
-    def __init__(self, device_type: HardwareTarget, max_concurrent: int) -> None:
-        self.device_type = device_type
-        self.max_concurrent = max_concurrent
-        self._sem = asyncio.Semaphore(max_concurrent)
-        self._active: Dict[str, ExecutionTicket] = {}
-        self._pending: List[_QueueEntry] = []
-        self._lock = asyncio.Lock()
-        self._dispatch_lock = asyncio.Lock()
-        # Strong refs for fire-and-forget dispatch tasks (prevents premature GC).
-        self._dispatch_tasks: set[asyncio.Task] = set()
-
-    async def _try_dispatch(self) -> None:
-        """Non-blocking dispatch: try to acquire semaphore immediately."""
-        async with self._dispatch_lock:
-            async with self._lock:
-                if not self._pending:
-                    return
-                # Peek without blocking.
-                if self._sem.locked():
-                    return  # No slot available right now.
-                await self._sem.acquire()
-                entry = self._pending.pop(0)
-
-            ticket = entry.ticket
-            ticket.grant_time = time.monotonic()
-            self._active[ticket.ticket_id] = ticket
-            ticket._ready.set()
-            logger.debug(
-                "Dispatched %s on %s (wait=%.0f ms)",
-                ticket.request_id,
-                self.device_type.value,
-                ticket.queue_wait_ms,
-            )
-
-    def release(self, ticket: ExecutionTicket) -> None:
-        self._active.pop(ticket.ticket_id, None)
-        self._sem.release()
-        self._spawn_dispatch()
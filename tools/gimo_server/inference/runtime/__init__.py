@@ -4,11 +4,13 @@ Public API::
 
     from inference.runtime import OnnxAdapter, GgufAdapter, SessionPool, SessionHandle
     from inference.runtime import RuntimeAdapter, select_ep_chain, EP_PRIORITY
+    from inference.runtime import ContinuousBatcher, BatchingConfig, BatchDecoder
 """
 from .base_adapter import EP_PRIORITY, RuntimeAdapter, SessionHandle, select_ep_chain
-from .gguf_adapter import GgufAdapter
+from .batcher import BatchDecoder, BatchingConfig, BatchRunner, ContinuousBatcher, DecodeStep
+from .gguf_adapter import GgufAdapter, SessionQueueFull
 from .onnx_adapter import OnnxAdapter
-from .session_pool import PoolMetrics, SessionPool
+from .session_pool import PoolAdmissionError, PoolMetrics, SessionPool
 
 __all__ = [
     "RuntimeAdapter",
@@ -17,6 +19,13 @@ __all__ = [
     "select_ep_chain",
     "OnnxAdapter",
     "GgufAdapter",
+    "SessionQueueFull",
+    "ContinuousBatcher",
+    "BatchingConfig",
+    "BatchDecoder",
+    "BatchRunner",
+    "DecodeStep",
     "SessionPool",
     "PoolMetrics",
+    "PoolAdmissionError",
 ]
@@ -0,0 +1,337 @@
+"""Continuous batching — concurrent requests for one loaded model share passes.
+
+Opt-in per model (:meth:`InferenceEngineService.enable_batching`).  Requests
+for a batched model are handed to the :class:`ContinuousBatcher` of their
+pooled session instead of each taking a scheduler slot and calling
+``adapter.run`` on its own.
+
+The batcher runs one loop per session, holding a single
+:class:`HardwareScheduler` slot while it has work:
+
+- When idle, the first request opens a collection window (``window_ms``) so a
+  burst can fill the batch up to ``max_batch_size``.
+- At every step boundary waiting requests join the running batch (up to
+  ``max_batch_size``); newcomers are prefilled together, then one decode step
+  runs for every active sequence and each caller receives its new text.
+- A sequence leaves as soon as it finishes and its place goes to the next
+  waiting request — nobody waits for the rest of the batch.
+- After ``max_hold_steps`` steps or ``max_hold_ms`` with the slot, if other
+  work is queued on the device, the slot is released and re-requested, so
+  the scheduler's priority aging still applies to everyone else.
+
+Adapters opt in by implementing :class:`BatchDecoder` (prefill/decode over
+many sequences, e.g. a multi-sequence KV cache).  Adapters that can only run
+a whole batch in one pass — an ONNX graph with a dynamic batch dimension —
+implement ``run_batch`` (:class:`BatchRunner`) instead; their requests are
+collected for a window and run as one pass.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Protocol, runtime_checkable
+
+from ..contracts import HardwareTarget, InferenceRequest
+from .base_adapter import SessionHandle
+
+logger = logging.getLogger("gie.runtime.batcher")
+
+_END = object()
+
+
+@dataclass(frozen=True)
+class BatchingConfig:
+    """Per-model batching settings."""
+    window_ms: float = 5.0
+    max_batch_size: int = 8
+    # Bound on one uninterrupted hold of the scheduler slot.
+    max_hold_steps: int = 16
+    max_hold_ms: float = 200.0
+
+
+@dataclass
+class BatchSequence:
+    """One request inside a batch; ``state`` is adapter-private (KV slot…)."""
+    seq_id: int
+    inputs: Dict[str, Any]
+    state: Any = None
+
+
+@dataclass
+class DecodeStep:
+    """What one prefill/decode pass produced for one sequence."""
+    text: str = ""
+    tokens: int = 1
+    finished: bool = False
+    finish_reason: str = ""
+
+
+@runtime_checkable
+class BatchDecoder(Protocol):
+    """Adapter that prefills and decodes many sequences per forward pass."""
+
+    async def prefill_batch(self, session: SessionHandle, seqs: List[BatchSequence]) -> List[DecodeStep]:
+        """Evaluate the prompts of *seqs* together; returns each one's first step."""
+        ...
+
+    async def decode_batch(self, session: SessionHandle, seqs: List[BatchSequence]) -> List[DecodeStep]:
+        """Advance every sequence in *seqs* by one token."""
+        ...
+
+    async def release_sequences(self, session: SessionHandle, seqs: List[BatchSequence]) -> None:
+        """Free per-sequence state (KV cells) of finished or abandoned sequences."""
+        ...
+
+
+@runtime_checkable
+class BatchRunner(Protocol):
+    """Adapter that runs several independent inputs as one pass."""
+
+    async def run_batch(self, session: SessionHandle, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ...
+
+
+def supports_batching(adapter: Any) -> bool:
+    return isinstance(adapter, (BatchDecoder, BatchRunner))
+
+
+class BatchedRequest:
+    """Caller's handle: iterate it for streamed text, or await :meth:`result`."""
+
+    def __init__(self, request: InferenceRequest, seq_id: int) -> None:
+        self.request = request
+        self.sequence = BatchSequence(seq_id=seq_id, inputs=request.inputs)
+        self.enqueued_at = time.monotonic()
+        self.first_token_at = 0.0
+        self.tokens = 0
+        self._parts: List[str] = []
+        self._pieces: asyncio.Queue = asyncio.Queue()
+        self._done: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.cancelled = False
+
+    # -- batcher side -------------------------------------------------------
+
+    def _push(self, step: DecodeStep) -> None:
+        if step.tokens and not self.first_token_at:
+            self.first_token_at = time.monotonic()
+        self.tokens += step.tokens
+        if step.text:
+            self._parts.append(step.text)
+            self._pieces.put_nowait(step.text)
+
+    def _finish(self, outputs: Optional[Dict[str, Any]] = None, error: Optional[BaseException] = None) -> None:
+        if self._done.done():
+            return
+        if error is not None:
+            self._done.set_exception(error)
+        else:
+            self._done.set_result(outputs or {})
+        self._pieces.put_nowait(_END)
+
+    def _finish_stream(self, reason: str) -> None:
+        gen_s = time.monotonic() - (self.first_token_at or self.enqueued_at)
+        self._finish({
+            "text": "".join(self._parts),
+            "tokens_generated": self.tokens,
+            "finish_reason": reason,
+            "tokens_per_second": self.tokens / gen_s if gen_s > 0 else 0.0,
+        })
+
+    # -- caller side --------------------------------------------------------
+
+    async def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for the outputs; after *timeout* seconds the sequence leaves the batch."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._done), timeout)
+        except asyncio.TimeoutError:
+            self.cancel()
+            raise TimeoutError(f"Request {self.request.request_id} timed out in the batch")
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            piece = await self._pieces.get()
+            if piece is _END:
+                break
+            yield piece
+        await self.result()  # re-raise a batch failure
+
+    def cancel(self) -> None:
+        """Caller gave up: the sequence leaves the batch at the next step."""
+        self.cancelled = True
+        if not self._done.done():
+            self._done.cancel()
+            self._pieces.put_nowait(_END)
+
+
+class ContinuousBatcher:
+    """Batching loop for one pooled session (see module docstring)."""
+
+    def __init__(
+        self,
+        adapter: Any,
+        session: SessionHandle,
+        config: BatchingConfig,
+        *,
+        scheduler: Any,
+        device: HardwareTarget,
+        on_idle: Optional[Callable[["ContinuousBatcher"], None]] = None,
+    ) -> None:
+        if not supports_batching(adapter):
+            raise TypeError(f"{type(adapter).__name__} implements neither run_batch nor prefill/decode_batch")
+        self.adapter = adapter
+        self.session = session
+        self.config = config
+        self._scheduler = scheduler
+        self._device = device
+        self._on_idle = on_idle
+        self._waiting: List[BatchedRequest] = []
+        self._active: List[BatchedRequest] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._ticket: Any = None
+        self._held_since = 0.0
+        self._held_steps = 0
+        self._seq = itertools.count()
+        self.batches = 0
+        self.batch_size_sum = 0
+        self.slot_yields = 0
+
+    def submit(self, request: InferenceRequest) -> BatchedRequest:
+        handle = BatchedRequest(request, next(self._seq))
+        self._waiting.append(handle)
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+        return handle
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.batch_size_sum / self.batches if self.batches else 0.0
+
+    # -- loop ---------------------------------------------------------------
+
+    async def _collect(self) -> None:
+        """Give a burst ``window_ms`` to fill the batch before starting it."""
+        deadline = time.monotonic() + self.config.window_ms / 1000
+        while len(self._waiting) < self.config.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    async def _acquire_slot(self) -> None:
+        if self._ticket is not None:
+            return
+        first = min(self._waiting or self._active, key=lambda h: h.request.priority).request
+        ticket = await self._scheduler.enqueue(first, self._device)
+        await ticket.wait(timeout=first.timeout_seconds)
+        self._ticket = ticket
+        self._held_since = time.monotonic()
+        self._held_steps = 0
+
+    def _release_slot(self) -> None:
+        if self._ticket is not None:
+            self._scheduler.release(self._ticket)
+            self._ticket = None
+
+    def _should_yield(self) -> bool:
+        """Held the slot long enough and someone else is queued for the device."""
+        held_ms = (time.monotonic() - self._held_since) * 1000
+        if self._held_steps < self.config.max_hold_steps and held_ms < self.config.max_hold_ms:
+            return False
+        return self._scheduler.queue_depth(self._device) > 0
+
+    def _admit(self) -> List[BatchedRequest]:
+        self._waiting = [h for h in self._waiting if not h.cancelled]
+        room = max(0, self.config.max_batch_size - len(self._active))
+        admitted, self._waiting = self._waiting[:room], self._waiting[room:]
+        return admitted
+
+    async def _loop(self) -> None:
+        error: Exception = RuntimeError("batcher stopped")
+        try:
+            while self._waiting or self._active:
+                if not self._active:
+                    await self._collect()
+                await self._acquire_slot()
+                if isinstance(self.adapter, BatchDecoder):
+                    await self._step()
+                else:
+                    await self._run_once()
+                self._held_steps += 1
+                if not self._active:
+                    self._release_slot()
+                elif self._should_yield():
+                    # Back of the queue: the active sequences resume when the
+                    # scheduler grants the slot again.
+                    self.slot_yields += 1
+                    self._release_slot()
+        except Exception as exc:
+            error = exc
+            logger.error("Batch on %s failed: %s", self.session.model_id, exc)
+        finally:
+            # Nothing finishes these once the loop is gone (failure or
+            # cancellation), so fail every caller still in or queued for it.
+            for handle in self._active + self._waiting:
+                handle._finish(error=error)
+            self._active, self._waiting = [], []
+            self._release_slot()
+            if self._on_idle is not None:
+                self._on_idle(self)
+
+    async def _run_once(self) -> None:
+        batch = self._admit()
+        if not batch:
+            return
+        self._record(len(batch))
+        self._active = batch
+        outputs = await self.adapter.run_batch(self.session, [h.request.inputs for h in batch])
+        for handle, out in zip(batch, outputs):
+            handle._finish(out)
+        self._active = []
+
+    async def _step(self) -> None:
+        admitted = self._admit()
+        if admitted:
+            self._active.extend(admitted)
+            steps = await self.adapter.prefill_batch(self.session, [h.sequence for h in admitted])
+            self._deliver(admitted, steps)
+        # Newly admitted sequences got their first token from prefill; the
+        # rest advance together.
+        running = [h for h in self._active if h not in admitted]
+        if running:
+            self._record(len(running))
+            self._deliver(running, await self.adapter.decode_batch(self.session, [h.sequence for h in running]))
+        finished = [h for h in self._active if h._done.done()]
+        if finished:
+            self._active = [h for h in self._active if not h._done.done()]
+            await self.adapter.release_sequences(self.session, [h.sequence for h in finished])
+
+    def _deliver(self, handles: List[BatchedRequest], steps: List[DecodeStep]) -> None:
+        for handle, step in zip(handles, steps):
+            if handle.cancelled:
+                continue
+            handle._push(step)
+            if step.finished:
+                handle._finish_stream(step.finish_reason or "stop")
+
+    def _record(self, size: int) -> None:
+        self.batches += 1
+        self.batch_size_sum += size
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "model_id": self.session.model_id,
+            "active": len(self._active),
+            "waiting": len(self._waiting),
+            "batches": self.batches,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+            "slot_yields": self.slot_yields,
+        }
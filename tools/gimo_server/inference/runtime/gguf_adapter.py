@@ -3,15 +3,28 @@
 Wraps ``llama_cpp.Llama`` and implements the :class:`RuntimeAdapter` protocol.
 Handles dynamic layer-offloading based on available VRAM so callers only need
 to specify a ``HardwareTarget``.
+
+A ``Llama`` object is not thread-safe, so every loaded session gets its own
+single-thread executor: calls on one session run one at a time, and never
+compete with unrelated work in the loop's default executor.  Each session
+also tracks which prompt tokens are already in its KV cache (plus a few saved
+KV snapshots) and only evaluates the part of a new prompt past the longest
+common prefix — consecutive agent turns sharing a long system/context prefix
+skip re-evaluating it.
 """
 from __future__ import annotations
 
 import asyncio
+import codecs
 import logging
 import math
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
 
 from ..contracts import (
     ExecutionProviderType,
@@ -51,6 +64,22 @@ _BYTES_PER_PARAM = {
 }
 
 
+# Requests one session accepts (running + waiting) before refusing more.
+_DEFAULT_MAX_QUEUE = 8
+# KV snapshots kept per session, so interleaved conversations each keep
+# their prefix instead of evicting one another's.
+_DEFAULT_PREFIX_STATES = 2
+# Live KV tokens a new prompt must drop before they are worth a snapshot:
+# a short divergent tail is cheaper to re-evaluate than to save.
+_MIN_SNAPSHOT_TOKENS = 64
+
+_END = object()
+
+
+class SessionQueueFull(RuntimeError):
+    """A session already has its maximum number of requests queued or running."""
+
+
 def _bytes_per_param(quant: str) -> float:
     return _BYTES_PER_PARAM.get(quant.lower(), 2.0)
 
@@ -83,9 +112,202 @@ def _estimate_gpu_layers(
     return max(0, math.floor(ratio * num_layers_total))
 
 
+def _common_prefix(a: Sequence[int], b: Sequence[int]) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _split_stop(text: str, stops: Sequence[str]) -> Tuple[str, str, bool]:
+    """Split streamed *text* into (safe to emit, held back, stop hit).
+
+    Text that could be the start of a stop sequence is held back until the
+    next piece shows whether it is one.
+    """
+    hits = [i for i in (text.find(s) for s in stops) if i >= 0]
+    if hits:
+        return text[:min(hits)], "", True
+    hold = 0
+    for stop in stops:
+        for k in range(min(len(stop) - 1, len(text)), hold, -1):
+            if text.endswith(stop[:k]):
+                hold = k
+                break
+    return text[:len(text) - hold], text[len(text) - hold:], False
+
+
+class _SessionRunner:
+    """Serialises all work on one ``Llama`` and manages its prompt KV cache.
+
+    Everything except :meth:`admit`/:meth:`close` runs on the session's
+    single worker thread, so the KV bookkeeping needs no locking.
+    """
+
+    def __init__(self, llama: Any, name: str, *, max_queue: int, prefix_states: int) -> None:
+        self.llama = llama
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"gguf-{name}")
+        self._max_queue = max(1, max_queue)
+        self._prefix_states = max(0, prefix_states)
+        self._pending: "set[Future[Any]]" = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Tokens whose KV is in the context right now, and saved snapshots
+        # keyed by the tokens they hold (LRU order).
+        self._kv_tokens: List[int] = []
+        self._states: "OrderedDict[Tuple[int, ...], Any]" = OrderedDict()
+
+    def submit(self, fn: Callable[[], Any]) -> "Future[Any]":
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Session has been unloaded")
+            if len(self._pending) >= self._max_queue:
+                raise SessionQueueFull(f"{len(self._pending)} requests already queued on this session")
+            future = self._executor.submit(fn)
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            queued = list(self._pending)
+        for future in queued:
+            future.cancel()
+        # A generation already running finishes on its own reference; the KV
+        # bookkeeping it uses is dropped on the worker thread after it.
+        self._executor.submit(self._release)
+        self._executor.shutdown(wait=False)
+        self.llama = None
+
+    # -- worker thread ------------------------------------------------------
+
+    def _release(self) -> None:
+        self._states.clear()
+        self._kv_tokens = []
+
+    def _snapshot_live(self, llama: Any, shared: int) -> None:
+        """Save the live KV before a prompt diverging at *shared* overwrites it."""
+        live = tuple(self._kv_tokens)
+        if len(live) - shared < _MIN_SNAPSHOT_TOKENS:
+            return
+        if any(_common_prefix(key, live) == len(live) for key in self._states):
+            return
+        # Snapshots the live KV extends are superseded by it.
+        for key in [k for k in self._states if _common_prefix(k, live) == len(k)]:
+            del self._states[key]
+        self._states[live] = llama.save_state()
+        while len(self._states) > self._prefix_states:
+            self._states.popitem(last=False)
+
+    def _prepare_prompt(self, llama: Any, tokens: List[int]) -> int:
+        """Bring the KV cache to *tokens*; returns how many were reused.
+
+        The live KV is snapshotted only when this prompt diverges from it and
+        the part it would lose is long enough to be worth restoring later.
+        """
+        reuse = shared = _common_prefix(self._kv_tokens, tokens)
+        snapshot = None
+        for key in self._states:
+            n = _common_prefix(key, tokens)
+            if n > reuse:
+                reuse, snapshot = n, key
+        state = None
+        if snapshot is not None:
+            state = self._states[snapshot]
+            self._states.move_to_end(snapshot)
+        if self._prefix_states and shared < len(self._kv_tokens):
+            self._snapshot_live(llama, shared)
+        if state is not None:
+            llama.load_state(state)
+        # The last prompt token is always evaluated: sampling needs its logits.
+        reuse = min(reuse, len(tokens) - 1)
+        llama.n_tokens = reuse
+        self._kv_tokens = tokens[:reuse]
+        llama.eval(tokens[reuse:])
+        self._kv_tokens = list(tokens)
+        return reuse
+
+    def generate(
+        self,
+        inputs: Dict[str, Any],
+        emit: Callable[[str], None],
+        cancel: threading.Event,
+    ) -> Dict[str, Any]:
+        llama = self.llama
+        if llama is None:
+            raise RuntimeError("Session has been unloaded")
+        prompt: str = inputs.get("prompt", "")
+        max_tokens: int = int(inputs.get("max_tokens", 256))
+        temperature: float = float(inputs.get("temperature", 0.7))
+        top_p: float = float(inputs.get("top_p", 0.95))
+        stop = [s for s in (inputs.get("stop") or []) if s]
+
+        n_ctx = llama.n_ctx()
+        tokens = llama.tokenize(prompt.encode("utf-8"))
+        if not tokens or len(tokens) >= n_ctx:
+            raise ValueError(f"Prompt of {len(tokens)} tokens does not fit a context of {n_ctx}")
+
+        t0 = time.perf_counter()
+        reused = self._prepare_prompt(llama, tokens)
+        t_prompt = time.perf_counter()
+
+        eos = llama.token_eos()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        parts: List[str] = []
+        held = ""
+        hit = False
+        generated = 0
+        finish_reason = "length"
+        pending: Optional[int] = None
+        for _ in range(min(max_tokens, n_ctx - len(tokens))):
+            if cancel.is_set():
+                finish_reason = "cancelled"
+                break
+            if pending is not None:
+                llama.eval([pending])
+                self._kv_tokens.append(pending)
+            token = llama.sample(temp=temperature, top_p=top_p)
+            if token == eos:
+                finish_reason = "stop"
+                break
+            generated += 1
+            pending = token
+            out, held, hit = _split_stop(held + decoder.decode(llama.detokenize([token])), stop)
+            if out:
+                parts.append(out)
+                emit(out)
+            if hit:
+                finish_reason = "stop"
+                break
+        if not hit:
+            tail = held + decoder.decode(b"", final=True)
+            if tail:
+                parts.append(tail)
+                emit(tail)
+
+        gen_s = time.perf_counter() - t_prompt
+        return {
+            "text": "".join(parts),
+            "tokens_generated": generated,
+            "tokens_prompt": len(tokens),
+            "tokens_prompt_cached": reused,
+            "finish_reason": finish_reason,
+            "prompt_ms": round((t_prompt - t0) * 1000, 2),
+            "tokens_per_second": generated / gen_s if gen_s > 0 else 0.0,
+        }
+
+
+@dataclass
 class _GgufSessionHandle(SessionHandle):
     """SessionHandle that carries the llama_cpp.Llama instance."""
-    pass  # _backend holds the Llama instance
+    # _backend holds the Llama instance; the runner serialises access to it.
+    _runner: Optional[_SessionRunner] = field(default=None, repr=False)
 
 
 # ---------------------------------------------------------------------------
@@ -118,22 +340,35 @@ class GgufAdapter:
             "text":            str,      # generated text
             "tokens_generated": int,
             "tokens_prompt":    int,
+            "tokens_prompt_cached": int, # prompt tokens whose KV was reused
+            "finish_reason":   str,
+            "tokens_per_second": float,
         }
+
+    ``stream()`` takes the same inputs and yields the text as it is generated.
     """
 
     def __init__(
         self,
         *,
         vram_free_gb: float = 0.0,
+        max_queue_per_session: int = _DEFAULT_MAX_QUEUE,
+        prefix_states: int = _DEFAULT_PREFIX_STATES,
     ) -> None:
         """
         Args:
             vram_free_gb: Free GPU VRAM in GB used for layer-offload estimation.
                           Pass 0 for CPU-only inference.
+            max_queue_per_session: Requests a session holds (running + waiting)
+                          before ``SessionQueueFull`` is raised.
+            prefix_states: KV snapshots kept per session for prefix reuse
+                          (0 = reuse only what is live in the context).
         """
         if not _LLAMA_AVAILABLE:
             logger.warning("llama-cpp-python not installed — GgufAdapter will raise on use")
         self._vram_free_gb = vram_free_gb
+        self._max_queue = max_queue_per_session
+        self._prefix_states = prefix_states
 
     # ------------------------------------------------------------------
     # RuntimeAdapter protocol
@@ -207,6 +442,7 @@ class GgufAdapter:
             last_used=time.monotonic(),
             _backend=llama,
         )
+        self._runner_for(handle)
         logger.info("GGUF model %s loaded (EP=%s)", spec.model_id, active_ep.value)
         return handle
 
@@ -215,47 +451,69 @@ class GgufAdapter:
         session: SessionHandle,
         inputs: Dict[str, Any],
     ) -> Dict[str, Any]:
-        if not _LLAMA_AVAILABLE:
-            raise ImportError("llama-cpp-python is required")
-
-        llama: "llama_cpp.Llama" = session._backend
-        if llama is None:
-            raise RuntimeError(f"Session {session.session_id} is no longer valid")
+        runner = self._runner_for(session)
+        session.last_used = time.monotonic()
+        never = threading.Event()
+        return await asyncio.wrap_future(
+            runner.submit(lambda: runner.generate(inputs, lambda _piece: None, never))
+        )
 
-        prompt: str = inputs.get("prompt", "")
-        max_tokens: int = int(inputs.get("max_tokens", 256))
-        temperature: float = float(inputs.get("temperature", 0.7))
-        top_p: float = float(inputs.get("top_p", 0.95))
-        stop: Optional[List[str]] = inputs.get("stop")
-
-        def _infer() -> Dict[str, Any]:
-            response = llama(
-                prompt=prompt,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                top_p=top_p,
-                stop=stop or [],
-                echo=False,
-            )
-            choice = response["choices"][0]
-            usage = response.get("usage", {})
-            return {
-                "text": choice["text"],
-                "tokens_generated": usage.get("completion_tokens", 0),
-                "tokens_prompt": usage.get("prompt_tokens", 0),
-                "finish_reason": choice.get("finish_reason", ""),
-            }
+    async def stream(
+        self,
+        session: SessionHandle,
+        inputs: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """Yield generated text as it is produced.
 
-        loop = asyncio.get_running_loop()
+        Closing the iterator early stops generation at the next token.
+        """
+        runner = self._runner_for(session)
         session.last_used = time.monotonic()
-        return await loop.run_in_executor(None, _infer)
+        loop = asyncio.get_running_loop()
+        pieces: asyncio.Queue = asyncio.Queue()
+        cancel = threading.Event()
+
+        def _emit(piece: str) -> None:
+            loop.call_soon_threadsafe(pieces.put_nowait, piece)
+
+        future = asyncio.wrap_future(runner.submit(lambda: runner.generate(inputs, _emit, cancel)))
+        # Scheduled after every piece the worker emitted before finishing.
+        future.add_done_callback(lambda _f: pieces.put_nowait(_END))
+        try:
+            while True:
+                piece = await pieces.get()
+                if piece is _END:
+                    break
+                yield piece
+            await future  # re-raise a generation error
+        finally:
+            cancel.set()
 
     async def unload(self, session: SessionHandle) -> None:
+        runner = getattr(session, "_runner", None)
+        if runner is not None:
+            runner.close()
+            session._runner = None
         if session._backend is not None:
             # llama_cpp.Llama releases native memory on __del__.
             session._backend = None
         logger.debug("GGUF session %s unloaded", session.session_id)
 
+    def _runner_for(self, session: SessionHandle) -> _SessionRunner:
+        runner = getattr(session, "_runner", None)
+        if runner is not None:
+            return runner
+        if session._backend is None:
+            raise RuntimeError(f"Session {session.session_id} is no longer valid")
+        runner = _SessionRunner(
+            session._backend,
+            session.model_id or session.session_id[:8],
+            max_queue=self._max_queue,
+            prefix_states=self._prefix_states,
+        )
+        session._runner = runner
+        return runner
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
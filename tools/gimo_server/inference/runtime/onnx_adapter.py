@@ -213,27 +213,65 @@ class OnnxAdapter:
         inputs: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Run inference.  Non-blocking — delegates to thread pool."""
-        if not _ORT_AVAILABLE:
-            raise ImportError("onnxruntime is required")
+        ort_session, use_binding = self._backend_for(session)
 
-        ort_session: "ort.InferenceSession" = session._backend
-        if ort_session is None:
-            raise RuntimeError(f"Session {session.session_id} has no backend (already unloaded?)")
+        loop = asyncio.get_running_loop()
+        session.last_used = time.monotonic()
+        return await loop.run_in_executor(None, self._run_sync, ort_session, inputs, use_binding)
 
-        # IO binding (zero-copy) when the active EP supports it.
-        use_binding = session.execution_provider in (
-            ExecutionProviderType.CUDA,
-            ExecutionProviderType.TENSORRT,
-            ExecutionProviderType.DIRECTML,
-            ExecutionProviderType.ROCM,
+    async def run_batch(
+        self,
+        session: SessionHandle,
+        inputs: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Run several requests as one pass along a dynamic batch dimension.
+
+        Requests whose inputs agree on names, dtypes and every dimension but
+        the first are concatenated on axis 0 and run together; outputs are
+        split back per request.  Graphs with a fixed batch dimension,
+        requests that do not fit any group, and groups whose outputs are not
+        batch-major (dim 0 != the summed batch size) run one by one.
+        """
+        ort_session, use_binding = self._backend_for(session)
+        dynamic = all(
+            not isinstance(i.shape[0], int) for i in ort_session.get_inputs() if i.shape
         )
 
-        def _run() -> Dict[str, Any]:
-            if use_binding:
-                return self._run_with_binding(ort_session, inputs)
-            output_names = [o.name for o in ort_session.get_outputs()]
-            results = ort_session.run(output_names, inputs)
-            return dict(zip(output_names, results))
+        def _run() -> List[Dict[str, Any]]:
+            import numpy as np
+
+            results: List[Optional[Dict[str, Any]]] = [None] * len(inputs)
+            groups: Dict[Any, List[int]] = {}
+            for idx, item in enumerate(inputs):
+                arrays = {k: np.asarray(v) for k, v in item.items()}
+                if not dynamic or any(a.ndim == 0 for a in arrays.values()):
+                    results[idx] = self._run_sync(ort_session, item, use_binding)
+                    continue
+                key = tuple(sorted((k, a.dtype.str, a.shape[1:]) for k, a in arrays.items()))
+                groups.setdefault(key, []).append(idx)
+
+            for members in groups.values():
+                if len(members) == 1:
+                    results[members[0]] = self._run_sync(ort_session, inputs[members[0]], use_binding)
+                    continue
+                sizes = [len(np.asarray(next(iter(inputs[i].values())))) for i in members]
+                feed = {
+                    name: np.concatenate([np.asarray(inputs[i][name]) for i in members])
+                    for name in inputs[members[0]]
+                }
+                merged = self._run_sync(ort_session, feed, use_binding)
+                total = sum(sizes)
+                if not all(np.ndim(v) and np.shape(v)[0] == total for v in merged.values()):
+                    # Some output is not batch-major (pooled, scalar…): it
+                    # cannot be split back, so each request runs alone.
+                    for idx in members:
+                        results[idx] = self._run_sync(ort_session, inputs[idx], use_binding)
+                    continue
+                bounds = np.cumsum(sizes)[:-1]
+                split = {name: np.split(value, bounds) for name, value in merged.items()}
+                for pos, idx in enumerate(members):
+                    results[idx] = {name: parts[pos] for name, parts in split.items()}
+            return results  # type: ignore[return-value]
 
         loop = asyncio.get_running_loop()
         session.last_used = time.monotonic()
@@ -251,6 +289,37 @@ class OnnxAdapter:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _backend_for(session: SessionHandle) -> "tuple[ort.InferenceSession, bool]":
+        if not _ORT_AVAILABLE:
+            raise ImportError("onnxruntime is required")
+
+        ort_session: "ort.InferenceSession" = session._backend
+        if ort_session is None:
+            raise RuntimeError(f"Session {session.session_id} has no backend (already unloaded?)")
+
+        # IO binding (zero-copy) when the active EP supports it.
+        use_binding = session.execution_provider in (
+            ExecutionProviderType.CUDA,
+            ExecutionProviderType.TENSORRT,
+            ExecutionProviderType.DIRECTML,
+            ExecutionProviderType.ROCM,
+        )
+        return ort_session, use_binding
+
+    @classmethod
+    def _run_sync(
+        cls,
+        ort_session: "ort.InferenceSession",
+        inputs: Dict[str, Any],
+        use_binding: bool,
+    ) -> Dict[str, Any]:
+        if use_binding:
+            return cls._run_with_binding(ort_session, inputs)
+        output_names = [o.name for o in ort_session.get_outputs()]
+        results = ort_session.run(output_names, inputs)
+        return dict(zip(output_names, results))
+
     @staticmethod
     def _probe_providers() -> List[ExecutionProviderType]:
         """Map raw ORT provider strings to our enum values."""
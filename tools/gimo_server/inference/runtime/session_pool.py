@@ -4,11 +4,24 @@ Keeps loaded model sessions alive between requests so we avoid the expensive
 model-load penalty on every call.  Evicts least-recently-used sessions when
 memory pressure is too high or the pool is full.
 
+Concurrency model (single event loop):
+
+- Hits never wait: a loaded session is returned without taking any lock.
+- Loads are single-flight per key: concurrent misses for the same model share
+  one ``adapter.load_model`` call; loads of *different* models run in parallel.
+- Sessions in use are refcounted (``acquire``) and never evicted underneath a
+  caller.  Explicit eviction of a busy session retires it from the pool and
+  unloads it when the last user releases it.
+- Before a load starts, its estimated footprint is reserved against
+  ``max_memory_mb``; idle sessions are evicted to make room and the load is
+  refused with :class:`PoolAdmissionError` if busy/loading sessions hold the
+  memory it needs.
+
 Typical usage::
 
     pool = SessionPool(max_sessions=4, max_memory_mb=12_000)
-    handle = await pool.get_or_load(spec, device, adapter)
-    outputs = await adapter.run(handle, inputs)
+    async with pool.acquire(spec, device, adapter) as handle:
+        outputs = await adapter.run(handle, inputs)
     # handle stays in pool until evicted
 """
 from __future__ import annotations
@@ -17,8 +30,9 @@ import asyncio
 import logging
 import time
 from collections import OrderedDict
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from ..contracts import HardwareTarget, ModelSpec
 from .base_adapter import RuntimeAdapter, SessionHandle
@@ -26,6 +40,10 @@ from .base_adapter import RuntimeAdapter, SessionHandle
 logger = logging.getLogger("gie.runtime.pool")
 
 
+class PoolAdmissionError(RuntimeError):
+    """A load was refused because busy or loading sessions hold the memory it needs."""
+
+
 # ---------------------------------------------------------------------------
 # Metrics
 # ---------------------------------------------------------------------------
@@ -37,6 +55,8 @@ class PoolMetrics:
     misses: int = 0         # sessions that had to be loaded from disk
     evictions: int = 0      # sessions evicted due to pressure
     load_errors: int = 0    # failed load attempts
+    coalesced: int = 0      # misses that joined an in-flight load of the same key
+    rejected: int = 0       # loads refused by the memory admission check
     total_load_ms: float = 0.0
 
     @property
@@ -54,6 +74,8 @@ class PoolMetrics:
             "misses": self.misses,
             "evictions": self.evictions,
             "load_errors": self.load_errors,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
             "hit_rate": round(self.hit_rate, 3),
             "avg_load_ms": round(self.avg_load_ms, 1),
         }
@@ -67,17 +89,22 @@ def _pool_key(model_id: str, device: HardwareTarget) -> str:
     return f"{model_id}::{device.value}"
 
 
+def _estimate_mb(spec: ModelSpec) -> float:
+    """Pre-load footprint estimate: the on-disk size (0 when unknown)."""
+    return spec.size_bytes / (1024 * 1024) if spec.size_bytes else 0.0
+
+
 # ---------------------------------------------------------------------------
 # SessionPool
 # ---------------------------------------------------------------------------
 
 class SessionPool:
-    """Thread-safe LRU pool of active inference sessions.
+    """Concurrency-safe LRU pool of active inference sessions.
 
     Args:
         max_sessions:   Hard cap on simultaneous loaded sessions.
         max_memory_mb:  Soft cap on total session memory.  When exceeded,
-                        the LRU session is evicted until we are under the cap.
+                        the LRU idle session is evicted until we are under the cap.
         warmup_ids:     Model IDs to pre-load on startup (optional).
     """
 
@@ -97,7 +124,16 @@ class SessionPool:
         # Adapter reference kept per key so we can call unload().
         self._adapters: Dict[str, RuntimeAdapter] = {}
 
-        self._lock = asyncio.Lock()
+        # Single-flight: pool_key → future resolved by the one coroutine loading it.
+        self._loading: Dict[str, asyncio.Future] = {}
+        # Memory reserved by in-flight loads (pool_key → estimated MB).
+        self._reserved_mb: Dict[str, float] = {}
+        # In-use refcounts keyed by session_id (stable across evict/reload).
+        self._refs: Dict[str, int] = {}
+        # Sessions evicted while in use: session_id → (handle, adapter).
+        # Unloaded when their refcount drops to zero.
+        self._retired: Dict[str, Tuple[SessionHandle, Optional[RuntimeAdapter]]] = {}
+
         self.metrics = PoolMetrics()
 
     # ------------------------------------------------------------------
@@ -112,57 +148,40 @@ class SessionPool:
     ) -> SessionHandle:
         """Return a cached session or load one, evicting if necessary.
 
-        This is the primary entry point for the engine — it guarantees that a
-        valid, ready-to-use session is returned (or raises on irrecoverable error).
+        The returned handle is *not* pinned; use :meth:`acquire` when the
+        caller is about to run on it and it must survive concurrent eviction.
         """
-        key = _pool_key(spec.model_id, device)
-
-        async with self._lock:
-            if key in self._sessions:
-                # Cache hit — bump to most-recently-used position.
-                self._sessions.move_to_end(key)
-                self._sessions[key].last_used = time.monotonic()
-                self.metrics.hits += 1
-                logger.debug("Pool hit: %s", key)
-                return self._sessions[key]
-
-            # Cache miss — load the model.
-            self.metrics.misses += 1
-            logger.debug("Pool miss: %s — loading", key)
-            t0 = time.monotonic()
-            try:
-                handle = await adapter.load_model(spec, device)
-            except Exception as exc:
-                self.metrics.load_errors += 1
-                logger.error("Failed to load %s: %s", key, exc)
-                raise
-
-            elapsed_ms = (time.monotonic() - t0) * 1000
-            self.metrics.total_load_ms += elapsed_ms
-
-            # Evict sessions to make room before adding the new one.
-            await self._evict_if_needed(handle.memory_mb)
+        return await self._get(spec, device, adapter, pin=False)
 
-            self._sessions[key] = handle
-            self._adapters[key] = adapter
-            return handle
+    @asynccontextmanager
+    async def acquire(
+        self,
+        spec: ModelSpec,
+        device: HardwareTarget,
+        adapter: RuntimeAdapter,
+    ) -> AsyncIterator[SessionHandle]:
+        """Get-or-load and pin the session for the duration of the block."""
+        handle = await self._get(spec, device, adapter, pin=True)
+        try:
+            yield handle
+        finally:
+            await self._release(handle)
 
     async def evict(self, model_id: str, device: Optional[HardwareTarget] = None) -> None:
-        """Explicitly evict a specific model from the pool."""
-        async with self._lock:
-            if device is not None:
-                key = _pool_key(model_id, device)
-                await self._evict_key(key)
-            else:
-                keys_to_evict = [k for k in self._sessions if k.startswith(f"{model_id}::")]
-                for key in keys_to_evict:
-                    await self._evict_key(key)
+        """Explicitly evict a specific model from the pool.
+
+        Busy sessions are removed from the pool immediately and unloaded once
+        their last user releases them.
+        """
+        if device is not None:
+            keys = [_pool_key(model_id, device)]
+        else:
+            keys = [k for k in self._sessions if k.startswith(f"{model_id}::")]
+        await self._unload_all([self._detach(k) for k in keys])
 
     async def evict_all(self) -> None:
         """Unload all sessions (called on engine shutdown)."""
-        async with self._lock:
-            for key in list(self._sessions):
-                await self._evict_key(key)
+        await self._unload_all([self._detach(k) for k in list(self._sessions)])
 
     def is_loaded(self, model_id: str, device: HardwareTarget) -> bool:
         return _pool_key(model_id, device) in self._sessions
@@ -177,6 +196,7 @@ class SessionPool:
                 "ep": v.execution_provider.value,
                 "memory_mb": v.memory_mb,
                 "last_used_age_s": round(time.monotonic() - v.last_used, 1),
+                "in_use": self._refs.get(v.session_id, 0),
             }
             for k, v in self._sessions.items()
         ]
@@ -187,6 +207,9 @@ class SessionPool:
     def session_count(self) -> int:
         return len(self._sessions)
 
+    def loading_count(self) -> int:
+        return len(self._loading)
+
     # ------------------------------------------------------------------
     # Warmup
     # ------------------------------------------------------------------
@@ -212,36 +235,208 @@ class SessionPool:
             except Exception as exc:
                 logger.warning("Warmup failed for %s: %s", spec.model_id, exc)
 
+    # ------------------------------------------------------------------
+    # Internal: lookup / single-flight load
+    # ------------------------------------------------------------------
+
+    async def _get(
+        self,
+        spec: ModelSpec,
+        device: HardwareTarget,
+        adapter: RuntimeAdapter,
+        *,
+        pin: bool,
+    ) -> SessionHandle:
+        key = _pool_key(spec.model_id, device)
+
+        while True:
+            handle = self._sessions.get(key)
+            if handle is not None:
+                # Cache hit — bump to most-recently-used position. No await
+                # between lookup and pin, so nothing can evict it in between.
+                self._sessions.move_to_end(key)
+                handle.last_used = time.monotonic()
+                self.metrics.hits += 1
+                if pin:
+                    self._pin(handle)
+                logger.debug("Pool hit: %s", key)
+                return handle
+
+            pending = self._loading.get(key)
+            if pending is None:
+                break
+            # Another coroutine is loading this key — share its result.
+            self.metrics.coalesced += 1
+            await asyncio.shield(pending)
+            # Loop: the loaded session may already have been evicted again,
+            # or the leader was cancelled and the key is free to load.
+
+        return await self._load(key, spec, device, adapter, pin=pin)
+
+    async def _load(
+        self,
+        key: str,
+        spec: ModelSpec,
+        device: HardwareTarget,
+        adapter: RuntimeAdapter,
+        *,
+        pin: bool,
+    ) -> SessionHandle:
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        self.metrics.misses += 1
+        logger.debug("Pool miss: %s — loading", key)
+
+        try:
+            estimate = _estimate_mb(spec)
+            victims = self._admit(key, estimate)
+            self._reserved_mb[key] = estimate
+            await self._unload_all(victims)
+
+            t0 = time.monotonic()
+            handle = await adapter.load_model(spec, device)
+            self.metrics.total_load_ms += (time.monotonic() - t0) * 1000
+        except BaseException as exc:
+            self._loading.pop(key, None)
+            self._reserved_mb.pop(key, None)
+            if isinstance(exc, PoolAdmissionError):
+                self.metrics.rejected += 1
+            elif isinstance(exc, Exception):
+                self.metrics.load_errors += 1
+                logger.error("Failed to load %s: %s", key, exc)
+            if isinstance(exc, Exception):
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody is waiting
+            else:
+                # The leader was cancelled, not the load: wake the waiters
+                # empty-handed so one of them takes the load over.
+                future.set_result(None)
+            raise
+
+        self._loading.pop(key, None)
+        self._reserved_mb.pop(key, None)
+
+        # Evict sessions to make room before adding the new one.
+        victims = self._collect_victims(handle.memory_mb)
+        self._sessions[key] = handle
+        self._adapters[key] = adapter
+        if pin:
+            self._pin(handle)
+        future.set_result(handle)
+        await self._unload_all(victims)
+        return handle
+
+    # ------------------------------------------------------------------
+    # Internal: refcounting
+    # ------------------------------------------------------------------
+
+    def _pin(self, handle: SessionHandle) -> None:
+        self._refs[handle.session_id] = self._refs.get(handle.session_id, 0) + 1
+
+    async def _release(self, handle: SessionHandle) -> None:
+        sid = handle.session_id
+        remaining = self._refs.get(sid, 0) - 1
+        if remaining > 0:
+            self._refs[sid] = remaining
+            return
+        self._refs.pop(sid, None)
+        retired = self._retired.pop(sid, None)
+        if retired is not None:
+            await self._unload(*retired)
+
+    def _in_use(self, handle: SessionHandle) -> bool:
+        return self._refs.get(handle.session_id, 0) > 0
+
     # ------------------------------------------------------------------
     # Internal eviction logic
+    #
+    # Victim selection and removal from the pool are synchronous so the
+    # bookkeeping stays consistent across awaits; only the actual
+    # ``adapter.unload`` calls are awaited, after the pool state is final.
     # ------------------------------------------------------------------
 
-    async def _evict_if_needed(self, incoming_mb: float) -> None:
-        """Evict LRU entries until we have room for *incoming_mb* bytes."""
+    def _committed_mb(self) -> float:
+        retired = sum(h.memory_mb for h, _ in self._retired.values())
+        return self.total_memory_mb() + retired + sum(self._reserved_mb.values())
+
+    def _admit(self, key: str, estimate_mb: float) -> List[Tuple[SessionHandle, Optional[RuntimeAdapter]]]:
+        """Memory admission check for a load that has not started yet.
+
+        Evicts idle LRU sessions to fit *estimate_mb*.  Raises
+        :class:`PoolAdmissionError` when the remaining shortfall is held by
+        sessions that are busy or still loading.
+        """
+        if estimate_mb <= 0:
+            return []
+        idle_mb = sum(h.memory_mb for h in self._sessions.values() if not self._in_use(h))
+        held_mb = self._committed_mb() - idle_mb
+        if held_mb > 0 and held_mb + estimate_mb > self._max_memory_mb:
+            raise PoolAdmissionError(
+                f"Cannot admit {key}: needs ~{estimate_mb:.0f} MB, "
+                f"{held_mb:.0f}/{self._max_memory_mb:.0f} MB held by busy or loading sessions"
+            )
+        return self._collect_victims(estimate_mb, count_cap=False)
+
+    def _collect_victims(
+        self, incoming_mb: float, *, count_cap: bool = True
+    ) -> List[Tuple[SessionHandle, Optional[RuntimeAdapter]]]:
+        """Detach idle LRU sessions until *incoming_mb* fits."""
+        victims: List[Tuple[SessionHandle, Optional[RuntimeAdapter]]] = []
         # Evict if we exceed session count cap.
-        while len(self._sessions) >= self._max_sessions:
-            await self._evict_lru()
+        while count_cap and len(self._sessions) >= self._max_sessions:
+            victim = self._detach_lru()
+            if victim is None:
+                break
+            victims.append(victim)
 
         # Evict if we would exceed memory cap.
-        while (
-            self._sessions
-            and self.total_memory_mb() + incoming_mb > self._max_memory_mb
-        ):
-            await self._evict_lru()
-
-    async def _evict_lru(self) -> None:
-        """Evict the least-recently-used session (first in OrderedDict)."""
-        if not self._sessions:
-            return
-        lru_key, _ = next(iter(self._sessions.items()))
-        await self._evict_key(lru_key)
-
-    async def _evict_key(self, key: str) -> None:
-        """Unload and remove a specific session by key."""
+        while self._sessions and self._committed_mb() + incoming_mb > self._max_memory_mb:
+            victim = self._detach_lru()
+            if victim is None:
+                break
+            victims.append(victim)
+
+        if count_cap and len(self._sessions) >= self._max_sessions:
+            logger.warning(
+                "Session pool over capacity (%d/%d): remaining sessions are in use",
+                len(self._sessions), self._max_sessions,
+            )
+        return victims
+
+    def _detach_lru(self) -> Optional[Tuple[SessionHandle, Optional[RuntimeAdapter]]]:
+        """Remove the least-recently-used *idle* session from the pool."""
+        for key, handle in self._sessions.items():
+            if not self._in_use(handle):
+                return self._detach(key)
+        return None
+
+    def _detach(self, key: str) -> Optional[Tuple[SessionHandle, Optional[RuntimeAdapter]]]:
+        """Remove *key* from the pool.
+
+        Returns ``(handle, adapter)`` to unload now, or ``None`` when the key
+        is unknown or the session is in use (then it is retired and unloaded
+        on its last release).
+        """
         handle = self._sessions.pop(key, None)
         adapter = self._adapters.pop(key, None)
         if handle is None:
-            return
+            return None
+        if self._in_use(handle):
+            self._retired[handle.session_id] = (handle, adapter)
+            logger.info("Session %s retired while in use; unload deferred", key)
+            return None
+        return handle, adapter
+
+    async def _unload_all(
+        self, victims: List[Optional[Tuple[SessionHandle, Optional[RuntimeAdapter]]]]
+    ) -> None:
+        for victim in victims:
+            if victim is not None:
+                await self._unload(*victim)
+
+    async def _unload(self, handle: SessionHandle, adapter: Optional[RuntimeAdapter]) -> None:
+        """Unload a session that is no longer reachable from the pool."""
+        key = _pool_key(handle.model_id, handle.hardware_target)
         try:
             if adapter is not None:
                 await adapter.unload(handle)
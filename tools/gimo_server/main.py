@@ -102,6 +102,8 @@ async def _ops_runs_cleanup_loop():
             draft_cleaned = OpsService.cleanup_old_drafts()
             if draft_cleaned:
                 logger.info("OPS draft cleanup: removed %s old drafts", draft_cleaned)
+            from tools.gimo_server.services.checkpoint_service import CheckpointService
+            await asyncio.to_thread(CheckpointService.sweep_expired)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
@@ -375,6 +377,11 @@ async def lifespan(app: FastAPI):
         # Initialize MCP facade at startup (lazy init incomplete - would break streamable HTTP)
         # TODO: Full lazy init requires refactoring streamable_http_context lifecycle
         _refresh_app_mcp_facade(app, settings)
+        # The legacy bridge mounted at /mcp proxies to this same app: dispatch
+        # its calls in-process instead of over the loopback socket.
+        from tools.gimo_server.mcp_bridge import bridge as mcp_bridge
+
+        mcp_bridge.use_asgi_app(app)
         streamable_http_context = getattr(app.state, "app_mcp_streamable_http_context", None)
         if streamable_http_context is not None:
             await app_mcp_exit_stack.enter_async_context(streamable_http_context)
@@ -675,6 +682,11 @@ async def lifespan(app: FastAPI):
             await _shutdown_services(logger, app, hw_monitor, run_worker, tasks)
             if hasattr(app.state, "run_worker"):
                 delattr(app.state, "run_worker")
+            await mcp_bridge.aclose_client()
+            mcp_bridge.use_asgi_app(None)
+            from tools.gimo_server.providers.cli_account import close_worker_pools
+
+            await close_worker_pools()
             try:
                 from tools.gimo_server.services.authority import ExecutionAuthority
 
@@ -1,8 +1,10 @@
 import asyncio
+import json
 import os
 import httpx
 import logging
 from pathlib import Path
+from typing import Any
 
 from tools.gimo_server.security.safe_log import sanitize_for_log
 
@@ -13,6 +15,14 @@ RETRY_BACKOFF = 1.0
 
 # Default local backend URL
 BACKEND_URL = "http://127.0.0.1:9325"
+PROXY_TIMEOUT = 30.0
+
+# One pooled client per event loop, shared by every proxied tool call.  When the
+# bridge is mounted inside the backend process, ``use_asgi_app`` routes calls
+# through an in-process ASGI transport instead.
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_asgi_app: Any = None
 
 # Token cache: avoids reading .orch_token file on every proxy call
 _token_cache: str | None = None
@@ -42,6 +52,67 @@ def _get_auth_token() -> str | None:
     return None
 
 
+def _auth_headers() -> dict[str, str]:
+    headers: dict[str, str] = {}
+    token = _get_auth_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    workspace = os.environ.get("ORCH_REPO_ROOT", "")
+    if workspace:
+        headers["X-Gimo-Workspace"] = workspace
+    return headers
+
+
+async def _inject_auth(request: httpx.Request) -> None:
+    """Request hook: attach the current token and workspace unless already set."""
+    for name, value in _auth_headers().items():
+        request.headers.setdefault(name, value)
+
+
+def use_asgi_app(app: Any) -> None:
+    """Dispatch proxied calls to *app* in-process (bridge co-located with the backend)."""
+    global _asgi_app, _client
+    _asgi_app = app
+    _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or getattr(_client, "is_closed", False):
+        transport = httpx.ASGITransport(app=_asgi_app) if _asgi_app is not None else None
+        _client = httpx.AsyncClient(
+            base_url=BACKEND_URL,
+            timeout=PROXY_TIMEOUT,
+            transport=transport,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+            event_hooks={"request": [_inject_auth]},
+        )
+        _client_loop = loop
+    return _client
+
+
+async def aclose_client() -> None:
+    """Close the pooled client if it belongs to the running loop; always drop it."""
+    global _client, _client_loop
+    client, loop = _client, _client_loop
+    _client, _client_loop = None, None
+    if client is not None and loop is asyncio.get_running_loop():
+        await client.aclose()
+
+
+def _format_response(response: httpx.Response) -> str:
+    try:
+        data = response.json()
+        data_str = json.dumps(data, indent=2) if isinstance(data, (dict, list)) else str(data)
+    except Exception:
+        data_str = response.text
+    if 200 <= response.status_code < 300:
+        return f"✅ Success ({response.status_code}):\n{data_str}"
+    return f"❌ Error ({response.status_code}):\n{data_str}"
+
+
 async def proxy_to_api(method: str, path: str, **kwargs) -> str:
     """
     Generic bridge function. Formats the parameters dynamically and sends standard HTTP requests.
@@ -58,61 +129,27 @@ async def proxy_to_api(method: str, path: str, **kwargs) -> str:
     body = kwargs.pop("__body", None)
 
     # Attach auth token and workspace context
-    headers = {}
-    token = _get_auth_token()
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    workspace = os.environ.get("ORCH_REPO_ROOT", "")
-    if workspace:
-        headers["X-Gimo-Workspace"] = workspace
+    headers = _auth_headers()
+
+    async def _send() -> str:
+        client = get_client()
+        request = client.build_request(
+            method=method,
+            url=url,
+            params=query_params,
+            json=body,
+            headers=headers,
+        )
+        return _format_response(await client.send(request))
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            request = client.build_request(
-                method=method,
-                url=url,
-                params=query_params,
-                json=body,
-                headers=headers,
-            )
-            response = await client.send(request)
-
-            try:
-                data = response.json()
-                import json
-                if isinstance(data, (dict, list)):
-                    data_str = json.dumps(data, indent=2)
-                else:
-                    data_str = str(data)
-            except Exception:
-                data_str = response.text
-
-            if 200 <= response.status_code < 300:
-                result = f"✅ Success ({response.status_code}):\n{data_str}"
-            else:
-                result = f"❌ Error ({response.status_code}):\n{data_str}"
-
-            return result
-
+        return await _send()
     except httpx.ConnectError:
-        # Retry once after a short delay
+        # Retry after a short delay (backend may still be starting)
         for attempt in range(MAX_PROXY_RETRIES):
             try:
                 await asyncio.sleep(RETRY_BACKOFF * (attempt + 1))
-                async with httpx.AsyncClient(timeout=30.0) as retry_client:
-                    request = retry_client.build_request(
-                        method=method, url=url, params=query_params, json=body, headers=headers,
-                    )
-                    response = await retry_client.send(request)
-                    try:
-                        data = response.json()
-                        import json
-                        data_str = json.dumps(data, indent=2) if isinstance(data, (dict, list)) else str(data)
-                    except Exception:
-                        data_str = response.text
-                    if 200 <= response.status_code < 300:
-                        return f"✅ Success ({response.status_code}):\n{data_str}"
-                    return f"❌ Error ({response.status_code}):\n{data_str}"
+                return await _send()
             except httpx.ConnectError:
                 continue
             except Exception as retry_err:
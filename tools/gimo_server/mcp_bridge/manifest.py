@@ -3087,6 +3087,14 @@ MANIFEST = [   {   'description': 'Health Info Route',
                           'required': True,
                           'type': 'string'}],
         'path': '/ops/mesh/models/{model_id}/download'},
+    {   'description': 'Get Model Manifest',
+        'method': 'GET',
+        'name': 'get_model_manifest_ops_mesh_models__model_id__manifest_get',
+        'params': [   {   'in': 'path',
+                          'name': 'model_id',
+                          'required': True,
+                          'type': 'string'}],
+        'path': '/ops/mesh/models/{model_id}/manifest'},
     {   'description': 'List Patterns',
         'method': 'GET',
         'name': 'list_patterns_ops_gics_patterns_get',
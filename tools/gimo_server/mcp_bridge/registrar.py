@@ -1,57 +1,66 @@
+"""Register the manifest's HTTP operations as MCP tools.
+
+Each operation gets an exec-generated wrapper with the exact signature FastMCP
+needs to publish its schema.  Generating and introspecting ~270 wrappers is the
+slowest part of bridge start-up, so ``manifest_tools`` builds the published
+schemas once, caches them on disk by app version (see ``spec_cache``), and
+returns ``LazyManifestTool`` entries whose wrapper is generated on the first
+call.  The bridge hands them to ``FastMCP(tools=...)``; ``register_all`` keeps
+the eager ``add_tool`` path for existing servers.
+"""
 import logging
 import keyword
+from typing import Any, Callable, Dict, List, Optional
+
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool
+from mcp.server.fastmcp.utilities.func_metadata import FuncMetadata
+from pydantic import Field, PrivateAttr
+
+from tools.gimo_server.mcp_bridge import spec_cache
 from tools.gimo_server.mcp_bridge.manifest import MANIFEST
 from tools.gimo_server.mcp_bridge.bridge import proxy_to_api
 from tools.gimo_server.security.safe_log import sanitize_for_log
 
 logger = logging.getLogger("mcp_bridge.registrar")
 
+_PY_TYPES = {"integer": "int", "boolean": "bool", "number": "float", "array": "list", "object": "dict"}
+
+
 def _safe_name(name: str) -> str:
     safe = name.replace("-", "_")
     if keyword.iskeyword(safe):
         safe = safe + "_"
     return safe
 
-def register_all(mcp: FastMCP):
-    count = 0
-    for t_def in MANIFEST:
-        try:
-            name = t_def["name"]
-            desc = t_def["description"]
-            
-            args_def = []
-            param_mapping = ""  # To rebuild original names inside the function
-            
-            # Separate required and optional parameters to build a valid python signature
-            required_params = []
-            optional_params = []
-            
-            for p in t_def["params"]:
-                p_type = p.get("type", "string")
-                py_type = "str"
-                if p_type == "integer": py_type = "int"
-                elif p_type == "boolean": py_type = "bool"
-                elif p_type == "number": py_type = "float"
-                elif p_type == "array": py_type = "list"
-                elif p_type == "object": py_type = "dict"
-                
-                req = p.get("required", False)
-                orig_name = p["name"]
-                safe_var = _safe_name(orig_name)
-                
-                param_mapping += f"    if {safe_var} is not None: __local_args['{orig_name}'] = {safe_var}\n"
-                
-                if req:
-                    required_params.append(f"{safe_var}: {py_type}")
-                else:
-                    optional_params.append(f"{safe_var}: {py_type} | None = None")
-            
-            args_def = required_params + optional_params
-            signature_str = ", ".join(args_def)
-            
-            # We generate a wrapper function via exec to get the exact signature for FastMCP
-            func_code = f"""
+
+def _build_wrapper(t_def: Dict[str, Any]) -> Callable[..., Any]:
+    name = t_def["name"]
+    desc = t_def["description"]
+
+    param_mapping = ""  # To rebuild original names inside the function
+
+    # Separate required and optional parameters to build a valid python signature
+    required_params = []
+    optional_params = []
+
+    for p in t_def["params"]:
+        py_type = _PY_TYPES.get(p.get("type", "string"), "str")
+        req = p.get("required", False)
+        orig_name = p["name"]
+        safe_var = _safe_name(orig_name)
+
+        param_mapping += f"    if {safe_var} is not None: __local_args['{orig_name}'] = {safe_var}\n"
+
+        if req:
+            required_params.append(f"{safe_var}: {py_type}")
+        else:
+            optional_params.append(f"{safe_var}: {py_type} | None = None")
+
+    signature_str = ", ".join(required_params + optional_params)
+
+    # We generate a wrapper function via exec to get the exact signature for FastMCP
+    func_code = f"""
 async def {name}({signature_str}) -> str:
     \"\"\"{desc}\"\"\"
     __local_args = {{}}
@@ -60,7 +69,7 @@ async def {name}({signature_str}) -> str:
     path_args = {{}}
     query_args = {{}}
     body_args = {{}}
-    
+
     for p_info in __tool_def['params']:
         orig = p_info['name']
         if orig in __local_args:
@@ -71,34 +80,131 @@ async def {name}({signature_str}) -> str:
                 query_args[orig] = __local_args[orig]
             else:
                 body_args[orig] = __local_args[orig]
-                
+
     kwargs = {{
         "__path_params": path_args,
         "__query": query_args,
         "__body": body_args if body_args else None
     }}
-    
+
     return await proxy_to_api(__tool_def['method'], __tool_def['path'], **kwargs)
 """
-            # Execute in a restricted scope with the required imports
-            local_scope = {
-                "proxy_to_api": proxy_to_api,
-                "__tool_def": t_def
-            }
-            exec(func_code, local_scope)  # nosec B102 — generated from trusted OpenAPI spec, not user input
-            
-            # The function is now in local_scope[name]
-            generated_func = local_scope[name]
-            
-            mcp.add_tool(generated_func)
-            count += 1
-            
+    # Execute in a restricted scope with the required imports
+    local_scope = {
+        "proxy_to_api": proxy_to_api,
+        "__tool_def": t_def
+    }
+    exec(func_code, local_scope)  # nosec B102 — generated from trusted OpenAPI spec, not user input
+    return local_scope[name]
+
+
+class LazyManifestTool(Tool):
+    """Tool published from a cached schema; its wrapper is generated on first call."""
+
+    fn_metadata: Optional[FuncMetadata] = Field(default=None)
+    cached_output_schema: Optional[Dict[str, Any]] = Field(default=None, exclude=True)
+    tool_def: Dict[str, Any] = Field(exclude=True)
+    _resolved: Optional[Tool] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_schema(cls, t_def: Dict[str, Any], schema: Dict[str, Any]) -> "LazyManifestTool":
+        holder: Dict[str, LazyManifestTool] = {}
+
+        async def _trampoline(**kwargs: Any) -> str:
+            return await holder["tool"].resolve().fn(**kwargs)
+
+        tool = cls(
+            fn=_trampoline,
+            name=schema["name"],
+            description=schema["description"],
+            parameters=schema["parameters"],
+            is_async=True,
+            cached_output_schema=schema.get("output_schema"),
+            tool_def=t_def,
+        )
+        holder["tool"] = tool
+        return tool
+
+    @property
+    def output_schema(self) -> Optional[Dict[str, Any]]:
+        return self.cached_output_schema
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved is not None
+
+    def resolve(self) -> Tool:
+        if self._resolved is None:
+            self._resolved = Tool.from_function(_build_wrapper(self.tool_def))
+        return self._resolved
+
+    async def run(self, arguments: Dict[str, Any], context: Any = None, convert_result: bool = False) -> Any:
+        return await self.resolve().run(arguments, context=context, convert_result=convert_result)
+
+
+def _published_schema(t_def: Dict[str, Any]) -> Dict[str, Any]:
+    tool = Tool.from_function(_build_wrapper(t_def))
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "parameters": tool.parameters,
+        "output_schema": tool.output_schema,
+    }
+
+
+def _build_manifest_schemas() -> Dict[str, Any]:
+    schemas = []
+    for t_def in MANIFEST:
+        try:
+            schemas.append(_published_schema(t_def))
+        except Exception as e:
+            logger.error(
+                "Failed to register tool %s: %s",
+                sanitize_for_log(t_def.get("name")),
+                sanitize_for_log(e),
+            )
+    return {"tools": schemas}
+
+
+def manifest_schemas(version: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Published schema per manifest tool name, from the on-disk cache when current."""
+    bundle = spec_cache.load_or_build(
+        "manifest_tools", version or spec_cache.app_version_hash(), _build_manifest_schemas
+    )
+    return {entry["name"]: entry for entry in bundle.get("tools", [])}
+
+
+def manifest_tools(lazy: bool = True) -> List[Tool]:
+    """Manifest operations as FastMCP tools, for ``FastMCP(tools=...)``.
+
+    Lazy tools are published from the cached schemas; eager tools generate
+    and introspect every wrapper up front.
+    """
+    tools: Dict[str, Tool] = {}
+    schemas = manifest_schemas() if lazy else {}
+    for t_def in MANIFEST:
+        try:
+            if lazy:
+                schema = schemas.get(t_def["name"])
+                if schema is None:
+                    continue
+                tool: Tool = LazyManifestTool.from_schema(t_def, schema)
+            else:
+                tool = Tool.from_function(_build_wrapper(t_def))
         except Exception as e:
             logger.error(
                 "Failed to register tool %s: %s",
                 sanitize_for_log(t_def.get("name")),
                 sanitize_for_log(e),
             )
+            continue
+        tools.setdefault(tool.name, tool)
+    return list(tools.values())
+
+
+def register_aliases(mcp: FastMCP) -> int:
+    """Register the hand-written aliases with ergonomic signatures."""
+    count = 0
 
     async def plan_create(
         objective: str,
@@ -142,5 +248,21 @@ async def {name}({signature_str}) -> str:
             count += 1
         except Exception as e:
             logger.error("Failed to register MCP alias %s: %s", alias.__name__, e)
+    return count
+
+
+def register_all(mcp: FastMCP):
+    count = 0
+    for t_def in MANIFEST:
+        try:
+            mcp.add_tool(_build_wrapper(t_def))
+            count += 1
+        except Exception as e:
+            logger.error(
+                "Failed to register tool %s: %s",
+                sanitize_for_log(t_def.get("name")),
+                sanitize_for_log(e),
+            )
+    count += register_aliases(mcp)
 
     logger.info("Successfully registered %s dynamic tools from manifest.", count)
@@ -0,0 +1,91 @@
+"""On-disk cache for bridge artefacts derived from the backend's code.
+
+Building FastMCP schemas for the manifest means generating and introspecting
+one wrapper per operation.  The result is a pure function of the source tree,
+so it is stored as JSON under ``<ops_data_dir>/mcp_cache`` (override with
+``ORCH_MCP_CACHE_DIR``) and keyed by ``app_version_hash()``.
+
+The version hash is built from the path, size and mtime of every ``.py`` file
+in ``tools/gimo_server`` plus the versions of the libraries that shape the
+schemas.  It costs a few hundred ``stat`` calls, far less than the work it
+replaces.  Any edit to the backend yields a new hash and a rebuild; older
+entries of the same artefact are pruned on write.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("mcp_bridge.spec_cache")
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+_SCHEMA_DISTS = ("fastapi", "pydantic", "mcp", "fastmcp")
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules", "orchestrator_ui"})
+
+
+def app_version_hash(root: Path = PACKAGE_ROOT) -> str:
+    """Digest of the backend source tree (path, size, mtime) and schema libraries."""
+    digest = hashlib.sha256(sys.version.encode("utf-8"))
+    for dist in _SCHEMA_DISTS:
+        try:
+            digest.update(f"{dist}={importlib.metadata.version(dist)}\n".encode("utf-8"))
+        except importlib.metadata.PackageNotFoundError:
+            digest.update(f"{dist}=-\n".encode("utf-8"))
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS and not d.startswith("."))
+        for name in sorted(filenames):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            digest.update(f"{rel}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def cache_dir() -> Path:
+    override = os.environ.get("ORCH_MCP_CACHE_DIR", "").strip()
+    if override:
+        return Path(override)
+    from tools.gimo_server.config import get_settings
+
+    return get_settings().ops_data_dir / "mcp_cache"
+
+
+def load_or_build(
+    name: str,
+    version: str,
+    build: Callable[[], Dict[str, Any]],
+    directory: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Return the cached artefact *name* for *version*, building and storing it on a miss."""
+    directory = Path(directory) if directory is not None else cache_dir()
+    path = directory / f"{name}-{version}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as exc:
+        logger.warning("Discarding unreadable MCP cache %s: %s", path.name, exc)
+
+    data = build()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+        for stale in directory.glob(f"{name}-*.json"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError as exc:
+        logger.warning("Could not persist MCP cache %s: %s", path.name, exc)
+    return data
@@ -126,6 +126,7 @@ class OpsRun(BaseModel):
     child_context: Optional[Dict[str, Any]] = None
     spawn_depth: int = 0          # Fractal depth (0 = root orchestrator)
     model_tier: Optional[int] = None  # quality_tier of the model assigned to this run
+    priority: int = 0  # Worker admission: higher first; fair-share by repo_id within a level
     validated_task_spec: Optional[Dict[str, Any]] = None # Phase 5B: Required for execution
     agent_preset: Optional[str] = None  # P10: Routing metadata persisted from draft
     execution_policy_name: Optional[str] = None  # P10: Execution policy persisted from draft
@@ -170,6 +171,8 @@ class OpsConfig(BaseModel):
     )
     draft_cleanup_ttl_days: int = 7
     max_concurrent_runs: int = 3
+    # Weighted fair-share of run admission per repo_id (missing keys weigh 1.0).
+    run_share_weights: Dict[str, float] = Field(default_factory=dict)
     operator_can_generate: bool = False
     economy: UserEconomyConfig = Field(default_factory=UserEconomyConfig)
     refactor: RefactorConfig = Field(default_factory=RefactorConfig)
@@ -30,6 +30,16 @@ class EvalRunRequest(BaseModel):
     judge: EvalJudgeConfig = Field(default_factory=EvalJudgeConfig)
     gate: EvalGateConfig = Field(default_factory=EvalGateConfig)
     case_limit: Optional[int] = Field(default=None, ge=1)
+    concurrency: int = Field(default=8, ge=1, le=64)
+    provider_rate_limits: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Max provider calls per second, keyed by provider id ('*' applies to all others)",
+    )
+    early_abort: bool = False
+    reuse_cached_outputs: bool = Field(
+        default=False,
+        description="Reuse outputs of identical temperature-0 calls from earlier runs (same provider and model)",
+    )
 
 class EvalCaseResult(BaseModel):
     case_id: str
@@ -51,6 +61,9 @@ class EvalRunReport(BaseModel):
     gate_passed: bool
     gate: EvalGateConfig
     results: List[EvalCaseResult] = Field(default_factory=list)
+    aborted: bool = False
+    skipped_cases: int = 0
+    cached_outputs: int = 0
 
 class EvalRunSummary(BaseModel):
     run_id: int
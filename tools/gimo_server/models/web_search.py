@@ -21,6 +21,7 @@ class WebSearchQuery(BaseModel):
     providers: List[WebSearchProvider] = Field(default_factory=lambda: ["duckduckgo"])
     include_content: bool = False
     timeout_seconds: float = Field(default=15.0, ge=1.0, le=60.0)
+    use_cache: bool = True
 
 
 class WebSearchResult(BaseModel):
@@ -41,3 +42,4 @@ class WebSearchFusionResponse(BaseModel):
     total_results: int = 0
     fusion_time_ms: float = 0.0
     deduplicated_count: int = 0
+    cached: bool = False
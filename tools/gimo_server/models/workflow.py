@@ -30,7 +30,14 @@ class WorkflowGraph(BaseModel):
 class WorkflowCheckpoint(BaseModel):
     node_id: str
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # "full": ``state`` is the whole state.  "delta": ``state`` holds only the
+    # keys set since the previous checkpoint, ``removed`` the keys deleted and
+    # ``appended`` the items added to append-only lists.  Use
+    # GraphEngine.materialize_checkpoint() to rebuild the state at a delta.
+    kind: Literal["full", "delta"] = "full"
     state: Dict[str, Any]
+    removed: List[str] = Field(default_factory=list)
+    appended: Dict[str, List[Any]] = Field(default_factory=dict)
     output: Any
     status: Literal["completed", "failed"]
 
@@ -111,8 +111,16 @@ async def ops_event_stream(request: Request):
     events, such as 'handover_required' or 'agent_doubt'.
 
     Supports standard SSE reconnection via Last-Event-ID header.
+
+    Optional query filters (applied server-side): ``event_types`` (comma
+    separated), ``run_id``, ``thread_id``, ``plan_id``; ``slow_policy`` is
+    ``coalesce`` (default) or ``drop``.
     """
-    from tools.gimo_server.services.notification_service import NotificationService
+    from tools.gimo_server.services.notification_service import (
+        SLOW_POLICIES,
+        EventMessage,
+        NotificationService,
+    )
 
     # Parse Last-Event-ID for reconnection replay
     last_event_id = 0
@@ -120,8 +128,21 @@ async def ops_event_stream(request: Request):
     if raw_id.isdigit():
         last_event_id = int(raw_id)
 
+    params = request.query_params
+    slow_policy = params.get("slow_policy", "coalesce")
+    if slow_policy not in SLOW_POLICIES:
+        raise HTTPException(status_code=400, detail=f"Invalid slow_policy: {slow_policy}")
+    event_types = [t.strip() for t in params.get("event_types", "").split(",") if t.strip()]
+
     async def event_generator():
-        queue = await NotificationService.subscribe(last_event_id=last_event_id)
+        queue = await NotificationService.subscribe(
+            last_event_id=last_event_id,
+            event_types=event_types or None,
+            run_id=params.get("run_id"),
+            thread_id=params.get("thread_id"),
+            plan_id=params.get("plan_id"),
+            slow_policy=slow_policy,
+        )
         try:
             while True:
                 if await request.is_disconnected():
@@ -129,7 +150,10 @@ async def ops_event_stream(request: Request):
 
                 try:
                     message = await asyncio.wait_for(queue.get(), timeout=1.0)
-                    # Extract event ID from the JSON payload for SSE id: field
+                    if isinstance(message, EventMessage):
+                        # Frame is built once per event and shared by all streams.
+                        yield message.sse_frame
+                        continue
                     try:
                         parsed = json.loads(message)
                         eid = parsed.get("id", "")
@@ -3,16 +3,45 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 import shutil
 import sys
 from asyncio.subprocess import PIPE
 from typing import Any, Dict, List
 
 from .base import ProviderAdapter
+from .cli_worker_pool import CliWorkerError, CliWorkerPool, CliWorkerResponseError, worker_modes
 from .tool_call_parser import parse_tool_calls_from_text as _parse_tool_calls_from_text
 
 logger = logging.getLogger("orchestrator.providers.cli_account")
 
+# One pool per CLI account (binary), shared by every adapter instance.  Its
+# semaphore is the account's concurrency limit for pooled and spawned calls.
+_POOLS: Dict[str, CliWorkerPool] = {}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+def worker_pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {account: pool.stats() for account, pool in _POOLS.items()}
+
+
+async def close_worker_pools() -> None:
+    pools = list(_POOLS.values())
+    _POOLS.clear()
+    loop = asyncio.get_running_loop()
+    for pool in pools:
+        if pool.loop is loop:
+            await pool.close()
+        else:
+            pool.kill_all()
+
+
 # ── P2: CLI Tool-Calling Engine ───────────────────────────────────────────────
 
 TOOL_CALLING_SYSTEM_PROMPT = """
@@ -142,7 +171,6 @@ class CliAccountAdapter(ProviderAdapter):
 
     def _build_env(self) -> dict:
         """Build environment for subprocess, clearing nested-session guards."""
-        import os
         env = {**os.environ, "PYTHONUTF8": "1"}
         if self._is_claude:
             # Claude Code refuses to run inside another Claude Code session.
@@ -151,12 +179,59 @@ class CliAccountAdapter(ProviderAdapter):
             env.pop("CLAUDE_CODE_ENTRYPOINT", None)
         return env
 
+    def _account_pool(self) -> CliWorkerPool:
+        """The warm pool for this CLI account, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        pool = _POOLS.get(self.binary)
+        if pool is None or pool.loop is not loop:
+            if pool is not None:
+                pool.kill_all()
+            # Windows keeps per-call spawn (see the stdin notes in _spawn_generate).
+            argv = None if sys.platform == "win32" else worker_modes().get(self.binary)
+            pool = CliWorkerPool(
+                argv,
+                env=self._build_env(),
+                size=_env_int("ORCH_CLI_ACCOUNT_CONCURRENCY", 2),
+                max_calls=_env_int("ORCH_CLI_WORKER_MAX_CALLS", 50),
+            )
+            _POOLS[self.binary] = pool
+        return pool
+
     async def generate(self, prompt: str, context: Dict[str, Any]) -> Dict[str, Any]:
         if not self.binary:
             raise RuntimeError("CLI binary is not configured")
         if shutil.which(self.binary) is None:
             raise RuntimeError(f"CLI binary not found: {self.binary}")
 
+        pool = self._account_pool()
+        async with pool.slot():
+            content: str | None = None
+            if pool.available:
+                try:
+                    content = await pool.run(prompt)
+                except CliWorkerResponseError as exc:
+                    raise RuntimeError(str(exc)) from exc
+                except CliWorkerError as exc:
+                    logger.warning("[cli-account] worker unavailable (%s); spawning per call", exc)
+            if content is None:
+                content = await self._spawn_generate(prompt)
+
+        logger.info("[cli-account] response length: %d chars", len(content))
+        # Estimate tokens since CLI adapters don't report usage (~4 chars/token)
+        est_prompt = len(prompt.encode("utf-8", errors="ignore")) // 4
+        est_completion = len(content.encode("utf-8", errors="ignore")) // 4 if content else 0
+        return {
+            "content": content,
+            "usage": {
+                "prompt_tokens": est_prompt,
+                "completion_tokens": est_completion,
+                "total_tokens": est_prompt + est_completion,
+                "estimated": True,
+            },
+        }
+
+    async def _spawn_generate(self, prompt: str) -> str:
+        """Run one prompt in a fresh CLI process and return its text output."""
         env = self._build_env()
 
         # On Windows, command-line length is limited (~8191 chars via CreateProcess,
@@ -224,24 +299,9 @@ class CliAccountAdapter(ProviderAdapter):
             raise RuntimeError(err or f"{self.binary} exited with code {returncode}")
 
         if self._is_codex:
-            content = _parse_codex_jsonl(out) if out else (err or "")
-        else:
-            # Claude -p outputs plain text directly
-            content = out or err or ""
-
-        logger.info("[cli-account] response length: %d chars", len(content))
-        # Estimate tokens since CLI adapters don't report usage (~4 chars/token)
-        est_prompt = len(prompt.encode("utf-8", errors="ignore")) // 4
-        est_completion = len(content.encode("utf-8", errors="ignore")) // 4 if content else 0
-        return {
-            "content": content,
-            "usage": {
-                "prompt_tokens": est_prompt,
-                "completion_tokens": est_completion,
-                "total_tokens": est_prompt + est_completion,
-                "estimated": True,
-            },
-        }
+            return _parse_codex_jsonl(out) if out else (err or "")
+        # Claude -p outputs plain text directly
+        return out or err or ""
 
     async def _raw_chat_with_tools(
         self,
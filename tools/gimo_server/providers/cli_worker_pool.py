@@ -0,0 +1,302 @@
+"""Warm pool of long-lived CLI worker processes for account-mode providers.
+
+Spawning the vendor CLI per call pays interpreter/runtime start-up and auth
+bootstrap before the first token.  CLIs that can stay resident (a server or
+REPL mode, or a thin wrapper around one) are kept running here and fed one
+prompt at a time over stdio.
+
+Worker line protocol (one JSON object per line):
+
+- on start, after its bootstrap: ``{"ready": true}``
+- request ``{"id": 1, "prompt": "..."}`` -> ``{"id": 1, "content": "..."}``
+  or ``{"id": 1, "error": "..."}``
+- health check ``{"id": 2, "ping": true}`` -> ``{"id": 2, "pong": true}``
+
+Worker modes are opt-in per binary through ``ORCH_CLI_WORKER_MODES``, a JSON
+object mapping the binary name to the argv that starts it in worker mode,
+e.g. ``{"codex": ["codex-worker", "--profile", "default"]}``.  Workers are
+recycled after ``max_calls`` requests or on any error; a worker idle for longer
+than ``health_check_after`` is pinged before reuse.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import time
+from asyncio.subprocess import PIPE
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional, Set
+
+logger = logging.getLogger("orchestrator.providers.cli_worker_pool")
+
+_STREAM_LIMIT = 16 * 1024 * 1024  # responses are single JSON lines
+
+
+class CliWorkerError(RuntimeError):
+    """Transport/protocol failure: the worker is unusable, the call may be retried."""
+
+
+class CliWorkerResponseError(RuntimeError):
+    """The worker answered with an error for this prompt."""
+
+
+def worker_modes() -> Dict[str, List[str]]:
+    raw = os.environ.get("ORCH_CLI_WORKER_MODES", "").strip()
+    if not raw:
+        return {}
+    try:
+        modes = json.loads(raw)
+    except ValueError:
+        logger.warning("Ignoring ORCH_CLI_WORKER_MODES: not valid JSON")
+        return {}
+    if not isinstance(modes, dict):
+        return {}
+    return {
+        str(name): [str(arg) for arg in argv]
+        for name, argv in modes.items()
+        if isinstance(argv, list) and argv
+    }
+
+
+class CliWorker:
+    """One resident CLI process speaking the line protocol."""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self.proc = proc
+        self.calls = 0
+        self.last_used = time.monotonic()
+        self._ids = itertools.count(1)
+
+    @classmethod
+    async def start(
+        cls, argv: List[str], *, env: Optional[Mapping[str, str]], startup_timeout: float
+    ) -> "CliWorker":
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdin=PIPE, stdout=PIPE, stderr=asyncio.subprocess.DEVNULL,
+            env=dict(env) if env is not None else None, limit=_STREAM_LIMIT,
+        )
+        worker = cls(proc)
+        try:
+            ready = await worker._read(startup_timeout)
+        except BaseException:
+            await worker.close()
+            raise
+        if not ready.get("ready"):
+            await worker.close()
+            raise CliWorkerError(f"worker did not report ready: {ready!r}")
+        return worker
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def request(self, prompt: str, timeout: float) -> str:
+        reply = await self._call({"prompt": prompt}, timeout)
+        self.calls += 1
+        if reply.get("error"):
+            raise CliWorkerResponseError(str(reply["error"]))
+        return str(reply.get("content") or "")
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            return bool((await self._call({"ping": True}, timeout)).get("pong"))
+        except CliWorkerError:
+            return False
+
+    async def close(self, timeout: float = 2.0) -> None:
+        if not self.alive:
+            return
+        try:
+            if self.proc.stdin is not None:
+                self.proc.stdin.close()
+            await asyncio.wait_for(self.proc.wait(), timeout)
+        except (asyncio.TimeoutError, OSError):
+            self.kill()
+            await self.proc.wait()
+
+    def kill(self) -> None:
+        if self.alive:
+            try:
+                self.proc.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _call(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        if not self.alive or self.proc.stdin is None:
+            raise CliWorkerError("worker process has exited")
+        request_id = next(self._ids)
+        line = json.dumps({"id": request_id, **message}, ensure_ascii=False) + "\n"
+        try:
+            self.proc.stdin.write(line.encode("utf-8"))
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise CliWorkerError(f"worker stdin closed: {exc}") from exc
+        reply = await self._read(timeout)
+        if reply.get("id") != request_id:
+            raise CliWorkerError(f"out-of-order reply {reply.get('id')!r}, expected {request_id}")
+        self.last_used = time.monotonic()
+        return reply
+
+    async def _read(self, timeout: float) -> Dict[str, Any]:
+        assert self.proc.stdout is not None
+        try:
+            raw = await asyncio.wait_for(self.proc.stdout.readline(), timeout)
+        except asyncio.TimeoutError as exc:
+            raise CliWorkerError(f"worker did not answer within {timeout:.0f}s") from exc
+        except ValueError as exc:  # line over the stream limit
+            raise CliWorkerError(str(exc)) from exc
+        if not raw:
+            raise CliWorkerError("worker closed its output")
+        try:
+            reply = json.loads(raw)
+        except ValueError as exc:
+            raise CliWorkerError(f"invalid worker reply: {raw[:200]!r}") from exc
+        if not isinstance(reply, dict):
+            raise CliWorkerError(f"invalid worker reply: {raw[:200]!r}")
+        return reply
+
+
+class CliWorkerPool:
+    """Bounded pool of warm workers for one CLI account.
+
+    ``size`` caps both live workers and concurrent calls.  Callers that fall
+    back to per-call spawn hold the same slot via ``slot()``, so the account's
+    concurrency limit applies to every call path.  With ``argv=None`` (no
+    worker mode) the pool is only that limit.
+    """
+
+    def __init__(
+        self,
+        argv: Optional[List[str]],
+        *,
+        env: Optional[Mapping[str, str]] = None,
+        size: int = 2,
+        max_calls: int = 50,
+        startup_timeout: float = 60.0,
+        request_timeout: float = 300.0,
+        health_check_after: float = 30.0,
+        retry_after: float = 60.0,
+    ) -> None:
+        self.argv = list(argv) if argv else None
+        self.env = env
+        self.size = max(1, size)
+        self.max_calls = max(1, max_calls)
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self.health_check_after = health_check_after
+        self.retry_after = retry_after
+        self.loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle: Deque[CliWorker] = deque()
+        self._workers: Set[CliWorker] = set()
+        self._disabled_until = 0.0
+        self._closed = False
+        self.spawned = 0
+        self.reused = 0
+        self.recycled = 0
+        self.failed_starts = 0
+        self.health_failures = 0
+
+    @property
+    def available(self) -> bool:
+        return self.argv is not None and not self._closed and time.monotonic() >= self._disabled_until
+
+    def slot(self) -> asyncio.Semaphore:
+        return self._slots
+
+    async def run(self, prompt: str) -> str:
+        """Run *prompt* on a warm worker; the caller must hold ``slot()``.
+
+        Raises ``CliWorkerError`` when no worker could serve the call (the
+        caller falls back to per-call spawn) and ``CliWorkerResponseError``
+        when the worker answered with an error.
+        """
+        worker = await self._acquire()
+        try:
+            content = await worker.request(prompt, self.request_timeout)
+        except BaseException:
+            await self._discard(worker)
+            raise
+        await self._release(worker)
+        return content
+
+    async def _acquire(self) -> CliWorker:
+        while self._idle:
+            worker = self._idle.popleft()
+            if not worker.alive:
+                await self._discard(worker)
+                continue
+            if time.monotonic() - worker.last_used > self.health_check_after:
+                if not await worker.ping(min(self.startup_timeout, 10.0)):
+                    self.health_failures += 1
+                    await self._discard(worker)
+                    continue
+            self.reused += 1
+            return worker
+        if not self.available:
+            raise CliWorkerError("worker mode temporarily disabled")
+        try:
+            worker = await CliWorker.start(self.argv, env=self.env, startup_timeout=self.startup_timeout)
+        except (OSError, CliWorkerError) as exc:
+            self.failed_starts += 1
+            self._disabled_until = time.monotonic() + self.retry_after
+            logger.warning("CLI worker start failed (%s); per-call spawn for %.0fs", exc, self.retry_after)
+            raise CliWorkerError(f"worker start failed: {exc}") from exc
+        self.spawned += 1
+        self._workers.add(worker)
+        return worker
+
+    async def _release(self, worker: CliWorker) -> None:
+        if self._closed or not worker.alive or worker.calls >= self.max_calls:
+            await self._discard(worker)
+            return
+        self._idle.append(worker)
+
+    async def _discard(self, worker: CliWorker) -> None:
+        self._workers.discard(worker)
+        self.recycled += 1
+        await worker.close()
+
+    async def prewarm(self, count: Optional[int] = None) -> int:
+        started = 0
+        target = min(self.size, count if count is not None else self.size)
+        while len(self._workers) < target and self.available:
+            try:
+                worker = await self._acquire()
+            except CliWorkerError:
+                break
+            self._idle.append(worker)
+            started += 1
+        return started
+
+    async def close(self) -> None:
+        self._closed = True
+        workers = list(self._workers)
+        self._idle.clear()
+        self._workers.clear()
+        await asyncio.gather(*(w.close() for w in workers), return_exceptions=True)
+
+    def kill_all(self) -> None:
+        """Synchronous teardown for pools whose event loop is gone."""
+        self._closed = True
+        for worker in self._workers:
+            worker.kill()
+        self._idle.clear()
+        self._workers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_mode": self.argv is not None,
+            "size": self.size,
+            "live": len(self._workers),
+            "idle": len(self._idle),
+            "spawned": self.spawned,
+            "reused": self.reused,
+            "recycled": self.recycled,
+            "failed_starts": self.failed_starts,
+            "health_failures": self.health_failures,
+            "disabled": not self.available,
+        }
@@ -27,6 +27,10 @@ async def evals_run(
         judge=body.judge,
         gate=body.gate,
         case_limit=body.case_limit,
+        concurrency=body.concurrency,
+        provider_rate_limits=body.provider_rate_limits,
+        early_abort=body.early_abort,
+        reuse_cached_outputs=body.reuse_cached_outputs,
     )
     storage = StorageService(gics=getattr(request.app.state, "gics", None))
     report_id = storage.save_eval_report(report)
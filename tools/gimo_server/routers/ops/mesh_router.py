@@ -7,6 +7,7 @@ All endpoints require operator role minimum.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Annotated, List
 
@@ -363,6 +364,10 @@ async def heartbeat(
         device = registry.process_heartbeat(payload)
     except ValueError as e:
         raise HTTPException(400, detail=str(e))
+
+    # Keep the in-memory thermal profile used by dispatch scoring in sync
+    from tools.gimo_server.services.mesh.telemetry import TelemetryService
+    TelemetryService().refresh_profile(device.device_id)
     return device
 
 
@@ -1396,12 +1401,29 @@ async def get_model_info(
     """Get metadata for a specific model."""
     _require_role(auth, "operator")
     catalog = _get_model_catalog(request)
-    model = catalog.get_model(model_id)
+    # First lookup of a model hashes the whole file — keep it off the loop.
+    model = await asyncio.to_thread(catalog.get_model, model_id)
     if model is None:
         raise HTTPException(404, detail=f"Model {model_id} not found")
     return model.model_dump(mode="json")
 
 
+@router.get("/models/{model_id}/manifest")
+async def get_model_manifest(
+    model_id: str,
+    request: Request,
+    auth: Annotated[AuthContext, Depends(verify_token)],
+    _rl: Annotated[None, Depends(check_rate_limit)],
+):
+    """Chunk manifest of a model, used by peers for parallel verified downloads."""
+    _require_role(auth, "operator")
+    catalog = _get_model_catalog(request)
+    manifest = await asyncio.to_thread(catalog.get_manifest, model_id)
+    if manifest is None:
+        raise HTTPException(404, detail=f"Model {model_id} not found")
+    return manifest.model_dump(mode="json")
+
+
 @router.get("/models/{model_id}/download")
 async def download_model(
     model_id: str,
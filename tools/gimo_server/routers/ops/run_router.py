@@ -201,7 +201,7 @@ async def approve_draft(
 
     if should_run:
         try:
-            run = OpsService.create_run(approved.id)
+            run = await OpsService.create_run(approved.id)
             audit_log("OPS", "/ops/runs", run.id, operation="WRITE_AUTO", actor=actor)
             
             composition = "custom_plan" if context.get("custom_plan_id") else None
@@ -293,7 +293,7 @@ async def create_run(
     _require_role(auth, "operator")
     OpsService.set_gics(getattr(request.app.state, "gics", None))
     try:
-        run = OpsService.create_run(body.approved_id)
+        run = await OpsService.create_run(body.approved_id)
     except PermissionError as exc:
         raise HTTPException(status_code=403, detail=str(exc))
     except ValueError as exc:
@@ -516,7 +516,7 @@ async def rerun(
     _require_role(auth, "operator")
     OpsService.set_gics(getattr(request.app.state, "gics", None))
     try:
-        run = OpsService.rerun(run_id)
+        run = await OpsService.rerun(run_id)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     except RuntimeError as exc:
@@ -690,7 +690,15 @@ async def list_workflow_checkpoints(
 ):
     _require_role(auth, "operator")
     storage = StorageService(gics=getattr(request.app.state, "gics", None))
-    items = storage.list_checkpoints(workflow_id)
+    try:
+        checkpoints = [WorkflowCheckpoint.model_validate(item) for item in storage.list_checkpoints(workflow_id)]
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Invalid persisted checkpoint: {exc}")
+    # Delta records only hold what changed; return the full state at each one.
+    items = [
+        checkpoint.model_copy(update={"kind": "full", "state": state, "removed": [], "appended": {}}).model_dump(mode="json")
+        for checkpoint, state in zip(checkpoints, GraphEngine.materialize_checkpoints(checkpoints))
+    ]
     audit_log("OPS", f"/ops/workflows/{workflow_id}/checkpoints", str(len(items)), operation="READ", actor=_actor_label(auth))
     return {"items": items, "count": len(items)}
 
@@ -730,7 +738,7 @@ async def resume_workflow(
         raw_checkpoints = storage.list_checkpoints(workflow_id)
         engine.state.checkpoints = [WorkflowCheckpoint.model_validate(item) for item in raw_checkpoints]
         if engine.state.checkpoints:
-            engine.state.data = dict(engine.state.checkpoints[-1].state)
+            engine.state.data = engine.materialize_checkpoint(-1)
         _WORKFLOW_ENGINES[workflow_id] = engine
     if not engine.state.checkpoints:
         raise HTTPException(status_code=409, detail="No checkpoints available to resume")
@@ -130,12 +130,13 @@ class ExecutionProofChain:
         subject_id: str | None = None,
         executor_type: str = "tool",
         executor_id: str | None = None,
+        proof_id: str | None = None,
     ) -> ExecutionProof:
         prev = self._proofs[-1] if self._proofs else None
         input_hash = _sha256_text(_canonical_json(args))
         output_hash = _sha256_text(_canonical_json(result))
         prev_chain_hash = prev.chain_hash if prev else ""
-        proof_id = f"proof_{uuid.uuid4().hex[:16]}"
+        proof_id = proof_id or f"proof_{uuid.uuid4().hex[:16]}"
         prev_proof_id = prev.proof_id if prev else ""
         timestamp = time.time()
         normalized_cost = float(cost or 0.0)
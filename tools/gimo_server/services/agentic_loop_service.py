@@ -29,6 +29,7 @@ from .providers.auth_service import ProviderAuthService
 from .providers.adapter_registry import build_provider_adapter
 from .providers.service_impl import ProviderService
 from .constraint_compiler_service import ConstraintCompilerService
+from .context_budget import ContextBudget, token_counter, trim_messages
 from .task_descriptor_service import TaskDescriptorService
 from .workspace.workspace_contract import WorkspaceContract
 
@@ -573,24 +574,15 @@ class AgenticLoopService:
         return cls._DEFAULT_CONTEXT_BUDGET
 
     @staticmethod
-    def _estimate_tokens(text: str) -> int:
-        """Fast token estimation: ~4 chars per token for English/code."""
-        return max(1, len(text) // 4)
+    def _estimate_tokens(text: str, model: str = "") -> int:
+        """Token count of *text* with *model*'s tokenizer (cached by content hash)."""
+        return max(1, token_counter(model).count_text(text))
 
     @classmethod
-    def _estimate_messages_tokens(cls, messages: List[Dict[str, Any]]) -> int:
-        """Estimate total tokens across all messages."""
-        total = 0
-        for msg in messages:
-            content = msg.get("content") or ""
-            if isinstance(content, str):
-                total += cls._estimate_tokens(content)
-            # Tool calls in assistant messages
-            for tc in msg.get("tool_calls", []):
-                func = tc.get("function", {})
-                total += cls._estimate_tokens(func.get("name", ""))
-                total += cls._estimate_tokens(func.get("arguments", ""))
-        return total
+    def _estimate_messages_tokens(cls, messages: List[Dict[str, Any]], model: str = "") -> int:
+        """Total tokens across all messages, tool calls and per-message overhead."""
+        counter = token_counter(model)
+        return sum(counter.count_message(msg) for msg in messages)
 
     @staticmethod
     def _compute_available_budget(budget: int, tools_tokens: int) -> int:
@@ -600,103 +592,33 @@ class AgenticLoopService:
             available = max(budget // 2, 1024)
         return available
 
-    @staticmethod
-    def _compress_tool_results_in_place(trimmed: List[Dict[str, Any]]) -> None:
-        """Pass 1: Compress large tool results (>500 chars)."""
-        for msg in trimmed:
-            if msg.get("role") == "tool":
-                content = msg.get("content", "")
-                if isinstance(content, str) and len(content) > 500:
-                    # Keep first 200 chars + last 100 chars
-                    msg["content"] = content[:200] + "\n...(truncated)...\n" + content[-100:]
-
-    @staticmethod
-    def _compress_assistant_text_in_place(trimmed: List[Dict[str, Any]]) -> None:
-        """Pass 2: Compress assistant text content (>300 chars)."""
-        for msg in trimmed:
-            if msg.get("role") == "assistant":
-                content = msg.get("content") or ""
-                if isinstance(content, str) and len(content) > 300:
-                    msg["content"] = content[:200] + "...(truncated)"
-
-    @classmethod
-    def _apply_sliding_window(
-        cls,
-        trimmed: List[Dict[str, Any]],
-        available: int,
-    ) -> List[Dict[str, Any]]:
-        """Pass 3: Sliding window — keep system + last N exchanges that fit."""
-        # Find the system prompt and last user message
-        system_msg = trimmed[0] if trimmed and trimmed[0].get("role") == "system" else None
-        result: List[Dict[str, Any]] = []
-        if system_msg:
-            # Compress system prompt too if budget is very tight
-            sys_content = system_msg.get("content", "")
-            if isinstance(sys_content, str) and cls._estimate_tokens(sys_content) > available // 3:
-                system_msg = {**system_msg, "content": sys_content[:600] + "\n...(workspace info truncated)"}
-            result.append(system_msg)
-
-        # Walk backwards to collect recent turns that fit
-        remaining = trimmed[1:] if system_msg else trimmed
-        # Collect from the end
-        tail: List[Dict[str, Any]] = []
-        tail_tokens = cls._estimate_messages_tokens(result)
-        for msg in reversed(remaining):
-            msg_tokens = cls._estimate_messages_tokens([msg])
-            if tail_tokens + msg_tokens > available:
-                break
-            tail.insert(0, msg)
-            tail_tokens += msg_tokens
-
-        # Ensure we have at least the last user message
-        if not tail and remaining:
-            tail = [remaining[-1]]
-
-        result.extend(tail)
-        return result
-
     @classmethod
     def _trim_messages_to_budget(
         cls,
         messages: List[Dict[str, Any]],
         budget: int,
         tools_tokens: int = 0,
+        *,
+        model: str = "",
+        tracker: ContextBudget | None = None,
     ) -> List[Dict[str, Any]]:
         """Trim message history to fit within token budget.
 
-        Strategy (preserves correctness of tool-call/tool-result pairs):
-        1. Always keep system prompt (messages[0]) and the last user message.
-        2. Compress tool result contents that exceed 500 chars.
-        3. If still over budget, drop oldest conversation turns (keeping
-           the system prompt and last 2 user/assistant exchanges).
-
-        Returns a new list — does not mutate the original.
+        *tracker* carries the running token total between turns so only newly
+        appended messages are counted.  Within budget the same list is
+        returned; otherwise old tool outputs are summarised first, then old
+        assistant prose, then whole old exchanges are dropped (see
+        ``context_budget.trim_messages``).  The original list and its message
+        dicts are never mutated.
         """
-        import copy
-
         available = cls._compute_available_budget(budget, tools_tokens)
-
-        est = cls._estimate_messages_tokens(messages)
-        if est <= available:
+        if tracker is None:
+            tracker = ContextBudget(token_counter(model))
+        if tracker.sync(messages) <= available:
             return messages
-
-        # Pass 1: Compress large tool results
-        trimmed = copy.deepcopy(messages)
-        cls._compress_tool_results_in_place(trimmed)
-
-        est = cls._estimate_messages_tokens(trimmed)
-        if est <= available:
-            return trimmed
-
-        # Pass 2: Compress assistant text content
-        cls._compress_assistant_text_in_place(trimmed)
-
-        est = cls._estimate_messages_tokens(trimmed)
-        if est <= available:
-            return trimmed
-
-        # Pass 3: Sliding window — keep system + last N exchanges
-        return cls._apply_sliding_window(trimmed, available)
+        trimmed, counts = trim_messages(messages, available, tracker.counter, counts=tracker.counts)
+        tracker.reset(trimmed, counts)
+        return trimmed
 
     @classmethod
     def _build_context_budget_hint(
@@ -830,6 +752,9 @@ class AgenticLoopService:
         gics = cls._get_gics()
         if not gics:
             return [], True
+        # Pre-action proofs handed out by SagpGateway precede this read in the chain.
+        from .governance_state import ProofPipeline
+        ProofPipeline.flush(thread_id)
         try:
             rows = gics.scan(prefix=f"ops:proof:{thread_id}:")
             records: List[Dict[str, Any]] = []
@@ -922,6 +847,9 @@ class AgenticLoopService:
             gics.put(f"ops:proof:{thread_id}:{proof.proof_id}", proof.to_dict())
         except Exception:
             logger.debug("Unable to persist execution proof for thread %s", thread_id, exc_info=True)
+        finally:
+            from .governance_state import ProofPipeline
+            ProofPipeline.forget(thread_id)
 
     @classmethod
     def get_thread_proofs(cls, thread_id: str) -> Dict[str, Any]:
@@ -1052,7 +980,7 @@ class AgenticLoopService:
         # Compact tool schemas for providers with strict payload limits (e.g. Groq 413).
         tool_schema_budget = min(4000, context_budget * 2) if is_constrained else 8000
         tools = cls._compact_tools_if_needed(tools, max_schema_chars=tool_schema_budget)
-        tools_tokens_est = sum(cls._estimate_tokens(json.dumps(t)) for t in tools)
+        tools_tokens_est = sum(cls._estimate_tokens(json.dumps(t), model) for t in tools)
         if is_constrained:
             logger.info(
                 "Constrained provider detected: %s (budget=%d tokens, tools=%d tokens)",
@@ -1293,6 +1221,7 @@ class AgenticLoopService:
         context_budget, is_constrained, tools, tools_tokens_est = cls._prepare_context_budget(
             model, provider_id, tools,
         )
+        budget_tracker = ContextBudget(token_counter(model))
         loop_started_at = time.monotonic()
 
         await emit_event(
@@ -1319,8 +1248,9 @@ class AgenticLoopService:
             predicted_max_tokens = cls._predict_max_tokens(task_key, model)
 
             # Trim messages to fit provider's context budget before each call
-            if is_constrained:
-                messages = cls._trim_messages_to_budget(messages, context_budget, tools_tokens_est)
+            messages = cls._trim_messages_to_budget(
+                messages, context_budget, tools_tokens_est, model=model, tracker=budget_tracker,
+            )
 
             try:
                 llm_result = await adapter.chat_with_tools(
@@ -1345,7 +1275,7 @@ class AgenticLoopService:
                     # it so future runs adapt immediately.
                     estimated_real_limit = max(
                         1024,
-                        cls._estimate_messages_tokens(messages) + tools_tokens_est - 512,
+                        budget_tracker.sync(messages) + tools_tokens_est - 512,
                     )
                     # Be conservative: assume the limit is 80% of what we sent
                     discovered_limit = int(estimated_real_limit * 0.8)
@@ -1366,6 +1296,7 @@ class AgenticLoopService:
                     # Emergency trim: halve the budget and retry once
                     messages = cls._trim_messages_to_budget(
                         messages, context_budget // 2, tools_tokens_est,
+                        model=model, tracker=budget_tracker,
                     )
                     try:
                         llm_result = await adapter.chat_with_tools(
@@ -1381,7 +1312,7 @@ class AgenticLoopService:
                         _hint = cls._build_context_budget_hint(
                             provider_id=provider_id, model=model,
                             context_budget=context_budget,
-                            messages_tokens=cls._estimate_messages_tokens(messages),
+                            messages_tokens=budget_tracker.sync(messages),
                             tools_tokens=tools_tokens_est,
                             iteration=iteration, error=str(retry_exc),
                         )
@@ -1453,7 +1384,7 @@ class AgenticLoopService:
                     _hint = cls._build_context_budget_hint(
                         provider_id=provider_id, model=model,
                         context_budget=context_budget,
-                        messages_tokens=cls._estimate_messages_tokens(messages),
+                        messages_tokens=budget_tracker.sync(messages),
                         tools_tokens=tools_tokens_est,
                         iteration=iteration, error="hollow_completion",
                     )
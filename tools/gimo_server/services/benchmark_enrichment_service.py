@@ -459,6 +459,14 @@ def lookup_model(
         if alias in profiles:
             return profiles[alias]
 
+    return _scan_profiles(key, aliases, profiles)
+
+
+def _scan_profiles(
+    key: str,
+    aliases: List[str],
+    profiles: Dict[str, ModelBenchmarks],
+) -> Optional[ModelBenchmarks]:
     # Substring match: "qwen2.5-coder:7b" matches "qwen-qwen2.5-coder-7b-instruct"
     for pkey, profile in profiles.items():
         if key in pkey or any(a in pkey for a in aliases):
@@ -470,6 +478,45 @@ def lookup_model(
     return None
 
 
+class BenchmarkIndex:
+    """Prebuilt alias index over *profiles* for repeated lookups.
+
+    Resolves like :func:`lookup_model` — profile key, then the name's
+    aliases — but checks the profiles' own aliases through a dict before
+    falling back to the substring scan, and memoises the result per model
+    id, so the scan runs at most once per model for a given profile set.
+    """
+
+    def __init__(self, profiles: Dict[str, ModelBenchmarks]) -> None:
+        self.profiles = profiles
+        self._by_alias: Dict[str, ModelBenchmarks] = {}
+        for profile in profiles.values():
+            for alias in profile.aliases:
+                self._by_alias.setdefault(alias, profile)
+        self._memo: Dict[str, Optional[ModelBenchmarks]] = {}
+
+    def lookup(self, model_id: str) -> Optional[ModelBenchmarks]:
+        try:
+            return self._memo[model_id]
+        except KeyError:
+            pass
+        key = _normalize_model_name(model_id)
+        aliases = _build_alias_map(model_id)
+        profile = self.profiles.get(key)
+        for alias in aliases:
+            if profile is not None:
+                break
+            profile = self.profiles.get(alias)
+        for alias in aliases:
+            if profile is not None:
+                break
+            profile = self._by_alias.get(alias)
+        if profile is None:
+            profile = _scan_profiles(key, aliases, self.profiles)
+        self._memo[model_id] = profile
+        return profile
+
+
 async def seed_gics_priors(
     gics_service: Any,
     provider_type: str,
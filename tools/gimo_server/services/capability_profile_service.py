@@ -128,7 +128,10 @@ class CapabilityProfileService:
             logger.warning("GICS capability write failed: %s", exc)
             return None
 
-        return TaskCapability(**{k: updated[k] for k in TaskCapability.__dataclass_fields__})
+        capability = TaskCapability(**{k: updated[k] for k in TaskCapability.__dataclass_fields__})
+        from .routing_scoreboard import RoutingScoreboard
+        RoutingScoreboard.on_task_outcome(provider_type, model_id, task_type, capability)
+        return capability
 
     @classmethod
     def _add_to_index(cls, provider_type: str, model_id: str, task_type: str) -> None:
@@ -171,6 +174,18 @@ class CapabilityProfileService:
         except Exception:
             return None
 
+    @classmethod
+    def known_task_types(cls, *, provider_type: str, model_id: str) -> List[str]:
+        """Task types with recorded outcomes for a model (from the index key)."""
+        gics = cls._gics()
+        if not gics:
+            return []
+        try:
+            idx = gics.get(cls._index_key(provider_type, model_id))
+            return list((idx or {}).get("fields", {}).get("task_types", []))
+        except Exception:
+            return []
+
     @classmethod
     def get_full_profile(cls, *, provider_type: str, model_id: str) -> ModelProfile:
         """Build the complete capability profile for a model across all task types."""
@@ -229,14 +244,14 @@ class CapabilityProfileService:
         except Exception:
             return None
 
+        from .routing_scoreboard import RoutingScoreboard
+
         best = None
         best_rate = -1.0
         for m in models:
             if m.quality_tier > max_tier:
                 continue
-            cap = cls.get_capability(
-                provider_type=m.provider_type, model_id=m.model_id, task_type=task_type,
-            )
+            cap = RoutingScoreboard.capability(m.provider_type, m.model_id, task_type)
             if not cap or cap.samples < min_samples:
                 continue
             if cap.success_rate > best_rate:
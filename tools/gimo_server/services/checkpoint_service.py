@@ -3,14 +3,39 @@ Checkpoint Service — Phase 5 of SEA (Sistema de Ejecución Adaptativa).
 
 Manages checkpoints for resumable operations.
 Operations can save intermediate state and be resumed later.
+
+Storage layout (GICS keys):
+    ckpt:{operation}:{operation_id}:{checkpoint_id}   checkpoint record
+    ckpt_idx:{checkpoint_id}                          id -> record key
+    ckpt_latest:{operation}:{operation_id}            latest checkpoint of an operation
+    ckpt_ttl:{bucket}:{checkpoint_id | chunk:digest}  expiry marker, one bucket per
+                                                      TTL_BUCKET_SECONDS of expires_at
+    ckpt_chunk:{sha256} / ckpt_chunk_lease:{sha256}   content-addressed state chunk
+                                                      and the last bucket using it
+    ckpt_meta:schema                                  layout version + sweep cursor
+
+Lookups by id and "latest for this operation" are point reads.  Top-level
+state values whose JSON exceeds CHUNK_THRESHOLD_BYTES are stored as chunks
+addressed by their SHA-256, so successive checkpoints of a mostly unchanged
+state only write the values that changed.  ``sweep_expired`` deletes whole
+TTL buckets once they are past; a chunk lives until the last bucket that
+referenced it is swept.  Records written before the index existed are
+indexed once, on first use.
 """
 
+import hashlib
+import itertools
+import json
 import logging
+import secrets
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger("orchestrator.services.checkpoint")
 
+_PROCESS_TAG = secrets.token_hex(4)
+_SEQUENCE = itertools.count()
+
 
 class CheckpointService:
     """Gestiona checkpoints para operaciones resumibles."""
@@ -20,6 +45,19 @@ class CheckpointService:
 
     # TTL for checkpoints (24 hours)
     CHECKPOINT_TTL = 86400
+    # Expiry granularity: markers are grouped (and swept) per bucket.
+    TTL_BUCKET_SECONDS = 600
+    # Top-level state values larger than this (JSON bytes) become chunks.
+    CHUNK_THRESHOLD_BYTES = 16 * 1024
+    CHUNK_SIZE_BYTES = 256 * 1024
+
+    SCHEMA_KEY = "ckpt_meta:schema"
+    SCHEMA_VERSION = 2
+
+    # GICS instance whose legacy records are known to be indexed.
+    _indexed_for: Optional[int] = None
+    # digest -> highest TTL bucket this process has leased the chunk for.
+    _chunk_buckets: Dict[str, int] = {}
 
     @classmethod
     def set_gics(cls, gics) -> None:
@@ -42,6 +80,46 @@ class CheckpointService:
             pass
         raise RuntimeError("CheckpointService: GICS not initialized. Call set_gics() or StorageService.set_shared_gics() first.")
 
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _record_key(operation: str, operation_id: str, checkpoint_id: str) -> str:
+        return f"ckpt:{operation}:{operation_id}:{checkpoint_id}"
+
+    @staticmethod
+    def _index_key(checkpoint_id: str) -> str:
+        return f"ckpt_idx:{checkpoint_id}"
+
+    @staticmethod
+    def _latest_key(operation: str, operation_id: str) -> str:
+        return f"ckpt_latest:{operation}:{operation_id}"
+
+    @staticmethod
+    def _bucket_prefix(bucket: int) -> str:
+        return f"ckpt_ttl:{bucket:012d}:"
+
+    @classmethod
+    def _bucket_for(cls, expires_at: float) -> int:
+        return int(expires_at // cls.TTL_BUCKET_SECONDS)
+
+    @staticmethod
+    def _new_checkpoint_id() -> str:
+        """Unique across threads (sequence) and processes (random process tag)."""
+        return f"ckpt_{int(time.time() * 1000)}_{_PROCESS_TAG}{next(_SEQUENCE):x}"
+
+    @staticmethod
+    def _fields(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not record:
+            return None
+        fields = record.get("fields")
+        return dict(fields) if isinstance(fields, dict) else None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
     @classmethod
     def save_checkpoint(
         cls,
@@ -67,7 +145,8 @@ class CheckpointService:
             Fields: {
                 operation: str,
                 operation_id: str,
-                state: dict,
+                state: dict,            # small values inline
+                state_chunks: dict,     # key -> [sha256, ...] for large values
                 metadata: dict,
                 timestamp: int,
                 resumable: bool,
@@ -76,22 +155,30 @@ class CheckpointService:
         """
         try:
             gics = cls._get_gics()
-            timestamp_ms = int(time.time() * 1000)
-            checkpoint_id = f"ckpt_{timestamp_ms}"
-            key = f"ckpt:{operation}:{operation_id}:{checkpoint_id}"
+            cls._ensure_indexed(gics)
+            checkpoint_id = cls._new_checkpoint_id()
+            key = cls._record_key(operation, operation_id, checkpoint_id)
+            now = int(time.time())
+            expires_at = now + cls.CHECKPOINT_TTL
+            bucket = cls._bucket_for(expires_at)
+            inline_state, chunk_refs = cls._pack_state(gics, state, bucket)
 
             fields = {
                 "operation": operation,
                 "operation_id": operation_id,
                 "checkpoint_id": checkpoint_id,
-                "state": state,
+                "state": inline_state,
                 "metadata": metadata or {},
-                "timestamp": int(time.time()),
+                "timestamp": now,
                 "resumable": True,
-                "expires_at": int(time.time()) + cls.CHECKPOINT_TTL,
+                "expires_at": expires_at,
             }
+            if chunk_refs:
+                fields["state_chunks"] = chunk_refs
 
             gics.put(key, fields)
+            cls._write_index(gics, fields, key)
+            gics.put(cls._latest_key(operation, operation_id), {"checkpoint_id": checkpoint_id, "key": key})
 
             logger.info(
                 "Checkpoint saved: %s (operation=%s, id=%s)",
@@ -113,38 +200,67 @@ class CheckpointService:
         Recupera checkpoint de GICS por ID.
 
         Args:
-            checkpoint_id: Checkpoint identifier (e.g., "ckpt_1735689650123")
+            checkpoint_id: Checkpoint identifier (e.g., "ckpt_1735689650123_…")
 
         Returns:
             Checkpoint data dict, or None if not found
         """
         try:
             gics = cls._get_gics()
+            cls._ensure_indexed(gics)
+            located = cls._locate(gics, checkpoint_id)
+            if located is None:
+                logger.warning("Checkpoint not found: %s", checkpoint_id)
+                return None
+            fields = located[1]
 
-            # Scan for checkpoint with this ID
-            # Pattern: ckpt:*:*:{checkpoint_id}
-            prefix = "ckpt:"
-            records = gics.scan(prefix=prefix)
+            # Check if expired
+            if time.time() > fields.get("expires_at", 0):
+                logger.warning("Checkpoint %s expired", checkpoint_id)
+                return None
 
-            for record in records:
-                key = record.get("key", "")
-                if key.endswith(f":{checkpoint_id}"):
-                    fields = record.get("fields") or {}
+            logger.debug("Checkpoint retrieved: %s", checkpoint_id)
+            return cls._unpack_state(gics, fields)
 
-                    # Check if expired
-                    expires_at = fields.get("expires_at", 0)
-                    if time.time() > expires_at:
-                        logger.warning("Checkpoint %s expired", checkpoint_id)
-                        return None
+        except Exception as exc:
+            logger.error("Failed to retrieve checkpoint %s: %s", checkpoint_id, exc, exc_info=True)
+            return None
 
-                    logger.debug("Checkpoint retrieved: %s", checkpoint_id)
-                    return fields
+    @classmethod
+    def get_latest(cls, operation: str, operation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Recupera el checkpoint resumable más reciente de una operación.
 
-            logger.warning("Checkpoint not found: %s", checkpoint_id)
-            return None
+        Args:
+            operation: Operation type (e.g., "plan", "run")
+            operation_id: Operation ID
+
+        Returns:
+            Checkpoint data dict, or None if the operation has none
+        """
+        try:
+            gics = cls._get_gics()
+            cls._ensure_indexed(gics)
+            pointer = cls._fields(gics.get(cls._latest_key(operation, operation_id))) or {}
+            if pointer.get("key"):
+                fields = cls._fields(gics.get(pointer["key"]))
+                if fields and fields.get("resumable") and time.time() <= fields.get("expires_at", 0):
+                    return cls._unpack_state(gics, fields)
+
+            # Pointer missing or its target resumed/deleted/expired: fall back
+            # to this operation's own records and repair the pointer.
+            candidates = cls.list_resumable(operation=operation, operation_id=operation_id, limit=1)
+            if not candidates:
+                return None
+            checkpoint_id = candidates[0]["checkpoint_id"]
+            gics.put(
+                cls._latest_key(operation, operation_id),
+                {"checkpoint_id": checkpoint_id, "key": cls._record_key(operation, operation_id, checkpoint_id)},
+            )
+            return cls.get_checkpoint(checkpoint_id)
 
         except Exception as exc:
-            logger.error("Failed to retrieve checkpoint %s: %s", checkpoint_id, exc, exc_info=True)
+            logger.error("Failed to get latest checkpoint for %s/%s: %s", operation, operation_id, exc, exc_info=True)
             return None
 
     @classmethod
@@ -203,8 +319,8 @@ class CheckpointService:
                     "metadata": fields.get("metadata", {}),
                 })
 
-            # Sort by timestamp (most recent first)
-            checkpoints.sort(key=lambda x: x["timestamp"], reverse=True)
+            # Sort by timestamp (most recent first); ids break ties within a second
+            checkpoints.sort(key=lambda x: (x["timestamp"] or 0, x["checkpoint_id"] or ""), reverse=True)
 
             # Limit results
             return checkpoints[:limit]
@@ -226,20 +342,20 @@ class CheckpointService:
         """
         try:
             gics = cls._get_gics()
-
-            # Find checkpoint key
-            prefix = "ckpt:"
-            records = gics.scan(prefix=prefix)
-
-            for record in records:
-                key = record.get("key", "")
-                if key.endswith(f":{checkpoint_id}"):
-                    gics.delete(key)
-                    logger.info("Checkpoint deleted: %s", checkpoint_id)
-                    return True
-
-            logger.warning("Checkpoint not found for deletion: %s", checkpoint_id)
-            return False
+            cls._ensure_indexed(gics)
+            located = cls._locate(gics, checkpoint_id)
+            if located is None:
+                logger.warning("Checkpoint not found for deletion: %s", checkpoint_id)
+                return False
+
+            key, fields = located
+            gics.delete(key)
+            gics.delete(cls._index_key(checkpoint_id))
+            gics.delete(cls._bucket_prefix(cls._bucket_for(fields.get("expires_at", 0))) + checkpoint_id)
+            cls._drop_latest(gics, fields.get("operation", ""), fields.get("operation_id", ""), checkpoint_id)
+            # Chunks are shared; they expire with the last bucket that used them.
+            logger.info("Checkpoint deleted: %s", checkpoint_id)
+            return True
 
         except Exception as exc:
             logger.error("Failed to delete checkpoint %s: %s", checkpoint_id, exc, exc_info=True)
@@ -250,26 +366,38 @@ class CheckpointService:
         """
         Limpia checkpoints expirados de GICS.
 
+        Returns:
+            Number of checkpoints cleaned up
+        """
+        return cls.sweep_expired()
+
+    @classmethod
+    def sweep_expired(cls, now: Optional[float] = None) -> int:
+        """
+        Borra los buckets de TTL ya vencidos (checkpoints y chunks sin uso).
+
+        Visits only buckets between the persisted sweep cursor and *now*, so
+        the cost is proportional to what expired, not to what is stored.
+
         Returns:
             Number of checkpoints cleaned up
         """
         try:
             gics = cls._get_gics()
-            prefix = "ckpt:"
-            records = gics.scan(prefix=prefix)
+            cls._ensure_indexed(gics)
+            now = time.time() if now is None else now
+            current = cls._bucket_for(now)
+            meta = cls._fields(gics.get(cls.SCHEMA_KEY)) or {}
+            cursor = meta.get("swept_through")
+            if cursor is None:
+                cursor = min(cls._oldest_bucket(gics, default=current), current) - 1
 
-            current_time = time.time()
             cleaned = 0
-
-            for record in records:
-                fields = record.get("fields") or {}
-                expires_at = fields.get("expires_at", 0)
-
-                if current_time > expires_at:
-                    key = record.get("key")
-                    if key:
-                        gics.delete(key)
-                        cleaned += 1
+            for bucket in range(int(cursor) + 1, current):
+                cleaned += cls._sweep_bucket(gics, bucket)
+            if meta.get("swept_through") != current - 1:
+                meta.update({"version": cls.SCHEMA_VERSION, "swept_through": current - 1})
+                gics.put(cls.SCHEMA_KEY, meta)
 
             if cleaned > 0:
                 logger.info("Cleaned up %d expired checkpoints", cleaned)
@@ -293,21 +421,17 @@ class CheckpointService:
         """
         try:
             gics = cls._get_gics()
+            cls._ensure_indexed(gics)
+            located = cls._locate(gics, checkpoint_id)
+            if located is None:
+                return False
 
-            # Find and update checkpoint
-            prefix = "ckpt:"
-            records = gics.scan(prefix=prefix)
-
-            for record in records:
-                key = record.get("key", "")
-                if key.endswith(f":{checkpoint_id}"):
-                    fields = record.get("fields") or {}
-                    fields["resumable"] = False
-                    gics.put(key, fields)
-                    logger.debug("Checkpoint marked non-resumable: %s", checkpoint_id)
-                    return True
-
-            return False
+            key, fields = located
+            fields["resumable"] = False
+            gics.put(key, fields)
+            cls._write_index(gics, fields, key)
+            logger.debug("Checkpoint marked non-resumable: %s", checkpoint_id)
+            return True
 
         except Exception as exc:
             logger.error(
@@ -319,7 +443,8 @@ class CheckpointService:
     @classmethod
     def get_stats(cls) -> Dict[str, Any]:
         """
-        Obtiene estadísticas de checkpoints.
+        Obtiene estadísticas de checkpoints (from the expiry markers, without
+        loading checkpoint states).
 
         Returns:
             {
@@ -331,21 +456,24 @@ class CheckpointService:
         """
         try:
             gics = cls._get_gics()
-            prefix = "ckpt:"
-            records = gics.scan(prefix=prefix)
+            cls._ensure_indexed(gics)
+            records = gics.scan(prefix="ckpt_ttl:")
 
             current_time = time.time()
-            total = len(records)
+            total = 0
             resumable = 0
             expired = 0
             by_operation = {}
 
             for record in records:
+                if ":chunk:" in record.get("key", ""):
+                    continue
                 fields = record.get("fields") or {}
                 expires_at = fields.get("expires_at", 0)
                 is_resumable = fields.get("resumable", False)
                 operation = fields.get("operation", "unknown")
 
+                total += 1
                 if current_time > expires_at:
                     expired += 1
                 elif is_resumable:
@@ -368,3 +496,173 @@ class CheckpointService:
                 "expired_checkpoints": 0,
                 "by_operation": {},
             }
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _locate(cls, gics, checkpoint_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(record key, fields) for *checkpoint_id* via the id index."""
+        entry = cls._fields(gics.get(cls._index_key(checkpoint_id)))
+        if not entry or not entry.get("key"):
+            return None
+        fields = cls._fields(gics.get(entry["key"]))
+        if fields is None:
+            return None
+        return entry["key"], fields
+
+    @classmethod
+    def _write_index(cls, gics, fields: Dict[str, Any], key: str) -> None:
+        checkpoint_id = fields["checkpoint_id"]
+        gics.put(cls._index_key(checkpoint_id), {"key": key})
+        gics.put(
+            cls._bucket_prefix(cls._bucket_for(fields.get("expires_at", 0))) + checkpoint_id,
+            {
+                "key": key,
+                "operation": fields.get("operation", "unknown"),
+                "operation_id": fields.get("operation_id", ""),
+                "resumable": bool(fields.get("resumable", False)),
+                "expires_at": fields.get("expires_at", 0),
+            },
+        )
+
+    @classmethod
+    def _ensure_indexed(cls, gics) -> None:
+        """Index records written before the id index existed (once per store)."""
+        if cls._indexed_for == id(gics):
+            return
+        meta = cls._fields(gics.get(cls.SCHEMA_KEY))
+        if not meta or int(meta.get("version", 0)) < cls.SCHEMA_VERSION:
+            latest: Dict[Tuple[str, str], Tuple[int, str, str]] = {}
+            migrated = 0
+            for record in gics.scan(prefix="ckpt:"):
+                key = record.get("key", "")
+                fields = record.get("fields") or {}
+                checkpoint_id = fields.get("checkpoint_id") or key.rsplit(":", 1)[-1]
+                if not checkpoint_id:
+                    continue
+                fields["checkpoint_id"] = checkpoint_id
+                cls._write_index(gics, fields, key)
+                migrated += 1
+                op_key = (str(fields.get("operation")), str(fields.get("operation_id")))
+                stamp = (int(fields.get("timestamp") or 0), checkpoint_id, key)
+                if stamp > latest.get(op_key, (-1, "", "")):
+                    latest[op_key] = stamp
+            for (operation, operation_id), (_, checkpoint_id, key) in latest.items():
+                gics.put(cls._latest_key(operation, operation_id), {"checkpoint_id": checkpoint_id, "key": key})
+            gics.put(cls.SCHEMA_KEY, {**(meta or {}), "version": cls.SCHEMA_VERSION})
+            if migrated:
+                logger.info("Indexed %d existing checkpoints", migrated)
+        cls._indexed_for = id(gics)
+
+    # ------------------------------------------------------------------
+    # Content-addressed state chunks
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _pack_state(cls, gics, state: Any, bucket: int) -> Tuple[Any, Dict[str, List[str]]]:
+        """Split large top-level values of *state* into chunks stored by digest."""
+        if not isinstance(state, dict):
+            return state, {}
+        inline: Dict[str, Any] = {}
+        refs: Dict[str, List[str]] = {}
+        for name, value in state.items():
+            blob = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+            if len(blob) < cls.CHUNK_THRESHOLD_BYTES:
+                inline[name] = value
+                continue
+            digests = []
+            for start in range(0, len(blob), cls.CHUNK_SIZE_BYTES):
+                piece = blob[start:start + cls.CHUNK_SIZE_BYTES]
+                digest = hashlib.sha256(piece.encode("utf-8")).hexdigest()
+                cls._store_chunk(gics, digest, piece, bucket)
+                digests.append(digest)
+            refs[name] = digests
+        return inline, refs
+
+    @classmethod
+    def _store_chunk(cls, gics, digest: str, piece: str, bucket: int) -> None:
+        if cls._chunk_buckets.get(digest, -1) >= bucket:
+            return  # already leased through this bucket by this process
+        lease_key = f"ckpt_chunk_lease:{digest}"
+        lease = cls._fields(gics.get(lease_key))
+        if lease is None:
+            gics.put(f"ckpt_chunk:{digest}", {"data": piece})
+        if lease is None or int(lease.get("bucket", -1)) < bucket:
+            gics.put(lease_key, {"bucket": bucket})
+            gics.put(cls._bucket_prefix(bucket) + f"chunk:{digest}", {"digest": digest})
+        cls._chunk_buckets[digest] = max(bucket, int((lease or {}).get("bucket", -1)))
+
+    @classmethod
+    def _unpack_state(cls, gics, fields: Dict[str, Any]) -> Dict[str, Any]:
+        refs = fields.pop("state_chunks", None)
+        if not refs:
+            return fields
+        state = dict(fields.get("state") or {})
+        for name, digests in refs.items():
+            pieces = []
+            for digest in digests:
+                chunk = cls._fields(gics.get(f"ckpt_chunk:{digest}"))
+                if chunk is None:
+                    raise KeyError(f"checkpoint state chunk missing: {digest}")
+                pieces.append(chunk["data"])
+            state[name] = json.loads("".join(pieces))
+        fields["state"] = state
+        return fields
+
+    # ------------------------------------------------------------------
+    # TTL sweep
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _oldest_bucket(cls, gics, default: int) -> int:
+        """Oldest bucket with markers; only needed before the first sweep."""
+        buckets = []
+        for record in gics.scan(prefix="ckpt_ttl:"):
+            try:
+                buckets.append(int(record.get("key", "").split(":")[1]))
+            except (IndexError, ValueError):
+                continue
+        return min(buckets, default=default)
+
+    @classmethod
+    def _sweep_bucket(cls, gics, bucket: int) -> int:
+        cleaned = 0
+        for record in gics.scan(prefix=cls._bucket_prefix(bucket)):
+            marker = record.get("key", "")
+            name = marker[len(cls._bucket_prefix(bucket)):]
+            if name.startswith("chunk:"):
+                digest = name[len("chunk:"):]
+                lease_key = f"ckpt_chunk_lease:{digest}"
+                lease = cls._fields(gics.get(lease_key)) or {}
+                if int(lease.get("bucket", -1)) <= bucket:
+                    gics.delete(f"ckpt_chunk:{digest}")
+                    gics.delete(lease_key)
+                    cls._chunk_buckets.pop(digest, None)
+            else:
+                fields = record.get("fields") or {}
+                key = fields.get("key") or ""
+                if key:
+                    gics.delete(key)
+                gics.delete(cls._index_key(name))
+                operation = str(fields.get("operation", ""))
+                operation_id = fields.get("operation_id")
+                if operation_id is None:
+                    # Markers written before they carried the operation id.
+                    head, tail = f"ckpt:{operation}:", f":{name}"
+                    if key.startswith(head) and key.endswith(tail):
+                        operation_id = key[len(head):-len(tail)]
+                if operation_id is not None:
+                    cls._drop_latest(gics, operation, str(operation_id), name)
+                cleaned += 1
+            gics.delete(marker)
+        return cleaned
+
+    @classmethod
+    def _drop_latest(cls, gics, operation: str, operation_id: str, checkpoint_id: str) -> None:
+        """Delete the operation's latest pointer if it names *checkpoint_id*."""
+        latest_key = cls._latest_key(operation, operation_id)
+        pointer = cls._fields(gics.get(latest_key)) or {}
+        if pointer.get("checkpoint_id") == checkpoint_id:
+            gics.delete(latest_key)
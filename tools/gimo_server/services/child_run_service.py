@@ -50,6 +50,7 @@ class ChildRunService:
             child_context=child_ctx,
             spawn_depth=parent.spawn_depth + 1,
             model_tier=child_tier,
+            priority=parent.priority,
         )
 
         # OpsService is file-backed — use its internal persistence API under the file lock
@@ -0,0 +1,385 @@
+"""Token accounting and structure-aware trimming for agentic message lists.
+
+Token counts come from a tokenizer chosen by model family (``tiktoken`` for
+OpenAI models when it is installed, calibrated heuristics otherwise) and are
+cached per message by content hash, so a turn only tokenizes the messages that
+were appended since the previous one.
+
+Trimming never mutates or deep-copies the caller's messages: the result is a
+new list that shares every untouched message dict, and only the messages that
+are elided or shortened are replaced by new dicts.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+logger = logging.getLogger("orchestrator.context_budget")
+
+# Role/delimiter tokens every chat message costs on top of its content.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class Tokenizer(Protocol):
+    name: str
+
+    def count(self, text: str) -> int: ...
+
+
+_WORD = re.compile(r"[A-Za-z]+")
+_DIGITS = re.compile(r"[0-9]+")
+_SYMBOL = re.compile(r"[!-/:-@\[-`{-~]")
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_CJK = re.compile(f"[{_CJK_RANGES}]")
+_OTHER = re.compile(f"[^\\x00-\\x7f{_CJK_RANGES}]+")
+
+
+class HeuristicTokenizer:
+    """BPE-shaped estimate without a vocabulary.
+
+    Counts word pieces, digit groups, punctuation, line breaks and non-Latin
+    script separately instead of ``len(text) / 4``, which undercounts code
+    (punctuation is mostly one token each) and CJK text (about one token per
+    character) by a factor of 2-4.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        word_chars: float = 4.0,
+        symbol_tokens: float = 1.0,
+        cjk_tokens: float = 1.0,
+        other_chars: float = 2.0,
+    ) -> None:
+        self.name = name
+        self.word_chars = word_chars
+        self.symbol_tokens = symbol_tokens
+        self.cjk_tokens = cjk_tokens
+        self.other_chars = other_chars
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        wc = self.word_chars
+        tokens = sum(math.ceil(len(w) / wc) for w in _WORD.findall(text))
+        tokens += sum(math.ceil(len(d) / 3) for d in _DIGITS.findall(text))
+        tokens += len(_SYMBOL.findall(text)) * self.symbol_tokens + text.count("\n")
+        if not text.isascii():
+            tokens += len(_CJK.findall(text)) * self.cjk_tokens
+            tokens += sum(math.ceil(len(run) / self.other_chars) for run in _OTHER.findall(text))
+        return max(1, int(tokens))
+
+
+class TiktokenTokenizer:
+    """Exact counts for OpenAI encodings (optional ``tiktoken`` dependency)."""
+
+    def __init__(self, encoding: Any) -> None:
+        self.name = f"tiktoken:{encoding.name}"
+        self._encoding = encoding
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=())) if text else 0
+
+
+_HEURISTICS: Dict[str, Tokenizer] = {
+    "openai": HeuristicTokenizer("openai", word_chars=4.0, symbol_tokens=0.8),
+    "anthropic": HeuristicTokenizer("anthropic", word_chars=3.5, symbol_tokens=0.9, cjk_tokens=1.2),
+    "llama": HeuristicTokenizer("llama", word_chars=3.5, cjk_tokens=1.5, other_chars=1.5),
+    "default": HeuristicTokenizer("default", word_chars=3.5, cjk_tokens=1.5, other_chars=1.5),
+}
+_OVERRIDES: Dict[str, Tokenizer] = {}
+_TIKTOKEN: Dict[str, Optional[Tokenizer]] = {}
+_LLAMA_MARKERS = (
+    "llama", "mistral", "mixtral", "qwen", "gemma", "phi", "deepseek", "granite", "yi-",
+)
+_OPENAI_PREFIXES = ("gpt", "chatgpt", "o1", "o3", "o4", "codex", "text-")
+
+
+def model_family(model: str) -> str:
+    name = (model or "").lower().rsplit("/", 1)[-1]
+    if "claude" in name:
+        return "anthropic"
+    if name.startswith(_OPENAI_PREFIXES):
+        return "openai"
+    if any(marker in name for marker in _LLAMA_MARKERS):
+        return "llama"
+    return "default"
+
+
+def register_tokenizer(family: str, tokenizer: Tokenizer) -> None:
+    """Use *tokenizer* for every model of *family* (see ``model_family``)."""
+    _OVERRIDES[family] = tokenizer
+
+
+def _tiktoken_for(model: str) -> Optional[Tokenizer]:
+    name = model.lower().rsplit("/", 1)[-1]
+    if name not in _TIKTOKEN:
+        try:
+            import tiktoken
+
+            try:
+                encoding = tiktoken.encoding_for_model(name)
+            except KeyError:
+                encoding = tiktoken.get_encoding("o200k_base")
+            _TIKTOKEN[name] = TiktokenTokenizer(encoding)
+        except Exception:  # not installed, or encoding files unavailable offline
+            _TIKTOKEN[name] = None
+    return _TIKTOKEN[name]
+
+
+def tokenizer_for(model: str) -> Tokenizer:
+    family = model_family(model)
+    if family in _OVERRIDES:
+        return _OVERRIDES[family]
+    if family == "openai":
+        exact = _tiktoken_for(model)
+        if exact is not None:
+            return exact
+    return _HEURISTICS[family]
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):  # multimodal parts: only text is counted
+        return "\n".join(str(p.get("text") or "") for p in content if isinstance(p, dict))
+    return ""
+
+
+class TokenCounter:
+    """Tokenizer plus an LRU of token counts keyed by content hash."""
+
+    def __init__(self, tokenizer: Tokenizer, *, max_entries: int = 50_000) -> None:
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key: bytes, compute) -> int:
+        with self._lock:
+            count = self._cache.get(key)
+            if count is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return count
+        count = compute()
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = count
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return count
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return self._cached(key, lambda: self.tokenizer.count(text))
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        parts = [_content_text(message.get("content"))]
+        for tc in message.get("tool_calls") or []:
+            func = tc.get("function") or {}
+            args = func.get("arguments", "")
+            parts.append(str(func.get("name", "")))
+            parts.append(args if isinstance(args, str) else json.dumps(args, ensure_ascii=False))
+        digest = hashlib.blake2b(digest_size=16, person=b"message")
+        for part in parts:
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\x00")
+        return self._cached(
+            digest.digest(),
+            lambda: MESSAGE_OVERHEAD_TOKENS + sum(self.tokenizer.count(p) for p in parts if p),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokenizer": self.tokenizer.name,
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_COUNTERS: Dict[str, TokenCounter] = {}
+
+
+def token_counter(model: str) -> TokenCounter:
+    """Shared counter for *model*'s tokenizer, so the cache outlives a single run."""
+    tokenizer = tokenizer_for(model)
+    counter = _COUNTERS.get(tokenizer.name)
+    if counter is None or counter.tokenizer is not tokenizer:
+        counter = _COUNTERS[tokenizer.name] = TokenCounter(tokenizer)
+    return counter
+
+
+class ContextBudget:
+    """Running token total of one message list, updated as messages are appended.
+
+    ``sync`` compares the tracked messages by identity and only counts the new
+    suffix, so the loop's append-per-turn pattern costs O(new messages).
+    Messages are treated as immutable once appended.
+    """
+
+    def __init__(self, counter: TokenCounter) -> None:
+        self.counter = counter
+        self.total = 0
+        self._messages: List[Dict[str, Any]] = []
+        self._counts: List[int] = []
+
+    @property
+    def counts(self) -> List[int]:
+        return self._counts
+
+    def sync(self, messages: Sequence[Dict[str, Any]]) -> int:
+        tracked = self._messages
+        same = 0
+        limit = min(len(tracked), len(messages))
+        while same < limit and tracked[same] is messages[same]:
+            same += 1
+        if same < len(tracked):
+            self.total -= sum(self._counts[same:])
+            del tracked[same:]
+            del self._counts[same:]
+        for msg in messages[same:]:
+            count = self.counter.count_message(msg)
+            tracked.append(msg)
+            self._counts.append(count)
+            self.total += count
+        return self.total
+
+    def reset(self, messages: Sequence[Dict[str, Any]], counts: Sequence[int]) -> None:
+        self._messages = list(messages)
+        self._counts = list(counts)
+        self.total = sum(self._counts)
+
+
+_ELIDED_PREFIX = "[earlier tool output elided"
+
+
+def _elided_tool_output(content: str) -> str:
+    lines = content.splitlines()
+    head = next((line.strip() for line in lines if line.strip()), "")[:160]
+    return (
+        f"{_ELIDED_PREFIX} to fit the context budget: "
+        f"{len(content)} chars, {len(lines)} lines] {head}"
+    )
+
+
+def trim_messages(
+    messages: Sequence[Dict[str, Any]],
+    available: int,
+    counter: TokenCounter,
+    *,
+    counts: Optional[Sequence[int]] = None,
+) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """Fit *messages* into *available* tokens; returns the new list and its counts.
+
+    Passes, each stopping as soon as the budget is met:
+
+    1. Old tool outputs, oldest first, become a one-line summary.
+    2. Old assistant prose is shortened.
+    3. Oldest assistant exchanges (assistant message plus its tool results)
+       are dropped, then the oldest user turns.
+    4. An oversized system prompt is cut, then the latest tool outputs are
+       summarised too.
+
+    The system prompt, the last user message and the latest assistant
+    exchange survive passes 1-3, and tool results are never separated from
+    the assistant message that requested them.
+    """
+    out = list(messages)
+    sizes = list(counts) if counts is not None else [counter.count_message(m) for m in out]
+    total = sum(sizes)
+    if total <= available or not out:
+        return out, sizes
+
+    def _replace(i: int, content: str) -> None:
+        nonlocal total
+        new = {**out[i], "content": content}
+        size = counter.count_message(new)
+        if size < sizes[i]:
+            total += size - sizes[i]
+            out[i], sizes[i] = new, size
+
+    n = len(out)
+    protected = set()
+    if out[0].get("role") == "system":
+        protected.add(0)
+    last_user = next((i for i in range(n - 1, -1, -1) if out[i].get("role") == "user"), None)
+    if last_user is not None:
+        protected.add(last_user)
+    last_call = next((i for i in range(n - 1, -1, -1) if out[i].get("tool_calls")), None)
+    if last_call is not None:
+        protected.add(last_call)
+        j = last_call + 1
+        while j < n and out[j].get("role") == "tool":
+            protected.add(j)
+            j += 1
+
+    # 1. Summarise old tool outputs.
+    for i in range(n):
+        if total <= available:
+            return out, sizes
+        content = out[i].get("content")
+        if i in protected or out[i].get("role") != "tool" or not isinstance(content, str):
+            continue
+        if not content.startswith(_ELIDED_PREFIX):
+            _replace(i, _elided_tool_output(content))
+
+    # 2. Shorten old assistant prose.
+    for i in range(n):
+        if total <= available:
+            return out, sizes
+        content = out[i].get("content")
+        if i in protected or out[i].get("role") != "assistant":
+            continue
+        if isinstance(content, str) and len(content) > 300:
+            _replace(i, content[:200] + "...(truncated)")
+
+    # 3. Drop whole exchanges: a unit is a non-tool message plus the tool results after it.
+    units: List[Tuple[int, int]] = []
+    start = 0
+    for i in range(1, n + 1):
+        if i == n or out[i].get("role") != "tool":
+            units.append((start, i))
+            start = i
+    keep = [True] * n
+    for head_role in ("assistant", None):
+        for lo, hi in units:
+            if total <= available:
+                break
+            if any(i in protected for i in range(lo, hi)):
+                continue
+            if head_role is not None and out[lo].get("role") != head_role:
+                continue
+            if not keep[lo]:
+                continue
+            for i in range(lo, hi):
+                keep[i] = False
+                total -= sizes[i]
+
+    # 4. Last resort: cut the system prompt, then summarise the protected tool outputs.
+    if total > available and 0 in protected:
+        content = out[0].get("content")
+        if isinstance(content, str) and sizes[0] > available // 3:
+            _replace(0, content[:600] + "\n...(workspace info truncated)")
+    for i in sorted(protected):
+        if total <= available:
+            break
+        content = out[i].get("content")
+        if out[i].get("role") == "tool" and isinstance(content, str):
+            _replace(i, _elided_tool_output(content))
+    if total > available:
+        logger.debug("Context still over budget after trimming: %d > %d tokens", total, available)
+
+    return [m for m, k in zip(out, keep) if k], [s for s, k in zip(sizes, keep) if k]
@@ -511,6 +511,7 @@ class CustomPlanService:
         if plan.nodes:
             from .plan_migration_service import PlanMigrationService
             plan.nodes = PlanMigrationService.migrate_nodes(plan.nodes)
+        cls._ensure_dir()
         plan_path = cls._plan_path(plan.id)
         tmp_path = plan_path.with_suffix(".tmp")
         with cls._save_lock:
@@ -891,7 +892,9 @@ class CustomPlanService:
 
             if not execution_workspace:
                 sandbox_run_id = f"{plan.id}_{execution_id or 'run'}_{node.id}"
-                sandbox_handle = SandboxService.create_worktree_handle(sandbox_run_id, str(repo_root), base_ref=base_ref)
+                sandbox_handle = await SandboxService.acquire_worktree_handle(
+                    sandbox_run_id, str(repo_root), base_ref=base_ref
+                )
                 execution_workspace = str(sandbox_handle.worktree_path)
 
             logger.info(
@@ -173,14 +173,18 @@ class CostService:
         In debug mode, returns the real cost but does NOT accumulate it
         against budget limits — development iterations won't drain budgets.
         """
-        pricing = cls.get_pricing(model)
-        input_cost = (input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (output_tokens / 1_000_000) * pricing["output"]
-        cost = round(input_cost + output_cost, 6)
+        cost = cls.cost_for_pricing(cls.get_pricing(model), input_tokens, output_tokens)
         if is_debug_mode():
             logger.debug("[CostService] DEBUG MODE — cost $%.6f for %s (not tracked against budget)", cost, model)
         return cost
 
+    @staticmethod
+    def cost_for_pricing(pricing: Dict[str, float], input_tokens: int, output_tokens: int) -> float:
+        """USD for a token count at ``pricing`` (per-1M input/output rates)."""
+        input_cost = (input_tokens / 1_000_000) * pricing["input"]
+        output_cost = (output_tokens / 1_000_000) * pricing["output"]
+        return round(input_cost + output_cost, 6)
+
     @classmethod
     def get_impact_comparison(cls, model_a: str, model_b: str) -> Dict[str, Any]:
         """Compares two models and returns % impact (savings)."""
@@ -1,20 +1,198 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 
 from ..ops_models import (
     EvalCaseResult,
     EvalDataset,
     EvalGateConfig,
+    EvalGoldenCase,
     EvalJudgeConfig,
     EvalRunReport,
     WorkflowGraph,
 )
 from .graph import GraphEngine
+from .providers.service import ProviderService
+
+logger = logging.getLogger("orchestrator.evals")
+
+
+class _RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart (FIFO by arrival)."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self._interval = 1.0 / float(rate_per_second)
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class EvalOutputCache:
+    """Bounded LRU of provider responses keyed by (prompt, provider, model, params).
+
+    Only deterministic calls (``temperature == 0``) are stored; see
+    ``_EvalProvider``.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 24 * 3600.0) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt: str, context: Dict[str, Any], provider: str, model: str) -> str:
+        params = {k: v for k, v in context.items() if k != "node_id"}
+        payload = json.dumps([prompt, provider, model, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self._ttl_seconds:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic(), dict(response))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _EvalProvider:
+    """Provider facade shared by every case of one regression run.
+
+    Serves repeated deterministic (prompt, provider, model, params) calls
+    from the output cache and applies per-provider rate limits to the calls
+    that do reach a provider.  The provider and model are the ones the call
+    resolves to, so a configuration change is a cache miss.  Anything else is
+    forwarded to the wrapped provider service.
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        *,
+        rate_limits: Dict[str, float],
+        cache: Optional[EvalOutputCache],
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._limits = {k: float(v) for k, v in rate_limits.items() if v and float(v) > 0}
+        self._limiters: Dict[str, _RateLimiter] = {}
+        self._active_provider: Optional[str] = None
+        self.cache_hits = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def generate(self, prompt: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        key = ""
+        if self._cache is not None and self._deterministic(context):
+            key = EvalOutputCache.key(prompt, context, *self._binding(context))
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                # Nothing was spent on this call.
+                return {**cached, "tokens_used": 0, "cost_usd": 0.0}
+        limiter = self._limiter_for(context)
+        if limiter is not None:
+            await limiter.acquire()
+        response = await self._inner.generate(prompt, context)
+        if key and response.get("content") is not None:
+            self._cache.put(key, response)
+        return response
+
+    @staticmethod
+    def _deterministic(context: Dict[str, Any]) -> bool:
+        """Only greedy sampling is reproducible; a missing temperature means the provider default."""
+        try:
+            return float(context.get("temperature")) == 0.0
+        except (TypeError, ValueError):
+            return False
+
+    def _binding(self, context: Dict[str, Any]) -> tuple[str, str]:
+        """The (provider, model) this call will actually run on."""
+        try:
+            cfg = ProviderService.get_config()
+        except Exception:
+            cfg = None
+        if cfg is not None:
+            try:
+                provider, model = ProviderService._resolve_effective_provider_and_model(
+                    cfg, dict(context), context.get("task_type") or "default"
+                )
+                entry = cfg.providers.get(provider)
+                return str(provider or ""), str(model or (entry.model if entry else "") or "")
+            except Exception:
+                pass
+        provider = str(context.get("provider") or context.get("selected_provider") or self._active())
+        return provider, str(context.get("model") or context.get("selected_model") or "")
+
+    def _limiter_for(self, context: Dict[str, Any]) -> Optional[_RateLimiter]:
+        if not self._limits:
+            return None
+        provider = str(context.get("provider") or context.get("selected_provider") or self._active())
+        rate = self._limits.get(provider, self._limits.get("*"))
+        if rate is None:
+            return None
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            limiter = self._limiters[provider] = _RateLimiter(rate)
+        return limiter
+
+    def _active(self) -> str:
+        if self._active_provider is None:
+            try:
+                cfg = ProviderService.get_config()
+                self._active_provider = str(getattr(cfg, "active", "") or "default")
+            except Exception:
+                self._active_provider = "default"
+        return self._active_provider
+
+
+class _GateUnreachable(Exception):
+    """Raised by a worker once the remaining cases cannot lift the run over the gate."""
 
 
 class EvalsService:
-    """Regression/evals runner for workflow graphs (Fase 4.4 MVP)."""
+    """Regression/evals runner for workflow graphs (Fase 4.4 MVP).
+
+    Cases run on ``concurrency`` workers; results are reported in dataset
+    order regardless of completion order.  Provider calls go through a shared
+    ``_EvalProvider`` (output cache + per-provider rate limits).
+    """
+
+    DEFAULT_CONCURRENCY = 8
+    _output_cache = EvalOutputCache()
 
     @classmethod
     async def run_regression(
@@ -25,40 +203,58 @@ class EvalsService:
         judge: EvalJudgeConfig,
         gate: EvalGateConfig,
         case_limit: int | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        provider_rate_limits: Dict[str, float] | None = None,
+        early_abort: bool = False,
+        reuse_cached_outputs: bool = False,
+        provider_service: Any = None,
     ) -> EvalRunReport:
         cases = dataset.cases[: int(case_limit)] if case_limit else list(dataset.cases)
-        results: List[EvalCaseResult] = []
+        total = len(cases)
+        slots: List[Optional[EvalCaseResult]] = [None] * total
+        provider = _EvalProvider(
+            provider_service or ProviderService(),
+            rate_limits=dict(provider_rate_limits or {}),
+            cache=cls._output_cache if reuse_cached_outputs else None,
+        )
+        queue = iter(enumerate(cases))
+        tally = {"done": 0, "failed": 0, "score": 0.0}
 
-        for case in cases:
-            engine = GraphEngine(workflow)
-            state = await engine.execute(initial_state=dict(case.input_state))
-            actual_state = dict(state.data)
+        async def _worker() -> None:
+            for index, case in queue:
+                result = await cls._run_case(workflow, case, judge, provider)
+                slots[index] = result
+                tally["done"] += 1
+                tally["failed"] += 0 if result.passed else 1
+                tally["score"] += result.score
+                if early_abort and cls._gate_unreachable(tally, total, gate):
+                    raise _GateUnreachable()
 
-            score, reason = cls._score_case(
-                expected_state=case.expected_state,
-                actual_state=actual_state,
-                judge=judge,
-            )
-            passed = score >= float(case.threshold)
-
-            results.append(
-                EvalCaseResult(
-                    case_id=case.case_id,
-                    passed=passed,
-                    score=round(score, 4),
-                    input_state=dict(case.input_state),
-                    expected_state=dict(case.expected_state),
-                    actual_state=cls._project_actual_state(actual_state, case.expected_state, judge),
-                    reason=reason,
-                )
-            )
+        aborted = False
+        workers = [asyncio.create_task(_worker()) for _ in range(min(max(1, int(concurrency)), total))]
+        if workers:
+            done, _ = await cls._wait_first_error(workers)
+            for task in done:
+                exc = task.exception()
+                if isinstance(exc, _GateUnreachable):
+                    aborted = True
+                elif exc is not None:
+                    raise exc
 
+        results = [item for item in slots if item is not None]
         total_cases = len(results)
         passed_cases = sum(1 for item in results if item.passed)
         failed_cases = total_cases - passed_cases
         pass_rate = (passed_cases / total_cases) if total_cases else 0.0
         avg_score = (sum(item.score for item in results) / total_cases) if total_cases else 0.0
-        gate_passed = pass_rate >= gate.min_pass_rate and avg_score >= gate.min_avg_score
+        gate_passed = (
+            not aborted and pass_rate >= gate.min_pass_rate and avg_score >= gate.min_avg_score
+        )
+        if aborted:
+            logger.info(
+                "Eval run for %s aborted after %d/%d cases: gate %.2f unreachable",
+                workflow.id, total_cases, total, gate.min_pass_rate,
+            )
 
         return EvalRunReport(
             workflow_id=workflow.id,
@@ -70,6 +266,60 @@ class EvalsService:
             gate_passed=gate_passed,
             gate=gate,
             results=results,
+            aborted=aborted,
+            skipped_cases=total - total_cases,
+            cached_outputs=provider.cache_hits,
+        )
+
+    @classmethod
+    async def _run_case(
+        cls,
+        workflow: WorkflowGraph,
+        case: EvalGoldenCase,
+        judge: EvalJudgeConfig,
+        provider: _EvalProvider,
+    ) -> EvalCaseResult:
+        engine = GraphEngine(workflow, provider_service=provider)
+        state = await engine.execute(initial_state=dict(case.input_state))
+        actual_state = dict(state.data)
+
+        score, reason = cls._score_case(
+            expected_state=case.expected_state,
+            actual_state=actual_state,
+            judge=judge,
+        )
+        return EvalCaseResult(
+            case_id=case.case_id,
+            passed=score >= float(case.threshold),
+            score=round(score, 4),
+            input_state=dict(case.input_state),
+            expected_state=dict(case.expected_state),
+            actual_state=cls._project_actual_state(actual_state, case.expected_state, judge),
+            reason=reason,
+        )
+
+    @staticmethod
+    async def _wait_first_error(workers: List[asyncio.Task]) -> tuple[set, set]:
+        """Wait for all workers; on the first exception cancel the rest."""
+        try:
+            done, pending = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return done, pending
+
+    @staticmethod
+    def _gate_unreachable(tally: Dict[str, float], total: int, gate: EvalGateConfig) -> bool:
+        """True when even all-passing remaining cases cannot meet the gate."""
+        remaining = total - tally["done"]
+        best_pass_rate = (total - tally["failed"]) / total
+        best_avg_score = (tally["score"] + remaining) / total
+        return (
+            best_pass_rate + 1e-9 < gate.min_pass_rate
+            or best_avg_score + 1e-9 < gate.min_avg_score
         )
 
     @staticmethod
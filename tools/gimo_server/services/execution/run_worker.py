@@ -2,8 +2,18 @@
 
 The worker polls for runs in ``pending`` status and dispatches them
 to the active LLM provider for execution.  It respects
-``max_concurrent_runs`` from :class:`OpsConfig` and enforces a
-per-run timeout.
+``max_concurrent_runs`` from :class:`OpsConfig` (per worker process) and
+enforces a per-run timeout.
+
+Several worker processes may share one ops store.  A run is started only
+after ``OpsService.claim_run`` leases it to this worker; the lease is
+renewed while the run executes and released when it ends.  A worker that
+dies stops renewing, its leases expire after ``ORCH_RUN_LEASE_TTL``
+seconds and the runs go back to ``pending`` for any worker to pick up.
+
+Admission order: higher ``OpsRun.priority`` first; within a priority
+level, the workspace (``repo_id``) with the fewest leased runs relative to
+its weight in ``OpsConfig.run_share_weights``; then the oldest run.
 
 Lifecycle is managed by the FastAPI lifespan in ``main.py``.
 """
@@ -14,9 +24,11 @@ import asyncio
 import logging
 import os
 import re
+import socket
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from ...ops_models import ExecutorReport
 from ..ops import OpsService
@@ -37,6 +49,55 @@ POLL_INTERVAL = 5
 # heartbeat is older than this many seconds are reclaimed back to `pending`.
 RECLAIM_TIMEOUT_SECONDS = int(os.environ.get("ORCH_RECLAIM_TIMEOUT", "60") or "60")
 
+# Run lease lifetime (seconds). Leases are renewed every third of it, so a
+# crashed worker's runs are reclaimed within one TTL.
+RUN_LEASE_TTL_SECONDS = float(os.environ.get("ORCH_RUN_LEASE_TTL", "30") or "30")
+
+
+def _share_key(run) -> str:
+    """Fair-share bucket of a run: its workspace, or ``default``."""
+    return str(getattr(run, "repo_id", None) or "default")
+
+
+def _admission_order(
+    pending: Iterable[Any],
+    *,
+    active: Dict[str, int],
+    weights: Dict[str, float],
+) -> List[Any]:
+    """Order pending runs for admission.
+
+    Strict priority levels (higher first).  Within a level, each pick goes
+    to the share key with the lowest ``(active + picked) / weight`` — the
+    least-served workspace — and takes its oldest run.  ``active`` counts
+    runs already leased store-wide per share key.
+    """
+    levels: Dict[int, Dict[str, List[Any]]] = {}
+    for run in pending:
+        queues = levels.setdefault(int(getattr(run, "priority", 0) or 0), {})
+        queues.setdefault(_share_key(run), []).append(run)
+
+    load = dict(active)
+    ordered: List[Any] = []
+    for priority in sorted(levels, reverse=True):
+        queues = levels[priority]
+        for queue in queues.values():
+            queue.sort(key=lambda r: getattr(r, "created_at", None) or datetime.min.replace(tzinfo=timezone.utc))
+            queue.reverse()  # pop() yields the oldest
+        while queues:
+            key = min(
+                queues,
+                key=lambda k: (
+                    load.get(k, 0) / max(float(weights.get(k, 1.0) or 1.0), 1e-6),
+                    getattr(queues[k][-1], "created_at", None) or datetime.min.replace(tzinfo=timezone.utc),
+                ),
+            )
+            ordered.append(queues[key].pop())
+            load[key] = load.get(key, 0) + 1
+            if not queues[key]:
+                del queues[key]
+    return ordered
+
 
 def _task_weight_for_run(run) -> "TaskWeight":
     """Infer ResourceGovernor TaskWeight from the run's approved/draft context."""
@@ -64,6 +125,9 @@ class RunWorker:
         self._running = False
         # Strong refs for per-run execution tasks (prevents premature GC).
         self._run_tasks: set[asyncio.Task] = set()
+        # Lease owner identity; unique per worker instance across hosts/processes.
+        self._owner_id = f"{socket.gethostname()}:{os.getpid()}:{os.urandom(3).hex()}"
+        self._last_heartbeat_scan: Optional[float] = None
 
     def _track_run_task(self, task: asyncio.Task) -> None:
         self._run_tasks.add(task)
@@ -115,38 +179,122 @@ class RunWorker:
             if self._is_still_active(rid)
         }
 
-        # R17 Cluster A: reclaim stale `running` runs whose heartbeat is older
-        # than RECLAIM_TIMEOUT_SECONDS. This recovers from worker crashes,
-        # process restarts, and hung executions. All transitions go through
-        # OpsService.update_run_status — no direct DB writes.
+        # Runs whose lease expired (owner crashed, hung or partitioned) go back
+        # to `pending`. Only lease files are read here.
         try:
-            self._reclaim_stale_running_runs()
+            for run_id in list(OpsService.reclaim_expired_run_leases() or []):
+                logger.warning("Reclaimed run %s: lease expired", run_id)
         except Exception:
-            logger.exception("Stale-run reclamation pass failed")
+            logger.exception("Run lease reclamation pass failed")
+
+        # R17 Cluster A: runs started outside the worker (no lease) are still
+        # reclaimed by heartbeat age. That pass reads every run, so it runs at
+        # most once per RECLAIM_TIMEOUT_SECONDS.
+        now = time.monotonic()
+        if self._last_heartbeat_scan is None or now - self._last_heartbeat_scan >= RECLAIM_TIMEOUT_SECONDS:
+            self._last_heartbeat_scan = now
+            try:
+                self._reclaim_stale_running_runs()
+            except Exception:
+                logger.exception("Stale-run reclamation pass failed")
 
         available_slots = max_concurrent - len(self._running_ids)
         if available_slots <= 0:
             return
 
+        pending = [r for r in OpsService.list_pending_runs() if r.id not in self._running_ids]
+        if not pending:
+            return
+        ordered = _admission_order(
+            pending,
+            active=self._active_leases_by_share(),
+            weights=dict(getattr(config, "run_share_weights", None) or {}),
+        )
+
         # Admission control via ResourceGovernor
         try:
             from ..authority import ExecutionAuthority
             authority = ExecutionAuthority.get()
-            from ..resource_governor import AdmissionDecision, TaskWeight
-            pending_preview = OpsService.list_pending_runs()
-            weight = _task_weight_for_run(pending_preview[0]) if pending_preview else TaskWeight.MEDIUM
-            decision = authority.resource_governor.evaluate(weight)
+            from ..resource_governor import AdmissionDecision
+            decision = authority.resource_governor.evaluate(_task_weight_for_run(ordered[0]))
             if decision != AdmissionDecision.ALLOW:
                 logger.info("ResourceGovernor deferred runs (decision=%s)", decision.value)
                 return
         except RuntimeError:
             pass  # Authority not yet initialized
 
-        pending = OpsService.list_pending_runs()
-        for run in pending[:available_slots]:
-            if run.id not in self._running_ids:
-                self._running_ids.add(run.id)
-                self._track_run_task(asyncio.create_task(self._execute_run(run.id)))
+        for run in ordered:
+            if available_slots <= 0:
+                break
+            lease = OpsService.claim_run(
+                run.id,
+                self._owner_id,
+                ttl_seconds=RUN_LEASE_TTL_SECONDS,
+                share_key=_share_key(run),
+            )
+            if not lease:
+                continue  # claimed by another worker since the listing
+            available_slots -= 1
+            self._running_ids.add(run.id)
+            self._track_run_task(asyncio.create_task(self._execute_leased_run(run.id)))
+
+    def _live_leases(self) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        live = []
+        try:
+            leases = list(OpsService.list_run_leases() or [])
+        except Exception:
+            return live
+        for lease in leases:
+            try:
+                if datetime.fromisoformat(str(lease.get("expires_at"))) >= now:
+                    live.append(lease)
+            except (AttributeError, TypeError, ValueError):
+                continue
+        return live
+
+    def _active_leases_by_share(self) -> Dict[str, int]:
+        active: Dict[str, int] = {}
+        for lease in self._live_leases():
+            key = str(lease.get("share_key") or "default")
+            active[key] = active.get(key, 0) + 1
+        return active
+
+    async def _execute_leased_run(self, run_id: str) -> None:
+        """Execute a run this worker has claimed, renewing its lease meanwhile."""
+        execution = asyncio.create_task(self._execute_run(run_id))
+        renewer = asyncio.create_task(self._renew_run_lease(run_id, execution))
+        try:
+            await execution
+        except asyncio.CancelledError:
+            lease_lost = renewer.done() and not renewer.cancelled() and renewer.result()
+            if not lease_lost:
+                raise
+            logger.warning("Execution of run %s stopped after its lease was lost", run_id)
+        finally:
+            renewer.cancel()
+            await asyncio.gather(renewer, return_exceptions=True)
+            try:
+                OpsService.release_run_lease(run_id, self._owner_id)
+            except Exception:
+                logger.warning("Failed to release lease on run %s", run_id, exc_info=True)
+
+    async def _renew_run_lease(self, run_id: str, execution: asyncio.Task) -> bool:
+        """Renew every TTL/3 until *execution* ends; True if the lease was lost."""
+        interval = max(RUN_LEASE_TTL_SECONDS / 3, 0.05)
+        while not execution.done():
+            await asyncio.sleep(interval)
+            try:
+                renewed = OpsService.renew_run_lease(run_id, self._owner_id, ttl_seconds=RUN_LEASE_TTL_SECONDS)
+            except Exception:
+                logger.warning("Lease renewal failed for run %s", run_id, exc_info=True)
+                continue
+            if not renewed and not execution.done():
+                # Another worker may already own the run: stop, never double-execute.
+                logger.error("Lost lease on run %s; cancelling local execution", run_id)
+                execution.cancel()
+                return True
+        return False
 
     def _reclaim_stale_running_runs(self) -> None:
         """R17 Cluster A: transition stale `running` runs back to `pending`.
@@ -154,7 +302,8 @@ class RunWorker:
         A run is considered stale if its ``heartbeat_at`` (or ``started_at``
         when no heartbeat exists yet) is older than ``RECLAIM_TIMEOUT_SECONDS``
         AND it is not currently being executed by this worker (not in
-        ``self._running_ids``). All transitions flow through
+        ``self._running_ids``) nor under a live lease — leased runs are
+        reclaimed on lease expiry instead. All transitions flow through
         ``OpsService.update_run_status`` — no direct DB writes.
         """
         now = datetime.now(timezone.utc)
@@ -163,9 +312,10 @@ class RunWorker:
             runs_iter = list(runs) if runs is not None else []
         except Exception:
             return
+        leased = {lease.get("run_id") for lease in self._live_leases()}
         for run in runs_iter:
-            if run.id in self._running_ids:
-                continue  # this worker owns it; do not reclaim
+            if run.id in self._running_ids or run.id in leased:
+                continue  # owned by this or another live worker; do not reclaim
             heartbeat = getattr(run, "heartbeat_at", None) or getattr(run, "started_at", None)
             if heartbeat is None:
                 # No heartbeat AND no start timestamp — fall back to created_at
@@ -416,13 +566,23 @@ class RunWorker:
             msg=f"Child {child_run_id} completed ({child_run.status}). Remaining: {remaining}")
 
         if remaining == 0:
-            OpsService.update_run_status(fresh.id, "running", msg="All child runs completed. Resuming.")
+            lease = OpsService.claim_run(
+                fresh.id,
+                self._owner_id,
+                ttl_seconds=RUN_LEASE_TTL_SECONDS,
+                share_key=_share_key(fresh),
+                from_statuses=("awaiting_subagents", "running"),
+                msg="All child runs completed. Resuming.",
+            )
+            if not lease:
+                logger.info("Parent run %s not resumed here: not awaiting or leased elsewhere", fresh.id)
+                return
             await NotificationService.publish("all_children_completed", {
                 "parent_run_id": fresh.id,
                 "critical": True,
             })
             self._running_ids.add(fresh.id)
-            self._track_run_task(asyncio.create_task(self._execute_run(fresh.id)))
+            self._track_run_task(asyncio.create_task(self._execute_leased_run(fresh.id)))
 
     def _validate_task_spec(self, spec: Any) -> tuple[bool, str]:
         """Strict validation of the Phase 5B task specification using Pydantic."""
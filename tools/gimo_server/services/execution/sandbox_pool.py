@@ -0,0 +1,294 @@
+"""Pool of ready git sandboxes sharing the source repository's object store.
+
+``EphemeralRepoService`` makes a full ``git clone --local`` plus checkout for
+every run; on a large repository that setup dominates short runs and every
+concurrent run pays the full working-tree size on disk again.
+
+Pooled sandboxes are ``git clone --shared --no-checkout`` clones (objects
+are read through ``objects/info/alternates``, nothing is copied) kept under
+``<ephemeral_repos_dir>/_pool/<repo-key>/<slot>``.  Checkout resets a slot to
+the requested base commit with ``checkout -f -B`` + ``clean -ffdx``, which
+only rewrites files that differ from the previous run.  Release recycles the
+slot unless the pool already holds ``max_idle`` idle slots for that repo or
+the run tampered with ``.git/config`` / hooks, in which case it is destroyed.
+At most ``max_size`` slots per repo are pooled; acquisitions beyond that get
+an overflow sandbox that is destroyed on release instead of blocking (plan
+nodes that fail keep their sandbox for manual review indefinitely).
+
+All git calls are async (``GitService._run_git_async``).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..git_service import GitService, _sanitize_git_ref
+
+logger = logging.getLogger("orchestrator.services.sandbox_pool")
+
+
+@dataclass
+class _Slot:
+    path: Path
+    source: Path
+    fingerprint: str
+    in_use: bool = False
+    overflow: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+    runs: int = 0
+
+
+@dataclass
+class _RepoPool:
+    source: Path
+    root: Path
+    slots: List[_Slot] = field(default_factory=list)
+    next_index: int = 0
+
+
+class SandboxPool:
+    """Per-source-repo pool of reusable shared clones."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_size: int = 8,
+        max_idle: int = 4,
+        idle_ttl_seconds: float = 900.0,
+    ) -> None:
+        self.root = Path(root)
+        self.max_size = max(1, int(max_size))
+        self.max_idle = max(0, int(max_idle))
+        self.idle_ttl_seconds = float(idle_ttl_seconds)
+        self._repos: Dict[str, _RepoPool] = {}
+        self._by_path: Dict[Path, _Slot] = {}
+        self._lock = asyncio.Lock()
+        self.metrics: Dict[str, int] = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "destroyed": 0,
+            "tampered": 0,
+            "overflow": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def acquire(self, source_repo: Path, base_ref: str, *, branch_name: str) -> Path:
+        """Return a sandbox checked out at *base_ref* on a fresh *branch_name*."""
+        source = Path(source_repo).resolve()
+        branch = _sanitize_git_ref(branch_name)
+        commit = await self._resolve_commit(source, base_ref)
+        repo = self._repo(source)
+        slot = await self._checkout_slot(repo)
+        try:
+            await self._reset(slot.path, commit, branch)
+        except BaseException:
+            self._destroy(slot, repo)
+            raise
+        # Snapshot what the run is handed; release compares against it.
+        slot.fingerprint = _fingerprint(slot.path)
+        slot.runs += 1
+        return slot.path
+
+    def release(self, sandbox_path: Path, *, reusable: bool = True) -> bool:
+        """Return a sandbox to the pool (sync — cheap bookkeeping only).
+
+        The expensive reset happens lazily on the next ``acquire``.  Returns
+        ``False`` when *sandbox_path* is not a pooled sandbox.
+        """
+        slot = self._by_path.get(Path(sandbox_path).resolve())
+        if slot is None or not slot.in_use:
+            return False
+        repo = self._repo(slot.source)
+        slot.in_use = False
+        slot.last_used = time.monotonic()
+        idle = sum(1 for s in repo.slots if not s.in_use)
+        tampered = reusable and slot.path.exists() and _fingerprint(slot.path) != slot.fingerprint
+        if tampered:
+            self.metrics["tampered"] += 1
+            logger.warning("Sandbox %s modified git config/hooks; destroying", slot.path)
+        if (
+            not reusable
+            or tampered
+            or slot.overflow
+            or not slot.path.exists()
+            or idle > self.max_idle
+        ):
+            self._destroy(slot, repo)
+        else:
+            self.metrics["recycled"] += 1
+        self._expire_idle(repo)
+        return True
+
+    def is_pooled(self, sandbox_path: Path) -> bool:
+        return Path(sandbox_path).resolve() in self._by_path
+
+    async def prewarm(self, source_repo: Path, count: int) -> int:
+        """Create up to *count* idle sandboxes ahead of demand."""
+        source = Path(source_repo).resolve()
+        repo = self._repo(source)
+        created = 0
+        while created < count and len(repo.slots) < min(self.max_size, self.max_idle):
+            async with self._lock:
+                slot = self._new_slot(repo)
+            await self._materialize(slot, repo)
+            slot.in_use = False
+            created += 1
+        return created
+
+    def close(self) -> None:
+        """Destroy every idle sandbox."""
+        for repo in list(self._repos.values()):
+            for slot in [s for s in repo.slots if not s.in_use]:
+                self._destroy(slot, repo)
+
+    def stats(self) -> Dict[str, Any]:
+        slots = [s for repo in self._repos.values() for s in repo.slots]
+        return {
+            **self.metrics,
+            "repos": len(self._repos),
+            "in_use": sum(1 for s in slots if s.in_use),
+            "idle": sum(1 for s in slots if not s.in_use),
+            "max_size": self.max_size,
+            "max_idle": self.max_idle,
+        }
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _repo(self, source: Path) -> _RepoPool:
+        key = hashlib.sha256(str(source).encode("utf-8", errors="ignore")).hexdigest()[:12]
+        repo = self._repos.get(key)
+        if repo is None:
+            repo = _RepoPool(source=source, root=self.root / key)
+            self._repos[key] = repo
+        return repo
+
+    async def _resolve_commit(self, source: Path, base_ref: str) -> str:
+        ref = _sanitize_git_ref(base_ref)
+        code, out, err = await GitService._run_git_async(
+            source, ["rev-parse", "--verify", f"{ref}^{{commit}}"]
+        )
+        if code != 0:
+            raise RuntimeError(f"Git rev-parse error for {ref}: {err or out}")
+        return out
+
+    async def _checkout_slot(self, repo: _RepoPool) -> _Slot:
+        async with self._lock:
+            self._expire_idle(repo)
+            # Most recently used first: its page cache is warmest.
+            idle = sorted((s for s in repo.slots if not s.in_use), key=lambda s: s.last_used)
+            while idle:
+                slot = idle.pop()
+                if slot.path.exists():
+                    slot.in_use = True
+                    self.metrics["reused"] += 1
+                    return slot
+                self._destroy(slot, repo)  # purged underneath us
+            slot = self._new_slot(repo)
+            if sum(1 for s in repo.slots if not s.overflow) > self.max_size:
+                slot.overflow = True
+                self.metrics["overflow"] += 1
+        await self._materialize(slot, repo)
+        return slot
+
+    def _new_slot(self, repo: _RepoPool) -> _Slot:
+        """Reserve a slot (caller holds ``_lock``); the clone happens outside the lock."""
+        repo.next_index += 1
+        slot = _Slot(
+            path=repo.root / f"s{repo.next_index:04d}",
+            source=repo.source,
+            fingerprint="",
+            in_use=True,
+        )
+        repo.slots.append(slot)
+        return slot
+
+    async def _materialize(self, slot: _Slot, repo: _RepoPool) -> None:
+        try:
+            await self._clone(repo.source, slot.path)
+        except Exception:
+            self._destroy(slot, repo)
+            raise
+        self._by_path[slot.path.resolve()] = slot
+        self.metrics["created"] += 1
+
+    async def _clone(self, source: Path, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            await asyncio.to_thread(_rmtree, target)
+        code, out, err = await GitService._run_git_async(
+            target.parent, ["clone", "--shared", "--no-checkout", "--quiet", str(source), str(target)]
+        )
+        if code != 0:
+            raise RuntimeError(f"Git shared clone error: {err or out}")
+
+    async def _reset(self, path: Path, commit: str, branch: str) -> None:
+        for args in (
+            ["checkout", "--quiet", "-f", "-B", branch, commit],
+            ["clean", "-ffdxq"],
+        ):
+            code, out, err = await GitService._run_git_async(path, args)
+            if code != 0:
+                raise RuntimeError(f"Git sandbox reset error ({args[0]}): {err or out}")
+        # Drop branches left by earlier runs so their commits don't pile up.
+        code, out, _ = await GitService._run_git_async(
+            path, ["for-each-ref", "--format=%(refname:short)", "refs/heads"]
+        )
+        stale = [name for name in out.splitlines() if name and name != branch] if code == 0 else []
+        if stale:
+            await GitService._run_git_async(path, ["branch", "-D", *stale])
+
+    def _expire_idle(self, repo: _RepoPool) -> None:
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        for slot in [s for s in repo.slots if not s.in_use and s.last_used < cutoff]:
+            self._destroy(slot, repo)
+
+    def _destroy(self, slot: _Slot, repo: _RepoPool) -> None:
+        if slot in repo.slots:
+            repo.slots.remove(slot)
+        self._by_path.pop(slot.path.resolve(), None)
+        self.metrics["destroyed"] += 1
+        if not slot.path.exists():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _rmtree(slot.path)
+            return
+        loop.run_in_executor(None, _rmtree, slot.path)
+
+
+def _fingerprint(path: Path) -> str:
+    """Digest of the bits of ``.git`` a run could use to persist code across runs."""
+    git_dir = path / ".git"
+    digest = hashlib.sha256()
+    try:
+        digest.update((git_dir / "config").read_bytes())
+    except OSError:
+        pass
+    hooks = git_dir / "hooks"
+    if hooks.is_dir():
+        for hook in sorted(hooks.iterdir()):
+            if hook.suffix != ".sample":
+                digest.update(hook.name.encode())
+                try:
+                    digest.update(hook.read_bytes())
+                except OSError:
+                    pass
+    return digest.hexdigest()
+
+
+def _rmtree(path: Path) -> None:
+    shutil.rmtree(path, ignore_errors=True)
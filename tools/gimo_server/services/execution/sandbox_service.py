@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import hashlib
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from ...config import get_settings
 from ..ephemeral_repo_service import EphemeralRepoService
+from .sandbox_pool import SandboxPool
 
 logger = logging.getLogger("orchestrator.services.sandbox_service")
 
@@ -18,11 +22,28 @@ class SandboxHandle:
     worktree_path: Path
     branch_name: str
     base_ref: str
+    pooled: bool = False
 
 
 class SandboxService:
     """Provision isolated execution sandboxes without mutating the source repo."""
     BASE_WORKTREE_PATH: Path = get_settings().ephemeral_repos_dir
+    _pool: Optional[SandboxPool] = None
+
+    @classmethod
+    def pool_enabled(cls) -> bool:
+        """Opt-in via ``ORCH_SANDBOX_POOL=1`` (shared-clone pool instead of per-run clones)."""
+        return os.environ.get("ORCH_SANDBOX_POOL", "").strip().lower() in {"1", "true", "yes", "on"}
+
+    @classmethod
+    def get_pool(cls) -> SandboxPool:
+        if cls._pool is None:
+            cls._pool = SandboxPool(
+                get_settings().ephemeral_repos_dir / "_pool",
+                max_size=int(os.environ.get("ORCH_SANDBOX_POOL_SIZE", "8")),
+                max_idle=int(os.environ.get("ORCH_SANDBOX_POOL_MAX_IDLE", "4")),
+            )
+        return cls._pool
 
     @classmethod
     def _workspace_id(cls, run_id: str) -> str:
@@ -68,6 +89,30 @@ class SandboxService:
             base_ref=base_ref,
         )
 
+    @classmethod
+    async def acquire_worktree_handle(
+        cls, run_id: str, repo_path: str, base_ref: str = "main"
+    ) -> SandboxHandle:
+        """Async variant of ``create_worktree_handle`` that draws from the sandbox pool.
+
+        Falls back to a per-run ephemeral clone, made in a worker thread, when
+        the pool is disabled.
+        """
+        if not cls.pool_enabled():
+            return await asyncio.to_thread(cls.create_worktree_handle, run_id, repo_path, base_ref=base_ref)
+        repo_root = Path(repo_path).resolve()
+        branch_name = cls._branch_name(run_id)
+        workspace_path = await cls.get_pool().acquire(repo_root, base_ref, branch_name=branch_name)
+        logger.info("Sandbox acquired for %s at %s [pooled shared clone]", run_id, workspace_path)
+        return SandboxHandle(
+            run_id=run_id,
+            repo_path=str(repo_root),
+            worktree_path=workspace_path,
+            branch_name=branch_name,
+            base_ref=base_ref,
+            pooled=True,
+        )
+
     @classmethod
     def cleanup_worktree(cls, handle: SandboxHandle) -> bool:
         try:
@@ -83,6 +128,11 @@ class SandboxService:
                 )
                 return False
 
+            if getattr(handle, "pooled", False) and cls._pool is not None:
+                if cls._pool.release(workspace_path):
+                    logger.info("Sandbox %s returned to pool.", handle.run_id)
+                    return True
+
             cls._ephemeral_repo_service().destroy_workspace(workspace_path)
             logger.info("Sandbox %s cleaned up successfully [ephemeral clone].", handle.run_id)
             return True
@@ -0,0 +1,210 @@
+"""Merge gate check support: result cache and affected-test selection.
+
+Check results (pytest, ruff, mypy, compileall) are a pure function of the
+workspace contents, the exact command line and the toolchain that ran it, so
+a passing result is cached under::
+
+    (tree hash, argv, toolchain fingerprint)
+
+The tree hash is the git tree id of the working tree including uncommitted
+and untracked files (see ``GitService.worktree_tree_hash_async``).  Only
+passing results are cached: a failing check is rerun on the next gate so a
+flaky test can recover on retry.
+
+``select_affected_tests`` narrows the pytest run to the test files that
+touch the changed paths.  It is deliberately conservative: any change it
+cannot map (config files, non-Python assets, a module with no matching test)
+returns ``None``, meaning "run the full suite".
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import logging
+import os
+import re
+import shutil
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("orchestrator.gate_checks")
+
+CheckKey = Tuple[str, Tuple[str, ...], str]
+
+# Tools whose version changes what a check reports.
+_TOOLCHAIN_DISTS = ("pytest", "ruff", "mypy")
+_TOOLCHAIN_TTL_SECONDS = 60.0
+_toolchain_memo: Tuple[float, str] = (0.0, "")
+
+# Changing any of these can affect every test.
+_FULL_SUITE_TRIGGERS = frozenset({
+    "conftest.py", "pyproject.toml", "setup.cfg", "setup.py", "pytest.ini",
+    "tox.ini", "noxfile.py", "Pipfile", "Pipfile.lock", "poetry.lock",
+})
+# Non-Python files that never affect test outcomes.
+_INERT_SUFFIXES = frozenset({".md", ".rst", ".png", ".jpg", ".jpeg", ".gif", ".svg"})
+_SKIP_DIRS = frozenset({
+    ".git", "__pycache__", ".venv", "venv", "node_modules", ".tox", ".mypy_cache",
+    ".pytest_cache", ".ruff_cache", "site-packages", "build", "dist",
+})
+
+
+def toolchain_fingerprint() -> str:
+    """Digest of the interpreter and check tool versions (memoised for a minute)."""
+    global _toolchain_memo
+    now = time.monotonic()
+    computed_at, value = _toolchain_memo
+    if value and now - computed_at < _TOOLCHAIN_TTL_SECONDS:
+        return value
+    parts: List[str] = [sys.version]
+    python = shutil.which("python")
+    if python:
+        real = os.path.realpath(python)
+        try:
+            st = os.stat(real)
+            parts.append(f"{real}:{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(real)
+    for dist in _TOOLCHAIN_DISTS:
+        try:
+            parts.append(f"{dist}={importlib.metadata.version(dist)}")
+        except importlib.metadata.PackageNotFoundError:
+            parts.append(f"{dist}=-")
+    value = hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+    _toolchain_memo = (now, value)
+    return value
+
+
+def check_key(tree_hash: str, argv: Iterable[str]) -> CheckKey:
+    return (tree_hash, tuple(argv), toolchain_fingerprint())
+
+
+class CheckResultCache:
+    """Bounded LRU of passing check outputs with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[CheckKey, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CheckKey) -> Optional[str]:
+        output = self._entries.get(key)
+        if output is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return output
+
+    def put(self, key: CheckKey, output: str) -> None:
+        self._entries[key] = output
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+CHECK_CACHE = CheckResultCache()
+
+
+def _is_test_file(name: str) -> bool:
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def _discover_test_files(base_dir: Path) -> List[str]:
+    found: List[str] = []
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = [d for d in dirs if d not in _SKIP_DIRS and not d.endswith(".egg-info")]
+        for name in files:
+            if _is_test_file(name):
+                found.append(Path(root, name).relative_to(base_dir).as_posix())
+    return sorted(found)
+
+
+def _module_matchers(rel_path: str) -> Tuple[str, List[re.Pattern[str]]]:
+    """Return (stem, patterns) that identify a test importing *rel_path*."""
+    parts = list(PurePosixPath(rel_path).with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    stem = parts[-1] if parts else ""
+    patterns: List[re.Pattern[str]] = []
+    if len(parts) == 1:
+        patterns.append(re.compile(rf"^\s*(?:import|from)\s+{re.escape(stem)}\b", re.M))
+    # Dotted suffixes with at least two components cover src-layouts and
+    # tests that import the package by a shorter root.
+    for start in range(len(parts) - 1):
+        dotted = ".".join(parts[start:])
+        parent = ".".join(parts[start:-1])
+        patterns.append(re.compile(rf"(?<![\w.]){re.escape(dotted)}\b"))
+        # ``from pkg.sub import module`` (single line or parenthesised)
+        patterns.append(re.compile(
+            rf"from\s+{re.escape(parent)}\s+import\s+(?:\([^)]*|[^\n]*)\b{re.escape(stem)}\b"
+        ))
+    return stem, patterns
+
+
+def select_affected_tests(base_dir: Path, changed_paths: Iterable[str]) -> Optional[List[str]]:
+    """Test files (repo-relative) affected by *changed_paths*, or ``None`` for the full suite."""
+    base_dir = Path(base_dir)
+    changed = sorted({p.replace("\\", "/").strip() for p in changed_paths if p and p.strip()})
+    if not changed:
+        return None
+
+    selected: Set[str] = set()
+    modules: List[str] = []
+    for rel in changed:
+        name = PurePosixPath(rel).name
+        if name in _FULL_SUITE_TRIGGERS or name.startswith("requirements"):
+            return None
+        suffix = PurePosixPath(rel).suffix.lower()
+        if suffix != ".py":
+            if suffix in _INERT_SUFFIXES:
+                continue
+            return None  # fixtures, templates, data: could be read by any test
+        if _is_test_file(name):
+            if (base_dir / rel).is_file():
+                selected.add(rel)
+            continue
+        modules.append(rel)
+
+    if modules:
+        test_files = _discover_test_files(base_dir)
+        sources: Dict[str, str] = {}
+        for rel in test_files:
+            try:
+                sources[rel] = (base_dir / rel).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                sources[rel] = ""
+        for module in modules:
+            stem, patterns = _module_matchers(module)
+            hits = {
+                rel for rel in test_files
+                if PurePosixPath(rel).name in (f"test_{stem}.py", f"{stem}_test.py")
+                or any(p.search(sources[rel]) for p in patterns)
+            }
+            if not hits:
+                logger.debug("No test maps to %s; falling back to the full suite", module)
+                return None
+            selected |= hits
+
+    return sorted(selected) or None
@@ -1,10 +1,15 @@
+import asyncio
+import os
 import re
+import shutil
 import subprocess
 import importlib.util
+import tempfile
 from pathlib import Path
 from typing import Optional
 
 from tools.gimo_server.config import SUBPROCESS_TIMEOUT
+from tools.gimo_server.services.gate_checks import CHECK_CACHE, check_key
 
 # Pattern for valid git ref names (branch, tag, commit hash)
 _VALID_GIT_REF = re.compile(r"^[a-zA-Z0-9_.\-/]+$")
@@ -169,6 +174,52 @@ class GitService:
         stdout, stderr = process.communicate(timeout=timeout or SUBPROCESS_TIMEOUT)
         return process.returncode, stdout.strip(), stderr.strip()
 
+    @staticmethod
+    async def _run_command_async(
+        base_dir: Path,
+        argv: list[str],
+        *,
+        timeout: Optional[float] = None,
+        env: Optional[dict[str, str]] = None,
+    ) -> tuple[int, str, str]:
+        """Run *argv* in *base_dir* without blocking the loop.
+
+        The child is killed when the timeout expires or the caller is cancelled.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=base_dir,
+            env=env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(), timeout=timeout or SUBPROCESS_TIMEOUT
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            raise
+        return (
+            process.returncode,
+            stdout.decode("utf-8", errors="replace").strip(),
+            stderr.decode("utf-8", errors="replace").strip(),
+        )
+
+    @staticmethod
+    async def _run_git_async(
+        base_dir: Path,
+        args: list[str],
+        *,
+        timeout: Optional[float] = None,
+        env: Optional[dict[str, str]] = None,
+    ) -> tuple[int, str, str]:
+        """Non-blocking ``_run_git`` for callers on the event loop."""
+        return await GitService._run_command_async(base_dir, ["git", *args], timeout=timeout, env=env)
+
     @staticmethod
     def get_head_commit(base_dir: Path) -> str:
         code, out, err = GitService._run_git(base_dir, ["rev-parse", "HEAD"])
@@ -351,6 +402,141 @@ class GitService:
             return False, err or out
         return True, out
 
+    # ------------------------------------------------------------------
+    # Async gate checks (merge gate runs these concurrently)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def worktree_tree_hash_async(base_dir: Path) -> Optional[str]:
+        """Git tree id of the working tree, including uncommitted and untracked files.
+
+        Staged into a throwaway copy of the index so the real index is untouched.
+        Returns ``None`` when *base_dir* is not a git work tree.
+        """
+        try:
+            code, index_path, _ = await GitService._run_git_async(
+                base_dir, ["rev-parse", "--git-path", "index"]
+            )
+            if code != 0 or not index_path:
+                return None
+            index = Path(index_path)
+            if not index.is_absolute():
+                index = Path(base_dir) / index
+            with tempfile.TemporaryDirectory(prefix="gimo-tree-") as tmp:
+                tmp_index = Path(tmp) / "index"
+                if index.exists():
+                    # Keeps the stat cache, so ``add -A`` only hashes changed files.
+                    shutil.copyfile(index, tmp_index)
+                env = {**os.environ, "GIT_INDEX_FILE": str(tmp_index)}
+                code, _, _ = await GitService._run_git_async(base_dir, ["add", "-A"], env=env)
+                if code != 0:
+                    return None
+                code, out, _ = await GitService._run_git_async(base_dir, ["write-tree"], env=env)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        return out if code == 0 and out else None
+
+    @staticmethod
+    async def changed_paths_async(base_dir: Path, base_ref: str) -> Optional[list[str]]:
+        """Paths that differ between *base_ref* and the working tree (plus untracked files).
+
+        Returns ``None`` when *base_ref* cannot be resolved in *base_dir*.
+        """
+        ref = _sanitize_git_ref(base_ref)
+        try:
+            code, out, _ = await GitService._run_git_async(base_dir, ["diff", "--name-only", ref, "--"])
+            if code != 0:
+                return None
+            code_u, untracked, _ = await GitService._run_git_async(
+                base_dir, ["ls-files", "--others", "--exclude-standard"]
+            )
+        except (OSError, asyncio.TimeoutError):
+            return None
+        if code_u != 0:
+            return None
+        return sorted({line for line in (out + "\n" + untracked).splitlines() if line.strip()})
+
+    @staticmethod
+    async def _run_check_async(
+        base_dir: Path,
+        argv: list[str],
+        *,
+        timeout: float,
+        tree_hash: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """Run one check command; passing results are cached per (tree, argv, toolchain)."""
+        key = check_key(tree_hash, argv) if tree_hash else None
+        if key is not None:
+            cached = CHECK_CACHE.get(key)
+            if cached is not None:
+                return True, cached
+        try:
+            code, out, err = await GitService._run_command_async(base_dir, argv, timeout=timeout)
+        except asyncio.TimeoutError:
+            return False, f"{' '.join(argv)} timed out after {timeout:g}s"
+        output = (out + ("\n" + err if err else "")).strip()
+        if code == 0 and key is not None:
+            CHECK_CACHE.put(key, output)
+        return code == 0, output
+
+    @staticmethod
+    async def run_tests_async(
+        base_dir: Path,
+        *,
+        test_paths: Optional[list[str]] = None,
+        tree_hash: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> tuple[bool, str]:
+        argv = ["python", "-m", "pytest", "-q", *(test_paths or [])]
+        return await GitService._run_check_async(
+            base_dir, argv, timeout=timeout or max(SUBPROCESS_TIMEOUT, 120), tree_hash=tree_hash
+        )
+
+    @staticmethod
+    async def run_lint_typecheck_async(
+        base_dir: Path,
+        *,
+        tree_hash: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> tuple[bool, str]:
+        """Async ``run_lint_typecheck``: ruff and mypy run side by side."""
+        outputs: list[str] = []
+        commands: list[list[str]] = []
+        if importlib.util.find_spec("ruff") is not None:
+            commands.append(["python", "-m", "ruff", "check", "."])
+        else:
+            outputs.append("ruff not installed; lint gate skipped")
+        if importlib.util.find_spec("mypy") is not None:
+            commands.append(["python", "-m", "mypy", "tools/gimo_server"])
+        else:
+            outputs.append("mypy not installed; typecheck gate skipped")
+        if not commands:
+            commands.append(["python", "-m", "compileall", "-q", "tools/gimo_server"])
+        results = await asyncio.gather(*(
+            GitService._run_check_async(
+                base_dir, argv, timeout=timeout or max(SUBPROCESS_TIMEOUT, 120), tree_hash=tree_hash
+            )
+            for argv in commands
+        ))
+        outputs.extend(out for _, out in results)
+        return all(ok for ok, _ in results), "\n".join(outputs).strip()
+
+    @staticmethod
+    async def dry_run_merge_async(
+        base_dir: Path, source_ref: str, target_ref: str, *, timeout: Optional[float] = None
+    ) -> tuple[bool, str]:
+        src = _sanitize_git_ref(source_ref)
+        tgt = _sanitize_git_ref(target_ref)
+        try:
+            code, out, err = await GitService._run_git_async(
+                base_dir, ["merge-tree", tgt, src], timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            return False, f"git merge-tree timed out after {timeout or SUBPROCESS_TIMEOUT:g}s"
+        if code != 0:
+            return False, err or out
+        return True, out
+
     @staticmethod
     def perform_merge(base_dir: Path, source_ref: str, target_ref: str) -> tuple[bool, str]:
         src = _sanitize_git_ref(source_ref)
@@ -0,0 +1,425 @@
+"""Process-wide governance state for ``SagpGateway.evaluate_action``.
+
+A verdict used to build two ``TrustEngine`` instances (each listing and
+folding up to 5000 trust events from GICS), resolve pricing and scan +
+write the thread's proof chain before returning.  Here:
+
+- :class:`GovernanceState` holds trust records (score, circuit state) per
+  dimension, per-(policy, tool) decisions and per-model pricing.  Trust
+  records are refolded off the request path: ``TrustStorage`` reports every
+  saved trust event through ``on_trust_event``, which wakes a background
+  refresher (coalescing bursts for ``REFRESH_COALESCE_S``).  A snapshot
+  older than ``ORCH_GOVERNANCE_SNAPSHOT_TTL_S`` (default 5 s) is refreshed
+  as well, which covers writers in other processes and time-driven circuit
+  transitions (open -> half_open after cooldown).  Only the first read of a
+  dimension folds synchronously.
+- :class:`ProofPipeline` persists pre-action proofs from one writer thread
+  in submission order.  The proof id is reserved up front and returned with
+  the verdict; failed writes stay queued and are retried.  Readers of a
+  chain call ``flush(thread_id)`` first, which writes that chain's backlog
+  inline, so they never see it without proofs already handed out.  The
+  writer keeps each thread's chain tail, so an append does not rescan the
+  chain; other in-process writers call ``forget`` after appending, and a
+  tail older than the snapshot TTL is re-read (writers in other processes).
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("orchestrator.governance_state")
+
+# Dimensions every verdict or snapshot reads; folded together on refresh.
+DEFAULT_DIMENSIONS = ("provider", "model", "tool")
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(os.environ.get("ORCH_GOVERNANCE_SNAPSHOT_TTL_S", "5"))
+    except ValueError:
+        return 5.0
+
+
+def _shared_gics() -> Any:
+    from .storage_service import StorageService
+
+    return StorageService._shared_gics
+
+
+@dataclass(frozen=True)
+class ToolDecision:
+    """Static part of a verdict for one (policy, tool)."""
+    policy_name: str
+    tool_allowed: bool
+    denial_reason: str
+    risk_band: str
+    requires_approval: bool
+    fs_mode: str
+
+
+class GovernanceState:
+    """In-memory trust records, policy decisions and pricing."""
+
+    REFRESH_COALESCE_S = 0.01
+
+    _lock = threading.Lock()
+    _backing_id: Optional[int] = None
+    _records: Dict[str, Dict[str, Any]] = {}
+    _dimensions: set = set(DEFAULT_DIMENSIONS)
+    _refreshed_at = 0.0
+    _generation = 0
+    _dirty = threading.Event()
+    _refresher: Optional[threading.Thread] = None
+    _tool_decisions: Dict[Tuple[str, str], ToolDecision] = {}
+    _pricing: Dict[str, Dict[str, float]] = {}
+    _pricing_registry_id: Optional[int] = None
+    refreshes = 0
+
+    # ------------------------------------------------------------------
+    # Trust
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def trust_record(cls, dimension_key: str) -> Dict[str, Any]:
+        cls._check_backing()
+        record = cls._records.get(dimension_key)
+        if record is None:
+            with cls._lock:
+                cls._dimensions.add(dimension_key)
+            cls.refresh()
+            record = cls._records.get(dimension_key) or {}
+        elif time.monotonic() - cls._refreshed_at >= _ttl_seconds():
+            cls._request_refresh()
+        return record
+
+    @classmethod
+    def trust_score(cls, dimension_key: str) -> float:
+        return float(cls.trust_record(dimension_key).get("score", 0.85))
+
+    @classmethod
+    def circuit_state(cls, dimension_key: str = "provider") -> str:
+        return str(cls.trust_record(dimension_key).get("circuit_state", "closed"))
+
+    @classmethod
+    def on_trust_event(cls, event: Dict[str, Any]) -> None:
+        """A trust event was saved: refold its dimension soon (not inline)."""
+        dimension_key = str(event.get("dimension_key") or "")
+        if dimension_key and dimension_key not in cls._dimensions:
+            return  # nobody reads it yet; first read folds it
+        cls._request_refresh()
+
+    @classmethod
+    def refresh(cls) -> None:
+        """Fold trust events once for every tracked dimension; blocking."""
+        from .storage.trust_storage import TrustStorage
+        from .trust_engine import TrustEngine
+
+        with cls._lock:
+            dimensions = sorted(cls._dimensions)
+            generation = cls._generation
+        engine = TrustEngine(trust_store=TrustStorage(gics_service=_shared_gics()))
+        try:
+            records = engine.query_dimensions(dimensions)
+        except Exception:
+            logger.warning("Governance snapshot refresh failed", exc_info=True)
+            records = {key: TrustEngine._empty_record(key) for key in dimensions}
+        with cls._lock:
+            if generation != cls._generation:
+                return  # reset meanwhile
+            cls._records = {**cls._records, **records}
+            cls._refreshed_at = time.monotonic()
+            cls.refreshes += 1
+
+    @classmethod
+    def _request_refresh(cls) -> None:
+        cls._dirty.set()
+        if cls._refresher is None or not cls._refresher.is_alive():
+            with cls._lock:
+                if cls._refresher is None or not cls._refresher.is_alive():
+                    cls._refresher = threading.Thread(
+                        target=cls._refresh_loop, name="governance-state-refresh", daemon=True,
+                    )
+                    cls._refresher.start()
+
+    @classmethod
+    def _refresh_loop(cls) -> None:
+        while True:
+            if not cls._dirty.wait(timeout=60.0):
+                return  # idle: the next request starts a new refresher
+            time.sleep(cls.REFRESH_COALESCE_S)
+            cls._dirty.clear()
+            try:
+                cls.refresh()
+            except Exception:  # noqa: BLE001
+                logger.warning("Governance snapshot refresh failed", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Policy and pricing
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def tool_decision(cls, policy_name: str, tool_name: str) -> ToolDecision:
+        key = (policy_name, tool_name)
+        decision = cls._tool_decisions.get(key)
+        if decision is not None:
+            return decision
+        from ..engine.tools.chat_tools_schema import get_tool_risk_level
+        from .execution.execution_policy_service import EXECUTION_POLICIES
+
+        policy = EXECUTION_POLICIES.get(policy_name, EXECUTION_POLICIES["workspace_safe"])
+        tool_allowed, denial_reason = True, ""
+        try:
+            policy.assert_tool_allowed(tool_name)
+        except PermissionError as exc:
+            tool_allowed, denial_reason = False, str(exc)
+        risk_band = get_tool_risk_level(tool_name).lower()
+        decision = ToolDecision(
+            policy_name=policy_name,
+            tool_allowed=tool_allowed,
+            denial_reason=denial_reason,
+            risk_band=risk_band,
+            requires_approval=tool_name in policy.requires_confirmation or risk_band == "high",
+            fs_mode=str(policy.fs_mode),
+        )
+        with cls._lock:
+            cls._tool_decisions[key] = decision
+        return decision
+
+    @classmethod
+    def pricing(cls, model: str) -> Dict[str, float]:
+        from .economy.cost_service import CostService
+
+        if id(CostService.PRICING_REGISTRY) != cls._pricing_registry_id:
+            CostService.load_pricing()
+            with cls._lock:
+                cls._pricing = {}
+                cls._pricing_registry_id = id(CostService.PRICING_REGISTRY)
+        key = str(model).lower()
+        pricing = cls._pricing.get(key)
+        if pricing is None:
+            pricing = CostService.get_pricing(model)
+            with cls._lock:
+                cls._pricing[key] = pricing
+        return pricing
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _check_backing(cls) -> None:
+        """A new GICS client invalidates every trust record."""
+        gics = _shared_gics()
+        if id(gics) != cls._backing_id:
+            with cls._lock:
+                cls._records = {}
+                cls._backing_id = id(gics)
+                cls._generation += 1
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._records = {}
+            cls._dimensions = set(DEFAULT_DIMENSIONS)
+            cls._refreshed_at = 0.0
+            cls._generation += 1
+            cls._backing_id = None
+            cls._tool_decisions = {}
+            cls._pricing = {}
+            cls._pricing_registry_id = None
+            cls.refreshes = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "dimensions": sorted(cls._dimensions),
+            "age_s": round(time.monotonic() - cls._refreshed_at, 3) if cls._refreshed_at else None,
+            "refreshes": cls.refreshes,
+            "tool_decisions": len(cls._tool_decisions),
+            "pricing": len(cls._pricing),
+        }
+
+
+class ProofPipeline:
+    """Ordered, off-request persistence of pre-action proofs.
+
+    Proofs wait in a per-thread FIFO until they are in GICS.  A failed write
+    (chain read or ``put``) leaves that proof and everything after it queued,
+    and the writer retries the thread with exponential backoff, so an id
+    handed out is never silently dropped.  When nothing can be persisted —
+    GICS is not initialized, or the thread's backlog is full — ``submit``
+    returns an ``ephemeral_`` id instead, as R20-005 did.
+    """
+
+    BATCH_MAX = 256
+    MAX_PENDING_PER_THREAD = 1024
+    RETRY_BASE_S = 0.05
+    RETRY_MAX_S = 5.0
+
+    _cond = threading.Condition()
+    _pending: Dict[str, Deque[Tuple[str, Dict[str, Any]]]] = {}
+    _retry: Dict[str, Tuple[float, float]] = {}  # thread_id -> (next attempt at, backoff)
+    _write_locks: Dict[str, threading.Lock] = {}
+    _writer: Optional[threading.Thread] = None
+    _tails: Dict[str, Tuple[float, int, Any]] = {}  # thread_id -> (loaded_at, id(gics), chain holding the tail)
+    write_failures = 0
+
+    @classmethod
+    def submit(cls, thread_id: str, proof_fields: Dict[str, Any]) -> str:
+        """Reserve a proof id for *thread_id* and queue the append; returns the id."""
+        if _shared_gics() is None:
+            logger.debug("Pre-action proof for %s not persisted: GICS unavailable", thread_id)
+            return f"ephemeral_{uuid.uuid4().hex[:16]}"
+        proof_id = f"proof_{uuid.uuid4().hex[:16]}"
+        with cls._cond:
+            pending = cls._pending.setdefault(thread_id, deque())
+            if len(pending) >= cls.MAX_PENDING_PER_THREAD:
+                logger.warning(
+                    "Pre-action proof for %s not persisted: %d proofs already waiting", thread_id, len(pending)
+                )
+                return f"ephemeral_{uuid.uuid4().hex[:16]}"
+            pending.append((proof_id, proof_fields))
+            if cls._writer is None or not cls._writer.is_alive():
+                cls._writer = threading.Thread(target=cls._write_loop, name="proof-pipeline", daemon=True)
+                cls._writer.start()
+            cls._cond.notify_all()
+        return proof_id
+
+    @classmethod
+    def flush(cls, thread_id: Optional[str] = None, timeout: float = 5.0) -> bool:
+        """Persist queued proofs now; True when none are left.
+
+        With *thread_id*, that thread's backlog is written in the calling
+        thread (one attempt, no waiting on other chains or on the retry
+        backoff).  Without it, waits up to *timeout* for every backlog to
+        drain — for tests and shutdown.
+        """
+        if thread_id is not None:
+            return cls._drain(thread_id, timeout=timeout)
+        deadline = time.monotonic() + timeout
+        with cls._cond:
+            while cls._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                cls._cond.wait(remaining)
+        return True
+
+    @classmethod
+    def pending(cls, thread_id: Optional[str] = None) -> int:
+        with cls._cond:
+            if thread_id is not None:
+                return len(cls._pending.get(thread_id, ()))
+            return sum(len(q) for q in cls._pending.values())
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop every queued proof and cached tail (tests)."""
+        with cls._cond:
+            cls._pending = {}
+            cls._retry = {}
+            cls._tails = {}
+            cls.write_failures = 0
+            cls._cond.notify_all()
+
+    @classmethod
+    def forget(cls, thread_id: str) -> None:
+        """Another writer appended to *thread_id*'s chain: re-read its tail."""
+        cls._tails.pop(thread_id, None)
+
+    @classmethod
+    def _write_loop(cls) -> None:
+        while True:
+            with cls._cond:
+                while True:
+                    now = time.monotonic()
+                    ready = [t for t in cls._pending if cls._retry.get(t, (0.0, 0.0))[0] <= now]
+                    if ready:
+                        break
+                    retry_at = [cls._retry[t][0] for t in cls._pending if t in cls._retry]
+                    cls._cond.wait(max(0.0, min(retry_at) - now) if retry_at else None)
+            for thread_id in ready:
+                try:
+                    cls._drain(thread_id, timeout=None)
+                except Exception:  # noqa: BLE001
+                    logger.warning("Pre-action proof writer failed for %s", thread_id, exc_info=True)
+                    cls._schedule_retry(thread_id)
+
+    @classmethod
+    def _drain(cls, thread_id: str, timeout: Optional[float]) -> bool:
+        """Write *thread_id*'s queued proofs in order; stops at the first failure."""
+        with cls._cond:
+            lock = cls._write_locks.setdefault(thread_id, threading.Lock())
+        if not lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+        try:
+            while True:
+                with cls._cond:
+                    items = list(itertools.islice(cls._pending.get(thread_id, ()), cls.BATCH_MAX))
+                if not items:
+                    return True
+                written = cls._write_batch(thread_id, items)
+                with cls._cond:
+                    pending = cls._pending[thread_id]
+                    for _ in range(written):
+                        pending.popleft()
+                    if not pending:
+                        del cls._pending[thread_id]
+                    if written == len(items):
+                        cls._retry.pop(thread_id, None)
+                    cls._cond.notify_all()
+                if written < len(items):
+                    cls._schedule_retry(thread_id)
+                    return False
+        finally:
+            lock.release()
+
+    @classmethod
+    def _schedule_retry(cls, thread_id: str) -> None:
+        with cls._cond:
+            backoff = cls._retry.get(thread_id, (0.0, cls.RETRY_BASE_S / 2))[1]
+            backoff = min(backoff * 2, cls.RETRY_MAX_S)
+            cls._retry[thread_id] = (time.monotonic() + backoff, backoff)
+            cls.write_failures += 1
+            cls._cond.notify_all()
+
+    @classmethod
+    def _write_batch(cls, thread_id: str, items: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """One chain read (or the cached tail), then the appends; returns how many were stored."""
+        from ..security.execution_proof import ExecutionProofChain
+        from .storage_service import StorageService
+
+        gics = _shared_gics()
+        if gics is None:
+            logger.debug("Pre-action proofs for %s waiting: GICS unavailable", thread_id)
+            return 0
+        now = time.monotonic()
+        cached = cls._tails.get(thread_id)
+        if cached is not None and cached[1] == id(gics) and now - cached[0] < _ttl_seconds():
+            chain = cached[2]
+        else:
+            try:
+                chain = ExecutionProofChain.from_records(thread_id, StorageService(gics).list_proofs(thread_id))
+            except Exception as exc:
+                logger.warning("Pre-action proofs for %s not persisted yet: %s", thread_id, exc)
+                return 0
+            now = time.monotonic()
+        written = 0
+        for proof_id, fields in items:
+            proof = chain.append(proof_id=proof_id, **fields)
+            try:
+                gics.put(f"ops:proof:{thread_id}:{proof.proof_id}", proof.to_dict())
+            except Exception as exc:
+                logger.warning("Pre-action proof %s not persisted yet: %s", proof_id, exc)
+                cls._tails.pop(thread_id, None)
+                return written
+            written += 1
+        cls._tails[thread_id] = (now, id(gics), ExecutionProofChain(thread_id, chain.to_list()[-1:]))
+        return written
@@ -1,25 +1,128 @@
-"""Checkpoint persistence and serialization for GraphEngine."""
+"""Checkpoint persistence and serialization for GraphEngine.
+
+Checkpoints are deltas against the previous one: only top-level keys whose
+value was replaced (identity check), keys written by the step's output and the
+small counters the engine mutates in place are stored, and append-only lists
+store just their new items.  Every ``checkpoint_full_every``-th checkpoint is
+a full snapshot so rebuilding a state never replays more than that many deltas.
+
+Nodes that mutate a nested value of the shared state in place must reassign
+the key (or return it in their output) for the change to reach a delta.
+"""
 from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from tools.gimo_server.ops_models import WorkflowCheckpoint
 
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger("orchestrator.services.graph_engine")
 
+# Lists the engine only ever appends to: deltas carry the new tail.
+_APPEND_ONLY_KEYS = frozenset({"step_logs", "model_router_trace", "cascade_trace", "human_annotations"})
+# Small dicts the engine mutates in place: copied into every checkpoint.
+_IN_PLACE_KEYS = frozenset({"budget_counters", "node_confidence", "human_reviews"})
+_MISSING = object()
+
 
 class CheckpointMixin:
     """Checkpoint management: save, restore, serialize."""
 
+    _CHECKPOINT_FULL_EVERY: int = 20
+
+    def _checkpoint(
+        self, node_id: str, output: Any, status: str, *, touched: Iterable[str] = (),
+    ) -> WorkflowCheckpoint:
+        """Record (and persist) a checkpoint of the current state."""
+        data = self.state.data
+        refs = self._cp_refs
+        full_every = max(1, int(self.checkpoint_full_every or self._CHECKPOINT_FULL_EVERY))
+        if refs is None or self._cp_data is not data or self._cp_since_full + 1 >= full_every:
+            state = {k: self._checkpoint_value(k, v) for k, v in data.items()}
+            checkpoint = WorkflowCheckpoint(node_id=node_id, state=state, output=output, status=status)
+            self._cp_since_full = 0
+        else:
+            touched = set(touched)
+            changed: Dict[str, Any] = {}
+            appended: Dict[str, Any] = {}
+            for key, value in data.items():
+                previous = refs.get(key, _MISSING)
+                if key in _APPEND_ONLY_KEYS and isinstance(value, list) and value is previous:
+                    seen = self._cp_lens.get(key, 0)
+                    if len(value) > seen:
+                        appended[key] = value[seen:]
+                    elif len(value) < seen:
+                        changed[key] = list(value)
+                elif value is not previous or key in touched or key in _IN_PLACE_KEYS:
+                    changed[key] = self._checkpoint_value(key, value)
+            removed = [key for key in refs if key not in data]
+            checkpoint = WorkflowCheckpoint(
+                node_id=node_id, kind="delta", state=changed, removed=removed,
+                appended=appended, output=output, status=status,
+            )
+            self._cp_since_full += 1
+        self._cp_data = data
+        self._cp_refs = dict(data)
+        self._cp_lens = {k: len(v) for k, v in data.items() if k in _APPEND_ONLY_KEYS and isinstance(v, list)}
+        self.state.checkpoints.append(checkpoint)
+        self._persist_checkpoint(checkpoint)
+        return checkpoint
+
+    @staticmethod
+    def _checkpoint_value(key: str, value: Any) -> Any:
+        if key in _APPEND_ONLY_KEYS and isinstance(value, list):
+            return list(value)
+        if key in _IN_PLACE_KEYS and isinstance(value, dict):
+            return dict(value)
+        return value
+
+    def materialize_checkpoint(self, checkpoint_index: int = -1) -> Dict[str, Any]:
+        """Rebuild the full state recorded at *checkpoint_index*."""
+        checkpoints = self.state.checkpoints
+        if not checkpoints:
+            raise ValueError("No checkpoints available")
+        index = range(len(checkpoints))[checkpoint_index]
+        start = index
+        while start > 0 and checkpoints[start].kind != "full":
+            start -= 1
+        state: Dict[str, Any] = {}
+        for checkpoint in checkpoints[start:index + 1]:
+            state = self._apply_checkpoint(state, checkpoint)
+        return state
+
+    @classmethod
+    def materialize_checkpoints(cls, checkpoints: List[WorkflowCheckpoint]) -> List[Dict[str, Any]]:
+        """Full state at every checkpoint, in one pass over the list."""
+        states: List[Dict[str, Any]] = []
+        state: Dict[str, Any] = {}
+        for checkpoint in checkpoints:
+            state = cls._apply_checkpoint(state, checkpoint)
+            states.append(state)
+        return states
+
+    @classmethod
+    def _apply_checkpoint(cls, state: Dict[str, Any], checkpoint: WorkflowCheckpoint) -> Dict[str, Any]:
+        """State after *checkpoint*; *state* (the one before it) is not modified."""
+        if checkpoint.kind == "full":
+            return {k: cls._checkpoint_value(k, v) for k, v in checkpoint.state.items()}
+        state = dict(state)
+        state.update(checkpoint.state)
+        for key in checkpoint.removed:
+            state.pop(key, None)
+        for key, items in checkpoint.appended.items():
+            state[key] = list(state.get(key) or []) + list(items)
+        return state
+
     def resume_from_checkpoint(self, checkpoint_index: int = -1) -> Optional[str]:
         if not self.state.checkpoints:
             raise ValueError("No checkpoints available to resume from")
 
         checkpoint = self.state.checkpoints[checkpoint_index]
-        self.state.data = dict(checkpoint.state)
+        self.state.data = self.materialize_checkpoint(checkpoint_index)
         self.state.data["resumed_from_checkpoint"] = {
             "node_id": checkpoint.node_id,
             "checkpoint_index": checkpoint_index,
@@ -59,6 +162,9 @@ class CheckpointMixin:
         if not (self.persist_checkpoints and self.storage):
             return
 
+        extra: Dict[str, Any] = {}
+        if checkpoint.kind == "delta":
+            extra = {"kind": "delta", "removed": checkpoint.removed, "appended": checkpoint.appended}
         try:
             self.storage.save_checkpoint(
                 workflow_id=self.graph.id,
@@ -66,6 +172,7 @@ class CheckpointMixin:
                 state=checkpoint.state,
                 output=checkpoint.output,
                 status=checkpoint.status,
+                **extra,
             )
         except Exception as exc:
             logger.error("Failed to persist checkpoint for node=%s: %s", checkpoint.node_id, exc)
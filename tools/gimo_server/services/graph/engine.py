@@ -6,6 +6,7 @@ Core execution loop that delegates to specialized mixins:
 - AgentPatternsMixin: supervisor_workers, reviewer_loop, handoff
 - NodeExecutorMixin: Node type dispatch (llm_call, tool_call, transform, etc.)
 - CheckpointMixin: Checkpoint persistence, graph serialization, condition evaluation
+- FanOutMixin: Concurrent fan-out branches with an edge-ordered merge
 """
 from __future__ import annotations
 
@@ -19,7 +20,6 @@ from typing import Any, Dict, Optional
 
 from tools.gimo_server.ops_models import (
     CostEvent,
-    WorkflowCheckpoint,
     WorkflowGraph,
     WorkflowNode,
     WorkflowState,
@@ -39,6 +39,7 @@ from .contract_validator import ContractValidatorMixin
 from .agent_patterns import AgentPatternsMixin
 from .node_executor import NodeExecutorMixin
 from .checkpoint_manager import CheckpointMixin
+from .fan_out import FanOutMixin
 
 logger = logging.getLogger("orchestrator.services.graph_engine")
 
@@ -49,6 +50,7 @@ class GraphEngine(
     AgentPatternsMixin,
     NodeExecutorMixin,
     CheckpointMixin,
+    FanOutMixin,
 ):
     """MVP Graph Execution Engine."""
 
@@ -64,6 +66,7 @@ class GraphEngine(
         workflow_timeout_seconds: Optional[int] = None,
         confidence_service: Optional[ConfidenceService] = None,
         provider_service: Optional[ProviderService] = None,
+        checkpoint_full_every: Optional[int] = None,
         _sub_graph_depth: int = 0,
     ):
         self.graph = graph
@@ -72,6 +75,11 @@ class GraphEngine(
         self.storage = storage
         self.persist_checkpoints = persist_checkpoints
         self.workflow_timeout_seconds = workflow_timeout_seconds
+        self.checkpoint_full_every = checkpoint_full_every
+        self._cp_data: Optional[Dict[str, Any]] = None
+        self._cp_refs: Optional[Dict[str, Any]] = None
+        self._cp_lens: Dict[str, int] = {}
+        self._cp_since_full = 0
         self._confidence_service = confidence_service
         self._sub_graph_depth = _sub_graph_depth
         self._nodes_by_id = {node.id: node for node in self.graph.nodes}
@@ -137,42 +145,14 @@ class GraphEngine(
                     self._update_budget_counters(output)
 
                     if isinstance(output, dict) and output.get("pause_execution"):
-                        self._resume_from_node_id = node.id
-                        self.state.data["execution_paused"] = True
-                        reason = output.get("pause_reason", "human_review_pending")
-                        self.state.data["pause_reason"] = reason
-                        self._append_step_log(
-                            step_id=step_id,
-                            node=node,
-                            status="paused",
-                            started_at=started_at,
-                            output=output,
-                        )
-
-                        from tools.gimo_server.services.notification_service import NotificationService
-                        try:
-                            loop = asyncio.get_running_loop()
-                            loop.create_task(NotificationService.publish("handover_required", {
-                                "workflow_id": self.graph.id,
-                                "node_id": node.id,
-                                "reason": reason,
-                                "context": output
-                            }))
-                        except Exception as ne:
-                            logger.error("Failed to publish notification: %s", ne)
-
+                        self._pause_at(node, step_id, started_at, output)
                         break
 
                     self.state.data["execution_paused"] = False
 
-                    checkpoint = WorkflowCheckpoint(
-                        node_id=node.id,
-                        state=self.state.data.copy(),
-                        output=output,
-                        status="completed"
+                    self._checkpoint(
+                        node.id, output, "completed", touched=output if isinstance(output, dict) else (),
                     )
-                    self.state.checkpoints.append(checkpoint)
-                    self._persist_checkpoint(checkpoint)
 
                     self._append_step_log(
                         step_id=step_id,
@@ -183,6 +163,11 @@ class GraphEngine(
                     )
 
                     current_node_id = self._get_next_node(node.id, output)
+                    branches = self._fan_out_branches(node, output)
+                    if branches:
+                        current_node_id, iterations, stop = await self._run_fan_out(node, branches, iterations)
+                        if stop:
+                            break
 
                     budget_reason = self._check_budget_after_step()
                     if budget_reason:
@@ -195,14 +180,7 @@ class GraphEngine(
                         error_text = "timed out"
                     else:
                         error_text = str(e) or e.__class__.__name__
-                    checkpoint = WorkflowCheckpoint(
-                        node_id=node.id,
-                        state=self.state.data.copy(),
-                        output=None,
-                        status="failed"
-                    )
-                    self.state.checkpoints.append(checkpoint)
-                    self._persist_checkpoint(checkpoint)
+                    self._checkpoint(node.id, None, "failed")
                     self._append_step_log(
                         step_id=step_id,
                         node=node,
@@ -233,6 +211,32 @@ class GraphEngine(
 
         return self.state
 
+    def _pause_at(self, node: WorkflowNode, step_id: str, started_at: float, output: Dict[str, Any]) -> None:
+        """Pause the run at *node*; a later ``execute`` resumes there."""
+        self._resume_from_node_id = node.id
+        self.state.data["execution_paused"] = True
+        reason = output.get("pause_reason", "human_review_pending")
+        self.state.data["pause_reason"] = reason
+        self._append_step_log(
+            step_id=step_id,
+            node=node,
+            status="paused",
+            started_at=started_at,
+            output=output,
+        )
+
+        from tools.gimo_server.services.notification_service import NotificationService
+        try:
+            loop = asyncio.get_running_loop()
+            loop.create_task(NotificationService.publish("handover_required", {
+                "workflow_id": self.graph.id,
+                "node_id": node.id,
+                "reason": reason,
+                "context": output
+            }))
+        except Exception as ne:
+            logger.error("Failed to publish notification: %s", ne)
+
     async def _run_node_with_retries(self, node: WorkflowNode) -> Any:
         attempts = 0
         max_attempts = max(int(node.retries or 0) + 1, 1)
@@ -0,0 +1,186 @@
+"""Fan-out execution for GraphEngine.
+
+A node with ``config["fan_out"]`` set runs every outgoing edge whose condition
+holds (not just the first) as a branch.  Branch targets that declare the state
+keys they write (``config["writes"]``) run concurrently when those sets are
+pairwise disjoint; otherwise the branches run one after another in edge order.
+Either way outputs are merged, checkpointed and logged in edge order, so the
+resulting state does not depend on completion order.  Each merged branch is
+handled like a main-loop step (pause, budget check); execution continues at
+the branches' common successor (the join node).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, List, Optional, Tuple
+
+from tools.gimo_server.ops_models import WorkflowNode
+
+logger = logging.getLogger("orchestrator.services.graph_engine")
+
+# Node types that write shared state directly or pause, so never run concurrently.
+_SERIAL_ONLY_TYPES = frozenset({"human_review", "contract_check", "sub_graph"})
+# Engine traces appended to while a node runs; re-ordered by branch after a fan-out.
+_TRACE_KEYS = ("model_router_trace", "cascade_trace")
+
+
+class FanOutMixin:
+    """Concurrent branches with a deterministic, edge-ordered merge."""
+
+    def _fan_out_branches(self, node: WorkflowNode, output: Any) -> List[WorkflowNode]:
+        if not node.config.get("fan_out"):
+            return []
+        targets = [
+            edge.to_node
+            for edge in self._edges_from.get(node.id, [])
+            if not edge.condition or self._evaluate_condition(edge.condition, output)
+        ]
+        if len(targets) < 2:
+            return []
+        return [self._nodes_by_id[target] for target in targets]
+
+    @staticmethod
+    def _branches_disjoint(branches: List[WorkflowNode]) -> bool:
+        claimed: set = set()
+        for branch in branches:
+            writes = branch.config.get("writes")
+            if branch.type in _SERIAL_ONLY_TYPES or not isinstance(writes, (list, tuple)):
+                return False
+            if claimed.intersection(writes):
+                return False
+            claimed.update(writes)
+        return True
+
+    async def _run_branch(self, branch: WorkflowNode, gate: asyncio.Semaphore) -> Tuple[Any, float]:
+        """Returns the branch output and its own run time."""
+        async with gate:
+            started_at = time.perf_counter()
+            output = await self._run_node_with_retries(branch)
+            return output, time.perf_counter() - started_at
+
+    async def _run_fan_out(
+        self, source: WorkflowNode, branches: List[WorkflowNode], iterations: int,
+    ) -> Tuple[Optional[str], int, bool]:
+        """Run *branches*; returns (join node id, iterations, stop).
+
+        A branch that fails, pauses (``pause_execution``) or takes the run over
+        budget stops the fan-out the way it stops the main loop: branches
+        before it in edge order stay merged, serial branches after it do not
+        run, and a paused run resumes at that branch.
+        """
+        if iterations + len(branches) > self.max_iterations:
+            self.state.data["aborted_reason"] = "max_iterations_exceeded"
+            return None, iterations, True
+        for branch in branches:
+            try:
+                await self._ensure_budget_guard(branch)
+            except RuntimeError as exc:
+                if "budget" in str(exc).lower():
+                    return None, iterations, True
+                raise
+
+        concurrent = self._branches_disjoint(branches)
+        written: dict = {}
+        successors: List[str] = []
+        if concurrent:
+            trace_marks = {key: len(self.state.data.get(key) or []) for key in _TRACE_KEYS}
+            limit = int(source.config.get("max_parallel") or len(branches))
+            gate = asyncio.Semaphore(max(1, limit))
+            logger.info("fan-out from %s: %d concurrent branches", source.id, len(branches))
+            results = await asyncio.gather(
+                *(self._run_branch(branch, gate) for branch in branches), return_exceptions=True,
+            )
+            self._order_traces(branches, trace_marks)
+            for branch, result in zip(branches, results):
+                iterations += 1
+                if not self._merge_branch(source, branch, result, iterations, written, successors, concurrent):
+                    return None, iterations, True
+        else:
+            gate = asyncio.Semaphore(1)
+            for branch in branches:
+                try:
+                    result = await self._run_branch(branch, gate)
+                except Exception as exc:
+                    result = exc
+                iterations += 1
+                # Merged before the next branch runs, so later branches see earlier outputs.
+                if not self._merge_branch(source, branch, result, iterations, written, successors, concurrent):
+                    return None, iterations, True
+
+        if len(successors) > 1:
+            logger.warning(
+                "fan-out from %s: branches continue at %s; following %s",
+                source.id, successors, successors[0],
+            )
+        return (successors[0] if successors else None), iterations, False
+
+    def _merge_branch(
+        self,
+        source: WorkflowNode,
+        branch: WorkflowNode,
+        result: Any,
+        iterations: int,
+        written: dict,
+        successors: List[str],
+        concurrent: bool,
+    ) -> bool:
+        """Apply one branch result as the main loop applies a node's; False stops the run."""
+        step_id = f"step_{iterations}"
+        if isinstance(result, BaseException):
+            logger.error("Error executing branch %s: %s", branch.id, result)
+            if isinstance(result, TimeoutError):
+                error_text = "timed out"
+            else:
+                error_text = str(result) or result.__class__.__name__
+            self._checkpoint(branch.id, None, "failed")
+            self._append_step_log(
+                step_id=step_id, node=branch, status="failed",
+                started_at=time.perf_counter(), output={"error": error_text},
+            )
+            if not self.state.data.get("aborted_reason") and not self.state.data.get("pause_reason"):
+                self.state.data["aborted_reason"] = "node_failure"
+            return False
+
+        output, elapsed = result
+        started_at = time.perf_counter() - elapsed
+        if isinstance(output, dict):
+            for key in output:
+                if concurrent and key in written and written[key] != branch.id:
+                    logger.warning(
+                        "fan-out from %s: key %r written by %s and %s; edge order wins",
+                        source.id, key, written[key], branch.id,
+                    )
+                written[key] = branch.id
+            self.state.data.update(output)
+        self._update_budget_counters(output)
+
+        if isinstance(output, dict) and output.get("pause_execution"):
+            self._pause_at(branch, step_id, started_at, output)
+            return False
+
+        self.state.data["execution_paused"] = False
+        self._checkpoint(branch.id, output, "completed", touched=output if isinstance(output, dict) else ())
+        self._append_step_log(
+            step_id=step_id, node=branch, status="completed", started_at=started_at, output=output,
+        )
+        successor = self._get_next_node(branch.id, output)
+        if successor and successor not in successors:
+            successors.append(successor)
+
+        budget_reason = self._check_budget_after_step()
+        if budget_reason:
+            self._handle_budget_exceeded(budget_reason)
+            return False
+        return True
+
+    def _order_traces(self, branches: List[WorkflowNode], marks: dict) -> None:
+        order = {branch.id: i for i, branch in enumerate(branches)}
+        for key, mark in marks.items():
+            trace = self.state.data.get(key)
+            if isinstance(trace, list) and len(trace) > mark + 1:
+                tail = sorted(trace[mark:], key=lambda e: order.get((e or {}).get("node_id"), len(order)))
+                trace[mark:] = tail
+                if key == "model_router_trace":
+                    self.state.data["model_router_last"] = trace[-1]
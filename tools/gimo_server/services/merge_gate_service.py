@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 
+from .gate_checks import select_affected_tests
 from .git_service import GitService
 from .ops import OpsService
 from .review_purge_contract import resolve_authoritative_repo_path, resolve_workspace_path
@@ -20,9 +22,8 @@ class MergeGateService:
     1) gates previos (policy/intent/risk)
     2) lock por repo (TTL + heartbeat)
     3) sandbox limpio (provisioned)
-    4) tests
-    5) lint/typecheck
-    6) dry-run merge
+    4-6) tests, lint/typecheck and dry-run merge, run concurrently with
+         per-check timeouts; passing results cached by tree hash
     7) PAUSE: transition to AWAITING_MERGE
     8) perform_manual_merge: explicit human trigger for repo mutation
     """
@@ -30,6 +31,18 @@ class MergeGateService:
     LOCK_TTL_SECONDS = 120
     HEARTBEAT_INTERVAL_SECONDS = 30
     PIPELINE_TIMEOUT_SECONDS = 900
+    CHECK_TIMEOUT_SECONDS = {"tests": 600.0, "lint": 300.0, "dry_run_merge": 120.0}
+
+    _CHECK_FAILURE_STATUS = {
+        "tests": ("VALIDATION_FAILED_TESTS", "tests failed"),
+        "lint": ("VALIDATION_FAILED_LINT", "lint/typecheck failed"),
+        "dry_run_merge": ("MERGE_CONFLICT", "dry-run merge conflict"),
+    }
+    _CHECK_STAGES = {
+        "tests": ("gate_tests", "Phase7: running tests in sandbox"),
+        "lint": ("gate_lint", "Phase7: running lint/typecheck in sandbox"),
+        "dry_run_merge": ("dry_run_merge", "Phase7: dry-run merge against authoritative repo"),
+    }
 
     # Intent classes considered low-risk for policy fallback purposes.
     _LOW_RISK_INTENTS = frozenset({
@@ -258,43 +271,138 @@ class MergeGateService:
         del repo_id
         workspace_dir = Path(provided_workspace).resolve()
         authoritative_dir = Path(authoritative_repo).resolve()
-        effective_source_ref = source_ref
 
-        try:
-            # 1. Tests in Sandbox
-            OpsService.set_run_stage(run_id, "gate_tests", msg="Phase7: running tests in sandbox")
-            ok_tests, tests_out = GitService.run_tests(workspace_dir)
-            if not ok_tests:
-                OpsService.update_run_status(run_id, "VALIDATION_FAILED_TESTS", msg="tests failed")
-                return
+        # Snapshot the workspace for the dry-run merge before any check starts,
+        # so the snapshot commit never races with files the test run writes.
+        if workspace_dir != authoritative_dir:
+            effective_source_ref = await asyncio.to_thread(
+                cls._prepare_workspace_source_ref, run_id, workspace_dir
+            )
+            await asyncio.to_thread(
+                GitService.fetch_local_ref, authoritative_dir, workspace_dir, effective_source_ref
+            )
+            dry_run_source_ref = "FETCH_HEAD"
+        else:
+            dry_run_source_ref = source_ref
+
+        tree_hash = await GitService.worktree_tree_hash_async(workspace_dir)
+        test_paths = await cls._select_tests(run_id, workspace_dir, target_ref)
+
+        # Tests, lint/typecheck and the dry-run merge are independent: run them
+        # concurrently. Listed in verdict priority order.
+        failed = await cls._run_checks(run_id, [
+            ("tests", GitService.run_tests_async(
+                workspace_dir,
+                test_paths=test_paths,
+                tree_hash=tree_hash,
+                timeout=cls.CHECK_TIMEOUT_SECONDS["tests"],
+            )),
+            ("lint", GitService.run_lint_typecheck_async(
+                workspace_dir,
+                tree_hash=tree_hash,
+                timeout=cls.CHECK_TIMEOUT_SECONDS["lint"],
+            )),
+            ("dry_run_merge", GitService.dry_run_merge_async(
+                authoritative_dir,
+                dry_run_source_ref,
+                target_ref,
+                timeout=cls.CHECK_TIMEOUT_SECONDS["dry_run_merge"],
+            )),
+        ])
+        if failed is not None:
+            status, msg = cls._CHECK_FAILURE_STATUS[failed]
+            OpsService.update_run_status(run_id, status, msg=msg)
+            return
+
+        # Phase 7B Mandatory Pause: transition to AWAITING_MERGE.
+        # NO merge_real here.
+        commit_before = GitService.get_head_commit(authoritative_dir)
+        OpsService.update_run_merge_metadata(run_id, commit_before=commit_before)
+        OpsService.update_run_status(run_id, "AWAITING_MERGE", msg="Gate passed; awaiting manual merge command.")
 
-            # 2. Lint/Typecheck in Sandbox
-            OpsService.set_run_stage(run_id, "gate_lint", msg="Phase7: running lint/typecheck in sandbox")
-            ok_lint, lint_out = GitService.run_lint_typecheck(workspace_dir)
-            if not ok_lint:
-                OpsService.update_run_status(run_id, "VALIDATION_FAILED_LINT", msg="lint/typecheck failed")
-                return
+    @classmethod
+    async def _run_checks(
+        cls, run_id: str, checks: List[Tuple[str, Awaitable[Tuple[bool, str]]]]
+    ) -> Optional[str]:
+        """Run *checks* concurrently; return the highest-priority failing check name.
+
+        The verdict is the same as running them in list order: a failure is only
+        reported once every earlier check has passed.  As soon as the verdict is
+        known the remaining checks are cancelled (their subprocesses are killed).
+        The run stage follows the verdict: a check's stage is set once every
+        earlier check has passed, as it was when they ran one after another.
+        """
+        order = [name for name, _ in checks]
+        staged: set = set()
 
-            # 3. Dry-run merge on the authoritative repo using the workspace as the source of truth.
-            OpsService.set_run_stage(run_id, "dry_run_merge", msg="Phase7: dry-run merge against authoritative repo")
-            if workspace_dir != authoritative_dir:
-                effective_source_ref = cls._prepare_workspace_source_ref(run_id, workspace_dir)
-                GitService.fetch_local_ref(authoritative_dir, workspace_dir, effective_source_ref)
-                dry_run_source_ref = "FETCH_HEAD"
-            else:
-                dry_run_source_ref = source_ref
-            ok_dry, dry_out = GitService.dry_run_merge(authoritative_dir, dry_run_source_ref, target_ref)
-            if not ok_dry:
-                OpsService.update_run_status(run_id, "MERGE_CONFLICT", msg="dry-run merge conflict")
+        def _stage(name: str) -> None:
+            if name in staged or name not in cls._CHECK_STAGES:
                 return
+            staged.add(name)
+            stage, msg = cls._CHECK_STAGES[name]
+            OpsService.set_run_stage(run_id, stage, msg=msg)
+
+        tasks = {
+            name: asyncio.create_task(cls._timed_check(run_id, name, check))
+            for name, check in checks
+        }
+        try:
+            if order:
+                _stage(order[0])
+            pending = set(tasks.values())
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for name in order:
+                    _stage(name)
+                    task = tasks[name]
+                    if not task.done():
+                        break
+                    if not task.result():
+                        return name
+            return None
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
 
-            # Phase 7B Mandatory Pause: transition to AWAITING_MERGE.
-            # NO merge_real here. 
-            commit_before = GitService.get_head_commit(authoritative_dir)
-            OpsService.update_run_merge_metadata(run_id, commit_before=commit_before)
-            OpsService.update_run_status(run_id, "AWAITING_MERGE", msg="Gate passed; awaiting manual merge command.")
-            
-        finally: pass
+    @classmethod
+    async def _timed_check(cls, run_id: str, name: str, check: Awaitable[Tuple[bool, str]]) -> bool:
+        started = time.perf_counter()
+        ok, _output = await check
+        OpsService.append_log(
+            run_id,
+            level="INFO" if ok else "ERROR",
+            msg=f"MergeGate: {name} {'passed' if ok else 'failed'} in {time.perf_counter() - started:.2f}s",
+        )
+        return ok
+
+    @classmethod
+    async def _select_tests(cls, run_id: str, workspace_dir: Path, target_ref: str) -> Optional[List[str]]:
+        """Affected-test selection (opt-in via ``ORCH_MERGE_GATE_TEST_SELECTION=affected``).
+
+        Returns ``None`` to run the full suite.
+        """
+        mode = os.environ.get("ORCH_MERGE_GATE_TEST_SELECTION", "all").strip().lower()
+        if mode != "affected":
+            return None
+        changed: Optional[List[str]] = None
+        for base_ref in (target_ref, f"origin/{target_ref}"):
+            changed = await GitService.changed_paths_async(workspace_dir, base_ref)
+            if changed is not None:
+                break
+        selected = (
+            await asyncio.to_thread(select_affected_tests, workspace_dir, changed)
+            if changed is not None else None
+        )
+        if selected is None:
+            OpsService.append_log(run_id, level="INFO", msg="MergeGate: affected-test selection fell back to full suite")
+        else:
+            OpsService.append_log(
+                run_id, level="INFO",
+                msg=f"MergeGate: running {len(selected)} affected test file(s) for {len(changed or [])} changed path(s)",
+            )
+        return selected
 
     @classmethod
     async def perform_manual_merge(cls, run_id: str) -> bool:
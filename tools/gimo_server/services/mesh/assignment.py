@@ -0,0 +1,158 @@
+"""Batch task assignment — min-cost matching of pending tasks × idle devices.
+
+The greedy path in ``TaskQueue.auto_assign_pending`` walks tasks in FIFO order
+and hands each one to the first device that can take it. That is cheap but
+blind to device strength: a heavy ``file_hash`` can land on a throttling
+phone while a workstation sits idle with a ``ping``.
+
+This module solves the same window of work as an assignment problem:
+
+    cost[task][device] = task_weight / device_speed
+
+where ``device_speed`` folds in free CPU, core count and the thermal health
+score from ``TelemetryService``. Pairs that break the hard constraints
+(workspace isolation, capability/thermal gate) get ``INFEASIBLE`` and are
+dropped after solving. The solver is the classic O(n²·m) Hungarian algorithm
+with potentials — no numpy/scipy dependency so it runs on Termux/Android too.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ...models.mesh import MeshDeviceInfo, MeshTask
+
+INFEASIBLE = math.inf
+
+# Relative work units per task type. Only the ratios matter: they steer heavy
+# tasks towards strong devices. Unknown types default to 1.0.
+TASK_TYPE_WEIGHT: Dict[str, float] = {
+    "ping": 0.1,
+    "text_validate": 1.0,
+    "text_transform": 2.0,
+    "json_validate": 1.0,
+    "shell_exec": 4.0,
+    "file_read": 1.5,
+    "file_hash": 3.0,
+}
+
+# Finite stand-in for INFEASIBLE inside the solver. Large enough that the
+# solver never prefers an infeasible pair over any feasible one.
+_BIG = 1e12
+
+
+def task_weight(task: MeshTask) -> float:
+    return TASK_TYPE_WEIGHT.get(task.task_type.value, 1.0)
+
+
+def device_speed(device: MeshDeviceInfo, health_score: float = 100.0) -> float:
+    """Relative throughput estimate for a device (higher = faster).
+
+    ``free CPU share × cores`` scaled by thermal health. Devices without
+    capability info are treated as 4-core. Never returns 0 so costs stay finite.
+    """
+    caps = device.capabilities
+    cores = caps.cpu_cores if caps and caps.cpu_cores > 0 else 4
+    free_cpu = max(0.05, 1.0 - max(0.0, min(device.cpu_percent, 100.0)) / 100.0)
+    health = max(0.05, min(health_score, 100.0) / 100.0)
+    return cores * free_cpu * health
+
+
+def solve_min_cost_assignment(cost: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """Minimum-cost one-to-one assignment for a rectangular matrix.
+
+    Returns ``(row, col)`` pairs. Every row is matched when rows <= cols (and
+    vice versa); pairs whose cost is ``INFEASIBLE`` are omitted from the
+    result, so callers may get fewer pairs than ``min(rows, cols)``.
+    """
+    n_rows = len(cost)
+    if n_rows == 0:
+        return []
+    n_cols = len(cost[0])
+    if n_cols == 0:
+        return []
+
+    transposed = n_rows > n_cols
+    if transposed:
+        matrix = [[cost[r][c] for r in range(n_rows)] for c in range(n_cols)]
+        n, m = n_cols, n_rows
+    else:
+        matrix = [list(row) for row in cost]
+        n, m = n_rows, n_cols
+
+    a = [[_BIG if math.isinf(v) else float(v) for v in row] for row in matrix]
+
+    # Hungarian algorithm with potentials (1-indexed, column 0 is a sentinel).
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)  # p[j] = row matched to column j
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [math.inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = math.inf
+            j1 = 0
+            row = a[i0 - 1]
+            ui0 = u[i0]
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - ui0 - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    pairs: List[Tuple[int, int]] = []
+    for j in range(1, m + 1):
+        i = p[j]
+        if i == 0:
+            continue
+        r, c = (j - 1, i - 1) if transposed else (i - 1, j - 1)
+        if math.isinf(cost[r][c]):
+            continue
+        pairs.append((r, c))
+    pairs.sort()
+    return pairs
+
+
+def build_cost_matrix(
+    tasks: Sequence[MeshTask],
+    devices: Sequence[MeshDeviceInfo],
+    feasible,
+    health_scores: Optional[Dict[str, float]] = None,
+) -> List[List[float]]:
+    """Cost matrix (tasks × devices). ``feasible(device, task)`` gates pairs."""
+    health_scores = health_scores or {}
+    speeds = [device_speed(d, health_scores.get(d.device_id, 100.0)) for d in devices]
+    matrix: List[List[float]] = []
+    for task in tasks:
+        weight = task_weight(task)
+        matrix.append([
+            weight / speeds[j] if feasible(d, task) else INFEASIBLE
+            for j, d in enumerate(devices)
+        ])
+    return matrix
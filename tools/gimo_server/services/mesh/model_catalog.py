@@ -2,13 +2,21 @@
 
 Scans OPS_DATA_DIR/mesh/models/ for .gguf files and provides metadata
 for the device setup wizard (model selection + download).
+
+Each model also gets a chunk manifest (fixed-size chunk SHA-256s plus a
+root hash) persisted next to it under ``.manifests/``.  It is computed once,
+reused until the file's size or mtime changes, and is what lets a node pull
+a model from several peers at once (see ``model_distribution``).
 """
 
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
+import os
 import re
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -19,6 +27,8 @@ from ...config import OPS_DATA_DIR
 logger = logging.getLogger("orchestrator.mesh.model_catalog")
 
 _MODELS_DIR = Path(OPS_DATA_DIR) / "mesh" / "models"
+_MANIFESTS_SUBDIR = ".manifests"
+MANIFEST_CHUNK_SIZE = 8 * 1024 * 1024
 
 # Pattern: qwen2.5_3b_q4_k_m.gguf → name=qwen2.5, params=3b, quant=q4_k_m
 _GGUF_PATTERN = re.compile(
@@ -37,12 +47,74 @@ class ModelInfo(BaseModel):
     sha256: str = ""
 
 
+class ModelManifest(BaseModel):
+    """Fixed-size chunk hashes of a model file.
+
+    ``root_hash`` is the SHA-256 of the concatenated raw chunk digests, so two
+    nodes holding the same bytes (at the same ``chunk_size``) agree on it.
+    ``size_bytes``/``mtime_ns`` describe the local file the manifest was
+    computed from and decide whether a persisted manifest is still valid.
+    """
+    model_id: str
+    filename: str
+    size_bytes: int
+    mtime_ns: int = 0
+    chunk_size: int
+    chunks: List[str]
+    root_hash: str
+    sha256: str
+
+    def chunk_range(self, index: int) -> tuple[int, int]:
+        """Byte offset and length of chunk ``index``."""
+        start = index * self.chunk_size
+        return start, min(self.chunk_size, self.size_bytes - start)
+
+
+def compute_root_hash(chunks: List[str]) -> str:
+    h = hashlib.sha256()
+    for digest in chunks:
+        h.update(bytes.fromhex(digest))
+    return h.hexdigest()
+
+
+def manifest_path(models_dir: Path, filename: str) -> Path:
+    return models_dir / _MANIFESTS_SUBDIR / f"{filename}.json"
+
+
+def load_manifest(model_path: Path, chunk_size: Optional[int] = None) -> Optional[ModelManifest]:
+    """Persisted manifest of ``model_path``, or None if missing or stale."""
+    try:
+        st = model_path.stat()
+        data = json.loads(manifest_path(model_path.parent, model_path.name).read_text(encoding="utf-8"))
+        manifest = ModelManifest.model_validate(data)
+    except (OSError, ValueError):
+        return None
+    if manifest.size_bytes != st.st_size or manifest.mtime_ns != st.st_mtime_ns:
+        return None
+    if chunk_size is not None and manifest.chunk_size != chunk_size:
+        return None
+    return manifest
+
+
+def store_manifest(model_path: Path, manifest: ModelManifest) -> ModelManifest:
+    """Persist ``manifest`` for ``model_path`` (atomic replace)."""
+    path = manifest_path(model_path.parent, model_path.name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(manifest.model_dump_json(), encoding="utf-8")
+    os.replace(tmp, path)
+    return manifest
+
+
 class ModelCatalogService:
     """Scans and caches model metadata from the models directory."""
 
     def __init__(self) -> None:
         _MODELS_DIR.mkdir(parents=True, exist_ok=True)
         self._cache: Dict[str, ModelInfo] = {}
+        self._ids: Dict[str, str] = {}  # model_id → filename
+        self._manifest_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
 
     def list_models(self) -> List[ModelInfo]:
         """List all available GGUF models with metadata."""
@@ -57,33 +129,76 @@ class ModelCatalogService:
 
     def get_model(self, model_id: str) -> Optional[ModelInfo]:
         """Get metadata for a specific model (includes SHA-256)."""
+        path = self._find_model_file(model_id)
+        if path is None:
+            return None
+        model = self._get_model_info(path)
+        manifest = self._manifest_for(path) if model is not None else None
+        if manifest is not None:
+            model = model.model_copy(update={"sha256": manifest.sha256})
+        return model
+
+    def get_model_path(self, model_id: str) -> Optional[Path]:
+        """Get the file path for a model, or None if not found."""
+        return self._find_model_file(model_id)
+
+    def get_manifest(self, model_id: str) -> Optional[ModelManifest]:
+        """Chunk manifest for a model, computed on first use and persisted."""
+        path = self._find_model_file(model_id)
+        return self._manifest_for(path) if path is not None else None
+
+    def _find_model_file(self, model_id: str) -> Optional[Path]:
+        """Resolve a model_id to its file without listing the directory.
+
+        model_ids are derived from filenames, so the usual case is a direct
+        stat; ids whose filename differs (case, spaces) are remembered by
+        ``_get_model_info`` and only a miss on both falls back to a scan.
+        """
+        candidates = [_MODELS_DIR / f"{model_id}.gguf"]
+        known = self._ids.get(model_id)
+        if known:
+            candidates.insert(0, _MODELS_DIR / known)
+        for path in candidates:
+            if path.is_file() and self._model_id_for(path.name) == model_id:
+                return path
         for model in self.list_models():
             if model.model_id == model_id:
-                # Compute SHA-256 on demand (not during list)
-                if not model.sha256:
-                    path = _MODELS_DIR / model.filename
-                    if path.exists():
-                        model.sha256 = self._compute_sha256(path)
-                        self._cache[model.filename] = model
-                return model
+                path = _MODELS_DIR / model.filename
+                return path if path.is_file() else None
         return None
 
-    def get_model_path(self, model_id: str) -> Optional[Path]:
-        """Get the file path for a model, or None if not found."""
-        model = self.get_model(model_id)
-        if model is None:
-            return None
-        path = _MODELS_DIR / model.filename
-        return path if path.exists() else None
+    def _manifest_for(self, path: Path) -> Optional[ModelManifest]:
+        chunk_size = MANIFEST_CHUNK_SIZE
+        manifest = load_manifest(path, chunk_size)
+        if manifest is not None:
+            return manifest
+        with self._manifest_lock(path.name):
+            # Another caller may have finished hashing while we waited.
+            manifest = load_manifest(path, chunk_size)
+            if manifest is not None:
+                return manifest
+            manifest = self._compute_manifest(path, chunk_size)
+            if manifest is None:
+                return None
+            try:
+                return store_manifest(path, manifest)
+            except OSError as e:
+                logger.warning("Failed to persist manifest for %s: %s", path.name, e)
+                return manifest
+
+    def _manifest_lock(self, filename: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._manifest_locks.setdefault(filename, threading.Lock())
 
     def _get_model_info(self, path: Path) -> Optional[ModelInfo]:
         """Parse model metadata from filename + file stats."""
         filename = path.name
 
         # Use cache if size hasn't changed
+        size = path.stat().st_size
         if filename in self._cache:
             cached = self._cache[filename]
-            if cached.size_bytes == path.stat().st_size:
+            if cached.size_bytes == size:
                 return cached
 
         # Parse filename
@@ -98,8 +213,7 @@ class ModelCatalogService:
             params = ""
             quant = ""
 
-        # Generate stable model_id from filename
-        model_id = filename.replace(".gguf", "").lower().replace(" ", "-")
+        model_id = self._model_id_for(filename)
 
         # SHA-256 deferred — only computed on get_model(), not list_models()
         # Hashing a 4GB file takes ~20s, unacceptable for catalog listing
@@ -109,24 +223,42 @@ class ModelCatalogService:
             name=name,
             params=params,
             quantization=quant,
-            size_bytes=path.stat().st_size,
+            size_bytes=size,
             sha256="",  # Lazy — computed on demand
         )
         self._cache[filename] = info
+        self._ids[model_id] = filename
         return info
 
     @staticmethod
-    def _compute_sha256(path: Path) -> str:
-        """Compute SHA-256 of a file in chunks (handles multi-GB files)."""
-        h = hashlib.sha256()
+    def _model_id_for(filename: str) -> str:
+        """Stable model_id from filename."""
+        return filename.replace(".gguf", "").lower().replace(" ", "-")
+
+    @staticmethod
+    def _compute_manifest(path: Path, chunk_size: int) -> Optional[ModelManifest]:
+        """Hash a file once: per-chunk SHA-256s and the whole-file SHA-256."""
+        whole = hashlib.sha256()
+        chunks: List[str] = []
         try:
+            st = path.stat()
             with open(path, "rb") as f:
                 while True:
-                    chunk = f.read(1024 * 1024)  # 1MB chunks
+                    chunk = f.read(chunk_size)
                     if not chunk:
                         break
-                    h.update(chunk)
-            return h.hexdigest()
+                    whole.update(chunk)
+                    chunks.append(hashlib.sha256(chunk).hexdigest())
         except Exception as e:
             logger.warning("Failed to compute SHA-256 for %s: %s", path.name, e)
-            return ""
+            return None
+        return ModelManifest(
+            model_id=ModelCatalogService._model_id_for(path.name),
+            filename=path.name,
+            size_bytes=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            chunk_size=chunk_size,
+            chunks=chunks,
+            root_hash=compute_root_hash(chunks),
+            sha256=whole.hexdigest(),
+        )
@@ -0,0 +1,364 @@
+"""Model distribution — pull one model from several mesh peers at once.
+
+The model's chunk manifest (``ModelCatalogService.get_manifest``) drives the
+transfer: chunks are fetched in parallel with HTTP Range requests spread over
+every peer that already holds the same bytes, each chunk is checked against
+its manifest hash before it is written, and a progress sidecar next to the
+``.part`` file lets an interrupted download resume where it stopped.
+
+A peer that keeps failing (unreachable, short reads, corrupt chunks) is
+dropped and its chunks go to the others; the download only fails when no
+healthy peer can serve a missing chunk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Set
+
+from .model_catalog import ModelManifest, compute_root_hash, load_manifest, store_manifest
+
+logger = logging.getLogger("orchestrator.mesh.model_distribution")
+
+_PART_SUFFIX = ".part"
+_STATE_SUFFIX = ".part.json"
+
+
+class ModelDistributionError(RuntimeError):
+    """A model could not be fetched from the given peers."""
+
+
+class ModelPeer(Protocol):
+    """A node that can serve byte ranges of a model it holds."""
+
+    peer_id: str
+
+    def fetch_range(self, model_id: str, start: int, length: int) -> bytes: ...
+
+
+class HttpModelPeer:
+    """A mesh node reached through its ``/ops/mesh/models`` endpoints."""
+
+    def __init__(self, base_url: str, token: str = "", *, timeout: float = 60.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.peer_id = self.base_url
+        self._token = token
+        self._timeout = timeout
+
+    def _url(self, model_id: str, suffix: str) -> str:
+        return f"{self.base_url}/ops/mesh/models/{urllib.parse.quote(model_id, safe='')}/{suffix}"
+
+    def _headers(self, accept: str) -> Dict[str, str]:
+        headers = {"Accept": accept}
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+        return headers
+
+    def fetch_manifest(self, model_id: str) -> ModelManifest:
+        url = self._url(model_id, "manifest")
+        req = urllib.request.Request(url, headers=self._headers("application/json"))
+        try:
+            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
+                return ModelManifest.model_validate(json.loads(resp.read().decode("utf-8")))
+        except urllib.error.HTTPError as exc:
+            raise ModelDistributionError(f"GET {url} → HTTP {exc.code}: {exc.reason}") from exc
+        except (urllib.error.URLError, OSError) as exc:
+            raise ModelDistributionError(f"GET {url} unreachable: {exc}") from exc
+        except ValueError as exc:
+            raise ModelDistributionError(f"GET {url} returned an invalid manifest: {exc}") from exc
+
+    def fetch_range(self, model_id: str, start: int, length: int) -> bytes:
+        url = self._url(model_id, "download")
+        headers = self._headers("application/octet-stream")
+        headers["Range"] = f"bytes={start}-{start + length - 1}"
+        req = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(req, timeout=self._timeout) as resp:
+                if resp.getcode() != 206:
+                    # A full-body 200 would stream the whole model for one chunk.
+                    raise ModelDistributionError(f"{url} ignored Range (HTTP {resp.getcode()})")
+                return resp.read(length)
+        except urllib.error.HTTPError as exc:
+            raise ModelDistributionError(f"GET {url} → HTTP {exc.code}: {exc.reason}") from exc
+        except (urllib.error.URLError, OSError) as exc:
+            raise ModelDistributionError(f"GET {url} unreachable: {exc}") from exc
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    bytes_transferred: int
+    chunks_fetched: int
+    chunks_resumed: int
+    bytes_by_peer: Dict[str, int] = field(default_factory=dict)
+
+
+def peers_holding(manifest: ModelManifest, peers: Sequence[HttpModelPeer]) -> List[HttpModelPeer]:
+    """Peers whose copy of the model has the same root hash as ``manifest``."""
+    holding = []
+    for peer in peers:
+        try:
+            remote = peer.fetch_manifest(manifest.model_id)
+        except ModelDistributionError as exc:
+            logger.debug("Peer %s skipped: %s", peer.peer_id, exc)
+            continue
+        if remote.root_hash == manifest.root_hash and remote.chunk_size == manifest.chunk_size:
+            holding.append(peer)
+    return holding
+
+
+def _validate(manifest: ModelManifest) -> None:
+    expected = -(-manifest.size_bytes // manifest.chunk_size) if manifest.chunk_size > 0 else -1
+    if len(manifest.chunks) != expected or compute_root_hash(manifest.chunks) != manifest.root_hash:
+        raise ModelDistributionError(f"Manifest for {manifest.model_id} is inconsistent")
+
+
+def _write_at(fd: int, data: bytes, offset: int, lock: threading.Lock) -> None:
+    if hasattr(os, "pwrite"):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+    with lock:  # Windows: no pwrite
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, data)
+
+
+def _read_at(fd: int, offset: int, length: int, lock: threading.Lock) -> bytes:
+    if hasattr(os, "pread"):
+        return os.pread(fd, length, offset)
+    with lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, length)
+
+
+class _Download:
+    """Shared state of one transfer; worker threads pull chunks from it."""
+
+    def __init__(
+        self,
+        manifest: ModelManifest,
+        peers: Sequence[ModelPeer],
+        part: Path,
+        state_path: Path,
+        *,
+        max_peer_failures: int,
+        per_peer_concurrency: int,
+        on_progress: Optional[Callable[[int, int], None]],
+    ) -> None:
+        self.manifest = manifest
+        self.peers = list(peers)
+        self.part = part
+        self.state_path = state_path
+        self.max_peer_failures = max_peer_failures
+        self.per_peer_concurrency = per_peer_concurrency
+        self.on_progress = on_progress
+        self.cond = threading.Condition()
+        self.io_lock = threading.Lock()
+        self.done: Set[int] = set()
+        self.queue: deque[int] = deque()
+        self.tried: Dict[int, Set[str]] = {}
+        self.in_flight: Dict[str, int] = {p.peer_id: 0 for p in self.peers}
+        self.strikes: Dict[str, int] = {p.peer_id: 0 for p in self.peers}
+        self.bytes_by_peer: Dict[str, int] = {p.peer_id: 0 for p in self.peers}
+        self.active = 0
+        self.error: Optional[str] = None
+        self.fd = -1
+
+    # ── progress sidecar ────────────────────────────────────────────────────
+    def load_progress(self) -> Set[int]:
+        """Chunks a previous attempt finished, re-checked against the .part file."""
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return set()
+        if (
+            not isinstance(state, dict)
+            or state.get("root_hash") != self.manifest.root_hash
+            or state.get("chunk_size") != self.manifest.chunk_size
+        ):
+            return set()
+        # The data write is not fsynced before the sidecar, so a crash can
+        # leave chunks marked done that never reached the disk: verify them.
+        verified = set()
+        for index in state.get("done") or []:
+            if not isinstance(index, int) or not 0 <= index < len(self.manifest.chunks):
+                continue
+            start, length = self.manifest.chunk_range(index)
+            data = _read_at(self.fd, start, length, self.io_lock)
+            if hashlib.sha256(data).hexdigest() == self.manifest.chunks[index]:
+                verified.add(index)
+        return verified
+
+    def _save_progress_locked(self) -> None:
+        state = {
+            "root_hash": self.manifest.root_hash,
+            "chunk_size": self.manifest.chunk_size,
+            "done": sorted(self.done),
+        }
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    # ── scheduling ──────────────────────────────────────────────────────────
+    def _healthy(self) -> List[ModelPeer]:
+        return [p for p in self.peers if self.strikes[p.peer_id] < self.max_peer_failures]
+
+    def _next_locked(self) -> Optional[tuple[int, ModelPeer]]:
+        """Pick a queued chunk and the least loaded healthy peer that has not
+        failed it yet; None when nothing can be scheduled right now."""
+        healthy = self._healthy()
+        for _ in range(len(self.queue)):
+            index = self.queue[0]
+            tried = self.tried.get(index, set())
+            untried = [p for p in healthy if p.peer_id not in tried]
+            if not untried:
+                self.error = (
+                    f"chunk {index} of {self.manifest.model_id} could not be fetched from any "
+                    f"healthy peer ({len(healthy)}/{len(self.peers)} left)"
+                )
+                return None
+            free = [p for p in untried if self.in_flight[p.peer_id] < self.per_peer_concurrency]
+            if free:
+                self.queue.popleft()
+                peer = min(free, key=lambda p: self.in_flight[p.peer_id])
+                self.in_flight[peer.peer_id] += 1
+                self.active += 1
+                return index, peer
+            self.queue.rotate(-1)
+        return None
+
+    def worker(self) -> None:
+        while True:
+            with self.cond:
+                while True:
+                    if self.error is not None or (not self.queue and not self.active):
+                        self.cond.notify_all()
+                        return
+                    picked = self._next_locked() if self.queue else None
+                    if picked is not None:
+                        break
+                    if self.error is not None:
+                        continue
+                    self.cond.wait()
+            index, peer = picked
+            ok = self._fetch(index, peer)
+            with self.cond:
+                self.active -= 1
+                self.in_flight[peer.peer_id] -= 1
+                if ok:
+                    self.strikes[peer.peer_id] = 0
+                    self.done.add(index)
+                    self._save_progress_locked()
+                else:
+                    self.strikes[peer.peer_id] += 1
+                    self.tried.setdefault(index, set()).add(peer.peer_id)
+                    self.queue.appendleft(index)
+                self.cond.notify_all()
+            if ok and self.on_progress is not None:
+                self.on_progress(len(self.done), len(self.manifest.chunks))
+
+    def _fetch(self, index: int, peer: ModelPeer) -> bool:
+        start, length = self.manifest.chunk_range(index)
+        try:
+            data = peer.fetch_range(self.manifest.model_id, start, length)
+        except Exception as exc:
+            logger.warning("Chunk %d from %s failed: %s", index, peer.peer_id, exc)
+            return False
+        if len(data) != length or hashlib.sha256(data).hexdigest() != self.manifest.chunks[index]:
+            logger.warning("Chunk %d from %s failed verification", index, peer.peer_id)
+            return False
+        try:
+            _write_at(self.fd, data, start, self.io_lock)
+        except OSError as exc:
+            with self.cond:
+                self.error = f"write to {self.part} failed: {exc}"
+            return False
+        with self.cond:
+            self.bytes_by_peer[peer.peer_id] += length
+        return True
+
+
+def download_model(
+    manifest: ModelManifest,
+    peers: Sequence[ModelPeer],
+    dest_dir: Path,
+    *,
+    per_peer_concurrency: int = 2,
+    max_peer_failures: int = 3,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> DownloadResult:
+    """Fetch the model described by ``manifest`` into ``dest_dir``.
+
+    Chunks are spread over ``peers`` with at most ``per_peer_concurrency``
+    requests in flight per peer.  On failure the ``.part`` file and its
+    progress sidecar stay behind and a later call with the same manifest
+    resumes from them.  The finished file is moved into place and its
+    manifest persisted, so this node can serve it without re-hashing.
+    """
+    _validate(manifest)
+    if not peers:
+        raise ModelDistributionError(f"No peers to fetch {manifest.model_id} from")
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    final = dest_dir / manifest.filename
+    existing = load_manifest(final, manifest.chunk_size) if final.is_file() else None
+    if existing is not None and existing.root_hash == manifest.root_hash:
+        return DownloadResult(final, 0, 0, len(manifest.chunks))
+
+    part = dest_dir / f"{manifest.filename}{_PART_SUFFIX}"
+    state_path = dest_dir / f"{manifest.filename}{_STATE_SUFFIX}"
+    job = _Download(
+        manifest,
+        peers,
+        part,
+        state_path,
+        max_peer_failures=max_peer_failures,
+        per_peer_concurrency=max(1, per_peer_concurrency),
+        on_progress=on_progress,
+    )
+    job.fd = os.open(part, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        if os.fstat(job.fd).st_size != manifest.size_bytes:
+            os.ftruncate(job.fd, manifest.size_bytes)
+        job.done = job.load_progress()
+        resumed = len(job.done)
+        job.queue.extend(i for i in range(len(manifest.chunks)) if i not in job.done)
+        if resumed:
+            logger.info("Resuming %s: %d/%d chunks present", manifest.model_id, resumed, len(manifest.chunks))
+
+        workers = min(len(job.queue), len(job.peers) * job.per_peer_concurrency)
+        if workers:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="model-dl") as pool:
+                for future in [pool.submit(job.worker) for _ in range(workers)]:
+                    future.result()
+        if job.error is not None:
+            raise ModelDistributionError(job.error)
+        os.fsync(job.fd)
+    finally:
+        os.close(job.fd)
+
+    os.replace(part, final)
+    st = final.stat()
+    store_manifest(final, manifest.model_copy(update={"mtime_ns": st.st_mtime_ns, "size_bytes": st.st_size}))
+    state_path.unlink(missing_ok=True)
+
+    fetched = len(manifest.chunks) - resumed
+    transferred = sum(job.bytes_by_peer.values())
+    logger.info(
+        "Fetched %s (%d chunks, %d bytes) from %d peers",
+        manifest.model_id, fetched, transferred, sum(1 for b in job.bytes_by_peer.values() if b),
+    )
+    return DownloadResult(final, transferred, fetched, resumed, dict(job.bytes_by_peer))
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import tempfile
 import uuid
 from datetime import datetime, timezone
@@ -247,12 +248,20 @@ class TaskQueue:
 
     # ── Auto-assign ──────────────────────────────────────────
 
-    def auto_assign_pending(self, mesh_enabled: bool) -> int:
+    def auto_assign_pending(self, mesh_enabled: bool, optimal: Optional[bool] = None) -> int:
         """Assign pending tasks to idle utility/hybrid devices with capacity.
         INV-W1: tasks only assigned to devices in the same workspace.
-        INV-W6: skip workspaces without an active Core device."""
+        INV-W6: skip workspaces without an active Core device.
+
+        ``optimal=True`` (or ``ORCH_MESH_OPTIMAL_ASSIGN=true``) solves the
+        FIFO window of pending tasks × idle devices as a min-cost matching
+        instead of first-fit. Same hard constraints in both modes."""
         if not mesh_enabled:
             return 0
+        if optimal is None:
+            optimal = os.environ.get("ORCH_MESH_OPTIMAL_ASSIGN", "").strip().lower() in (
+                "1", "true", "yes",
+            )
 
         pending = self.list_tasks(status=TaskStatus.pending)
         if not pending:
@@ -274,6 +283,14 @@ class TaskQueue:
         self._registry._ws_svc_cache = ws_svc
         _core_cache: dict[str, bool] = {}
 
+        def _has_core(ws_id: str) -> bool:
+            if ws_id not in _core_cache:
+                _core_cache[ws_id] = ws_svc.has_active_core(ws_id, self._registry)
+            return _core_cache[ws_id]
+
+        if optimal:
+            return self._assign_optimal(pending, eligible, _has_core)
+
         assigned_count = 0
         device_idx = 0
 
@@ -282,10 +299,7 @@ class TaskQueue:
                 break
 
             # INV-W6: skip tasks in workspaces without active Core
-            ws_id = task.workspace_id
-            if ws_id not in _core_cache:
-                _core_cache[ws_id] = ws_svc.has_active_core(ws_id, self._registry)
-            if not _core_cache[ws_id]:
+            if not _has_core(task.workspace_id):
                 continue
 
             # Find a device that can handle this task (INV-W1: workspace match)
@@ -300,3 +314,40 @@ class TaskQueue:
                     break
 
         return assigned_count
+
+    def _feasible(self, device: MeshDeviceInfo, task: MeshTask) -> bool:
+        """INV-W1 workspace match + capability/thermal gate."""
+        return device.active_workspace_id == task.workspace_id and self.can_device_handle(
+            device, task
+        )
+
+    def _assign_optimal(self, pending: List[MeshTask], eligible: List[MeshDeviceInfo], has_core) -> int:
+        """Min-cost matching over the oldest assignable tasks.
+
+        The window is the first ``len(eligible)`` tasks (FIFO) that have at
+        least one feasible device, so old heavy tasks are not starved by a
+        stream of cheap pings — only their placement is optimised.
+        """
+        from .assignment import build_cost_matrix, solve_min_cost_assignment
+        from .telemetry import TelemetryService
+
+        window: List[MeshTask] = []
+        for task in pending:
+            if len(window) >= len(eligible):
+                break
+            if not has_core(task.workspace_id):
+                continue
+            if any(self._feasible(d, task) for d in eligible):
+                window.append(task)
+        if not window:
+            return 0
+
+        telemetry = TelemetryService()
+        health = {d.device_id: telemetry.get_profile(d.device_id).health_score for d in eligible}
+        cost = build_cost_matrix(window, eligible, self._feasible, health)
+
+        assigned_count = 0
+        for t_idx, d_idx in solve_min_cost_assignment(cost):
+            if self.assign_task(window[t_idx].task_id, eligible[d_idx].device_id):
+                assigned_count += 1
+        return assigned_count
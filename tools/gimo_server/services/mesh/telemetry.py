@@ -6,8 +6,10 @@ computes device health scores, and feeds GICS for routing optimization.
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
+import threading
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -71,6 +73,11 @@ class TelemetryService:
     """Ingests thermal events, builds profiles, computes health scores.
 
     Use get_instance() to access the singleton.
+
+    Profiles are held in memory once read. Dispatch scoring reads them per
+    device per decision, so it must never touch disk; the on-disk JSON is
+    the durable copy, re-read only on heartbeat when its mtime moved (another
+    process wrote it).
     """
 
     def __new__(cls) -> "TelemetryService":
@@ -85,6 +92,9 @@ class TelemetryService:
             return
         self._initialized = True
         _PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        # device_id -> (profile, mtime_ns of the file it was read from; 0 = no file)
+        self._profiles: Dict[str, tuple[DeviceThermalProfile, int]] = {}
+        self._cache_lock = threading.Lock()
 
     def _lock(self) -> FileLock:
         return FileLock(str(_LOCK_FILE), timeout=5)
@@ -93,8 +103,16 @@ class TelemetryService:
 
     def ingest_thermal_event(self, event: ThermalEvent) -> DeviceThermalProfile:
         """Process a thermal event and update the device's thermal profile."""
-        profile = self.get_profile(event.device_id)
+        with self._lock():
+            # Read-modify-write under the file lock: start from what is on
+            # disk, so an event ingested by another process is not lost.
+            profile = copy.copy(self.refresh_profile(event.device_id))
+            self._apply_event(profile, event)
+            self._write_profile(profile)
+        return profile
 
+    @classmethod
+    def _apply_event(cls, profile: DeviceThermalProfile, event: ThermalEvent) -> None:
         profile.total_events += 1
         profile.last_event_at = event.timestamp.isoformat()
 
@@ -127,11 +145,8 @@ class TelemetryService:
             profile.worst_battery_temp = max(profile.worst_battery_temp, event.trigger_value)
 
         # Recompute health score and duty cycle
-        profile.health_score = self._compute_health_score(profile)
-        profile.recommended_duty_cycle_min = self._compute_duty_cycle(profile)
-
-        self._save_profile(profile)
-        return profile
+        profile.health_score = cls._compute_health_score(profile)
+        profile.recommended_duty_cycle_min = cls._compute_duty_cycle(profile)
 
     # ── Health score ─────────────────────────────────────────
 
@@ -179,14 +194,40 @@ class TelemetryService:
     # ── Profile CRUD ─────────────────────────────────────────
 
     def get_profile(self, device_id: str) -> DeviceThermalProfile:
+        """Cached profile; disk is only read on the first access per device."""
+        cached = self._profiles.get(device_id)
+        if cached is not None:
+            return cached[0]
+        return self._load_profile(device_id)
+
+    def refresh_profile(self, device_id: str) -> DeviceThermalProfile:
+        """Heartbeat hook: re-read the profile only if its file changed on disk."""
+        cached = self._profiles.get(device_id)
+        if cached is None:
+            return self._load_profile(device_id)
         path = _PROFILES_DIR / f"{device_id}.json"
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        if mtime_ns == cached[1]:
+            return cached[0]
+        return self._load_profile(device_id)
+
+    def _load_profile(self, device_id: str) -> DeviceThermalProfile:
+        path = _PROFILES_DIR / f"{device_id}.json"
+        profile = DeviceThermalProfile(device_id)
+        mtime_ns = 0
         if path.exists():
             try:
+                mtime_ns = path.stat().st_mtime_ns
                 data = json.loads(path.read_text(encoding="utf-8"))
-                return DeviceThermalProfile(device_id, data)
+                profile = DeviceThermalProfile(device_id, data)
             except Exception:
                 logger.warning("Failed to load profile for %s", device_id)
-        return DeviceThermalProfile(device_id)
+        with self._cache_lock:
+            self._profiles[device_id] = (profile, mtime_ns)
+        return profile
 
     def list_profiles(self) -> List[DeviceThermalProfile]:
         profiles: List[DeviceThermalProfile] = []
@@ -199,13 +240,16 @@ class TelemetryService:
                 continue
         return profiles
 
-    def _save_profile(self, profile: DeviceThermalProfile) -> None:
-        with self._lock():
-            path = _PROFILES_DIR / f"{profile.device_id}.json"
-            path.write_text(
-                json.dumps(profile.to_dict(), indent=2, default=str),
-                encoding="utf-8",
-            )
+    def _write_profile(self, profile: DeviceThermalProfile) -> None:
+        """Write and cache *profile*; the caller holds the file lock."""
+        path = _PROFILES_DIR / f"{profile.device_id}.json"
+        path.write_text(
+            json.dumps(profile.to_dict(), indent=2, default=str),
+            encoding="utf-8",
+        )
+        mtime_ns = path.stat().st_mtime_ns
+        with self._cache_lock:
+            self._profiles[profile.device_id] = (profile, mtime_ns)
 
     # ── GICS integration ─────────────────────────────────────
 
@@ -1,12 +1,15 @@
 """Dynamic model inventory built from user's configured providers."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 import time
 from dataclasses import dataclass, field
 from typing import Optional
 
+from .routing_scoreboard import RoutingScoreboard
+
 logger = logging.getLogger("orchestrator.model_inventory")
 
 CACHE_TTL = 300  # 5 minutes
@@ -179,9 +182,18 @@ class ModelInventoryService:
                         await bes.seed_gics_priors(gics, ptype, model_ids, profiles)
                 except Exception:
                     logger.debug("GICS prior seeding skipped (daemon may be unavailable)")
+                RoutingScoreboard.load_benchmarks(profiles)
         except Exception:
             logger.debug("Benchmark enrichment skipped", exc_info=True)
 
+        # Mirror the (freshly seeded) GICS evidence for every model so routing
+        # decisions do not read GICS per candidate.
+        try:
+            from .model_router_service import TASK_REQUIREMENTS
+            await asyncio.to_thread(RoutingScoreboard.prewarm, entries, list(TASK_REQUIREMENTS))
+        except Exception:
+            logger.debug("Routing scoreboard prewarm skipped", exc_info=True)
+
         return entries
 
     @classmethod
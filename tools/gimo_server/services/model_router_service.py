@@ -256,13 +256,12 @@ class ModelRouterService:
 
     @classmethod
     def _gics_success_adjustment(cls, task_type: str, entry: ModelEntry) -> tuple[float, list[str]]:
-        from .capability_profile_service import CapabilityProfileService
-        from .ops import OpsService
+        from .routing_scoreboard import RoutingScoreboard
 
         reasons: list[str] = []
         adjustment = 0.0
 
-        reliability = OpsService.get_model_reliability(provider_type=entry.provider_type, model_id=entry.model_id) or {}
+        reliability = RoutingScoreboard.reliability(entry.provider_type, entry.model_id) or {}
         if reliability:
             score = max(0.0, min(1.0, float(reliability.get("score", 0.5) or 0.5)))
             adjustment += (score - 0.5) * 0.4
@@ -275,11 +274,7 @@ class ModelRouterService:
                 reasons.append("gics_anomaly_detected=true")
                 reasons.append("gics_anomaly_penalty=0.25")
 
-        capability = CapabilityProfileService.get_capability(
-            provider_type=entry.provider_type,
-            model_id=entry.model_id,
-            task_type=task_type,
-        )
+        capability = RoutingScoreboard.capability(entry.provider_type, entry.model_id, task_type)
         if capability and capability.samples >= 2:
             capability_adjust = max(-0.2, min(0.2, (capability.success_rate - 0.5) * 0.4))
             adjustment += capability_adjust
@@ -308,20 +303,27 @@ class ModelRouterService:
 
         Fallback silencioso: modelo sin benchmark profile → adjustment 0.
         """
-        reasons: list[str] = []
         try:
             from .benchmark_enrichment_service import lookup_model as _bench_lookup
+            from .routing_scoreboard import RoutingScoreboard
         except Exception:  # noqa: BLE001
-            return 0.0, reasons
+            return 0.0, []
 
         try:
-            profile = _bench_lookup(entry.model_id)
+            profile = _bench_lookup(entry.model_id, RoutingScoreboard.benchmark_profiles())
         except Exception as exc:  # noqa: BLE001
             logger.debug(
                 "benchmark lookup failed for model=%s: %s", entry.model_id, exc
             )
-            return 0.0, reasons
+            return 0.0, []
+        return cls._benchmark_adjustment_for_profile(task_type, profile)
 
+    @classmethod
+    def _benchmark_adjustment_for_profile(
+        cls, task_type: str, profile: Any
+    ) -> tuple[float, list[str]]:
+        """Ajuste ±0.2 por la dimensión del task_type de un profile ya resuelto."""
+        reasons: list[str] = []
         if profile is None:
             return 0.0, reasons
 
@@ -352,6 +354,36 @@ class ModelRouterService:
         )
         return adjustment, reasons
 
+    @classmethod
+    def _route_score(cls, task_type: str, entry: ModelEntry) -> Any:
+        """GICS + benchmark adjustments for *entry*, from the routing scoreboard.
+
+        Recomputed only when the scoreboard has no valid score, i.e. after an
+        outcome event, an inventory/benchmark refresh or the TTL.
+        """
+        from .routing_scoreboard import RouteScore, RoutingScoreboard
+
+        score = RoutingScoreboard.cached_score(task_type, entry.provider_type, entry.model_id)
+        if score is not None:
+            return score
+        gics_adjustment, gics_reasons = cls._gics_success_adjustment(task_type, entry)
+        # BUGS_LATENTES §H5: benchmark dimensions per-request (ordinal 0-1)
+        try:
+            profile = RoutingScoreboard.benchmark_profile(entry.model_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("benchmark lookup failed for model=%s: %s", entry.model_id, exc)
+            profile = None
+        bench_adjustment, bench_reasons = cls._benchmark_adjustment_for_profile(task_type, profile)
+        score = RouteScore(
+            gics_adjustment=gics_adjustment,
+            gics_reasons=tuple(gics_reasons),
+            anomaly="gics_anomaly_detected=true" in gics_reasons,
+            benchmark_adjustment=bench_adjustment,
+            benchmark_reasons=tuple(bench_reasons),
+        )
+        RoutingScoreboard.store_score(task_type, entry.provider_type, entry.model_id, score)
+        return score
+
     @classmethod
     def choose_binding_from_candidates(
         cls,
@@ -395,14 +427,12 @@ class ModelRouterService:
             topology_bonus = 0.0
             if preferred_provider and binding.provider_id == preferred_provider:
                 topology_bonus = 1.0 if not preferred_model or binding.model == preferred_model else 0.7
-            gics_adjustment, gics_reasons = cls._gics_success_adjustment(normalized_task_type, entry)
+            score = cls._route_score(normalized_task_type, entry)
+            gics_adjustment, gics_reasons = score.gics_adjustment, list(score.gics_reasons)
             # BUGS_LATENTES §H7 — propaga anomaly flag + alternative del GICS
             # al consumidor via RoutingDecision (advisory, no bloquea).
-            entry_anomaly = any("gics_anomaly_detected=true" in r for r in gics_reasons)
-            # BUGS_LATENTES §H5: benchmark dimensions per-request (ordinal 0-1)
-            bench_adjustment, bench_reasons = cls._benchmark_dimension_adjustment(
-                normalized_task_type, entry
-            )
+            entry_anomaly = score.anomaly
+            bench_adjustment, bench_reasons = score.benchmark_adjustment, list(score.benchmark_reasons)
             success_score = topology_bonus + gics_adjustment + bench_adjustment
             quality_score = (1.0 if entry.quality_tier >= tier_min else 0.0) + (entry.quality_tier / 100.0)
             latency_score = (1.0 if entry.is_local else 0.0) + (0.0 if not entry.size_gb else max(0.0, 0.5 - (entry.size_gb / 100.0)))
@@ -576,15 +606,14 @@ class ModelRouterService:
         """
         try:
             from .ops import OpsService
+            from .routing_scoreboard import RoutingScoreboard
             gics = getattr(OpsService, "_gics", None)
             if not gics:
                 return candidates
             filtered = []
             for m in candidates:
                 try:
-                    rel = gics.get_model_reliability(
-                        provider_type=m.provider_id, model_id=m.model_id
-                    )
+                    rel = RoutingScoreboard.reliability(m.provider_id, m.model_id)
                     if rel and rel.get("anomaly", False):
                         reason_parts.append(f"gics_anomaly_excluded:{m.model_id}")
                         continue
@@ -1,13 +1,29 @@
-"""Global Event Emitter for GIMO with circuit breaker and coalescing."""
+"""Global Event Emitter for GIMO with circuit breaker and coalescing.
+
+Each event is serialised once into an :class:`EventMessage` (a ``str`` that
+also carries its id, type and a pre-built SSE frame) and the same object is
+pushed to every matching subscriber.  Subscribers may register a
+:class:`SubscriptionFilter` so a UI watching one thread never receives the
+rest of the process's heartbeats, and choose a slow-consumer policy:
+
+- ``coalesce`` (default): on a full queue drop the oldest queued event and
+  enqueue the newest.
+- ``drop``: on a full queue drop the new event.
+
+Both feed the per-subscriber circuit breaker.  The replay buffer is a
+fixed-size ring indexed by the (contiguous) event id.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import logging
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional
 
 logger = logging.getLogger("orchestrator.services.notifications")
 
@@ -15,15 +31,111 @@ CIRCUIT_BREAKER_THRESHOLD = 5
 CIRCUIT_BREAKER_COOLDOWN = 30.0
 COALESCE_INTERVAL = 0.1  # 100ms
 
+SLOW_POLICY_COALESCE = "coalesce"
+SLOW_POLICY_DROP = "drop"
+SLOW_POLICIES = frozenset({SLOW_POLICY_COALESCE, SLOW_POLICY_DROP})
+
+_SCOPE_KEYS = ("run_id", "thread_id", "plan_id")
+
+
+class EventMessage(str):
+    """Serialised event shared by every subscriber queue.
+
+    Behaves as the JSON string (existing consumers ``json.loads`` it or send
+    it verbatim) while exposing ``event_id``/``event_type`` and a cached SSE
+    frame so stream handlers don't re-parse per subscriber.
+    """
+
+    event_id: int
+    event_type: str
+    scope: Dict[str, Any]
+
+    def __new__(cls, event_id: int, event_type: str, payload: Dict[str, Any]) -> "EventMessage":
+        obj = super().__new__(cls, json.dumps({"id": event_id, "event": event_type, "data": payload}))
+        obj.event_id = event_id
+        obj.event_type = event_type
+        # Filter keys only, so replay can re-filter without re-parsing.
+        obj.scope = {k: payload[k] for k in _SCOPE_KEYS if k in payload}
+        obj._sse_frame = None
+        return obj
+
+    @property
+    def sse_frame(self) -> str:
+        if self._sse_frame is None:
+            self._sse_frame = f"id: {self.event_id}\ndata: {self}\n\n"
+        return self._sse_frame
+
+
+@dataclass(frozen=True)
+class SubscriptionFilter:
+    """Server-side event filter. ``None`` fields match anything.
+
+    Scope fields (``run_id``/``thread_id``/``plan_id``) match against the
+    same keys in the event payload; events lacking the key do not match.
+    """
+
+    event_types: Optional[FrozenSet[str]] = None
+    run_id: Optional[str] = None
+    thread_id: Optional[str] = None
+    plan_id: Optional[str] = None
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        event_types: Optional[Iterable[str]] = None,
+        run_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        plan_id: Optional[str] = None,
+    ) -> Optional["SubscriptionFilter"]:
+        types = frozenset(t for t in (event_types or ()) if t) or None
+        if types is None and not (run_id or thread_id or plan_id):
+            return None
+        return cls(types, run_id or None, thread_id or None, plan_id or None)
+
+    def matches(self, event_type: str, payload: Dict[str, Any]) -> bool:
+        if self.event_types is not None and event_type not in self.event_types:
+            return False
+        if self.run_id is not None and payload.get("run_id") != self.run_id:
+            return False
+        if self.thread_id is not None and payload.get("thread_id") != self.thread_id:
+            return False
+        if self.plan_id is not None and payload.get("plan_id") != self.plan_id:
+            return False
+        return True
+
 
 @dataclass
 class SubscriberState:
     queue: asyncio.Queue
+    filter: Optional[SubscriptionFilter] = None
+    slow_policy: str = SLOW_POLICY_COALESCE
     consecutive_failures: int = 0
     circuit_open: bool = False
     circuit_opened_at: float = 0.0
     total_drops: int = 0
     total_published: int = 0
+    total_coalesced: int = 0
+    total_filtered: int = 0
+    connected_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        flt = self.filter
+        return {
+            "slow_policy": self.slow_policy,
+            "filter": None if flt is None else {
+                "event_types": sorted(flt.event_types) if flt.event_types else None,
+                "run_id": flt.run_id,
+                "thread_id": flt.thread_id,
+                "plan_id": flt.plan_id,
+            },
+            "queued": self.queue.qsize(),
+            "published": self.total_published,
+            "dropped": self.total_drops,
+            "coalesced": self.total_coalesced,
+            "filtered": self.total_filtered,
+            "circuit_open": self.circuit_open,
+        }
 
 
 class NotificationService:
@@ -37,14 +149,19 @@ class NotificationService:
         "forced_disconnects": 0,
         "circuit_opens": 0,
         "coalesced": 0,
+        "filtered": 0,
+        "serialized": 0,
     }
     _pending: Dict[str, Dict[str, Any]] = {}
     _flush_task: Optional[asyncio.Task] = None
+    # Loop serving the subscriber queues; lets sync code on worker threads publish.
+    _loop: Optional[asyncio.AbstractEventLoop] = None
 
     # ── SSE event IDs + replay buffer ────────────────────────────────────────
+    # Ids are contiguous, so the ring is addressed as id - first_id_in_ring.
     _next_event_id: int = 1
-    _replay_buffer: List[tuple[int, str]] = []  # (id, serialised message)
     _replay_buffer_max: int = 500
+    _replay_buffer: Deque[EventMessage] = deque(maxlen=500)
 
     @classmethod
     def configure(cls, *, queue_maxsize: int | None = None):
@@ -61,13 +178,16 @@ class NotificationService:
             "forced_disconnects": 0,
             "circuit_opens": 0,
             "coalesced": 0,
+            "filtered": 0,
+            "serialized": 0,
         }
         cls._pending = {}
         if cls._flush_task and not cls._flush_task.done():
             cls._flush_task.cancel()
         cls._flush_task = None
+        cls._loop = None
         cls._next_event_id = 1
-        cls._replay_buffer = []
+        cls._replay_buffer = deque(maxlen=cls._replay_buffer_max)
 
     @classmethod
     def get_metrics(cls) -> Dict[str, Any]:
@@ -81,24 +201,52 @@ class NotificationService:
         }
 
     @classmethod
-    async def subscribe(cls, *, last_event_id: int = 0) -> asyncio.Queue:
+    def get_subscriber_stats(cls) -> List[Dict[str, Any]]:
+        return [sub.to_dict() for sub in cls._subscribers]
+
+    @classmethod
+    async def subscribe(
+        cls,
+        *,
+        last_event_id: int = 0,
+        event_types: Optional[Iterable[str]] = None,
+        run_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        plan_id: Optional[str] = None,
+        slow_policy: str = SLOW_POLICY_COALESCE,
+    ) -> asyncio.Queue:
+        if slow_policy not in SLOW_POLICIES:
+            raise ValueError(f"Unknown slow_policy {slow_policy!r}; expected one of {sorted(SLOW_POLICIES)}")
         queue: asyncio.Queue = asyncio.Queue(maxsize=cls._queue_maxsize)
-        state = SubscriberState(queue=queue)
+        flt = SubscriptionFilter.build(
+            event_types=event_types, run_id=run_id, thread_id=thread_id, plan_id=plan_id,
+        )
+        state = SubscriberState(queue=queue, filter=flt, slow_policy=slow_policy)
         cls._subscribers.append(state)
+        cls._loop = asyncio.get_running_loop()
 
         # Replay missed events if client reconnected with Last-Event-ID
         if last_event_id > 0:
-            for eid, msg in cls._replay_buffer:
-                if eid > last_event_id:
-                    try:
-                        queue.put_nowait(msg)
-                    except asyncio.QueueFull:
-                        break
+            for msg in cls._replay_since(last_event_id):
+                if flt is not None and not flt.matches(msg.event_type, msg.scope):
+                    continue
+                try:
+                    queue.put_nowait(msg)
+                except asyncio.QueueFull:
+                    break
 
         logger.info("New SSE client connected (last_event_id=%d). Total: %d", last_event_id, len(cls._subscribers))
         cls._ensure_flush_task()
         return queue
 
+    @classmethod
+    def _replay_since(cls, last_event_id: int) -> Iterable[EventMessage]:
+        ring = cls._replay_buffer
+        if not ring:
+            return ()
+        start = max(0, last_event_id - ring[0].event_id + 1)
+        return itertools.islice(ring, start, None)
+
     @classmethod
     def unsubscribe(cls, queue: asyncio.Queue):
         cls._subscribers = [s for s in cls._subscribers if s.queue is not queue]
@@ -117,26 +265,49 @@ class NotificationService:
         )
 
         if is_critical:
+            # A pending coalesced event for the same key is superseded, not reordered after it.
+            cls._pending.pop(f"{payload.get('run_id', '_')}:{event_type}", None)
             await cls._broadcast_now(event_type, payload)
         else:
             coalesce_key = f"{payload.get('run_id', '_')}:{event_type}"
             cls._pending[coalesce_key] = {"event": event_type, "data": payload}
             cls._metrics["coalesced"] += 1
 
+    @classmethod
+    def publish_nowait(cls, event_type: str, payload: Dict[str, Any]) -> None:
+        """Schedule ``publish`` from sync code, on the event loop or a worker thread.
+
+        A no-op without subscribers, or when no loop is serving them.
+        """
+        if not cls._subscribers:
+            return
+        loop = cls._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and (loop is None or running is loop):
+            running.create_task(cls.publish(event_type, payload))
+        elif loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(cls.publish(event_type, payload), loop)
+
     @classmethod
     async def _broadcast_now(cls, event_type: str, payload: Dict[str, Any]):
         event_id = cls._next_event_id
         cls._next_event_id += 1
-        message = json.dumps({"id": event_id, "event": event_type, "data": payload})
+        message = EventMessage(event_id, event_type, payload)
+        cls._metrics["serialized"] += 1
 
-        # Append to replay buffer (bounded ring)
-        cls._replay_buffer.append((event_id, message))
-        if len(cls._replay_buffer) > cls._replay_buffer_max:
-            cls._replay_buffer = cls._replay_buffer[-cls._replay_buffer_max:]
+        # Append to replay buffer (fixed-size ring)
+        cls._replay_buffer.append(message)
 
         stale: List[SubscriberState] = []
 
         for sub in list(cls._subscribers):
+            if sub.filter is not None and not sub.filter.matches(event_type, payload):
+                sub.total_filtered += 1
+                cls._metrics["filtered"] += 1
+                continue
             if sub.circuit_open:
                 elapsed = time.monotonic() - sub.circuit_opened_at
                 if elapsed < CIRCUIT_BREAKER_COOLDOWN:
@@ -162,12 +333,13 @@ class NotificationService:
                         "Circuit breaker opened for subscriber (drops=%d)",
                         sub.total_drops,
                     )
-                else:
+                elif sub.slow_policy == SLOW_POLICY_COALESCE:
                     # Coalescing: drop oldest, push newest
                     try:
                         sub.queue.get_nowait()
                         sub.queue.put_nowait(message)
                         sub.total_published += 1
+                        sub.total_coalesced += 1
                         cls._metrics["published"] += 1
                     except (asyncio.QueueEmpty, asyncio.QueueFull):
                         stale.append(sub)
@@ -4,11 +4,12 @@ import os
 import json
 import logging
 import threading
+import time
 from collections import Counter
 from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger("orchestrator.observability")
 
@@ -22,6 +23,7 @@ from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExport
 
 from ...config import OPS_DATA_DIR
 from ..run_lifecycle import is_active_run_status
+from .quantile_sketch import WindowedSketch
 
 
 from opentelemetry.sdk.trace import SpanProcessor
@@ -72,7 +74,8 @@ class UISpanProcessor(SpanProcessor):
             item["duration_ms"] = int((span.end_time - span.start_time) / 1e6)
             item["event"] = "end"
 
-        self.ui_spans.append(item)
+        with ObservabilityService._lock:
+            ObservabilityService._append_ui_span(item)
 
 
 class ObservabilityService:
@@ -96,7 +99,15 @@ class ObservabilityService:
         "tokens_total": 0,
         "cost_total_usd": 0.0,
     }
-    _stage_latency: Dict[str, List[float]] = {}
+    # stage -> windowed latency sketch (constant memory per stage)
+    _stage_latency: Dict[str, WindowedSketch] = {}
+    # trace_id -> spans (insertion order), kept in step with _ui_spans
+    _trace_index: Dict[str, Deque[Dict[str, Any]]] = {}
+    _trace_summaries: Dict[str, Dict[str, Any]] = {}
+    # run_id -> (status, heartbeat_at, started_at, created_at); None = not seeded
+    _run_health_index: Optional[Dict[str, Tuple[str, Any, Any, Any]]] = None
+    _run_health_seeded_at: float = 0.0
+    _run_health_resync_seconds: float = 300.0
     _run_outcome_counters: Counter[str] = Counter()
     _error_category_counters: Counter[str] = Counter()
     
@@ -256,7 +267,7 @@ class ObservabilityService:
             cls._initialize_sdk()
 
         with cls._lock:
-            cls._ui_spans.append(
+            cls._append_ui_span(
                 {
                     "kind": "handoff",
                     "workflow_id": workflow_id,
@@ -313,7 +324,10 @@ class ObservabilityService:
             cls._structured_events.append(event)
 
             if stage:
-                cls._stage_latency.setdefault(stage, []).append(latency_ms)
+                sketch = cls._stage_latency.get(stage)
+                if sketch is None:
+                    sketch = cls._stage_latency[stage] = WindowedSketch()
+                sketch.add(latency_ms)
 
             if status == "FALLBACK_MODEL_USED":
                 cls._run_outcome_counters["fallback"] += 1
@@ -474,29 +488,100 @@ class ObservabilityService:
         return alerts
 
     @classmethod
-    def _compute_run_health_metrics(cls) -> Dict[str, Any]:
-        """Best-effort run-health snapshot used for P2 operational SLI/SLO monitoring."""
-        now = datetime.now(timezone.utc)
+    def observe_run(
+        cls,
+        run_id: str,
+        *,
+        status: Optional[str] = None,
+        heartbeat_at: Any = None,
+        started_at: Any = None,
+        created_at: Any = None,
+    ) -> None:
+        """Fold a run status/heartbeat event into the cached run-health index.
+
+        Called by the run store on every status change and heartbeat so
+        ``get_metrics`` does not have to list every run on each scrape.
+        Before the index is seeded (first scrape) events are ignored — the
+        seed reads the store itself.
+        """
+        with cls._lock:
+            index = cls._run_health_index
+            if index is None:
+                return
+            prev = index.get(run_id)
+            if prev is None:
+                prev = ("pending", None, None, _as_datetime(created_at) or datetime.now(timezone.utc))
+            index[run_id] = (
+                status or prev[0],
+                _as_datetime(heartbeat_at) or prev[1],
+                _as_datetime(started_at) or prev[2],
+                _as_datetime(created_at) or prev[3],
+            )
+
+    @classmethod
+    def forget_run(cls, run_id: str) -> None:
+        with cls._lock:
+            if cls._run_health_index is not None:
+                cls._run_health_index.pop(run_id, None)
+
+    @classmethod
+    def _seed_run_health_index(cls) -> Optional[Dict[str, Tuple[str, Any, Any, Any]]]:
         try:
             from ..ops import OpsService
 
             runs = OpsService.list_runs()
         except Exception:
-            return {
-                "active_runs": 0,
-                "terminal_runs": 0,
-                "stuck_runs": 0,
-                "stuck_run_ids": [],
-                "run_completion_ratio": 1.0,
-                "stuck_run_threshold_seconds": int(cls._stuck_run_threshold_seconds),
-            }
+            return None
+        index = {
+            str(r.id): (
+                str(getattr(r, "status", "") or ""),
+                getattr(r, "heartbeat_at", None),
+                getattr(r, "started_at", None),
+                getattr(r, "created_at", None),
+            )
+            for r in runs
+        }
+        with cls._lock:
+            cls._run_health_index = index
+            cls._run_health_seeded_at = time.monotonic()
+        return index
+
+    @classmethod
+    def _compute_run_health_metrics(cls) -> Dict[str, Any]:
+        """Best-effort run-health snapshot used for P2 operational SLI/SLO monitoring.
+
+        Served from the event-maintained index; the run store is only listed
+        to seed it and then every ``_run_health_resync_seconds`` to pick up
+        writes made by other processes.
+        """
+        now = datetime.now(timezone.utc)
+        with cls._lock:
+            index = cls._run_health_index
+            stale = time.monotonic() - cls._run_health_seeded_at >= cls._run_health_resync_seconds
+            entries = list(index.items()) if index is not None and not stale else None
+        if entries is None:
+            seeded = cls._seed_run_health_index()
+            if seeded is None:
+                return {
+                    "active_runs": 0,
+                    "terminal_runs": 0,
+                    "stuck_runs": 0,
+                    "stuck_run_ids": [],
+                    "run_completion_ratio": 1.0,
+                    "stuck_run_threshold_seconds": int(cls._stuck_run_threshold_seconds),
+                }
+            entries = list(seeded.items())
 
-        active_runs = [r for r in runs if is_active_run_status(getattr(r, "status", ""))]
-        terminal_runs = [r for r in runs if r not in active_runs]
+        active_runs: List[str] = []
+        terminal_runs = 0
         stuck_run_ids: List[str] = []
 
-        for run in active_runs:
-            anchor = getattr(run, "heartbeat_at", None) or getattr(run, "started_at", None) or getattr(run, "created_at", None)
+        for run_id, (status, heartbeat_at, started_at, created_at) in entries:
+            if not is_active_run_status(status):
+                terminal_runs += 1
+                continue
+            active_runs.append(run_id)
+            anchor = heartbeat_at or started_at or created_at
             if not anchor:
                 continue
             try:
@@ -504,14 +589,14 @@ class ObservabilityService:
             except Exception:
                 continue
             if age_s >= float(cls._stuck_run_threshold_seconds):
-                stuck_run_ids.append(str(run.id))
+                stuck_run_ids.append(run_id)
 
-        total = len(active_runs) + len(terminal_runs)
-        completion_ratio = float(len(terminal_runs)) / float(total) if total else 1.0
+        total = len(active_runs) + terminal_runs
+        completion_ratio = float(terminal_runs) / float(total) if total else 1.0
 
         return {
             "active_runs": len(active_runs),
-            "terminal_runs": len(terminal_runs),
+            "terminal_runs": terminal_runs,
             "stuck_runs": len(stuck_run_ids),
             "stuck_run_ids": stuck_run_ids,
             "run_completion_ratio": completion_ratio,
@@ -528,9 +613,9 @@ class ObservabilityService:
             human_approval_rate = float(cls._run_outcome_counters.get("human_approval_required", 0)) / total_outcomes
             policy_block_rate = float(cls._run_outcome_counters.get("policy_block", 0)) / total_outcomes
 
-            latency_by_stage = {
-                stage: (sum(values) / len(values) if values else 0.0)
-                for stage, values in cls._stage_latency.items()
+            latency_by_stage = {stage: sketch.mean for stage, sketch in cls._stage_latency.items()}
+            latency_quantiles_by_stage = {
+                stage: sketch.summary() for stage, sketch in cls._stage_latency.items()
             }
             avg_latency = sum(latency_by_stage.values()) / len(latency_by_stage) if latency_by_stage else 0.0
             error_rate = float(metrics.get("nodes_failed", 0)) / max(1, int(metrics.get("nodes_total", 0)))
@@ -540,6 +625,7 @@ class ObservabilityService:
                 {
                     "schema_version": cls.OBS_LOG_SCHEMA_VERSION,
                     "latency_ms_by_stage": latency_by_stage,
+                    "latency_quantiles_by_stage": latency_quantiles_by_stage,
                     "fallback_rate": fallback_rate,
                     "human_approval_required_rate": human_approval_rate,
                     "policy_block_rate": policy_block_rate,
@@ -624,21 +710,51 @@ class ObservabilityService:
         except Exception:
             return 0
 
+    @classmethod
+    def _append_ui_span(cls, item: Dict[str, Any]) -> None:
+        """Append to ``_ui_spans`` keeping the trace index in step. Caller holds ``_lock``."""
+        spans = cls._ui_spans
+        if spans.maxlen is not None and len(spans) >= spans.maxlen:
+            evicted_trace = spans[0].get("trace_id")
+            bucket = cls._trace_index.get(evicted_trace) if evicted_trace else None
+            if bucket:
+                bucket.popleft()
+                cls._trace_summaries.pop(evicted_trace, None)
+                if not bucket:
+                    del cls._trace_index[evicted_trace]
+        spans.append(item)
+        trace_id = item.get("trace_id")
+        if trace_id:
+            bucket = cls._trace_index.get(trace_id)
+            if bucket is None:
+                bucket = cls._trace_index[trace_id] = deque()
+            bucket.append(item)
+            cls._trace_summaries.pop(trace_id, None)
+
     @classmethod
     def list_traces(cls, *, limit: int = 20) -> List[Dict[str, Any]]:
-        """Returns a list of aggregated traces (latest first)."""
+        """Returns a list of aggregated traces (latest first).
+
+        Per-trace aggregates are cached and only rebuilt for traces that
+        received a span since the last call.
+        """
         with cls._lock:
-            raw_spans = list(cls._ui_spans)
-        
-        traces = cls._group_spans(raw_spans)
-        result = cls._finalize_traces(traces)
-        result.sort(key=lambda x: x["start_time"], reverse=True)
-        return result[:limit]
+            summaries: List[Dict[str, Any]] = []
+            for trace_id, bucket in cls._trace_index.items():
+                summary = cls._trace_summaries.get(trace_id)
+                if summary is None:
+                    grouped = cls._group_spans(list(bucket))
+                    summary = cls._finalize_traces(grouped)[0]
+                    cls._trace_summaries[trace_id] = summary
+                summaries.append(summary)
+
+        summaries.sort(key=lambda x: x["start_time"], reverse=True)
+        return [dict(t, spans=list(t["spans"])) for t in summaries[:limit]]
 
     @classmethod
     def get_trace(cls, trace_id: str) -> Optional[Dict[str, Any]]:
         with cls._lock:
-            raw_spans = [s for s in cls._ui_spans if s["trace_id"] == trace_id]
+            raw_spans = list(cls._trace_index.get(trace_id) or ())
         
         if not raw_spans:
             return None
@@ -811,7 +927,7 @@ class ObservabilityService:
             **(attributes or {}),
         }
         with cls._lock:
-            cls._ui_spans.append(span)
+            cls._append_ui_span(span)
             if (attributes or {}).get("status") == "failed":
                 cls._ui_metrics["nodes_failed"] += 1
             if kind == "node":
@@ -826,6 +942,10 @@ class ObservabilityService:
             cls._structured_events.clear()
             cls._active_spans.clear()
             cls._stage_latency = {}
+            cls._trace_index = {}
+            cls._trace_summaries = {}
+            cls._run_health_index = None
+            cls._run_health_seeded_at = 0.0
             cls._run_outcome_counters = Counter()
             cls._error_category_counters = Counter()
             # Reset UI internal metrics
@@ -833,3 +953,12 @@ class ObservabilityService:
                 cls._ui_metrics[k] = 0.0 if isinstance(cls._ui_metrics[k], float) else 0
             # Keep _initialized=True so the SDK is not re-initialized,
             # but ensure the UISpanProcessor still references our reset dicts.
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
@@ -0,0 +1,154 @@
+"""Bounded-memory streaming quantiles for stage latencies.
+
+``DDSketch`` is a log-bucketed histogram with a relative-accuracy guarantee:
+every reported quantile is within ``relative_accuracy`` of the true sample
+value.  Sketches merge by adding bucket counts, so per-window sketches can be
+combined at query time.  ``max_buckets`` caps memory; when exceeded the lowest
+buckets are collapsed (accuracy degrades only for the smallest values, which
+matter least for latency SLOs).
+
+``WindowedSketch`` keeps a ring of per-window sketches (default 15 × 60 s)
+plus lifetime count/sum, so memory is constant regardless of sample volume.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Optional, Tuple
+
+
+class DDSketch:
+    """Mergeable relative-error quantile sketch (non-negative values)."""
+
+    __slots__ = ("relative_accuracy", "max_buckets", "_gamma", "_log_gamma",
+                 "_bins", "_zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        value = float(value)
+        if math.isnan(value):
+            return
+        if value <= 0.0:
+            value = 0.0
+            self._zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._bins[key] = self._bins.get(key, 0) + 1
+            if len(self._bins) > self.max_buckets:
+                self._collapse()
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch") -> None:
+        if other._gamma != self._gamma:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, n in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + n
+        if len(self._bins) > self.max_buckets:
+            self._collapse()
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        q = min(max(q, 0.0), 1.0)
+        rank = q * (self.count - 1)
+        if rank < self._zero_count:
+            return 0.0
+        seen = self._zero_count
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if seen > rank:
+                estimate = 2.0 * self._gamma ** key / (self._gamma + 1.0)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def bucket_count(self) -> int:
+        return len(self._bins)
+
+    def _collapse(self) -> None:
+        keys = sorted(self._bins)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        folded = sum(self._bins.pop(k) for k in keys[:excess])
+        self._bins[target] += folded
+
+
+class WindowedSketch:
+    """Ring of per-window ``DDSketch`` instances plus lifetime count/sum."""
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 60.0,
+        num_windows: int = 15,
+        relative_accuracy: float = 0.01,
+        max_buckets: int = 2048,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = float(window_seconds)
+        self.num_windows = int(num_windows)
+        self._relative_accuracy = relative_accuracy
+        self._max_buckets = max_buckets
+        self._clock = clock
+        self._windows: Deque[Tuple[float, DDSketch]] = deque(maxlen=self.num_windows)
+        self.total_count = 0
+        self.total_sum = 0.0
+
+    def add(self, value: float) -> None:
+        now = self._clock()
+        start = math.floor(now / self.window_seconds) * self.window_seconds
+        if not self._windows or self._windows[-1][0] != start:
+            self._windows.append((start, DDSketch(self._relative_accuracy, self._max_buckets)))
+        self._windows[-1][1].add(value)
+        self.total_count += 1
+        self.total_sum += float(value)
+
+    def merged(self, horizon_seconds: Optional[float] = None) -> DDSketch:
+        """Merge the windows that started within *horizon_seconds* (default: all kept)."""
+        horizon = horizon_seconds if horizon_seconds is not None else self.window_seconds * self.num_windows
+        cutoff = self._clock() - horizon
+        out = DDSketch(self._relative_accuracy, self._max_buckets)
+        for start, sketch in self._windows:
+            if start + self.window_seconds > cutoff:
+                out.merge(sketch)
+        return out
+
+    @property
+    def mean(self) -> float:
+        return self.total_sum / self.total_count if self.total_count else 0.0
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, float]:
+        merged = self.merged()
+        out: Dict[str, float] = {"count": merged.count}
+        for q in quantiles:
+            out[f"p{int(round(q * 100))}"] = round(merged.quantile(q), 3)
+        out["window_seconds"] = self.window_seconds * self.num_windows
+        return out
+
+    @property
+    def window_count(self) -> int:
+        return len(self._windows)
@@ -14,6 +14,13 @@ from ._base import _utcnow, _json_dump
 logger = logging.getLogger("orchestrator.ops")
 
 
+def _run_priority(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
 class RunMixin:
     """Run CRUD, event store, log store, and run lifecycle."""
 
@@ -84,6 +91,33 @@ class RunMixin:
         cls._persist_run(run)
         events_path.write_text("", encoding="utf-8")
 
+    @classmethod
+    def _notify_run_health(cls, run_id: str, *, forget: bool = False, **fields: Any) -> None:
+        """Push a run status/heartbeat change into ObservabilityService's run-health cache."""
+        try:
+            from ..observability_pkg.observability_service import ObservabilityService
+
+            if forget:
+                ObservabilityService.forget_run(run_id)
+            else:
+                ObservabilityService.observe_run(run_id, **fields)
+        except Exception:
+            logger.debug("run-health notify failed for %s", run_id, exc_info=True)
+
+    @classmethod
+    def _publish_run_status(cls, run: OpsRun) -> None:
+        """Announce the run's current status/stage as a ``run_status`` SSE event."""
+        try:
+            from ..notification_service import NotificationService
+
+            status = str(run.status)
+            payload: Dict[str, Any] = {"run_id": run.id, "status": status, "stage": run.stage}
+            if status in cls._TERMINAL_RUN_STATUSES:
+                payload["critical"] = True
+            NotificationService.publish_nowait("run_status", payload)
+        except Exception:
+            logger.debug("run_status publish failed for %s", run.id, exc_info=True)
+
     @classmethod
     def _persist_run(cls, run: OpsRun) -> None:
         payload = run.model_dump(mode="json")
@@ -200,82 +234,125 @@ class RunMixin:
         return [r for r in cls.list_runs() if r.status == status]
 
     @classmethod
-    def create_run(cls, approved_id: str) -> OpsRun:
+    def _active_run_for_key(cls, run_key: str) -> Optional[OpsRun]:
+        """Active run for *run_key*; a stale one (no heartbeat for > 10 mins) is
+        marked as errored and ignored."""
+        runs_for_key = cls._find_runs_by_run_key(run_key)
+        active = next((item for item in runs_for_key if cls._is_run_active(item)), None)
+
+        # STALE RUN RECOVERY: If a run is active but has no heartbeat for > 10 mins, treat it as orphaned
+        if active:
+            stale_threshold = _utcnow() - timedelta(minutes=10)
+            heartbeat = active.heartbeat_at or active.created_at
+            if heartbeat < stale_threshold:
+                logger.warning("Recovering stale run %s for run_key %s", active.id, run_key)
+                # Force move to error so it's no longer 'active'
+                cls._append_run_log_entry(active.id, level="ERROR", msg="Marked as STALE by new run attempt")
+                active.status = "error"
+                cls._persist_run(active)
+                cls._notify_run_health(active.id, status="error")
+                active = None # Allow new run
+        return active
+
+    @classmethod
+    async def create_run(cls, approved_id: str) -> OpsRun:
+        """Create a pending run for *approved_id*, provisioning its sandbox.
+
+        The sandbox comes from ``SandboxService.acquire_worktree_handle`` and is
+        provisioned before the OPS lock is taken, so git work never blocks the
+        event loop or other OPS writers; it is released again if the run
+        cannot be registered.
+        """
+        if approved_id.startswith("d_"):
+            raise PermissionError("Runs can only be created from approved_id")
+        approved = cls.get_approved(approved_id)
+        if not approved:
+            raise ValueError(f"Approved entry {approved_id} not found")
+
+        draft = cls.get_draft(approved.draft_id)
+        context = dict((draft.context if draft else {}) or {})
+        # R20-001: propagate operator_class from the draft into the stage
+        # context so the policy gate / intent classifier can whitelist
+        # cognitive_agent operators (MCP, agent SDK) and avoid the
+        # "fallback_to_most_restrictive_human_review" branch.
+        if draft is not None:
+            context["operator_class"] = str(
+                getattr(draft, "operator_class", None) or "human_ui"
+            )
+        validated_task_spec = dict(context.get("validated_task_spec") or {})
+        repo_context_pack = dict(context.get("repo_context_pack") or {})
+        surface = str(context.get("surface") or "operator")
+        workspace_mode = str(context.get("workspace_mode") or "ephemeral")
+        commit_base = str(validated_task_spec.get("base_commit") or context.get("commit_base") or "HEAD")
+        run_key = cls._deterministic_run_id(approved.draft_id, commit_base)
+        run_id = cls._new_run_id()
+
+        # Cheap early conflict check; repeated under the lock below.
         with cls._lock():
-            if approved_id.startswith("d_"):
-                raise PermissionError("Runs can only be created from approved_id")
-            approved = cls.get_approved(approved_id)
-            if not approved:
-                raise ValueError(f"Approved entry {approved_id} not found")
-
-            draft = cls.get_draft(approved.draft_id)
-            context = dict((draft.context if draft else {}) or {})
-            # R20-001: propagate operator_class from the draft into the stage
-            # context so the policy gate / intent classifier can whitelist
-            # cognitive_agent operators (MCP, agent SDK) and avoid the
-            # "fallback_to_most_restrictive_human_review" branch.
-            if draft is not None:
-                context["operator_class"] = str(
-                    getattr(draft, "operator_class", None) or "human_ui"
-                )
-            validated_task_spec = dict(context.get("validated_task_spec") or {})
-            repo_context = dict(context.get("repo_context") or {})
-            repo_context_pack = dict(context.get("repo_context_pack") or {})
-            surface = str(context.get("surface") or "operator")
-            workspace_mode = str(context.get("workspace_mode") or "ephemeral")
-            repo_id = str(repo_context.get("repo_id") or repo_context.get("target_branch") or "default")
-            commit_base = str(validated_task_spec.get("base_commit") or context.get("commit_base") or "HEAD")
-            run_key = cls._deterministic_run_id(approved.draft_id, commit_base)
-            run_id = cls._new_run_id()
+            active = cls._active_run_for_key(run_key)
+        if active:
+            raise RuntimeError(f"RUN_ALREADY_ACTIVE:{active.id}")
+
+        sandbox = None
+        if validated_task_spec:
+            from ..app_session_service import AppSessionService
+            from ..execution.sandbox_service import SandboxService
+            from ..workspace.workspace_policy_service import WorkspacePolicyService
+
+            repo_handle = str(validated_task_spec.get("repo_handle") or "").strip()
+            if surface == WorkspacePolicyService.SURFACE_CHATGPT_APP:
+                session_id = str(repo_context_pack.get("session_id") or "").strip()
+                repo_path = AppSessionService.get_bound_repo_path(session_id) if session_id else None
+                if not repo_path:
+                    raise RuntimeError("CHATGPT_APP_REPO_SNAPSHOT_UNAVAILABLE")
+            else:
+                repo_path = AppSessionService.get_path_from_handle(repo_handle) if repo_handle else None
+            if not repo_path:
+                raise RuntimeError("VALIDATED_TASK_SPEC_REPO_UNRESOLVABLE")
 
-            runs_for_key = cls._find_runs_by_run_key(run_key)
-            active = next((item for item in runs_for_key if cls._is_run_active(item)), None)
+            effective_mode = WorkspacePolicyService.resolve_effective_mode(
+                requested_mode=workspace_mode,
+                surface=surface,
+            )
+            validated_task_spec["workspace_mode"] = effective_mode
+            if effective_mode == WorkspacePolicyService.MODE_SOURCE_REPO:
+                validated_task_spec["workspace_path"] = str(repo_path)
+            else:
+                sandbox = await SandboxService.acquire_worktree_handle(run_id, repo_path, base_ref=commit_base)
+                validated_task_spec["workspace_path"] = str(sandbox.worktree_path)
 
-            # STALE RUN RECOVERY: If a run is active but has no heartbeat for > 10 mins, treat it as orphaned
-            if active:
-                stale_threshold = _utcnow() - timedelta(minutes=10)
-                heartbeat = active.heartbeat_at or active.created_at
-                if heartbeat < stale_threshold:
-                    logger.warning("Recovering stale run %s for run_key %s", active.id, run_key)
-                    # Force move to error so it's no longer 'active'
-                    cls._append_run_log_entry(active.id, level="ERROR", msg="Marked as STALE by new run attempt")
-                    active.status = "error"
-                    cls._persist_run(active)
-                    active = None # Allow new run
+        try:
+            return cls._register_run(
+                run_id, approved, context, validated_task_spec, run_key=run_key, commit_base=commit_base,
+            )
+        except BaseException:
+            if sandbox is not None:
+                SandboxService.cleanup_worktree(sandbox)
+            raise
 
+    @classmethod
+    def _register_run(
+        cls,
+        run_id: str,
+        approved: Any,
+        context: Dict[str, Any],
+        validated_task_spec: Dict[str, Any],
+        *,
+        run_key: str,
+        commit_base: str,
+    ) -> OpsRun:
+        with cls._lock():
+            active = cls._active_run_for_key(run_key)
             if active:
                 raise RuntimeError(f"RUN_ALREADY_ACTIVE:{active.id}")
 
+            runs_for_key = cls._find_runs_by_run_key(run_key)
             attempt = 1
             if runs_for_key:
                 attempt = max(int(item.attempt or 1) for item in runs_for_key) + 1
 
-            if validated_task_spec:
-                from ..app_session_service import AppSessionService
-                from ..execution.sandbox_service import SandboxService
-                from ..workspace.workspace_policy_service import WorkspacePolicyService
-
-                repo_handle = str(validated_task_spec.get("repo_handle") or "").strip()
-                if surface == WorkspacePolicyService.SURFACE_CHATGPT_APP:
-                    session_id = str(repo_context_pack.get("session_id") or "").strip()
-                    repo_path = AppSessionService.get_bound_repo_path(session_id) if session_id else None
-                    if not repo_path:
-                        raise RuntimeError("CHATGPT_APP_REPO_SNAPSHOT_UNAVAILABLE")
-                else:
-                    repo_path = AppSessionService.get_path_from_handle(repo_handle) if repo_handle else None
-                if not repo_path:
-                    raise RuntimeError("VALIDATED_TASK_SPEC_REPO_UNRESOLVABLE")
-
-                effective_mode = WorkspacePolicyService.resolve_effective_mode(
-                    requested_mode=workspace_mode,
-                    surface=surface,
-                )
-                validated_task_spec["workspace_mode"] = effective_mode
-                if effective_mode == WorkspacePolicyService.MODE_SOURCE_REPO:
-                    validated_task_spec["workspace_path"] = str(repo_path)
-                else:
-                    sandbox = SandboxService.create_worktree_handle(run_id, repo_path, base_ref=commit_base)
-                    validated_task_spec["workspace_path"] = str(sandbox.worktree_path)
+            repo_context = dict(context.get("repo_context") or {})
+            repo_id = str(repo_context.get("repo_id") or repo_context.get("target_branch") or "default")
 
             # P10: Extract routing metadata before draft expires
             routing_decision_raw = context.get("routing_decision")
@@ -295,7 +372,7 @@ class RunMixin:
 
             run = OpsRun(
                 id=run_id,
-                approved_id=approved_id,
+                approved_id=approved.id,
                 status="pending",  # type: ignore[arg-type]
                 repo_id=repo_id,
                 draft_id=approved.draft_id,
@@ -303,6 +380,7 @@ class RunMixin:
                 run_key=run_key,
                 risk_score=float(context.get("risk_score") or 0.0),
                 policy_decision_id=str(context.get("policy_decision_id") or ""),
+                priority=_run_priority(context.get("priority")),
                 log=[],
                 started_at=None,
                 created_at=_utcnow(),
@@ -323,6 +401,7 @@ class RunMixin:
                     "data": {"status": "pending"},
                 },
             )
+            cls._notify_run_health(run.id, status="pending", created_at=run.created_at)
             try:
                 from ..authority import ExecutionAuthority
                 ExecutionAuthority.get().run_worker.notify()
@@ -331,7 +410,7 @@ class RunMixin:
             return run
 
     @classmethod
-    def rerun(cls, run_id: str) -> OpsRun:
+    async def rerun(cls, run_id: str) -> OpsRun:
         source = cls.get_run(run_id)
         if not source:
             raise ValueError(f"Run {run_id} not found")
@@ -340,7 +419,7 @@ class RunMixin:
         if cls._is_run_active(source):
             raise RuntimeError(f"RERUN_SOURCE_ACTIVE:{source.id}")
 
-        rerun = cls.create_run(source.approved_id)
+        rerun = await cls.create_run(source.approved_id)
         rerun.rerun_of = source.id
         cls._persist_run(rerun)
         return rerun
@@ -358,44 +437,51 @@ class RunMixin:
     @classmethod
     def update_run_status(cls, run_id: str, status: str, *, msg: str | None = None) -> OpsRun:
         with cls._lock():
-            run = cls._load_run_metadata(run_id)
-            if not run:
-                raise ValueError(f"Run {run_id} not found")
+            return cls._update_run_status_locked(run_id, status, msg=msg)
 
-            # FSM Guard — materialize events to get the ACTUAL current state.
-            # The base JSON may still show the initial status because non-terminal
-            # transitions are stored as events and only compacted after ≥50 events.
-            # Reading only the base metadata would give stale status for the guard.
-            run_materialized = cls._materialize_run(cls._load_run_metadata(run_id))
-            current_status = str(run_materialized.status or "pending")
-            if current_status == status:
-                return run  # Idempotent
-
-            allowed = cls.VALID_TRANSITIONS.get(current_status, set())
-            if status not in allowed:
-                # Strictly enforce FSM in production
-                raise RuntimeError(f"INVALID_FSM_TRANSITION:{current_status}->{status}")
-
-            started_at = None
-            if status == "running" and not run.started_at:
-                started_at = _utcnow().isoformat()
-            if msg:
-                cls._append_run_log_entry(run_id, level="INFO", msg=msg)
-            cls._append_run_event(
-                run_id,
-                {
-                    "ts": _utcnow().isoformat(),
-                    "event": "status",
-                    "data": {"status": status, **({"started_at": started_at} if started_at else {})},
-                },
-            )
-            run = cls._materialize_run(run)
-            if status in cls._TERMINAL_RUN_STATUSES:
-                cls._persist_run(run)
-            else:
-                cls._compact_run_events_if_needed(run)
-            run.log = cls._read_run_logs(run_id, tail=cls._RUN_LOG_TAIL)
-            return run
+    @classmethod
+    def _update_run_status_locked(cls, run_id: str, status: str, *, msg: str | None = None) -> OpsRun:
+        """``update_run_status`` body; caller holds ``cls._lock()``."""
+        run = cls._load_run_metadata(run_id)
+        if not run:
+            raise ValueError(f"Run {run_id} not found")
+
+        # FSM Guard — materialize events to get the ACTUAL current state.
+        # The base JSON may still show the initial status because non-terminal
+        # transitions are stored as events and only compacted after ≥50 events.
+        # Reading only the base metadata would give stale status for the guard.
+        run_materialized = cls._materialize_run(cls._load_run_metadata(run_id))
+        current_status = str(run_materialized.status or "pending")
+        if current_status == status:
+            return run  # Idempotent
+
+        allowed = cls.VALID_TRANSITIONS.get(current_status, set())
+        if status not in allowed:
+            # Strictly enforce FSM in production
+            raise RuntimeError(f"INVALID_FSM_TRANSITION:{current_status}->{status}")
+
+        started_at = None
+        if status == "running" and not run.started_at:
+            started_at = _utcnow().isoformat()
+        if msg:
+            cls._append_run_log_entry(run_id, level="INFO", msg=msg)
+        cls._append_run_event(
+            run_id,
+            {
+                "ts": _utcnow().isoformat(),
+                "event": "status",
+                "data": {"status": status, **({"started_at": started_at} if started_at else {})},
+            },
+        )
+        run = cls._materialize_run(run)
+        cls._notify_run_health(run_id, status=status, started_at=started_at)
+        cls._publish_run_status(run)
+        if status in cls._TERMINAL_RUN_STATUSES:
+            cls._persist_run(run)
+        else:
+            cls._compact_run_events_if_needed(run)
+        run.log = cls._read_run_logs(run_id, tail=cls._RUN_LOG_TAIL)
+        return run
 
     @classmethod
     def resume_run(
@@ -475,6 +561,7 @@ class RunMixin:
                 )
                 run = cls._materialize_run(run)
                 cls._compact_run_events_if_needed(run)
+                cls._notify_run_health(run_id, heartbeat_at=now)
                 return run
         except Exception as exc:
             logger.debug("heartbeat_run failed for %s: %s", run_id, exc)
@@ -497,6 +584,7 @@ class RunMixin:
             if msg:
                 cls._append_run_log_entry(run_id, level="INFO", msg=msg)
             run = cls._materialize_run(run)
+            cls._publish_run_status(run)
             cls._compact_run_events_if_needed(run)
             run.log = cls._read_run_logs(run_id, tail=cls._RUN_LOG_TAIL)
             return run
@@ -603,6 +691,7 @@ class RunMixin:
                     f.unlink(missing_ok=True)
                     cls._run_log_path(f.stem).unlink(missing_ok=True)
                     cls._run_events_path(f.stem).unlink(missing_ok=True)
+                    cls._notify_run_health(f.stem, forget=True)
                     cleaned += 1
             except Exception:
                 continue
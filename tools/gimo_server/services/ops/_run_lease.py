@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ._base import _utcnow, _json_dump
+
+logger = logging.getLogger("orchestrator.ops")
+
+
+class RunLeaseMixin:
+    """Renewable run leases: which worker process executes a run, and until when.
+
+    A lease file (``locks/run_leases/<run_id>.json``) is written under the OPS
+    file lock together with the ``pending -> running`` transition, so two
+    worker processes sharing one ops store can never both claim a run.  The
+    owner renews it while executing; a lease that is not renewed expires and
+    ``reclaim_expired_run_leases`` puts the run back to ``pending``.
+    """
+
+    @classmethod
+    def _run_leases_dir(cls) -> Path:
+        return cls.LOCKS_DIR / "run_leases"
+
+    @classmethod
+    def _run_lease_path(cls, run_id: str) -> Path:
+        return cls._run_leases_dir() / f"{run_id}.json"
+
+    @classmethod
+    def _read_run_lease(cls, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    @staticmethod
+    def _lease_live(lease: Optional[Dict[str, Any]], now: datetime) -> bool:
+        if not lease:
+            return False
+        try:
+            return now <= datetime.fromisoformat(str(lease.get("expires_at") or ""))
+        except ValueError:
+            return False
+
+    @classmethod
+    def _write_run_lease_locked(
+        cls, run_id: str, owner_id: str, *, ttl_seconds: float, share_key: str, claimed_at: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        now = _utcnow()
+        lease = {
+            "lease_id": f"lease_{os.urandom(4).hex()}",
+            "run_id": run_id,
+            "owner_id": owner_id,
+            "share_key": share_key,
+            "claimed_at": claimed_at or now.isoformat(),
+            "expires_at": (now + timedelta(seconds=ttl_seconds)).isoformat(),
+        }
+        path = cls._run_lease_path(run_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(_json_dump(lease), encoding="utf-8")
+        os.replace(tmp, path)
+        return lease
+
+    @classmethod
+    def claim_run(
+        cls,
+        run_id: str,
+        owner_id: str,
+        *,
+        ttl_seconds: float = 60,
+        share_key: str = "default",
+        from_statuses: Iterable[str] = ("pending",),
+        msg: str | None = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically lease *run_id* to *owner_id* and mark it ``running``.
+
+        Returns the lease, or None when the run is gone, not in one of
+        *from_statuses*, or leased to another live owner.
+        """
+        with cls._lock():
+            run = cls._load_run_metadata(run_id)
+            if not run:
+                return None
+            status = str(cls._materialize_run(run).status or "pending")
+            if status not in set(from_statuses):
+                return None
+            current = cls._read_run_lease(cls._run_lease_path(run_id))
+            if cls._lease_live(current, _utcnow()) and current.get("owner_id") != owner_id:
+                return None
+            lease = cls._write_run_lease_locked(run_id, owner_id, ttl_seconds=ttl_seconds, share_key=share_key)
+            if status != "running":
+                cls._update_run_status_locked(run_id, "running", msg=msg or f"Claimed by worker {owner_id}")
+            return lease
+
+    @classmethod
+    def renew_run_lease(cls, run_id: str, owner_id: str, *, ttl_seconds: float = 60) -> bool:
+        """Extend *owner_id*'s lease; False when the lease was lost (expired and reclaimed)."""
+        with cls._lock():
+            current = cls._read_run_lease(cls._run_lease_path(run_id))
+            if not current or current.get("owner_id") != owner_id:
+                return False
+            cls._write_run_lease_locked(
+                run_id,
+                owner_id,
+                ttl_seconds=ttl_seconds,
+                share_key=str(current.get("share_key") or "default"),
+                claimed_at=current.get("claimed_at"),
+            )
+            return True
+
+    @classmethod
+    def release_run_lease(cls, run_id: str, owner_id: str) -> None:
+        with cls._lock():
+            path = cls._run_lease_path(run_id)
+            current = cls._read_run_lease(path)
+            if current and current.get("owner_id") == owner_id:
+                path.unlink(missing_ok=True)
+
+    @classmethod
+    def list_run_leases(cls) -> List[Dict[str, Any]]:
+        """All lease records (live or expired), without loading any run."""
+        directory = cls._run_leases_dir()
+        if not directory.exists():
+            return []
+        leases = []
+        for path in directory.glob("*.json"):
+            lease = cls._read_run_lease(path)
+            if lease:
+                leases.append(lease)
+        return leases
+
+    @classmethod
+    def reclaim_expired_run_leases(cls) -> List[str]:
+        """Return runs whose lease expired to ``pending``; returns their ids.
+
+        Only lease files are visited, so the cost follows the number of runs
+        in flight rather than the size of the run store.
+        """
+        reclaimed: List[str] = []
+        directory = cls._run_leases_dir()
+        if not directory.exists():
+            return reclaimed
+        now = _utcnow()
+        expired = [
+            path for path in directory.glob("*.json")
+            if not cls._lease_live(cls._read_run_lease(path), now)
+        ]
+        if not expired:
+            return reclaimed
+        with cls._lock():
+            now = _utcnow()
+            for path in expired:
+                lease = cls._read_run_lease(path)
+                if lease is None or cls._lease_live(lease, now):
+                    continue  # renewed meanwhile
+                run_id = str(lease.get("run_id") or path.stem)
+                path.unlink(missing_ok=True)
+                run = cls._load_run_metadata(run_id)
+                if not run or str(cls._materialize_run(run).status) != "running":
+                    continue
+                try:
+                    cls._update_run_status_locked(
+                        run_id,
+                        "pending",
+                        msg=f"Reclaimed by run_worker: lease of {lease.get('owner_id')} expired",
+                    )
+                    reclaimed.append(run_id)
+                except Exception as exc:
+                    logger.warning("Failed to reclaim run %s: %s", run_id, exc)
+        return reclaimed
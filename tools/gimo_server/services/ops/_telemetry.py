@@ -7,6 +7,7 @@ from ...ops_models import AgentInsight
 from ..gics_service import GicsService
 from ..agent_telemetry_service import AgentTelemetryService
 from ..agent_insight_service import AgentInsightService
+from ..routing_scoreboard import RoutingScoreboard
 
 logger = logging.getLogger("orchestrator.ops")
 
@@ -57,7 +58,7 @@ class TelemetryMixin:
         if not cls._gics:
             return None
         try:
-            return cls._gics.seed_model_prior(
+            merged = cls._gics.seed_model_prior(
                 provider_type=provider_type,
                 model_id=model_id,
                 prior_scores=prior_scores,
@@ -65,6 +66,8 @@ class TelemetryMixin:
             )
         except Exception:
             return None
+        RoutingScoreboard.on_model_outcome(provider_type, model_id, merged)
+        return merged
 
     @classmethod
     def record_model_outcome(
@@ -81,7 +84,7 @@ class TelemetryMixin:
         if not cls._gics:
             return None
         try:
-            return cls._gics.record_model_outcome(
+            outcome = cls._gics.record_model_outcome(
                 provider_type=provider_type,
                 model_id=model_id,
                 success=success,
@@ -91,6 +94,8 @@ class TelemetryMixin:
             )
         except Exception:
             return None
+        RoutingScoreboard.on_model_outcome(provider_type, model_id, outcome)
+        return outcome
 
     @classmethod
     def get_model_reliability(cls, *, provider_type: str, model_id: str) -> Optional[Dict[str, Any]]:
@@ -6,6 +6,7 @@ from ._plan import PlanConfigMixin
 from ._draft import DraftMixin
 from ._approved import ApprovedMixin
 from ._run import RunMixin
+from ._run_lease import RunLeaseMixin
 from ._lock import LockMixin
 
 
@@ -15,6 +16,7 @@ class OpsService(
     DraftMixin,
     ApprovedMixin,
     RunMixin,
+    RunLeaseMixin,
     LockMixin,
     OpsServiceBase,
 ):
@@ -0,0 +1,279 @@
+"""Routing scoreboard — in-memory GICS evidence for ModelRouterService.
+
+A routing decision used to read, for every candidate binding, the model's
+reliability (``ops:model_score:*``) and its per-task capability
+(``ops:capability:*``) from GICS, and to resolve a benchmark profile with a
+linear alias scan.  The scoreboard keeps all three in process:
+
+- reliability per ``(provider_type, model_id)`` and capability per
+  ``(task_type, provider_type, model_id)``, updated from the values the
+  writers already return (``OpsService.record_model_outcome``,
+  ``OpsService.seed_model_priors``,
+  ``CapabilityProfileService.record_task_outcome``);
+- benchmark profiles behind a prebuilt alias index
+  (:class:`~.benchmark_enrichment_service.BenchmarkIndex`), reloaded when the
+  inventory refresh fetches benchmarks;
+- the combined adjustments per ``(task_type, provider_type, model_id)``, so a
+  warm decision is a handful of dict lookups.
+
+``prewarm`` loads every inventory model after an inventory refresh; a key
+not seen yet is read through once.  Entries older than
+``ORCH_ROUTING_SCOREBOARD_TTL_S`` (default 600 s) are re-read, which bounds
+staleness from writers in other processes.  Without a GICS client there is
+nothing to mirror and reads go straight through.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("orchestrator.routing_scoreboard")
+
+def _norm(value: Any) -> str:
+    """Same normalisation as the GICS key builders."""
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(os.environ.get("ORCH_ROUTING_SCOREBOARD_TTL_S", "600"))
+    except ValueError:
+        return 600.0
+
+
+@dataclass(frozen=True)
+class RouteScore:
+    """Evidence-based adjustments for one (task_type, provider_type, model_id)."""
+    gics_adjustment: float
+    gics_reasons: Tuple[str, ...]
+    anomaly: bool
+    benchmark_adjustment: float
+    benchmark_reasons: Tuple[str, ...]
+
+
+class RoutingScoreboard:
+    """Process-wide mirror of the GICS signals the router ranks by."""
+
+    _lock = threading.Lock()
+    _backing_id: Optional[int] = None
+    _reliability: Dict[Tuple[str, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+    _capability: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+    _scores: Dict[Tuple[str, str], Dict[str, RouteScore]] = {}  # (provider, model) -> task -> score
+    _bench_index: Any = None
+    hits = 0
+    misses = 0
+
+    # ------------------------------------------------------------------
+    # Backing store
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _cacheable(cls) -> bool:
+        """True when a GICS client is attached; resets on a new client."""
+        from .ops import OpsService
+
+        gics = getattr(OpsService, "_gics", None)
+        if gics is None:
+            return False
+        if id(gics) != cls._backing_id:
+            with cls._lock:
+                cls._reliability = {}
+                cls._capability = {}
+                cls._scores = {}
+                cls._backing_id = id(gics)
+        return True
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._reliability = {}
+            cls._capability = {}
+            cls._scores = {}
+            cls._bench_index = None
+            cls._backing_id = None
+            cls.hits = 0
+            cls.misses = 0
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def reliability(cls, provider_type: str, model_id: str) -> Optional[Dict[str, Any]]:
+        from .ops import OpsService
+
+        if not cls._cacheable():
+            return OpsService.get_model_reliability(provider_type=provider_type, model_id=model_id)
+        key = (_norm(provider_type), _norm(model_id))
+        cached = cls._reliability.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _ttl_seconds():
+            cls.hits += 1
+            return cached[1]
+        cls.misses += 1
+        value = OpsService.get_model_reliability(provider_type=provider_type, model_id=model_id)
+        cls._store_reliability(key, value)
+        return value
+
+    @classmethod
+    def capability(cls, provider_type: str, model_id: str, task_type: str) -> Any:
+        from .capability_profile_service import CapabilityProfileService
+
+        if not cls._cacheable():
+            return CapabilityProfileService.get_capability(
+                provider_type=provider_type, model_id=model_id, task_type=task_type,
+            )
+        key = (_norm(task_type), _norm(provider_type), _norm(model_id))
+        cached = cls._capability.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _ttl_seconds():
+            cls.hits += 1
+            return cached[1]
+        cls.misses += 1
+        value = CapabilityProfileService.get_capability(
+            provider_type=provider_type, model_id=model_id, task_type=task_type,
+        )
+        cls._store_capability(key, value)
+        return value
+
+    @classmethod
+    def benchmark_profile(cls, model_id: str) -> Any:
+        index = cls._bench_index
+        if index is None:
+            index = cls._load_benchmark_index()
+        return index.lookup(model_id)
+
+    @classmethod
+    def benchmark_profiles(cls) -> Dict[str, Any]:
+        index = cls._bench_index
+        if index is None:
+            index = cls._load_benchmark_index()
+        return index.profiles
+
+    @classmethod
+    def cached_score(cls, task_type: str, provider_type: str, model_id: str) -> Optional[RouteScore]:
+        """Combined adjustments if still valid, else None (caller recomputes)."""
+        if not cls._cacheable():
+            return None
+        key = (_norm(task_type), _norm(provider_type), _norm(model_id))
+        score = cls._scores.get(key[1:], {}).get(key[0])
+        if score is None:
+            return None
+        now = time.monotonic()
+        ttl = _ttl_seconds()
+        rel = cls._reliability.get(key[1:])
+        cap = cls._capability.get(key)
+        if rel is None or cap is None or now - rel[0] >= ttl or now - cap[0] >= ttl:
+            return None
+        cls.hits += 1
+        return score
+
+    @classmethod
+    def store_score(cls, task_type: str, provider_type: str, model_id: str, score: RouteScore) -> None:
+        if cls._cacheable():
+            with cls._lock:
+                cls._scores.setdefault((_norm(provider_type), _norm(model_id)), {})[_norm(task_type)] = score
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def on_model_outcome(cls, provider_type: str, model_id: str, reliability: Optional[Dict[str, Any]]) -> None:
+        """Reliability written by ``record_model_outcome`` / ``seed_model_priors``."""
+        if reliability is None or not cls._cacheable():
+            return
+        cls._store_reliability((_norm(provider_type), _norm(model_id)), dict(reliability))
+
+    @classmethod
+    def on_task_outcome(cls, provider_type: str, model_id: str, task_type: str, capability: Any) -> None:
+        """Capability written by ``CapabilityProfileService.record_task_outcome``."""
+        if capability is None or not cls._cacheable():
+            return
+        cls._store_capability((_norm(task_type), _norm(provider_type), _norm(model_id)), capability)
+
+    @classmethod
+    def load_benchmarks(cls, profiles: Dict[str, Any]) -> None:
+        """Install freshly fetched benchmark profiles (inventory refresh)."""
+        from .benchmark_enrichment_service import BenchmarkIndex
+
+        index = BenchmarkIndex(profiles or {})
+        with cls._lock:
+            cls._bench_index = index
+            cls._scores = {}
+
+    @classmethod
+    def prewarm(cls, entries: Iterable[Any], task_types: Iterable[str]) -> int:
+        """Read reliability + capability for every (model, task type); blocking.
+
+        Capabilities come from the per-model task index, so task types a model
+        has never run are recorded as absent without a read each.
+        """
+        from .capability_profile_service import CapabilityProfileService
+        from .ops import OpsService
+
+        if not cls._cacheable():
+            return 0
+        task_types = list(task_types)
+        reads = 0
+        for entry in entries:
+            pt, mid = entry.provider_type, entry.model_id
+            cls._store_reliability(
+                (_norm(pt), _norm(mid)), OpsService.get_model_reliability(provider_type=pt, model_id=mid),
+            )
+            known = {_norm(t) for t in CapabilityProfileService.known_task_types(provider_type=pt, model_id=mid)}
+            reads += 2
+            for task in task_types:
+                key = (_norm(task), _norm(pt), _norm(mid))
+                if key[0] in known:
+                    reads += 1
+                    value = CapabilityProfileService.get_capability(provider_type=pt, model_id=mid, task_type=task)
+                else:
+                    value = None
+                cls._store_capability(key, value)
+        logger.debug("Routing scoreboard prewarmed with %d GICS reads", reads)
+        return reads
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "reliability": len(cls._reliability),
+            "capability": len(cls._capability),
+            "scores": sum(len(tasks) for tasks in cls._scores.values()),
+            "benchmark_profiles": len(cls._bench_index.profiles) if cls._bench_index is not None else 0,
+            "hits": cls.hits,
+            "misses": cls.misses,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _store_reliability(cls, key: Tuple[str, str], value: Optional[Dict[str, Any]]) -> None:
+        with cls._lock:
+            cls._reliability[key] = (time.monotonic(), value)
+            cls._scores.pop(key, None)
+
+    @classmethod
+    def _store_capability(cls, key: Tuple[str, str, str], value: Any) -> None:
+        with cls._lock:
+            cls._capability[key] = (time.monotonic(), value)
+            cls._scores.get(key[1:], {}).pop(key[0], None)
+
+    @classmethod
+    def _load_benchmark_index(cls) -> Any:
+        """First use before any inventory refresh: load the on-disk cache once."""
+        from .benchmark_enrichment_service import BenchmarkIndex, _load_stale_cache
+
+        try:
+            profiles = _load_stale_cache() or {}
+        except Exception:  # noqa: BLE001
+            logger.debug("benchmark profiles unavailable for routing", exc_info=True)
+            profiles = {}
+        with cls._lock:
+            if cls._bench_index is None:
+                cls._bench_index = BenchmarkIndex(profiles)
+        return cls._bench_index
@@ -33,35 +33,21 @@ class SagpGateway:
         """Evaluate whether an action is allowed under current governance.
 
         Orchestrates: ExecutionPolicyService, TrustEngine, CostService,
-        BudgetForecastService, ExecutionProofChain.
+        BudgetForecastService, ExecutionProofChain. Reads come from the
+        in-memory :class:`GovernanceState`; the pre-action proof is persisted
+        by :class:`ProofPipeline` after the verdict is returned.
         """
-        from ..engine.tools.chat_tools_schema import get_tool_risk_level
         from ..services.economy.cost_service import CostService
-        from ..services.execution.execution_policy_service import (
-            EXECUTION_POLICIES,
-            ExecutionPolicyProfile,
-        )
+        from .governance_state import GovernanceState
 
-        # 1. Resolve policy
+        # 1-3. Policy, tool allowance, risk band and HITL (cached per policy/tool)
         effective_policy_name = policy_name or "workspace_safe"
-        policy: ExecutionPolicyProfile = EXECUTION_POLICIES.get(
-            effective_policy_name,
-            EXECUTION_POLICIES["workspace_safe"],
-        )
-
-        # 2. Check tool allowed
-        tool_allowed = True
-        denial_reason = ""
-        try:
-            policy.assert_tool_allowed(tool_name)
-        except PermissionError as exc:
-            tool_allowed = False
-            denial_reason = str(exc)
-
-        # 3. Get risk band
-        risk_band = get_tool_risk_level(tool_name).lower()
+        decision = GovernanceState.tool_decision(effective_policy_name, tool_name)
+        tool_allowed = decision.tool_allowed
+        denial_reason = decision.denial_reason
+        risk_band = decision.risk_band
 
-        # 4. Trust score — lightweight: use static heuristic if engine unavailable
+        # 4. Trust score
         trust_score = cls._get_trust_score("tool")
 
         # 5. Circuit breaker state
@@ -69,39 +55,33 @@ class SagpGateway:
 
         # 6. Cost estimation (use default model if not specified in args)
         model = (tool_args or {}).get("model", "claude-sonnet-4-6")
-        estimated_cost = CostService.calculate_cost(
-            model=model,
-            input_tokens=int((tool_args or {}).get("input_tokens", 1000)),
-            output_tokens=int((tool_args or {}).get("output_tokens", 500)),
+        estimated_cost = CostService.cost_for_pricing(
+            GovernanceState.pricing(model),
+            int((tool_args or {}).get("input_tokens", 1000)),
+            int((tool_args or {}).get("output_tokens", 500)),
         )
 
         # 7. Budget check
         budget_ok = cls._check_budget(estimated_cost)
 
         # 8. HITL required?
-        requires_approval = (
-            tool_name in policy.requires_confirmation
-            or risk_band == "high"
-        )
+        requires_approval = decision.requires_approval
 
         # 9. Final decision
         allowed = tool_allowed and circuit_state != "open" and budget_ok
 
-        # 10. Create and PERSIST a real pre-action proof (R20-005).
-        # Previously this returned a synthetic uuid slice that was never
-        # written to any store, so downstream `verify_proof_chain` always
-        # returned length:0 for a thread where an `evaluate_action` call had
-        # just returned a proof_id. Now we append to an ExecutionProofChain
-        # and persist the proof to GICS under the canonical
-        # `ops:proof:<thread_id>:<proof_id>` key. If no thread_id is supplied,
-        # we still generate a synthetic id but mark it as ephemeral in the
-        # reasoning so callers know not to use it for chain verification.
+        # 10. Create a real pre-action proof (R20-005). The proof id is
+        # reserved now and the proof is appended to the thread's
+        # ExecutionProofChain under `ops:proof:<thread_id>:<proof_id>` by the
+        # ProofPipeline writer, in call order. If no thread_id is supplied,
+        # we still generate a synthetic id but mark it as ephemeral so callers
+        # know not to use it for chain verification.
         proof_id = cls._persist_pre_action_proof(
             thread_id=thread_id,
             tool_name=tool_name,
             tool_args=tool_args or {},
             policy_name=effective_policy_name,
-            allowed=(tool_allowed and circuit_state != "open" and budget_ok),
+            allowed=allowed,
             surface_type=str(getattr(surface, "surface_type", "") or ""),
             cost=estimated_cost,
         )
@@ -128,7 +108,7 @@ class SagpGateway:
             proof_id=proof_id,
             reasoning="; ".join(reasons),
             constraints=(
-                (f"fs:{policy.fs_mode}",)
+                (f"fs:{decision.fs_mode}",)
                 + (("hitl_required",) if requires_approval else ())
             ),
         )
@@ -192,7 +172,9 @@ class SagpGateway:
         """Delegate to ExecutionProofChain.verify()."""
         try:
             from ..security.execution_proof import ExecutionProofChain
+            from .governance_state import ProofPipeline
             from .storage_service import StorageService
+            ProofPipeline.flush(thread_id)
             storage = StorageService()
             raw_proofs = storage.list_proofs(thread_id) if hasattr(storage, "list_proofs") else []
             chain = ExecutionProofChain.from_records(thread_id, raw_proofs)
@@ -246,87 +228,55 @@ class SagpGateway:
         surface_type: str,
         cost: float,
     ) -> str:
-        """Persist a real pre-action proof entry to GICS.
+        """Queue a real pre-action proof entry for GICS.
 
-        Returns the proof_id of the persisted entry. If no thread_id was
-        supplied, returns an ephemeral id prefixed with ``ephemeral_`` so
-        callers never confuse it with a chain-verifiable id.
+        Returns the proof_id the entry is persisted under. If no thread_id was
+        supplied, or the proof cannot be persisted (GICS unavailable, backlog
+        full), returns an ephemeral id prefixed with ``ephemeral_`` so callers
+        never confuse it with a chain-verifiable id.
         """
         if not thread_id:
             return f"ephemeral_{uuid.uuid4().hex[:16]}"
-        try:
-            from ..security.execution_proof import ExecutionProofChain
-            from .storage_service import StorageService
-
-            storage = StorageService()
-            gics = getattr(storage, "gics", None)
-            raw_proofs = storage.list_proofs(thread_id) if hasattr(storage, "list_proofs") else []
-            chain = ExecutionProofChain.from_records(thread_id, raw_proofs)
-            proof = chain.append(
-                tool_name=tool_name,
-                args={
-                    "kind": "pre_action",
-                    "policy_name": policy_name,
-                    "surface_type": surface_type,
-                    "args": dict(tool_args or {}),
-                },
-                result={
-                    "kind": "pre_action_verdict",
-                    "allowed": bool(allowed),
-                    "policy_name": policy_name,
-                },
-                mood="pre_action",
-                cost=float(cost or 0.0),
-                subject_type="thread",
-                subject_id=thread_id,
-                executor_type="sagp",
-                executor_id="sagp:evaluate_action",
-            )
-            if gics is not None:
-                try:
-                    gics.put(f"ops:proof:{thread_id}:{proof.proof_id}", proof.to_dict())
-                except Exception as exc:
-                    logger.debug("Pre-action proof persist (put) failed: %s", exc)
-            else:
-                logger.debug(
-                    "Pre-action proof appended but GICS unavailable — proof %s will be lost on restart",
-                    proof.proof_id,
-                )
-            return proof.proof_id
-        except Exception as exc:
-            logger.warning("Pre-action proof persistence failed: %s", exc)
-            # Honest fallback: mark as ephemeral so consumers don't expect
-            # chain verifiability.
-            return f"ephemeral_{uuid.uuid4().hex[:16]}"
+        from .governance_state import ProofPipeline
+
+        return ProofPipeline.submit(thread_id, {
+            "tool_name": tool_name,
+            "args": {
+                "kind": "pre_action",
+                "policy_name": policy_name,
+                "surface_type": surface_type,
+                "args": dict(tool_args or {}),
+            },
+            "result": {
+                "kind": "pre_action_verdict",
+                "allowed": bool(allowed),
+                "policy_name": policy_name,
+            },
+            "mood": "pre_action",
+            "cost": float(cost or 0.0),
+            "subject_type": "thread",
+            "subject_id": thread_id,
+            "executor_type": "sagp",
+            "executor_id": "sagp:evaluate_action",
+        })
 
     # ── Private helpers ───────────────────────────────────────────────────
 
     @classmethod
     def _get_trust_score(cls, dimension_key: str) -> float:
-        """Get trust score, falling back to default if engine unavailable."""
+        """Get trust score from the governance snapshot, falling back to default."""
         try:
-            from ..services.trust_engine import TrustEngine
-            from ..services.storage.trust_storage import TrustStorage
-            from .storage_service import StorageService
-            storage = TrustStorage(gics_service=StorageService._shared_gics)
-            engine = TrustEngine(trust_store=storage)
-            record = engine.query_dimension(dimension_key)
-            score = float(record.get("score", 0.85))
-            return score
+            from .governance_state import GovernanceState
+            return GovernanceState.trust_score(dimension_key)
         except Exception:
             return 0.85
 
     @classmethod
     def _get_circuit_state(cls) -> str:
-        """Get circuit breaker state."""
+        """Get circuit breaker state from the governance snapshot."""
         try:
-            from ..services.trust_engine import TrustEngine
-            from ..services.storage.trust_storage import TrustStorage
-            from .storage_service import StorageService
-            storage = TrustStorage(gics_service=StorageService._shared_gics)
-            engine = TrustEngine(trust_store=storage)
-            record = engine.query_dimension("provider")
-            return str(record.get("circuit_state", "closed"))
+            from .governance_state import GovernanceState
+            return GovernanceState.circuit_state("provider")
         except Exception:
             return "closed"
 
@@ -370,7 +320,9 @@ class SagpGateway:
         if not thread_id:
             return 0
         try:
+            from .governance_state import ProofPipeline
             from .storage_service import StorageService
+            ProofPipeline.flush(thread_id)
             storage = StorageService()
             raw_proofs = storage.list_proofs(thread_id) if hasattr(storage, "list_proofs") else []
             return len(raw_proofs)
@@ -67,6 +67,11 @@ class TrustStorage:
             raise
         except Exception as e:
             logger.error("Failed to push trust event to GICS: %s", e)
+            return
+
+        from ..governance_state import GovernanceState
+
+        GovernanceState.on_trust_event(event_data)
 
     def delete_trust_event(self, event_key: str) -> None:
         """R18 Change 4 — always raises. Trust events are append-only."""
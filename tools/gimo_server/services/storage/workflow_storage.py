@@ -15,6 +15,7 @@ class WorkflowStorage:
     def __init__(self, conn: Optional[Any] = None, gics: Optional[Any] = None):
         self._conn = conn # Kept for backward compatibility
         self.gics = gics
+        self._last_cp_ts: Dict[str, int] = {}
 
     def ensure_tables(self) -> None:
         """No-op: using GICS."""
@@ -38,7 +39,11 @@ class WorkflowStorage:
         state: Any,
         output: Optional[Any],
         status: str,
+        kind: str = "full",
+        removed: Optional[List[str]] = None,
+        appended: Optional[Dict[str, List[Any]]] = None,
     ) -> None:
+        """Persist a checkpoint; for ``kind="delta"`` *state* holds only the changed keys."""
         if not self.gics:
             return
             
@@ -46,16 +51,23 @@ class WorkflowStorage:
         output_payload = output if isinstance(output, str) or output is None else json.dumps(output)
         
         try:
-            timestamp = int(time.time() * 1000)
+            # Strictly increasing per workflow: deltas are replayed in timestamp order.
+            timestamp = max(int(time.time() * 1000), self._last_cp_ts.get(workflow_id, 0) + 1)
+            self._last_cp_ts[workflow_id] = timestamp
             cp_key = f"wf:{workflow_id}:cp:{timestamp}:{node_id}"
-            self.gics.put(cp_key, {
+            fields = {
                 "workflow_id": workflow_id,
                 "node_id": node_id,
                 "state": state_payload,
                 "output": output_payload,
                 "status": status,
                 "timestamp": timestamp
-            })
+            }
+            if kind != "full":
+                fields["kind"] = kind
+                fields["removed"] = json.dumps(removed or [])
+                fields["appended"] = json.dumps(appended or {})
+            self.gics.put(cp_key, fields)
         except Exception as e:
             logger.error("Failed to push checkpoint for %s to GICS: %s", workflow_id, e)
 
@@ -99,6 +111,9 @@ class WorkflowStorage:
                     "output": self._maybe_parse_json(fields.get("output")),
                     "status": fields.get("status"),
                     "timestamp": fields.get("timestamp"),
+                    "kind": fields.get("kind") or "full",
+                    "removed": self._maybe_parse_json(fields.get("removed")) or [],
+                    "appended": self._maybe_parse_json(fields.get("appended")) or {},
                 })
             checkpoints.sort(key=lambda x: x.get("timestamp") or 0)
             return checkpoints
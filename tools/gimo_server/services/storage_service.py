@@ -47,8 +47,10 @@ class StorageService:
     def save_workflow(self, workflow_id: str, data: str) -> None:
         return self.workflows.save_workflow(workflow_id, data)
 
-    def save_checkpoint(self, workflow_id: str, node_id: str, state: Any, output: Optional[Any], status: str) -> None:
-        return self.workflows.save_checkpoint(workflow_id, node_id, state, output, status)
+    def save_checkpoint(
+        self, workflow_id: str, node_id: str, state: Any, output: Optional[Any], status: str, **delta: Any,
+    ) -> None:
+        return self.workflows.save_checkpoint(workflow_id, node_id, state, output, status, **delta)
 
     def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         return self.workflows.get_workflow(workflow_id)
@@ -270,7 +270,7 @@ class SubAgentManager:
             operator_class=operator_class_value,
         )
         approved = OpsService.approve_draft(draft.id, approved_by=f"sub_agent:{parent_id}")
-        run = OpsService.create_run(approved.id)
+        run = await OpsService.create_run(approved.id)
         projection = cls._build_projection(
             parent_id=parent_id,
             workspace_path=workspace_path,
@@ -53,7 +53,17 @@ class TrustEngine:
     def query_dimension(self, dimension_key: str, *, events_limit: int = 5000) -> Dict[str, Any]:
         events = self.storage.list_trust_events(limit=events_limit)
         record_map = self._build_records(events)
-        record = record_map.get(dimension_key, self._empty_record(dimension_key))
+        return self._publish_record(dimension_key, record_map.get(dimension_key, self._empty_record(dimension_key)))
+
+    def query_dimensions(self, dimension_keys: List[str], *, events_limit: int = 5000) -> Dict[str, Dict[str, Any]]:
+        """``query_dimension`` for several keys over one event listing and fold."""
+        keys = list(dict.fromkeys(dimension_keys))
+        wanted = set(keys)
+        events = [e for e in self.storage.list_trust_events(limit=events_limit) if e.get("dimension_key") in wanted]
+        record_map = self._build_records(events)
+        return {key: self._publish_record(key, record_map.get(key, self._empty_record(key))) for key in keys}
+
+    def _publish_record(self, dimension_key: str, record: Dict[str, Any]) -> Dict[str, Any]:
         if self.debug_mode:
             # Show real data but never block, never persist
             record["debug_mode"] = True
@@ -0,0 +1,238 @@
+"""Caches for web search: fused results per normalized query, and fetched pages.
+
+Agents (and parallel sub-agents) tend to repeat the same or near-identical
+queries within a session.  ``SearchResultCache`` keys fused responses by the
+normalized query text (case-folded, whitespace-collapsed, trailing
+punctuation stripped) and the provider set.  An entry fetched with
+``max_results=N`` also serves any later request for ``<= N`` results.
+
+``PageCache`` keeps cleaned page text with the response's ``ETag`` /
+``Last-Modified`` validators.  Fresh entries are served directly; stale ones
+are revalidated with a conditional GET, so an unchanged page costs a 304
+instead of a full download.  It is capped by total bytes as well as entries.
+
+``SingleFlight`` collapses concurrent identical requests into one upstream
+call.  The call runs as its own task, so a cancelled caller does not cancel it
+for the others.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from ..models.web_search import WebSearchFusionResponse
+
+T = TypeVar("T")
+ResultKey = Tuple[str, Tuple[str, ...]]
+
+
+def normalize_query(query: str) -> str:
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.strip(" ?!.,;:")
+
+
+@dataclass
+class _ResultEntry:
+    response: WebSearchFusionResponse
+    max_results: int
+    stored_at: float
+
+
+class SearchResultCache:
+    """LRU + TTL cache of fused search responses."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[ResultKey, _ResultEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, providers: Iterable[str]) -> ResultKey:
+        return normalize_query(query), tuple(sorted(set(providers)))
+
+    def get(self, key: ResultKey, max_results: int) -> Optional[WebSearchFusionResponse]:
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            entry = None
+        if entry is None or entry.max_results < max_results:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        response = entry.response.model_copy(deep=True)
+        response.results = response.results[:max_results]
+        return response
+
+    def put(self, key: ResultKey, response: WebSearchFusionResponse, max_results: int) -> None:
+        existing = self._entries.get(key)
+        if existing is not None and existing.max_results > max_results and (
+            self._clock() - existing.stored_at <= self.ttl_seconds
+        ):
+            return  # keep the wider entry
+        self._entries[key] = _ResultEntry(
+            response=response.model_copy(deep=True),
+            max_results=max_results,
+            stored_at=self._clock(),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass
+class PageEntry:
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    size: int
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class PageCache:
+    """LRU + TTL cache of cleaned page text, capped by entries and total bytes."""
+
+    def __init__(
+        self,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, PageEntry] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def lookup(self, url: str) -> Tuple[Optional[PageEntry], bool]:
+        """Return ``(entry, fresh)``; a stale entry is returned for revalidation."""
+        entry = self._entries.get(url)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        self._entries.move_to_end(url)
+        if self._clock() - entry.stored_at <= self.ttl_seconds:
+            self.hits += 1
+            return entry, True
+        if not entry.revalidatable:
+            self._remove(url)
+            self.misses += 1
+            return None, False
+        return entry, False
+
+    def put(
+        self, url: str, content: str, *, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        size = len(content.encode("utf-8"))
+        self._remove(url)
+        if size > self.max_bytes:
+            return
+        self._entries[url] = PageEntry(
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=self._clock(),
+            size=size,
+        )
+        self.total_bytes += size
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def mark_revalidated(self, url: str) -> None:
+        entry = self._entries.get(url)
+        if entry is not None:
+            entry.stored_at = self._clock()
+            self.revalidated += 1
+
+    def _remove(self, url: str) -> None:
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+
+class SingleFlight:
+    """De-duplicate concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+RESULT_CACHE = SearchResultCache()
+PAGE_CACHE = PageCache()
+SEARCH_FLIGHTS = SingleFlight()
+PAGE_FLIGHTS = SingleFlight()
@@ -1,40 +1,102 @@
-"""Content extraction — fetches and cleans page content for search results."""
+"""Content extraction — fetches and cleans page content for search results.
+
+Pages go through ``web_search_cache.PAGE_CACHE``: fresh entries are served
+without a request, stale ones are revalidated with ``If-None-Match`` /
+``If-Modified-Since``, and concurrent fetches of one URL share a request.
+"""
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 import re
-from typing import List
+from typing import List, Optional
 
 import httpx
 
 from ..models.web_search import WebSearchResult
+from . import web_search_cache
 
 logger = logging.getLogger("orchestrator.services.web_search_content")
 _EXTRACT_TIMEOUT = 8.0
 _MAX_CONTENT_LENGTH = 5000
+_USER_AGENT = "GIMO-Agent/1.0"
 
 
 async def extract_content_for_results(
     results: List[WebSearchResult],
     max_concurrent: int = 5,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> List[WebSearchResult]:
     sem = asyncio.Semaphore(max_concurrent)
+    owns_client = client is None
+    if client is None:
+        client = httpx.AsyncClient(timeout=_EXTRACT_TIMEOUT, follow_redirects=True)
 
     async def _fetch_one(result: WebSearchResult) -> WebSearchResult:
         if result.content:
             return result
-        async with sem:
-            try:
-                async with httpx.AsyncClient(timeout=_EXTRACT_TIMEOUT, follow_redirects=True) as client:
-                    resp = await client.get(result.url, headers={"User-Agent": "GIMO-Agent/1.0"})
-                    resp.raise_for_status()
-                    result.content = _clean_html(resp.text)[:_MAX_CONTENT_LENGTH]
-            except Exception as exc:
-                logger.debug("Content extraction failed for %s: %s", result.url, exc)
-            return result
+        content = await fetch_page_content(result.url, client=client, semaphore=sem)
+        if content is not None:
+            result.content = content
+        return result
+
+    try:
+        return await asyncio.gather(*[_fetch_one(r) for r in results])
+    finally:
+        if owns_client:
+            await client.aclose()
+
+
+async def fetch_page_content(
+    url: str,
+    *,
+    client: httpx.AsyncClient,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> Optional[str]:
+    """Cleaned text of *url*, or ``None`` when it cannot be fetched."""
+    entry, fresh = web_search_cache.PAGE_CACHE.lookup(url)
+    if entry is not None and fresh:
+        return entry.content
+    return await web_search_cache.PAGE_FLIGHTS.do(
+        url, lambda: _fetch_and_store(url, client, entry, semaphore)
+    )
+
+
+async def _fetch_and_store(
+    url: str,
+    client: httpx.AsyncClient,
+    stale: Optional[web_search_cache.PageEntry],
+    semaphore: Optional[asyncio.Semaphore],
+) -> Optional[str]:
+    headers = {"User-Agent": _USER_AGENT}
+    if stale is not None:
+        if stale.etag:
+            headers["If-None-Match"] = stale.etag
+        if stale.last_modified:
+            headers["If-Modified-Since"] = stale.last_modified
+    try:
+        async with semaphore or contextlib.nullcontext():
+            resp = await client.get(url, headers=headers)
+        if resp.status_code == 304 and stale is not None:
+            web_search_cache.PAGE_CACHE.mark_revalidated(url)
+            return stale.content
+        resp.raise_for_status()
+    except Exception as exc:
+        logger.debug("Content extraction failed for %s: %s", url, exc)
+        # A stale copy beats nothing when the origin is unreachable.
+        return stale.content if stale is not None else None
 
-    return await asyncio.gather(*[_fetch_one(r) for r in results])
+    content = _clean_html(resp.text)[:_MAX_CONTENT_LENGTH]
+    if "no-store" not in resp.headers.get("cache-control", "").lower():
+        web_search_cache.PAGE_CACHE.put(
+            url,
+            content,
+            etag=resp.headers.get("etag"),
+            last_modified=resp.headers.get("last-modified"),
+        )
+    return content
 
 
 def _clean_html(html: str) -> str:
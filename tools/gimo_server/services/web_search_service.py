@@ -13,13 +13,19 @@ from ..models.web_search import (
     WebSearchQuery,
     WebSearchResult,
 )
+from . import web_search_cache
 from .web_search_providers import PROVIDER_REGISTRY
 
 logger = logging.getLogger("orchestrator.services.web_search")
 
 
 class WebSearchService:
-    """Parallel multi-provider web search with result fusion and cross-reference ranking."""
+    """Parallel multi-provider web search with result fusion and cross-reference ranking.
+
+    Fused responses are cached per normalized query and provider set, and
+    concurrent identical queries share one upstream fan-out (see
+    ``web_search_cache``).  ``WebSearchQuery.use_cache=False`` bypasses both.
+    """
 
     @staticmethod
     async def search(query: WebSearchQuery) -> WebSearchFusionResponse:
@@ -27,7 +33,42 @@ class WebSearchService:
         providers = list(query.providers or ["duckduckgo"])
         if "duckduckgo" not in providers:
             providers.append("duckduckgo")
+        if not query.use_cache:
+            return await WebSearchService._search_upstream(query, providers, start)
+
+        cache = web_search_cache.RESULT_CACHE
+        key = cache.key(query.query, providers)
+        response = cache.get(key, query.max_results)
+        if response is not None:
+            response.cached = True
+            response.fusion_time_ms = round((time.monotonic() - start) * 1000, 1)
+        else:
+            shared = await web_search_cache.SEARCH_FLIGHTS.do(
+                (key, query.max_results),
+                lambda: WebSearchService._search_and_store(query, providers, key, start),
+            )
+            # Callers sharing a flight each get their own copy.
+            response = shared.model_copy(deep=True)
+        response.query = query.query
+        return response
 
+    @staticmethod
+    async def _search_and_store(
+        query: WebSearchQuery,
+        providers: List[str],
+        key: web_search_cache.ResultKey,
+        start: float,
+    ) -> WebSearchFusionResponse:
+        response = await WebSearchService._search_upstream(query, providers, start)
+        # Only responses with results are cached; an outage is retried next call.
+        if response.providers_used:
+            web_search_cache.RESULT_CACHE.put(key, response, query.max_results)
+        return response
+
+    @staticmethod
+    async def _search_upstream(
+        query: WebSearchQuery, providers: List[str], start: float
+    ) -> WebSearchFusionResponse:
         tasks = {}
         for provider in providers:
             search_fn = PROVIDER_REGISTRY.get(provider)